@@ -7,7 +7,19 @@ from collections.abc import Callable
 import typer
 from rich.table import Table
 
-from migration.lib import PHASES, console, list_gates, set_verbose, stdout_console
+from migration import explain
+from migration.duck import close_duck_session
+from migration.lib import (
+    PHASES,
+    close_pg_pools,
+    console,
+    die,
+    drain_spans,
+    list_gates,
+    log,
+    set_verbose,
+    stdout_console,
+)
 from migration.phases import (
     build,
     constraints,
@@ -25,10 +37,12 @@ from migration.phases import (
     parity,
     preflight,
     prod_schema_guard,
+    raw_indexes,
     reference_data,
     rollback,
     schema_snapshot,
     smoke,
+    unlogged,
     verify_prisma_local,
 )
 
@@ -41,6 +55,7 @@ app = typer.Typer(
 
 @app.callback()
 def _main(
+    ctx: typer.Context,
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -53,6 +68,24 @@ def _main(
     """DEMOS migration toolkit."""
     if verbose:
         set_verbose(True)
+    # Pooled Postgres connections and the DuckDB session outlive any one helper
+    # call; close them when the command finishes (including a die() exit) rather than at GC time.
+    ctx.call_on_close(close_pg_pools)
+    ctx.call_on_close(close_duck_session)
+    ctx.call_on_close(lambda: _write_timings(ctx.invoked_subcommand or ""))
+
+
+def _write_timings(command: str) -> None:
+    """Persist the spans this command recorded; never changes the exit status."""
+    spans = drain_spans()
+    if not spans:
+        return
+    from migration import duck
+
+    try:
+        duck.write_timings(spans, command)
+    except Exception as e:
+        log(f"WARNING: could not write the timings run history: {e}")
 
 
 @app.command("init")
@@ -125,10 +158,63 @@ def cmd_id_maps() -> None:
     init_pg.run_id_maps()
 
 
+_NO_RAW_INDEXES_HELP = (
+    "Skip the post-load ANALYZE of mysql_raw and the CREATE INDEX CONCURRENTLY pass "
+    "over the join keys in fk_candidates.csv and the stg SQL (see `migrate raw-indexes`)."
+)
+
+
 @app.command("load-full")
-def cmd_load_full() -> None:
+def cmd_load_full(
+    shards: int = typer.Option(
+        1,
+        "--shards",
+        min=1,
+        help="Split the tables into N row-balanced buckets (sized from "
+        "reports/schema_snapshot/table_stats.csv; FK-linked tables share a bucket) "
+        "and run one pgloader per bucket.",
+    ),
+    parallel: int | None = typer.Option(
+        None,
+        "--parallel",
+        min=1,
+        help="Run at most N pgloader shards (default: --shards) or COPY tables "
+        "(default: PG_POOL_SIZE) at once. Each pgloader process gets its own "
+        "PGLOADER_DYNAMIC_SPACE_MB heap.",
+    ),
+    # B008: typer reads the Enum annotation to build the choice list.
+    engine: load_full.LoadEngine = typer.Option(  # noqa: B008
+        load_full.LoadEngine.PGLOADER,
+        "--engine",
+        case_sensitive=False,
+        help="Loader engine: 'pgloader' (default) or 'copy' (in-process binary "
+        "COPY via DuckDB's MySQL scanner; same casts.load mapping and drop list; "
+        "not combinable with --shards; required by UNLOGGED_BUILD).",
+    ),
+    no_raw_indexes: bool = typer.Option(False, "--no-raw-indexes", help=_NO_RAW_INDEXES_HELP),
+) -> None:
     """Full pgloader MySQL -> mysql_raw with drop list applied."""
-    load_full.run_load_full()
+    load_full.run_load_full(
+        shards=shards, parallel=parallel, engine=engine, raw_indexes=not no_raw_indexes
+    )
+
+
+@app.command("raw-indexes")
+def cmd_raw_indexes(
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="ANALYZE and report the join keys that would be indexed without building them.",
+    ),
+) -> None:
+    """ANALYZE mysql_raw and index its unindexed join keys (runs after load-full/delta)."""
+    raw_indexes.run_raw_indexes(dry_run=dry_run)
+
+
+@app.command("set-logged")
+def cmd_set_logged() -> None:
+    """SET LOGGED every UNLOGGED mysql_raw/stg table and report the WAL saved (runs in build)."""
+    unlogged.run_set_logged()
 
 
 @app.command("fk-candidates")
@@ -145,36 +231,169 @@ def cmd_load_fidelity(
         help="Exit non-zero on any source/mysql_raw row-count mismatch. "
         "Default is informational (report + WARN only).",
     ),
+    fast: bool = typer.Option(
+        False,
+        "--fast",
+        help="Triage on catalog estimates (information_schema.TABLES.TABLE_ROWS vs "
+        "pg_class.reltuples) and count exactly only the tables whose estimates differ "
+        "by more than 10%; the rest are reported UNVERIFIED, and --strict fails on "
+        "them. Quick enough to run after every delta.",
+    ),
+    checksum: bool = typer.Option(
+        False,
+        "--checksum",
+        help="Also compare row content: hash primary-key range chunks server-side on "
+        "MySQL and mysql_raw, and write the differing rows of any mismatching chunk "
+        "to reports/runs/load_fidelity_checksum_<stamp>/ as Parquet.",
+    ),
+    jobs: int = typer.Option(
+        4,
+        "--jobs",
+        "-j",
+        min=1,
+        help="With --checksum, compare up to N chunks concurrently.",
+    ),
+    chunk_rows: int = typer.Option(
+        100_000,
+        "--chunk-rows",
+        min=1,
+        help="With --checksum, the approximate rows per primary-key range chunk.",
+    ),
 ) -> None:
     """Compare live MySQL vs mysql_raw row counts via DuckDB dual-attach (non-gating)."""
-    load_fidelity.run_load_fidelity(strict=strict)
+    load_fidelity.run_load_fidelity(
+        strict=strict, fast=fast, checksum=checksum, jobs=jobs, chunk_rows=chunk_rows
+    )
 
 
 @app.command("schema-snapshot")
-def cmd_schema_snapshot() -> None:
+def cmd_schema_snapshot(
+    jobs: int = typer.Option(
+        4,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Run up to N information_schema captures concurrently.",
+    ),
+) -> None:
     """Snapshot the MySQL source information_schema to reports/schema_snapshot/."""
-    schema_snapshot.run_schema_snapshot()
+    schema_snapshot.run_schema_snapshot(jobs=jobs)
 
 
 @app.command("reference-data")
-def cmd_reference_data() -> None:
+def cmd_reference_data(
+    jobs: int = typer.Option(
+        4,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Dump up to N lookup tables and views concurrently.",
+    ),
+) -> None:
     """Dump MySQL *_rfrnc lookup rows + views to reports/reference_data/ (crosswalk input)."""
-    reference_data.run_reference_data_dump()
+    reference_data.run_reference_data_dump(jobs=jobs)
 
 
 @app.command("analyze")
-def cmd_analyze() -> None:
-    """Register reports/ CSV+Parquet artifacts as in-memory DuckDB views (offline analysis)."""
+def cmd_analyze(
+    ingest: bool = typer.Option(
+        False,
+        "--ingest",
+        help="Copy each artifact into a native DuckDB table instead of a view over "
+        "the file, so joins run at columnar speed.",
+    ),
+    query: str = typer.Option(
+        "",
+        "--query",
+        "-q",
+        help="After refreshing the catalog, run this SQL against it and print the result.",
+    ),
+) -> None:
+    """Refresh reports/analysis.duckdb over the reports/ CSV+Parquet artifacts (offline analysis).
+
+    Only new or changed files are re-registered, so repeat runs are quick.
+    """
+    from migration import duck
+
+    duck.analyze(ingest=ingest, quiet=bool(query))
+    if not query:
+        return
+    header, rows = duck.query_analysis(query)
+    table = Table(show_lines=False)
+    for column in header:
+        table.add_column(column)
+    for row in rows:
+        table.add_row(*("" if v is None else str(v) for v in row))
+    stdout_console.print(table)
+    log(f"analyze --query: {len(rows)} row(s)")
+
+
+@app.command("timings")
+def cmd_timings(
+    threshold: float = typer.Option(
+        0.25,
+        "--threshold",
+        min=0.0,
+        help="Flag a span more than this fraction slower than its median over "
+        "earlier runs (0.25 = 25%).",
+    ),
+    min_seconds: float = typer.Option(
+        1.0,
+        "--min-seconds",
+        min=0.0,
+        help="Ignore slowdowns smaller than this many seconds (sub-second jitter).",
+    ),
+    limit: int = typer.Option(
+        25, "--limit", min=1, help="Show the N slowest spans of the latest run."
+    ),
+    fail_on_regression: bool = typer.Option(
+        False,
+        "--fail-on-regression",
+        help="Exit non-zero when any span regressed (for CI or a rehearsal script).",
+    ),
+) -> None:
+    """Compare the latest phase/SQL-file/parity timings with earlier rehearsals."""
     from migration import duck
 
-    duck.analyze()
+    deltas = duck.timing_regressions(threshold=threshold, min_seconds=min_seconds)
+    regressed = [d for d in deltas if d.regressed]
+    shown = regressed + [d for d in deltas if not d.regressed][: max(limit - len(regressed), 0)]
+    table = Table(title="Timings: latest run vs. median of earlier runs", show_lines=False)
+    table.add_column("Kind")
+    table.add_column("Name")
+    table.add_column("Latest s", justify="right")
+    table.add_column("Median s", justify="right")
+    table.add_column("Runs", justify="right")
+    table.add_column("Flag")
+    for d in shown:
+        table.add_row(
+            d.kind,
+            d.name,
+            f"{d.seconds:.2f}",
+            "-" if d.baseline is None else f"{d.baseline:.2f}",
+            str(d.history),
+            "[red]REGRESSED[/red]" if d.regressed else "",
+        )
+    stdout_console.print(table)
+    log(f"timings: {len(regressed)} regression(s) across {len(deltas)} span(s)")
+    if regressed and fail_on_regression:
+        die(f"{len(regressed)} span(s) regressed; see the table above")
 
 
 @app.command("diagnose")
-def cmd_diagnose() -> None:
+def cmd_diagnose(
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Run up to N parity checks concurrently over pooled Postgres "
+        "connections (see PG_POOL_SIZE). Report order is unchanged.",
+    ),
+) -> None:
     """Read-only triage: aggregate the non-gating probes (parity report-only +
     load-fidelity) into reports/runs/diagnose_<stamp>.md. Marks no gates; exits 0."""
-    diagnose.run_diagnose()
+    diagnose.run_diagnose(jobs=jobs)
 
 
 @app.command("verify-prod-schema")
@@ -212,21 +431,134 @@ def cmd_freeze() -> None:
 
 
 @app.command("delta")
-def cmd_delta() -> None:
+def cmd_delta(
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Fetch only rows at/after each manifest table's high-water mark "
+        "(its updated_col) and upsert them by primary key, instead of a pgloader "
+        "TRUNCATE + full re-pull. Deletes are not propagated.",
+    ),
+    allow_insert_only_marks: bool = typer.Option(
+        False,
+        "--allow-insert-only-marks",
+        help="With --incremental, accept manifest marks that only move on insert "
+        "(creatd_dt): rows updated in place on those tables are not re-fetched.",
+    ),
+    no_raw_indexes: bool = typer.Option(False, "--no-raw-indexes", help=_NO_RAW_INDEXES_HELP),
+) -> None:
     """P2 pgloader final delta."""
-    load_delta.run_load_delta()
+    load_delta.run_load_delta(
+        incremental=incremental,
+        raw_indexes=not no_raw_indexes,
+        allow_insert_only_marks=allow_insert_only_marks,
+    )
+
+
+_EXPLAIN_SLOW_HELP = (
+    "Capture the EXPLAIN (ANALYZE, BUFFERS) JSON plan of every statement slower than "
+    "SECONDS (via auto_explain; slow reads are re-run under EXPLAIN when it is "
+    "unavailable) into reports/runs/explain_<command>_<stamp>/ with a summary of "
+    "top seq scans and row misestimates. Adds instrumentation overhead; rehearsals only."
+)
 
 
 @app.command("build")
-def cmd_build() -> None:
+def cmd_build(
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Re-apply only the 05_id_maps/10_stg files whose declared Inputs changed "
+        "(mysql_raw row count + max _loaded_at, override CSVs, the file itself) "
+        "since the last build, instead of truncating stg and re-applying everything.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Apply up to N independent demos_app build files concurrently, ordered "
+        "by their front-matter Inputs/Outputs, each in its own transaction. Default "
+        "1 keeps the single-transaction build_app.",
+    ),
+    no_materialize: bool = typer.Option(
+        False,
+        "--no-materialize",
+        help="Leave the stg.*_resolved relations as plain views instead of snapshotting "
+        "each into an UNLOGGED, analyzed table (indexed on its selective *_id columns) "
+        "as soon as it is built.",
+    ),
+    replay: bool = typer.Option(
+        False,
+        "--replay",
+        help="Replay the delta onto the demos_app left by `migrate warm-build`: an "
+        "incremental build_stg, then delete only the demos_app rows fed by source rows "
+        "loaded since the warm build (and their FK dependents) and re-insert them with "
+        "their id-map UUIDs, instead of truncating. Pair with `delta --incremental`.",
+    ),
+    explain_slow: float | None = typer.Option(
+        None,
+        "--explain-slow",
+        min=0.0,
+        metavar="SECONDS",
+        help=_EXPLAIN_SLOW_HELP,
+    ),
+) -> None:
     """P3 build_stg + build_app."""
-    build.run_build()
+    with explain.capture(explain_slow, "build"):
+        build.run_build(
+            incremental=incremental, jobs=jobs, materialize=not no_materialize, replay=replay
+        )
+
+
+@app.command("warm-build")
+def cmd_warm_build(
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Apply up to N independent demos_app build files concurrently (as `build --jobs`).",
+    ),
+    no_materialize: bool = typer.Option(
+        False,
+        "--no-materialize",
+        help="Leave the stg.*_resolved relations as plain views (as `build --no-materialize`).",
+    ),
+    explain_slow: float | None = typer.Option(
+        None,
+        "--explain-slow",
+        min=0.0,
+        metavar="SECONDS",
+        help=_EXPLAIN_SLOW_HELP,
+    ),
+) -> None:
+    """Pre-freeze build_stg + build_app from the full load, for a cutover-day `build --replay`."""
+    with explain.capture(explain_slow, "warm-build"):
+        build.run_warm_build(jobs=jobs, materialize=not no_materialize)
 
 
 @app.command("constraints")
-def cmd_constraints() -> None:
+def cmd_constraints(
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Validate FKs on up to N child tables concurrently over pooled "
+        "Postgres connections (see PG_POOL_SIZE).",
+    ),
+    explain_slow: float | None = typer.Option(
+        None,
+        "--explain-slow",
+        min=0.0,
+        metavar="SECONDS",
+        help=_EXPLAIN_SLOW_HELP,
+    ),
+) -> None:
     """P5 apply FKs (NOT VALID then VALIDATE), triggers, indexes."""
-    constraints.run_constraints()
+    with explain.capture(explain_slow, "constraints"):
+        constraints.run_constraints(jobs=jobs)
 
 
 @app.command("parity")
@@ -237,9 +569,25 @@ def cmd_parity(
         help="Mark the parity gate green even when checks are PENDING. "
         "For dress rehearsals only; logs a WARN with the pending checks.",
     ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Run up to N parity checks concurrently over pooled Postgres "
+        "connections (see PG_POOL_SIZE). Report order is unchanged.",
+    ),
+    explain_slow: float | None = typer.Option(
+        None,
+        "--explain-slow",
+        min=0.0,
+        metavar="SECONDS",
+        help=_EXPLAIN_SLOW_HELP,
+    ),
 ) -> None:
     """P6 parity report."""
-    parity.run_parity(accept_pending=accept_pending)
+    with explain.capture(explain_slow, "parity"):
+        parity.run_parity(accept_pending=accept_pending, jobs=jobs)
 
 
 @app.command("flip")
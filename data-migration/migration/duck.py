@@ -3,21 +3,47 @@
 DuckDB's server-less, file-oriented OLAP is the right tool for querying the
 deterministic CSVs the pipeline already emits (schema snapshot, reference
 data, crosswalks, parity outputs) -- no Postgres required. This module adds a
-Parquet companion to the review-friendly CSVs and an in-memory analysis
-entrypoint that registers those artifacts as views. Nothing here is on the
-cutover-critical gate path; it never connects to a live database.
+Parquet companion to the review-friendly CSVs and a persistent analysis
+catalog (``reports/analysis.duckdb``) that registers those artifacts as views
+or tables and refreshes only what changed, and keeps the run-history
+store of phase/SQL-file/parity-check timings (``reports/runs/timings_*.parquet``)
+that ``migrate timings`` compares across rehearsals. Nothing here is on the
+cutover-critical gate path.
+
+It also owns the process-scoped DuckDB session (:func:`duck_connection`) that
+the role-C phases (schema snapshot, reference data, load fidelity, the
+prod-schema guard, the crosswalk audit) use to attach the live MySQL source and
+the Postgres clusters READ_ONLY. Scanners load and catalogs attach once per
+process, on first use.
 """
 
 from __future__ import annotations
 
+import json
+import os
+import threading
+from collections.abc import Generator, Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlparse
 
-from migration.lib import REPORTS_DIR, log, rel
+from migration.lib import (
+    REPORTS_DIR,
+    ROOT_DIR,
+    RUNS_DIR,
+    Env,
+    Span,
+    die,
+    file_stamp,
+    log,
+    rel,
+)
 
 
-def _q(s: str | Path) -> str:
-    """Single-quote-escape a path for inlining into DuckDB SQL."""
+def escape_literal(s: str | Path) -> str:
+    """Single-quote-escape a path, DSN or SQL text for inlining into a DuckDB string literal."""
     return str(s).replace("'", "''")
 
 
@@ -35,14 +61,32 @@ def to_parquet(csv_path: Path, parquet_path: Path | None = None) -> Path:
     con = duckdb.connect()
     try:
         con.execute(
-            f"COPY (SELECT * FROM read_csv_auto('{_q(csv_path)}', all_varchar=true)) "
-            f"TO '{_q(out)}' (FORMAT parquet)"
+            f"COPY (SELECT * FROM read_csv_auto('{escape_literal(csv_path)}', all_varchar=true)) "
+            f"TO '{escape_literal(out)}' (FORMAT parquet)"
         )
     finally:
         con.close()
     return out
 
 
+def copy_to_files(con: Any, select_sql: str, stem: Path) -> int:
+    """Stream ``select_sql`` to ``<stem>.parquet`` and ``<stem>.csv``; return the row count.
+
+    The query runs once, straight into Parquet with its source types, and the
+    CSV is written from that local file, so no row passes through Python. An
+    empty result still yields a header-only CSV.
+    """
+    parquet, csv_path = stem.with_suffix(".parquet"), stem.with_suffix(".csv")
+    row = con.execute(
+        f"COPY ({select_sql}) TO '{escape_literal(parquet)}' (FORMAT parquet)"
+    ).fetchone()
+    con.execute(
+        f"COPY (SELECT * FROM read_parquet('{escape_literal(parquet)}')) TO '{escape_literal(csv_path)}' "
+        "(FORMAT csv, HEADER)"
+    )
+    return int(row[0]) if row else 0
+
+
 def csv_dir_to_parquet(directory: Path) -> int:
     """Best-effort: emit a Parquet copy of every ``*.csv`` in ``directory``.
 
@@ -74,19 +118,56 @@ class ArtifactInfo:
     columns: int
 
 
+# The persistent analysis catalog `migrate analyze` maintains (under the
+# analyzed root). `_artifacts` is its manifest: one row per registered file.
+ANALYSIS_DB_NAME = "analysis.duckdb"
+_ARTIFACTS_DDL = """
+CREATE TABLE IF NOT EXISTS _artifacts (
+    name VARCHAR PRIMARY KEY, path VARCHAR, mtime DOUBLE, size BIGINT,
+    rows BIGINT, columns INTEGER, ingested BOOLEAN
+)
+"""
+
+
 def _view_name(path: Path, root: Path) -> str:
     """A SQL-safe view name from an artifact's path relative to ``root``."""
     rel_path = path.relative_to(root).with_suffix("")
     return "_".join(part for part in rel_path.parts).replace("-", "_").replace(".", "_")
 
 
-def analyze(root: Path = REPORTS_DIR) -> list[ArtifactInfo]:
-    """Register every CSV/Parquet under ``root`` as an in-memory DuckDB view.
+def _artifacts(root: Path) -> dict[str, Path]:
+    """View name -> artifact under ``root``; a Parquet companion wins over its CSV."""
+    found: dict[str, Path] = {}
+    for p in sorted(root.rglob("*")):
+        if p.suffix not in (".csv", ".parquet"):
+            continue
+        name = _view_name(p, root)
+        if name not in found or p.suffix == ".parquet":
+            found[name] = p
+    return found
+
+
+def _drop(con: Any, name: str, ingested: bool) -> None:
+    con.execute(f'DROP {"TABLE" if ingested else "VIEW"} IF EXISTS "{name}"')
 
-    Returns one :class:`ArtifactInfo` per artifact (view name, path, row and
-    column counts). This is the entrypoint for ad-hoc offline analysis: hold
-    the returned connection-less inventory, or extend with project queries
-    that join the artifacts -- all without a running Postgres.
+
+def analyze(
+    root: Path = REPORTS_DIR,
+    *,
+    ingest: bool = False,
+    db_path: Path | None = None,
+    quiet: bool = False,
+) -> list[ArtifactInfo]:
+    """Refresh the on-disk analysis catalog over every CSV/Parquet under ``root``.
+
+    The catalog is ``<root>/analysis.duckdb`` unless ``db_path`` is given.
+    Each artifact is a view named after its path (``ingest=True``: a native
+    table copied from the file, so joins run columnar). Only new or changed
+    files -- by mtime, size, or the ingest mode -- are re-registered and
+    re-counted; the ``_artifacts`` manifest answers the rest, and objects
+    whose file is gone are dropped. Returns one :class:`ArtifactInfo` per
+    artifact (view name, path, row and column counts); ``quiet`` logs only
+    the summary line instead of the inventory.
     """
     import duckdb
 
@@ -96,27 +177,393 @@ def analyze(root: Path = REPORTS_DIR) -> list[ArtifactInfo]:
         log(f"analyze: {rel(root)} not present")
         return infos
 
-    paths = sorted(p for p in root.rglob("*") if p.suffix in (".csv", ".parquet"))
-    con = duckdb.connect()
+    found = _artifacts(root)
+    con = duckdb.connect(str(db_path or root / ANALYSIS_DB_NAME))
+    refreshed = 0
     try:
-        for p in paths:
-            name = _view_name(p, root)
+        con.execute(_ARTIFACTS_DDL)
+        known = {
+            str(r[0]): r[1:]
+            for r in con.execute(
+                "SELECT name, path, mtime, size, rows, columns, ingested FROM _artifacts"
+            ).fetchall()
+        }
+        for name in known.keys() - found.keys():
+            _drop(con, name, bool(known[name][5]))
+            con.execute("DELETE FROM _artifacts WHERE name = ?", [name])
+        for name, p in found.items():
+            st = p.stat()
+            prior = known.get(name)
+            stamp = (str(p), st.st_mtime, st.st_size, ingest)
+            if prior is not None and (*prior[:3], bool(prior[5])) == stamp:
+                infos.append(ArtifactInfo(name, rel(p), int(prior[3]), int(prior[4])))
+                continue
             reader = "read_parquet" if p.suffix == ".parquet" else "read_csv_auto"
             try:
+                if prior is not None:
+                    _drop(con, name, bool(prior[5]))
+                kind = "TABLE" if ingest else "VIEW"
                 con.execute(
-                    f'CREATE OR REPLACE VIEW "{name}" AS '
-                    f"SELECT * FROM {reader}('{_q(p)}')"
+                    f"CREATE OR REPLACE {kind} \"{name}\" AS SELECT * FROM {reader}('{escape_literal(p)}')"
                 )
-                count_rows = con.execute(f'SELECT count(*) FROM "{name}"').fetchall()
-                rows = int(count_rows[0][0]) if count_rows else 0
+                counted = con.execute(f'SELECT count(*) FROM "{name}"').fetchone()
+                rows = int(counted[0]) if counted else 0
                 cols = len(con.execute(f'SELECT * FROM "{name}" LIMIT 0').description or [])
             except Exception as e:
                 log(f"WARNING: could not register {rel(p)}: {e}")
+                con.execute("DELETE FROM _artifacts WHERE name = ?", [name])
                 continue
-            infos.append(ArtifactInfo(name=name, path=rel(p), rows=rows, columns=cols))
+            con.execute(
+                "INSERT OR REPLACE INTO _artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [name, str(p), st.st_mtime, st.st_size, rows, cols, ingest],
+            )
+            infos.append(ArtifactInfo(name, rel(p), rows, cols))
+            refreshed += 1
     finally:
         con.close()
-    for i in infos:
+    for i in [] if quiet else infos:
         log(f"  {i.name}: {i.rows} rows x {i.columns} cols ({i.path})")
-    log(f"analyze: registered {len(infos)} artifact(s) under {rel(root)}")
+    log(
+        f"analyze: {len(infos)} artifact(s) under {rel(root)} "
+        f"({refreshed} new or changed) in {rel(db_path or root / ANALYSIS_DB_NAME)}"
+    )
     return infos
+
+
+def query_analysis(
+    sql: str, root: Path = REPORTS_DIR, *, db_path: Path | None = None
+) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """Run ``sql`` against the analysis catalog (refresh it first with :func:`analyze`)."""
+    import duckdb
+
+    path = db_path or Path(root) / ANALYSIS_DB_NAME
+    if not path.exists():
+        die(f"no {rel(path)}; run `migrate analyze` first")
+    con = duckdb.connect(str(path), read_only=True)
+    try:
+        cur = con.execute(sql)
+        header = [d[0] for d in cur.description or []]
+        return header, cur.fetchall()
+    except duckdb.Error as e:
+        die(f"analyze --query failed: {e}")
+    finally:
+        con.close()
+
+
+_TIMINGS_DDL = """
+CREATE TABLE spans (
+    run_id VARCHAR, command VARCHAR, kind VARCHAR, name VARCHAR,
+    started_at TIMESTAMP, seconds DOUBLE, rows BIGINT,
+    db_blks_hit BIGINT, db_blks_read BIGINT, ok BOOLEAN, settings VARCHAR
+)
+"""
+
+
+def write_timings(
+    spans: Sequence[Span], command: str, directory: Path | None = None
+) -> Path | None:
+    """Append ``spans`` to the run-history store as one Parquet file.
+
+    Each CLI invocation writes ``timings_<stamp>_<command>_<pid>.parquet``
+    under ``directory`` (default ``reports/runs/``); the files together are
+    the store, so nothing is ever rewritten. ``started_at`` is naive UTC;
+    ``settings`` holds a phase's effective session profile as JSON. Returns
+    the written path, or ``None`` when there was nothing to record.
+    """
+    import duckdb
+
+    if not spans:
+        return None
+    out_dir = directory or RUNS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    run_id = f"{file_stamp()}_{command or 'migrate'}"
+    out = out_dir / f"timings_{run_id}_{os.getpid()}.parquet"
+    con = duckdb.connect()
+    try:
+        con.execute(_TIMINGS_DDL)
+        con.executemany(
+            "INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    command,
+                    s.kind,
+                    s.name,
+                    s.started_at.replace(tzinfo=None),
+                    s.seconds,
+                    s.rows,
+                    s.db_blks_hit,
+                    s.db_blks_read,
+                    s.ok,
+                    json.dumps(s.settings) if s.settings else None,
+                )
+                for s in spans
+            ],
+        )
+        con.execute(f"COPY spans TO '{escape_literal(out)}' (FORMAT parquet)")
+    finally:
+        con.close()
+    return out
+
+
+@dataclass(frozen=True)
+class TimingDelta:
+    """The latest wall time of one span against its history.
+
+    ``baseline`` is the median over earlier runs (``None`` on first sight);
+    ``regressed`` is set by :func:`timing_regressions`' thresholds.
+    """
+
+    kind: str
+    name: str
+    seconds: float
+    baseline: float | None
+    history: int
+    regressed: bool
+
+
+# One row per (kind, name): its most recent successful run against the median
+# of every earlier one. A span repeated inside one run (a file re-applied by
+# `resume`) is summed for that run.
+_TIMINGS_SQL = """
+WITH per_run AS (
+    SELECT kind, name, run_id, min(started_at) AS started_at, sum(seconds) AS seconds
+    FROM read_parquet('{glob}', union_by_name = true)
+    WHERE ok
+    GROUP BY kind, name, run_id
+), ranked AS (
+    SELECT *, row_number() OVER (PARTITION BY kind, name ORDER BY started_at DESC) AS rn
+    FROM per_run
+)
+SELECT cur.kind, cur.name, cur.seconds, median(prev.seconds), count(prev.seconds)
+FROM ranked cur
+LEFT JOIN ranked prev ON prev.kind = cur.kind AND prev.name = cur.name AND prev.rn > 1
+WHERE cur.rn = 1
+GROUP BY cur.kind, cur.name, cur.seconds
+ORDER BY cur.seconds DESC, cur.kind, cur.name
+"""
+
+
+def timing_regressions(
+    root: Path | None = None, *, threshold: float = 0.25, min_seconds: float = 1.0
+) -> list[TimingDelta]:
+    """Compare each span's latest run with its history in ``root`` (``reports/runs/``).
+
+    A span regressed when it is more than ``threshold`` (a fraction) slower
+    than its baseline median *and* at least ``min_seconds`` slower in
+    absolute terms, so sub-second jitter on small files never flags. Failed
+    spans are left out of both sides. Returned slowest first.
+    """
+    import duckdb
+
+    root = root or RUNS_DIR
+    if not any(root.glob("timings_*.parquet")):
+        log(f"timings: no timings_*.parquet under {rel(root)} yet")
+        return []
+    con = duckdb.connect()
+    try:
+        rows = con.execute(
+            _TIMINGS_SQL.format(glob=escape_literal(root / "timings_*.parquet"))
+        ).fetchall()
+    finally:
+        con.close()
+    out: list[TimingDelta] = []
+    for kind, name, seconds, baseline, history in rows:
+        regressed = (
+            baseline is not None
+            and seconds - baseline >= min_seconds
+            and seconds > baseline * (1 + threshold)
+        )
+        out.append(TimingDelta(kind, name, seconds, baseline, int(history), regressed))
+    return out
+
+
+# Catalog alias -> (DuckDB ATTACH type, scanner extension). ``src`` is the live
+# MySQL source, ``pg`` the migration target (``env.pg_dsn()``), ``ref`` the
+# prod-schema guard's reference cluster (``REFERENCE_PG_URL``).
+CATALOGS: dict[str, tuple[str, str]] = {
+    "src": ("mysql", "mysql_scanner"),
+    "pg": ("postgres", "postgres_scanner"),
+    "ref": ("postgres", "postgres_scanner"),
+}
+
+
+def mysql_attach_dsn(mysql_url: str, mysql_db: str) -> str:
+    """Build a DuckDB MySQL ATTACH DSN from the connection URL + database name.
+
+    Accepts a standard MySQL connection URL; ``mysql_db`` takes
+    precedence over the URL path for the database name. Percent-encoded
+    credentials are decoded. Empty components are omitted so DuckDB applies
+    its own defaults. The host defaults to ``localhost`` and the port to
+    ``3306`` when absent.
+    """
+    u = urlparse(mysql_url)
+    db = mysql_db or u.path.lstrip("/")
+    parts = {
+        "host": u.hostname or "localhost",
+        "port": str(u.port or 3306),
+        "user": unquote(u.username) if u.username else "",
+        "password": unquote(u.password) if u.password else "",
+        "database": db,
+    }
+    return " ".join(f"{k}={v}" for k, v in parts.items() if v != "")
+
+
+def mysql_query_sql(mysql_sql: str) -> str:
+    """Wrap one MySQL query in DuckDB's ``mysql_query('src', '...')`` passthrough.
+
+    Single quotes are doubled. Callers pass static catalog queries or SQL
+    whose identifiers they have checked with :func:`migration.lib.is_safe_identifier`.
+    """
+    escaped = mysql_sql.replace("'", "''")
+    return f"SELECT * FROM mysql_query('src', '{escaped}')"
+
+
+def mysql_query(con: Any, mysql_sql: str) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """Run one MySQL query on the ``src`` catalog; return ``(header, rows)``."""
+    cur = con.execute(mysql_query_sql(mysql_sql))
+    header = [d[0] for d in cur.description]
+    return header, cur.fetchall()
+
+
+def mysql_batches(con: Any, mysql_sql: str, batch_rows: int) -> Iterator[list[tuple[Any, ...]]]:
+    """Stream one MySQL query on the ``src`` catalog ``batch_rows`` rows at a time."""
+    result = con.execute(mysql_query_sql(mysql_sql))
+    while batch := result.fetchmany(batch_rows):
+        yield batch
+
+
+def _extension_dir(env: Env) -> Path | None:
+    if not env.duckdb_extension_dir:
+        return None
+    base = Path(env.duckdb_extension_dir)
+    return base if base.is_absolute() else (ROOT_DIR / base).resolve()
+
+
+def _duck_config(env: Env) -> dict[str, Any]:
+    """DuckDB ``connect`` config from the ``DUCKDB_*`` settings (defaults left unset)."""
+    config: dict[str, Any] = {}
+    if env.duckdb_threads:
+        config["threads"] = env.duckdb_threads
+    if env.duckdb_memory_limit:
+        config["memory_limit"] = env.duckdb_memory_limit
+    ext_dir = _extension_dir(env)
+    if ext_dir is not None:
+        config["extension_directory"] = str(ext_dir)
+        config["autoinstall_known_extensions"] = False
+    return config
+
+
+def _catalog_dsn(env: Env, alias: str) -> str:
+    if alias == "src":
+        return mysql_attach_dsn(env.mysql_url, env.mysql_db)
+    if alias == "pg":
+        return env.pg_dsn()
+    if not env.reference_pg_url:
+        die("REFERENCE_PG_URL is not set; cannot attach the reference cluster")
+    return env.reference_pg_url
+
+
+class _DuckSession:
+    """One in-memory DuckDB database shared by every caller in the process.
+
+    Extensions and ATTACHed catalogs belong to the database, so every cursor
+    sees them; each borrower gets its own cursor, which is safe to use from a
+    worker thread. A catalog is re-attached only when its DSN changes.
+    """
+
+    def __init__(self, env: Env) -> None:
+        import duckdb
+
+        self._ext_dir = _extension_dir(env)
+        self._con = duckdb.connect(":memory:", config=_duck_config(env))
+        self._loaded: set[str] = set()
+        self._attached: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, extension: str) -> None:
+        if extension in self._loaded:
+            return
+        try:
+            self._con.execute(f"LOAD {extension}")
+        except Exception:
+            if self._ext_dir is not None:
+                die(
+                    f"DuckDB extension {extension} is not installed in {rel(self._ext_dir)}; "
+                    "run `migrate preflight` on a host with network access first"
+                )
+            self._con.execute(f"INSTALL {extension}; LOAD {extension}")
+        self._loaded.add(extension)
+
+    def cursor(self, env: Env, catalogs: Sequence[str]) -> Any:
+        with self._lock:
+            for alias in catalogs:
+                kind, extension = CATALOGS[alias]
+                dsn = _catalog_dsn(env, alias)
+                if self._attached.get(alias) == dsn:
+                    continue
+                self._load(extension)
+                if alias in self._attached:
+                    self._con.execute(f"DETACH {alias}")
+                    del self._attached[alias]
+                try:
+                    self._con.execute(
+                        f"ATTACH '{escape_literal(dsn)}' AS {alias} (TYPE {kind}, READ_ONLY)"
+                    )
+                except Exception as e:
+                    # Only the exception type: the message can echo the DSN.
+                    die(f"could not attach {alias} ({kind}) via DuckDB: {type(e).__name__}")
+                self._attached[alias] = dsn
+            return self._con.cursor()
+
+    def close(self) -> None:
+        self._con.close()
+
+
+# Process-scoped like lib's Postgres pools: the scanners load and each catalog
+# attaches once, so back-to-back probes (``diagnose``, snapshot + reference
+# dump + load fidelity) stop paying that latency. Closed by
+# :func:`close_duck_session` (the CLI's shutdown hook).
+_session: _DuckSession | None = None
+_session_lock = threading.Lock()
+
+
+@contextmanager
+def duck_connection(env: Env, *catalogs: str) -> Generator[Any]:
+    """Borrow a cursor on the process DuckDB session with ``catalogs`` attached.
+
+    ``catalogs`` are :data:`CATALOGS` aliases, each attached READ_ONLY on
+    first use and kept for the rest of the process. The session takes its
+    ``DUCKDB_*`` settings from the ``env`` that first opens it. An attach
+    failure dies without echoing the DSN.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _DuckSession(env)
+        session = _session
+    cur = session.cursor(env, catalogs)
+    try:
+        yield cur
+    finally:
+        cur.close()
+
+
+def close_duck_session() -> None:
+    """Close the process DuckDB session, detaching every catalog. Safe to call twice."""
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
+
+
+def install_extensions(env: Env) -> None:
+    """``INSTALL`` the MySQL and Postgres scanners (into ``DUCKDB_EXTENSION_DIR`` if set)."""
+    import duckdb
+
+    con = duckdb.connect(":memory:", config=_duck_config(env))
+    try:
+        con.execute("INSTALL mysql_scanner; INSTALL postgres_scanner;")
+    finally:
+        con.close()
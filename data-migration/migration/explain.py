@@ -0,0 +1,201 @@
+"""``--explain-slow``: keep the plans of slow build / constraints / parity statements.
+
+``build``, ``constraints`` and ``parity`` accept ``--explain-slow=<seconds>``.
+While the command runs, :func:`migration.lib.set_explain_slow` has every
+Postgres session load ``auto_explain`` and report any statement over the
+threshold as a JSON ``EXPLAIN (ANALYZE, BUFFERS)`` plan, attributed to the
+SQL file or parity check that issued it (see
+:func:`migration.lib._attach_slow_explain`). Where the server cannot load
+``auto_explain``, slow ``psql_query`` reads are re-run under ``EXPLAIN`` in a
+rolled-back transaction instead.
+
+On exit the plans are written to ``reports/runs/explain_<command>_<stamp>/``:
+one ``NN_<source>.json`` per statement plus ``summary.md`` ranking the
+statements, the heaviest sequential scans, and the worst row misestimates --
+the tuning loop for the ``*_resolved`` views at full PMDA volume.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from migration.lib import (
+    RUNS_DIR,
+    SlowPlan,
+    drain_slow_plans,
+    file_stamp,
+    log,
+    rel,
+    set_explain_slow,
+)
+
+# A node whose actual and estimated rows differ by at least this factor is a
+# misestimate worth a look (stale stats, correlated predicates, bad joins).
+MISESTIMATE_FACTOR = 10
+_TOP_N = 10
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+@dataclass(frozen=True)
+class PlanNode:
+    """One node of a captured plan, flattened with the statement it belongs to."""
+
+    statement: int
+    source: str
+    node_type: str
+    relation: str
+    plan_rows: float
+    actual_rows: float
+    loops: float
+    total_ms: float
+    shared_read: int
+
+    @property
+    def rows_out(self) -> float:
+        """Rows produced across every loop."""
+        return self.actual_rows * self.loops
+
+    @property
+    def misestimate(self) -> float:
+        """How far off the planner's per-loop row estimate was, as a factor >= 1."""
+        hi, lo = max(self.plan_rows, self.actual_rows), min(self.plan_rows, self.actual_rows)
+        return hi / max(lo, 1.0)
+
+
+def plan_nodes(index: int, plan: SlowPlan) -> list[PlanNode]:
+    """Every node of ``plan`` (depth first). Nodes never executed are skipped."""
+    out: list[PlanNode] = []
+    stack: list[dict[str, Any]] = [plan.plan.get("Plan", {})]
+    while stack:
+        node = stack.pop()
+        stack.extend(reversed(node.get("Plans", [])))
+        loops = float(node.get("Actual Loops", 0) or 0)
+        if not loops:
+            continue
+        relation = node.get("Relation Name", "")
+        if relation and node.get("Schema"):
+            relation = f"{node['Schema']}.{relation}"
+        out.append(
+            PlanNode(
+                statement=index,
+                source=plan.source,
+                node_type=str(node.get("Node Type", "?")),
+                relation=relation,
+                plan_rows=float(node.get("Plan Rows", 0) or 0),
+                actual_rows=float(node.get("Actual Rows", 0) or 0),
+                loops=loops,
+                total_ms=float(node.get("Actual Total Time", 0) or 0) * loops,
+                shared_read=int(node.get("Shared Read Blocks", 0) or 0),
+            )
+        )
+    return out
+
+
+def _first_line(text: str, width: int = 80) -> str:
+    line = " ".join(text.split())
+    return line if len(line) <= width else line[: width - 3] + "..."
+
+
+def summary_markdown(plans: Sequence[SlowPlan], files: Sequence[str]) -> str:
+    """Render ``summary.md``: slowest statements, top seq scans, worst misestimates."""
+    nodes = [n for i, p in enumerate(plans, 1) for n in plan_nodes(i, p)]
+    lines = [
+        "# Slow statements",
+        "",
+        "| # | Source | ms | Top node | Plan | Query |",
+        "|---|---|---|---|---|---|",
+    ]
+    order = sorted(range(len(plans)), key=lambda i: -plans[i].duration_ms)
+    for i in order:
+        p = plans[i]
+        top = p.plan.get("Plan", {}).get("Node Type", "?")
+        query = _first_line(str(p.plan.get("Query Text", ""))).replace("|", "\\|")
+        lines.append(
+            f"| {i + 1} | {p.source or '-'} | {p.duration_ms:.0f} | {top} | {files[i]} | {query} |"
+        )
+    seq = sorted((n for n in nodes if n.node_type == "Seq Scan"), key=lambda n: -n.total_ms)
+    lines.extend(
+        [
+            "",
+            "## Top sequential scans",
+            "",
+            "| # | Relation | Rows | Loops | ms | Shared read blocks |",
+            "|---|---|---|---|---|---|",
+        ]
+    )
+    for n in seq[:_TOP_N]:
+        lines.append(
+            f"| {n.statement} | {n.relation or '-'} | {n.rows_out:.0f} | {n.loops:.0f} | "
+            f"{n.total_ms:.0f} | {n.shared_read} |"
+        )
+    bad = sorted(
+        (n for n in nodes if n.misestimate >= MISESTIMATE_FACTOR), key=lambda n: -n.misestimate
+    )
+    lines.extend(
+        [
+            "",
+            f"## Row misestimates (>= {MISESTIMATE_FACTOR}x)",
+            "",
+            "| # | Node | Relation | Estimated | Actual (per loop) | Factor |",
+            "|---|---|---|---|---|---|",
+        ]
+    )
+    for n in bad[:_TOP_N]:
+        lines.append(
+            f"| {n.statement} | {n.node_type} | {n.relation or '-'} | {n.plan_rows:.0f} | "
+            f"{n.actual_rows:.0f} | {n.misestimate:.0f}x |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_plans(
+    plans: Sequence[SlowPlan], command: str, directory: Path | None = None
+) -> Path | None:
+    """Write each plan's JSON and ``summary.md`` under a fresh ``explain_*`` directory.
+
+    Returns the directory, or ``None`` when no statement crossed the threshold.
+    """
+    if not plans:
+        return None
+    out = (directory or RUNS_DIR) / f"explain_{command}_{file_stamp()}"
+    out.mkdir(parents=True, exist_ok=True)
+    names: list[str] = []
+    for i, p in enumerate(plans, 1):
+        slug = _SLUG_RE.sub("_", Path(p.source).stem or "statement").strip("_")[:60]
+        name = f"{i:03d}_{slug or 'statement'}.json"
+        body = {"source": p.source, "duration_ms": p.duration_ms, "method": p.method, **p.plan}
+        (out / name).write_text(json.dumps(body, indent=2) + "\n", encoding="utf-8")
+        names.append(name)
+    (out / "summary.md").write_text(summary_markdown(plans, names), encoding="utf-8")
+    return out
+
+
+@contextmanager
+def capture(seconds: float | None, command: str) -> Generator[None]:
+    """Run the enclosed command under ``--explain-slow`` when ``seconds`` is set.
+
+    Plans are written even when the command dies, so a failed build still
+    leaves the plan of the statement that was slow before it.
+    """
+    if seconds is None:
+        yield
+        return
+    set_explain_slow(seconds)
+    log(f"--explain-slow: capturing plans of statements over {seconds:g}s")
+    try:
+        yield
+    finally:
+        set_explain_slow(None)
+        plans = drain_slow_plans()
+        out = write_plans(plans, command)
+        if out is None:
+            log(f"--explain-slow: no statement took {seconds:g}s or more")
+        else:
+            log(f"--explain-slow: {len(plans)} plan(s) -> {rel(out / 'summary.md')}")
@@ -2,26 +2,35 @@
 
 from __future__ import annotations
 
+import contextvars
 import csv
 import functools
+import io
+import json
 import os
 import re
 import shlex
 import shutil
 import subprocess
 import sys
+import threading
+import time
 import urllib.parse
 import urllib.request
-from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+import weakref
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, LiteralString, NoReturn, ParamSpec, TypeVar, cast
 
 import psycopg
+import psycopg.pq
 import psycopg.sql
 from jinja2 import Environment, StrictUndefined
-from pydantic import PrivateAttr
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from rich.console import Console
 from rich.progress import (
@@ -269,6 +278,216 @@ def progress_spinner(description: str) -> Iterator[_NullProgress | _LiveProgress
         yield _LiveProgress(progress, task)
 
 
+@dataclass
+class Span:
+    """One timed unit of work: a phase, an applied SQL file, or a parity check.
+
+    ``rows`` and the ``db_blks_*`` buffer counters stay ``None`` where the
+    recorder cannot measure them or was not asked to (see
+    :func:`_execute_sql_file`). The ``db_`` prefix is a reminder that they
+    are ``pg_stat_database`` deltas: every session's I/O over the span.
+    ``settings`` is the effective session profile of a ``phase`` span
+    (see :func:`phase_scope`); ``None`` when none applied.
+    """
+
+    kind: str  # "phase" | "sql_file" | "parity_check"
+    name: str
+    started_at: datetime
+    seconds: float = 0.0
+    rows: int | None = None
+    db_blks_hit: int | None = None
+    db_blks_read: int | None = None
+    ok: bool = True
+    settings: dict[str, str] | None = None
+
+
+# Spans recorded by this process, oldest first. Written to
+# reports/runs/timings_<stamp>_<command>_<pid>.parquet by the CLI's shutdown hook
+# (migration.duck.write_timings) and read back by `migrate timings`.
+_spans: list[Span] = []
+_spans_lock = threading.Lock()
+# Per-thread stack of open span names; the innermost one labels any plan
+# captured under --explain-slow.
+_open_spans = threading.local()
+
+
+@contextmanager
+def span(kind: str, name: str) -> Generator[Span]:
+    """Time the enclosed block and record it as a :class:`Span`.
+
+    The caller may fill in ``rows``/``db_blks_*`` on the yielded span. A block
+    that raises (including a :func:`die` exit) is still recorded, with
+    ``ok=False``, so the run history shows where a failed rehearsal stopped.
+    Safe to use from worker threads.
+    """
+    s = Span(kind, name, datetime.now(UTC))
+    stack: list[str] = _open_spans.__dict__.setdefault("names", [])
+    stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield s
+    except BaseException:
+        s.ok = False
+        raise
+    finally:
+        s.seconds = time.perf_counter() - start
+        stack.pop()
+        with _spans_lock:
+            _spans.append(s)
+
+
+def drain_spans() -> list[Span]:
+    """Return every span recorded so far and clear the in-process buffer."""
+    with _spans_lock:
+        out = list(_spans)
+        _spans.clear()
+    return out
+
+
+def _current_span_name() -> str:
+    """Name of the innermost span open on this thread ("" outside any span)."""
+    stack: list[str] = _open_spans.__dict__.get("names", [])
+    return stack[-1] if stack else ""
+
+
+@dataclass(frozen=True)
+class SlowPlan:
+    """The plan of one statement that crossed the ``--explain-slow`` threshold.
+
+    ``source`` is the innermost open span (a SQL file, parity check or
+    phase); ``plan`` is the ``EXPLAIN (FORMAT JSON)`` object (``"Plan"``
+    plus, where known, ``"Query Text"``); ``method`` is ``"auto_explain"``
+    or ``"rerun"``.
+    """
+
+    source: str
+    duration_ms: float
+    plan: dict[str, Any]
+    method: str
+
+
+# --explain-slow state (see migration/explain.py). `_explain_min_ms` is the
+# threshold (None = off); `_auto_explain_ok` is None until the first
+# connection probes `LOAD 'auto_explain'`.
+_explain_min_ms: int | None = None
+_auto_explain_ok: bool | None = None
+_explained_conns: weakref.WeakSet[psycopg.Connection] = weakref.WeakSet()
+# The log_min_duration each live connection last had set; DISCARD ALL empties it.
+_explain_applied: weakref.WeakKeyDictionary[psycopg.Connection, int] = (
+    weakref.WeakKeyDictionary()
+)
+_slow_plans: list[SlowPlan] = []
+_slow_plans_lock = threading.Lock()
+
+# auto_explain's NOTICE under log_format=json: "duration: 1.234 ms  plan:\n{...}".
+_AUTO_EXPLAIN_RE = re.compile(r"^duration: ([0-9.]+) ms\s+plan:\s*(\{.*\})\s*$", re.DOTALL)
+# Only plain reads are re-run when auto_explain is unavailable.
+_READ_ONLY_RE = re.compile(r"^\s*(SELECT|WITH|TABLE|VALUES)\b", re.IGNORECASE)
+
+
+def set_explain_slow(seconds: float | None) -> None:
+    """Capture plans for statements slower than ``seconds`` (``None`` turns it off)."""
+    global _explain_min_ms, _auto_explain_ok
+    _explain_min_ms = None if seconds is None else int(seconds * 1000)
+    _auto_explain_ok = None
+
+
+def drain_slow_plans() -> list[SlowPlan]:
+    """Return every captured plan so far and clear the in-process buffer."""
+    with _slow_plans_lock:
+        out = list(_slow_plans)
+        _slow_plans.clear()
+    return out
+
+
+def _record_slow_plan(plan: SlowPlan) -> None:
+    with _slow_plans_lock:
+        _slow_plans.append(plan)
+
+
+def _capture_auto_explain(diag: psycopg.errors.Diagnostic) -> None:
+    """Notice handler: keep auto_explain's JSON plans, ignore every other NOTICE."""
+    m = _AUTO_EXPLAIN_RE.match(diag.message_primary or "")
+    if not m:
+        return
+    try:
+        plan = json.loads(m.group(2))
+    except ValueError:
+        return
+    _record_slow_plan(SlowPlan(_current_span_name(), float(m.group(1)), plan, "auto_explain"))
+
+
+def _attach_slow_explain(conn: psycopg.Connection) -> None:
+    """Under --explain-slow, have auto_explain send slow plans to this session.
+
+    ``auto_explain`` logs at NOTICE so the plans reach the client (and
+    :func:`_capture_auto_explain`) instead of the server log; nested
+    statements are included so DO-block loaders are covered. The settings
+    are session-level, so a pooled connection pays the ``LOAD`` and ``SET``
+    round trip once rather than per borrow (a reset borrow's ``DISCARD ALL``
+    drops them again); once the mode is off, a connection that still carries
+    them has the threshold switched off. Must run outside a transaction.
+    When the library cannot be loaded the mode falls back to
+    :func:`_explain_rerun` for ``psql_query`` reads, with one warning.
+    """
+    global _auto_explain_ok
+    min_ms = _explain_min_ms
+    applied = _explain_applied.get(conn)
+    if min_ms is None:
+        if applied is not None:
+            conn.execute("SET auto_explain.log_min_duration = -1")
+            del _explain_applied[conn]
+        return
+    if _auto_explain_ok is False or applied == min_ms:
+        return
+    try:
+        with conn.transaction():
+            conn.execute(
+                cast(
+                    LiteralString,
+                    "LOAD 'auto_explain'; "
+                    f"SET auto_explain.log_min_duration = {int(min_ms)}; "
+                    "SET auto_explain.log_analyze = on; "
+                    "SET auto_explain.log_buffers = on; "
+                    "SET auto_explain.log_format = json; "
+                    "SET auto_explain.log_nested_statements = on; "
+                    "SET auto_explain.log_level = notice",
+                )
+            )
+    except psycopg.Error as exc:
+        _auto_explain_ok = False
+        first = str(exc).strip().splitlines()[0] if str(exc).strip() else type(exc).__name__
+        log(
+            f"WARNING: --explain-slow: auto_explain unavailable ({first}); only slow "
+            "psql_query reads will be re-run under EXPLAIN"
+        )
+        return
+    _auto_explain_ok = True
+    _explain_applied[conn] = min_ms
+    if conn not in _explained_conns:
+        conn.add_notice_handler(_capture_auto_explain)
+        _explained_conns.add(conn)
+
+
+def _explain_rerun(env: Env, sql: str, params: Sequence[Any] | None, duration_ms: float) -> None:
+    """Fallback capture: re-run one slow read under EXPLAIN ANALYZE, then roll back.
+
+    Best-effort -- a failure here is logged and never reaches the caller.
+    """
+    if not _READ_ONLY_RE.match(sql):
+        return
+    explain = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql
+    try:
+        with pg_connection(env) as conn, conn.transaction(force_rollback=True):
+            row = conn.execute(cast(LiteralString, explain), params).fetchone()
+    except psycopg.Error as exc:
+        log(f"WARNING: --explain-slow: could not re-run a slow query under EXPLAIN: {exc}")
+        return
+    if row and row[0]:
+        plan = {"Query Text": sql, **row[0][0]}
+        _record_slow_plan(SlowPlan(_current_span_name(), duration_ms, plan, "rerun"))
+
+
 class Env(BaseSettings):
     """Snapshot of the connection-related environment variables.
 
@@ -294,6 +513,20 @@ class Env(BaseSettings):
     # irreversible DROP. Unset is allowed for local dev; required when the
     # target is the prod RDS (pg_url unset).
     reference_pg_url: str = ""
+    # Upper bound on the process-scoped psycopg pool backing psql_query /
+    # psql_command / psql_exec_composed / psql_file (see pg_connection). Each
+    # pooled connection saves a TLS + auth handshake per call against RDS.
+    pg_pool_size: int = Field(default=4, ge=1)
+    # Process-scoped DuckDB session (migration.duck.duck_connection) shared by
+    # the phases that attach MySQL/Postgres through DuckDB. Threads 0 and a
+    # blank memory limit keep DuckDB's defaults (one thread per core, 80% of
+    # RAM). With an extension directory set, the scanners are only LOADed from
+    # it, never downloaded; `migrate preflight` installs them there, so a
+    # cutover host needs no network for them. Relative paths resolve against
+    # the repo root.
+    duckdb_threads: int = Field(default=0, ge=0)
+    duckdb_memory_limit: str = ""
+    duckdb_extension_dir: str = ""
     mysql_url: str
     mysql_db: str = ""
     pg_db: str = ""
@@ -339,6 +572,21 @@ class Env(BaseSettings):
     # a shell var. Also honored via the SKIP_JSONSCHEMA env var.
     skip_jsonschema: bool = False
 
+    # Opt-in WAL-free rebuild of the re-loadable schemas: load_full (copy
+    # engine only), delta and build_stg create or convert the mysql_raw and
+    # stg tables UNLOGGED, and build_app ends with `migrate set-logged`. A
+    # server crash in between empties them (reload from MySQL). demos_app and the migration id maps
+    # are never touched. See migration/phases/unlogged.py. Also honored via
+    # the UNLOGGED_BUILD env var.
+    unlogged_build: bool = False
+
+    # Opt-in blue/green cutover: build_stg, build_app, constraints and parity
+    # target the shadow schema demos_app_next while the live demos_app keeps
+    # serving, flip renames the shadow into place (keeping the old schema as
+    # demos_app_prev) and `migrate rollback` renames it back. See
+    # migration/phases/blue_green.py. Also honored via the BLUE_GREEN env var.
+    blue_green: bool = False
+
     # Path to a local checkout of the DEMOS app repo, used by
     # `verify-prisma-local` and the migrate-local devcontainer loader.
     # Relative paths resolve against the migration repo root.
@@ -755,23 +1003,23 @@ _PGLOADER_ERROR_RE = re.compile(
 _PGLOADER_TOTAL_RE = re.compile(r"Total import time\s+(\u2713|\d+)")
 
 
-def assert_pgloader_ok(log_path: Path) -> None:
-    """Hard-fail when a pgloader run reported any error in its log.
+def pgloader_log_problem(log_path: Path) -> str | None:
+    """Return why a pgloader run's log is not a clean load, or ``None`` if it is.
 
     pgloader returns exit status 0 even when individual tables error out
     (the counts go to its log summary), so trusting the exit code lets a
-    partial load mark a gate green. This parses the captured log: it dies
-    on any fatal marker, on a non-zero error count in the ``Total import
-    time`` summary row, or when no summary row is present at all (the run
-    cannot be confirmed to have completed).
+    partial load mark a gate green. This parses the captured log: it flags
+    any fatal marker, a non-zero error count in the ``Total import time``
+    summary row, or a missing summary row (the run cannot be confirmed to
+    have completed).
     """
     if not log_path.exists():
-        die(f"pgloader log not found: {rel(log_path)}")
+        return f"pgloader log not found: {rel(log_path)}"
     text = log_path.read_text(encoding="utf-8", errors="replace")
 
     for marker in _PGLOADER_FATAL_MARKERS:
         if marker in text:
-            die(f"pgloader reported a fatal error ({marker!r}); see {rel(log_path)}")
+            return f"pgloader reported a fatal error ({marker!r}); see {rel(log_path)}"
 
     if _PGLOADER_ERROR_RE.search(text):
         hint = ""
@@ -781,15 +1029,45 @@ def assert_pgloader_ok(log_path: Path) -> None:
                 " MySQL 8 collation (e.g. utf8mb4_0900_*); install a source-built"
                 " pgloader (see docs/operator/howto-troubleshoot-pgloader.adoc)"
             )
-        die(f"pgloader logged an ERROR{hint}; see {rel(log_path)}")
+        return f"pgloader logged an ERROR{hint}; see {rel(log_path)}"
 
     m = _PGLOADER_TOTAL_RE.search(text)
     if m is None:
-        die(f"pgloader log has no summary row; load unconfirmed; see {rel(log_path)}")
+        return f"pgloader log has no summary row; load unconfirmed; see {rel(log_path)}"
     token = m.group(1)
     errors = 0 if token == "\u2713" else int(token)
     if errors > 0:
-        die(f"pgloader reported {errors} table-level error(s); see {rel(log_path)}")
+        return f"pgloader reported {errors} table-level error(s); see {rel(log_path)}"
+    return None
+
+
+def assert_pgloader_ok(*log_paths: Path) -> None:
+    """Hard-fail when any pgloader run reported an error in its log.
+
+    See :func:`pgloader_log_problem` for what counts as an error. Accepts
+    several logs (one per shard of a sharded load) and dies once with every
+    problem found, so one bad shard does not hide another.
+    """
+    problems = [p for p in map(pgloader_log_problem, log_paths) if p is not None]
+    if len(problems) == 1:
+        die(problems[0])
+    if problems:
+        die(f"{len(problems)} pgloader run(s) failed:\n  " + "\n  ".join(problems))
+
+
+_SAFE_IDENTIFIER_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"  # pragma: allowlist secret
+)
+
+
+def is_safe_identifier(name: str) -> bool:
+    """True when ``name`` is a bare identifier safe to inline into SQL.
+
+    The load, fidelity and delta phases splice source table/column names into
+    MySQL passthrough queries; anything beyond ASCII letters, digits and ``_``
+    is refused rather than escaped.
+    """
+    return bool(name) and all(c in _SAFE_IDENTIFIER_CHARS for c in name)
 
 
 def read_drop_list(path: Path | None = None) -> list[str]:
@@ -837,9 +1115,439 @@ def cast_block(path: Path | None = None) -> str:
     return cast_file.read_text(encoding="utf-8").rstrip("\n")
 
 
+# Per-phase session settings (sql/session_profiles.yaml): a mapping of phase
+# name -> {GUC: value}. The profile of the phase being run is applied to every
+# psycopg connection the helpers below hand out; see :func:`session_profile`.
+SESSION_PROFILES_FILE: Path = SQL_DIR / "session_profiles.yaml"
+# Profiles may only name phases that exist: the cutover gates plus load_full.
+PROFILE_PHASES: tuple[str, ...] = ("load_full", *PHASES)
+_GUC_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]*(\.[a-z_][a-z0-9_]*)?$")
+
+
+@dataclass
+class SessionProfile:
+    """The session settings one phase applies to its connections.
+
+    ``effective`` is filled from ``current_setting()`` on the first
+    connection the profile is applied to, so it records what the server
+    accepted (e.g. ``1GB`` for ``1024MB``).
+    """
+
+    name: str
+    settings: dict[str, str]
+    effective: dict[str, str] = field(default_factory=dict)
+
+
+_active_profile: SessionProfile | None = None
+_profile_lock = threading.Lock()
+# What each live connection last had applied; DISCARD ALL empties it.
+_applied_settings: weakref.WeakKeyDictionary[psycopg.Connection, dict[str, str]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _guc_value(value: object) -> str:
+    # YAML reads a bare `off` / `on` as a boolean.
+    if isinstance(value, bool):
+        return "on" if value else "off"
+    return str(value)
+
+
+def load_session_profiles(path: Path | None = None) -> dict[str, dict[str, str]]:
+    """Read ``sql/session_profiles.yaml`` into ``{phase: {setting: value}}``.
+
+    A missing file means no profiles. Dies on a phase outside
+    :data:`PROFILE_PHASES`, a malformed setting name, or a non-scalar value.
+    """
+    import yaml
+
+    profiles_file = path or SESSION_PROFILES_FILE
+    if not profiles_file.exists():
+        return {}
+    raw = yaml.safe_load(profiles_file.read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, dict):
+        die(f"{rel(profiles_file)}: expected a mapping of phase -> settings")
+    out: dict[str, dict[str, str]] = {}
+    for phase_name, settings in raw.items():
+        if phase_name not in PROFILE_PHASES:
+            die(f"{rel(profiles_file)}: unknown phase {phase_name!r}")
+        if not isinstance(settings, dict):
+            die(f"{rel(profiles_file)}: {phase_name}: expected a mapping of setting -> value")
+        for key, value in settings.items():
+            if not _GUC_NAME_RE.match(str(key)):
+                die(f"{rel(profiles_file)}: {phase_name}: bad setting name {key!r}")
+            if isinstance(value, dict | list) or value is None:
+                die(f"{rel(profiles_file)}: {phase_name}.{key}: expected a scalar value")
+        out[phase_name] = {str(k): _guc_value(v) for k, v in settings.items()}
+    return out
+
+
+@contextmanager
+def session_profile(name: str) -> Generator[SessionProfile]:
+    """Apply phase ``name``'s session profile to connections opened inside.
+
+    Every connection from :func:`pg_connection`, :func:`psql_files`,
+    :func:`psql_file_tx` and :func:`apply_files` gets the settings with
+    ``set_config(..., false)`` before use, including those opened by worker
+    threads. Pooled connections keep them across borrows and have settings
+    the next phase does not name reset to the server default. A phase
+    without a profile runs on server defaults.
+    """
+    global _active_profile
+    profile = SessionProfile(name, load_session_profiles().get(name, {}))
+    previous, _active_profile = _active_profile, profile
+    try:
+        yield profile
+    finally:
+        _active_profile = previous
+
+
+_SET_CONFIG_SQL = "SELECT set_config(k, v, false) FROM unnest(%s::text[], %s::text[]) AS t(k, v)"
+_RESET_CONFIG_SQL = (
+    "SELECT set_config(name, reset_val, false) FROM pg_settings WHERE name = ANY(%s)"
+)
+
+
+def _apply_session_profile(conn: psycopg.Connection) -> None:
+    """Bring ``conn``'s session settings in line with the active profile.
+
+    A no-op when the connection already carries them, so a pooled connection
+    pays the round trip once per phase rather than per borrow (a ``reset``
+    borrow's ``DISCARD ALL`` drops them again). Must run outside a
+    transaction.
+    """
+    profile = _active_profile
+    wanted = profile.settings if profile else {}
+    current = _applied_settings.get(conn, {})
+    if wanted == current:
+        return
+    stale = [k for k in current if k not in wanted]
+    record = profile is not None and bool(wanted) and not profile.effective
+    try:
+        with conn.transaction():
+            if stale:
+                conn.execute(_RESET_CONFIG_SQL, [stale])
+            if wanted:
+                conn.execute(_SET_CONFIG_SQL, [list(wanted), list(wanted.values())])
+            rows = (
+                conn.execute(
+                    "SELECT k, current_setting(k) FROM unnest(%s::text[]) AS k", [list(wanted)]
+                ).fetchall()
+                if record
+                else []
+            )
+    except psycopg.Error as e:
+        die(f"session profile {profile.name if profile else '(none)'!r} was rejected: {e}")
+    _applied_settings[conn] = dict(wanted)
+    if profile is None or not rows:
+        return
+    with _profile_lock:
+        if profile.effective:
+            return
+        profile.effective = {str(k): str(v) for k, v in rows}
+    log(
+        f"session profile {profile.name}: "
+        + ", ".join(f"{k}={v}" for k, v in profile.effective.items())
+    )
+
+
+# Blue/green builds (migration.phases.blue_green) write the demos_app layer
+# into a shadow schema. The SQL files and phase code name `demos_app`
+# literally, so while :func:`app_schema` is active every statement sent
+# through the connections below has that name rewritten to the shadow. The
+# target is a context variable, not a module global: it is scoped to the
+# caller's thread (or task), and pools that must follow it submit through
+# :class:`ContextThreadPoolExecutor`.
+APP_SCHEMA = "demos_app"
+_APP_SCHEMA_RE = re.compile(rf"\b{APP_SCHEMA}\b")
+_app_schema_target: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "app_schema_target", default=None
+)
+
+
+@contextmanager
+def app_schema(target: str | None) -> Generator[None]:
+    """Route ``demos_app`` references to schema ``target`` inside the block.
+
+    Applies to every statement (``execute``, ``executemany``, ``copy``,
+    ``stream``) on connections from :func:`pg_connection`, :func:`psql_files`,
+    :func:`psql_file_tx` and :func:`apply_files`, in the calling context and
+    in workers started from it through :class:`ContextThreadPoolExecutor`.
+    The rewrite is textual: names, string literals and comments alike, so
+    catalog filters such as ``nspname = 'demos_app'`` follow. Bound
+    parameters cannot be rewritten, so a statement binding ``demos_app``
+    (or a ``demos_app.``-qualified name) while routed raises
+    :class:`psycopg.ProgrammingError` instead of silently reading the live
+    schema. ``None`` leaves statements as written.
+    """
+    token = _app_schema_target.set(target)
+    try:
+        yield
+    finally:
+        _app_schema_target.reset(token)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """``ThreadPoolExecutor`` running each task in a copy of the submitter's context.
+
+    Plain pool workers start from an empty context, so an :func:`app_schema`
+    scope opened by the caller would not reach them.
+    """
+
+    def submit(self, fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs) -> Future[R]:
+        ctx = contextvars.copy_context()
+
+        def run() -> R:
+            return ctx.run(fn, *args, **kwargs)
+
+        return super().submit(run)
+
+
+def canonical_app_schema(text: str, target: str) -> str:
+    """Map ``target`` back to ``demos_app`` in text read from the catalog."""
+    return re.sub(rf"\b{re.escape(target)}\b", APP_SCHEMA, text)
+
+
+def _route_app_schema(cur: psycopg.Cursor[Any], query: Any) -> Any:
+    target = _app_schema_target.get()
+    if target is None:
+        return query
+    if isinstance(query, psycopg.sql.Composable):
+        query = query.as_string(cur)
+    elif isinstance(query, bytes):
+        query = query.decode()
+    return _APP_SCHEMA_RE.sub(target, query)
+
+
+def _check_app_schema_params(params: Any) -> None:
+    """Refuse bound ``demos_app`` names while :func:`app_schema` routes statements."""
+    target = _app_schema_target.get()
+    if target is None or params is None:
+        return
+    values = params.values() if isinstance(params, Mapping) else params
+    for value in values:
+        if isinstance(value, str) and (
+            value == APP_SCHEMA or value.startswith(f"{APP_SCHEMA}.")
+        ):
+            raise psycopg.ProgrammingError(
+                f"bound parameter {value!r} names {APP_SCHEMA} while statements are "
+                f"routed to {target}; parameters are not rewritten, so inline the "
+                f"name in the SQL or resolve it against {target}"
+            )
+
+
+# Statements whose effect outlives the borrow: session GUCs, loaded libraries,
+# prepared statements, LISTEN, temp tables. ``set_config`` is matched anywhere
+# (its ``is_local`` flag is not parsed); the rest only at a statement start, so
+# ``UPDATE ... SET`` does not count. A match makes :class:`_PgPool` reset the
+# connection before reuse.
+_SESSION_STATE_RE = re.compile(
+    r"(?:\A|;)\s*(?:--[^\n]*\n\s*)*"
+    r"(?:SET\b(?!\s+(?:LOCAL|TRANSACTION|CONSTRAINTS)\b)|RESET\b|LOAD\b|PREPARE\b|LISTEN\b"
+    r"|CREATE\s+(?:(?:GLOBAL|LOCAL)\s+)?TEMP(?:ORARY)?\b)"
+    r"|\bset_config\s*\(",
+    re.IGNORECASE,
+)
+# Pooled connections a borrower has changed session state on; see _PgPool._release.
+_session_changed: weakref.WeakSet[psycopg.Connection] = weakref.WeakSet()
+
+
+def _changes_session_state(query: str) -> bool:
+    return _SESSION_STATE_RE.search(query) is not None
+
+
+class _AppSchemaCursor(psycopg.Cursor[Any]):
+    """Cursor applying :func:`app_schema` routing to every statement it sends.
+
+    Also notes statements that change session state (see
+    :data:`_SESSION_STATE_RE`) so the pool resets the connection on return.
+    """
+
+    def execute(self, query: Any, params: Any = None, **kwargs: Any) -> Any:
+        _check_app_schema_params(params)
+        query = _route_app_schema(self, query)
+        text = query.as_string(self) if isinstance(query, psycopg.sql.Composable) else query
+        if _changes_session_state(text.decode() if isinstance(text, bytes) else text):
+            _session_changed.add(self.connection)
+        return super().execute(query, params, **kwargs)
+
+    def executemany(self, query: Any, params_seq: Any, **kwargs: Any) -> None:
+        if _app_schema_target.get() is not None:
+            params_seq = list(params_seq)
+            for params in params_seq:
+                _check_app_schema_params(params)
+        super().executemany(_route_app_schema(self, query), params_seq, **kwargs)
+
+    def copy(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        _check_app_schema_params(params)
+        return super().copy(_route_app_schema(self, statement), params, **kwargs)
+
+    def stream(self, query: Any, params: Any = None, **kwargs: Any) -> Any:
+        _check_app_schema_params(params)
+        return super().stream(_route_app_schema(self, query), params, **kwargs)
+
+
+# Idle time after which a pooled connection is pinged before reuse: long
+# enough that back-to-back helper calls skip the round trip, short enough to
+# catch connections the server or a NAT dropped while the CLI was busy elsewhere.
+_POOL_PING_AFTER_S = 30.0
+
+
+class _PgPool:
+    """Bounded, thread-safe pool of autocommit psycopg connections to one DSN.
+
+    Connections open lazily up to ``max_size``; a borrower that finds the pool
+    exhausted blocks until another returns one. A connection that comes back
+    closed, broken, or mid-transaction is discarded rather than reused, so a
+    failed statement never poisons the next caller. One that sat idle longer
+    than :data:`_POOL_PING_AFTER_S` is pinged on borrow and replaced once if
+    the ping fails. A borrower that changed session state gets the connection
+    reset (``DISCARD ALL``) on return even without ``reset=True``.
+    """
+
+    def __init__(self, dsn: str, max_size: int) -> None:
+        self._dsn = dsn
+        self._max_size = max_size
+        self._idle: list[tuple[psycopg.Connection, float]] = []
+        self._opened = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _checkout(self) -> tuple[psycopg.Connection, float] | None:
+        """Pop a reusable idle connection, or reserve a slot for a new one (``None``)."""
+        with self._cond:
+            while True:
+                while self._idle:
+                    conn, idle_since = self._idle.pop()
+                    if not (conn.closed or conn.broken) and (
+                        conn.info.transaction_status == psycopg.pq.TransactionStatus.IDLE
+                    ):
+                        return conn, idle_since
+                    self._opened -= 1
+                    conn.close()
+                if self._opened < self._max_size:
+                    self._opened += 1
+                    return None
+                self._cond.wait()
+
+    def _open(self) -> psycopg.Connection:
+        """Open a connection into a slot already reserved by :meth:`_checkout`."""
+        try:
+            return psycopg.connect(self._dsn, autocommit=True, cursor_factory=_AppSchemaCursor)
+        except BaseException:
+            with self._cond:
+                self._opened -= 1
+                self._cond.notify()
+            raise
+
+    def _acquire(self) -> psycopg.Connection:
+        idle = self._checkout()
+        if idle is None:
+            return self._open()
+        conn, idle_since = idle
+        if time.monotonic() - idle_since < _POOL_PING_AFTER_S:
+            return conn
+        try:
+            conn.execute("SELECT 1")
+        except psycopg.Error:
+            conn.close()
+            return self._open()
+        return conn
+
+    def _release(self, conn: psycopg.Connection, *, reset: bool) -> None:
+        keep = (
+            not self._closed
+            and not (conn.closed or conn.broken)
+            and conn.info.transaction_status == psycopg.pq.TransactionStatus.IDLE
+        )
+        if keep and (reset or conn in _session_changed):
+            try:
+                conn.execute("DISCARD ALL")
+            except psycopg.Error:
+                keep = False
+            _applied_settings.pop(conn, None)
+            _explain_applied.pop(conn, None)
+            _session_changed.discard(conn)
+        with self._cond:
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._opened -= 1
+            self._cond.notify()
+        if not keep:
+            conn.close()
+
+    @contextmanager
+    def connection(self, *, reset: bool = False) -> Generator[psycopg.Connection]:
+        """Borrow a connection; ``reset`` runs ``DISCARD ALL`` before it is reused."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn, reset=reset)
+
+    def close(self) -> None:
+        """Close every idle connection; borrowed ones close when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+        for conn, _ in idle:
+            conn.close()
+
+
+# Process-scoped pools keyed by DSN. Every fresh connection to the DEMOS RDS
+# pays a full TLS (``sslmode=verify-full``) + auth handshake, and the parity and
+# constraints phases issue hundreds of small statements; the helpers below
+# borrow from here instead. Closed by :func:`close_pg_pools` (the CLI's
+# shutdown hook).
+_pg_pools: dict[str, _PgPool] = {}
+_pg_pools_lock = threading.Lock()
+
+
+@contextmanager
+def pg_connection(env: Env, *, reset: bool = False) -> Generator[psycopg.Connection]:
+    """Borrow a pooled autocommit connection to ``env.pg_dsn()``.
+
+    The pool is created on first use, sized by ``Env.pg_pool_size``
+    (``PG_POOL_SIZE``), and shared by every caller in the process, including
+    worker threads. Pass ``reset=True`` when the borrower may change session
+    state in ways the cursor does not recognise (e.g. a ``SET`` inside a DO
+    block) so the connection is returned clean; plain ``SET``/``RESET``/
+    ``LOAD``/``CREATE TEMP`` statements are noticed without it. Callers
+    wanting a transaction use ``conn.transaction()``.
+    """
+    dsn = env.pg_dsn()
+    with _pg_pools_lock:
+        pool = _pg_pools.get(dsn)
+        if pool is None:
+            pool = _pg_pools[dsn] = _PgPool(dsn, env.pg_pool_size)
+    with pool.connection(reset=reset) as conn:
+        _attach_slow_explain(conn)
+        _apply_session_profile(conn)
+        # The pool's own session setup is tracked separately; only the
+        # borrower's changes should trigger a reset on return.
+        _session_changed.discard(conn)
+        yield conn
+
+
+def close_pg_pools() -> None:
+    """Close every pooled Postgres connection. Safe to call more than once."""
+    with _pg_pools_lock:
+        pools = list(_pg_pools.values())
+        _pg_pools.clear()
+    for pool in pools:
+        pool.close()
+
+
 def psql_file(env: Env, sql_path: Path) -> None:
-    """Apply one SQL file in its own implicit transaction (autocommit)."""
-    with psycopg.connect(env.pg_dsn(), autocommit=True) as conn:
+    """Apply one SQL file in its own implicit transaction (autocommit).
+
+    Runs on a pooled connection that is reset afterwards, so any session
+    state the file sets (``search_path``, GUCs) does not leak to the next
+    borrower.
+    """
+    with pg_connection(env, reset=True) as conn, span("sql_file", rel(sql_path)):
         conn.execute(cast(LiteralString, sql_path.read_text(encoding="utf-8")))
 
 
@@ -851,7 +1559,7 @@ def psql_command(env: Env, sql: str, params: Sequence[Any] | None = None) -> Non
     parameterless statement skips psycopg's ``%`` placeholder parsing (a bare
     ``%`` in the SQL would otherwise raise at client-side conversion).
     """
-    with psycopg.connect(env.pg_dsn(), autocommit=True) as conn:
+    with pg_connection(env) as conn:
         conn.execute(cast(LiteralString, sql), params)
 
 
@@ -878,12 +1586,46 @@ def _sql_error_detail(path: Path, exc: psycopg.Error) -> str:
     return "; ".join(parts)
 
 
+def _block_counters(conn: psycopg.Connection) -> tuple[int, int] | None:
+    """Database-wide ``(blks_hit, blks_read)`` from ``pg_stat_database``.
+
+    Flushes this backend's pending statistics first so the file just applied
+    is counted. Returns ``None`` inside an open transaction, where the
+    backend's own counters are not published until commit.
+    """
+    if conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+        return None
+    conn.execute("SELECT pg_stat_force_next_flush()")
+    row = conn.execute(
+        "SELECT blks_hit, blks_read FROM pg_stat_database WHERE datname = current_database()"
+    ).fetchone()
+    return (int(row[0]), int(row[1])) if row else None
+
+
 def _execute_sql_file(conn: psycopg.Connection, path: Path) -> None:
-    """Apply one SQL file; on a psycopg error die with file + diagnostics context."""
-    try:
-        conn.execute(cast(LiteralString, path.read_text(encoding="utf-8")))
-    except psycopg.Error as exc:
-        die(_sql_error_detail(path, exc))
+    """Apply one SQL file; on a psycopg error die with file + diagnostics context.
+
+    Records a ``sql_file`` :class:`Span` with the rows reported by the file's
+    statements. Under ``--explain-slow`` (already an instrumentation run) and
+    on an autocommit connection it also records the database's buffer
+    hit/read delta -- other sessions' I/O included, so treat it as a trend;
+    otherwise the two extra round trips per file are skipped.
+    """
+    with span("sql_file", rel(path)) as s:
+        before = _block_counters(conn) if _explain_min_ms is not None else None
+        try:
+            cur = conn.execute(cast(LiteralString, path.read_text(encoding="utf-8")))
+        except psycopg.Error as exc:
+            die(_sql_error_detail(path, exc))
+        rows = 0
+        while True:
+            rows += max(cur.rowcount, 0)
+            if not cur.nextset():
+                break
+        s.rows = rows
+        after = _block_counters(conn) if before else None
+        if before and after:
+            s.db_blks_hit, s.db_blks_read = after[0] - before[0], after[1] - before[1]
 
 
 def _attach_verbose_notices(conn: psycopg.Connection) -> None:
@@ -905,15 +1647,36 @@ def psql_files(env: Env, files: Sequence[Path], pre_sql: str = "") -> None:
     if not files:
         log("psql_files: no files to apply")
         return
-    with psycopg.connect(env.pg_dsn()) as conn, conn.transaction():
-        _attach_verbose_notices(conn)
-        if pre_sql:
-            conn.execute(cast(LiteralString, pre_sql))
-        with progress_for(len(files), "apply build files") as p:
-            for f in files:
-                p.step(rel(f))
-                debug_log(f"applying {rel(f)}")
-                _execute_sql_file(conn, f)
+    with psycopg.connect(env.pg_dsn(), cursor_factory=_AppSchemaCursor) as conn:
+        _attach_slow_explain(conn)
+        _apply_session_profile(conn)
+        with conn.transaction():
+            _attach_verbose_notices(conn)
+            if pre_sql:
+                conn.execute(cast(LiteralString, pre_sql))
+            with progress_for(len(files), "apply build files") as p:
+                for f in files:
+                    p.step(rel(f))
+                    debug_log(f"applying {rel(f)}")
+                    _execute_sql_file(conn, f)
+
+
+def psql_file_tx(env: Env, sql_path: Path, pre_sql: str = "") -> None:
+    """Apply one SQL file in its own transaction on a dedicated connection.
+
+    The single-file counterpart of :func:`psql_files` for callers that run
+    files concurrently (one connection per worker): ``pre_sql`` runs first
+    inside the transaction, and a failure rolls back only this file.
+    """
+    with psycopg.connect(env.pg_dsn(), cursor_factory=_AppSchemaCursor) as conn:
+        _attach_slow_explain(conn)
+        _apply_session_profile(conn)
+        with conn.transaction():
+            _attach_verbose_notices(conn)
+            if pre_sql:
+                conn.execute(cast(LiteralString, pre_sql))
+            debug_log(f"applying {rel(sql_path)}")
+            _execute_sql_file(conn, sql_path)
 
 
 def psql_query(
@@ -932,17 +1695,26 @@ def psql_query(
     placeholders whenever params is not ``None``, so a parameterless query
     containing a literal ``%`` (e.g. ``LIKE '%\\_id' ESCAPE '\\'``) would
     raise at client-side query conversion. None disables that parsing.
+
+    Under ``--explain-slow`` without ``auto_explain`` on the server, a read
+    slower than the threshold is re-run once under ``EXPLAIN ANALYZE`` in a
+    rolled-back transaction after its rows are fetched (see
+    :func:`_explain_rerun`); the result returned is unaffected.
     """
-    with psycopg.connect(env.pg_dsn(), autocommit=True) as conn, conn.cursor() as cur:
+    with pg_connection(env) as conn, conn.cursor() as cur:
+        start = time.perf_counter()
         cur.execute(cast(LiteralString, sql), params)
-        if cur.description is None:
-            return []
-        return list(cur.fetchall())
+        rows = [] if cur.description is None else list(cur.fetchall())
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    min_ms = _explain_min_ms
+    if min_ms is not None and _auto_explain_ok is False and elapsed_ms >= min_ms:
+        _explain_rerun(env, sql, params, elapsed_ms)
+    return rows
 
 
 def psql_exec_composed(env: Env, query: psycopg.sql.Composed | psycopg.sql.SQL) -> None:
     """Execute a `psycopg.sql.SQL`/`Composed` statement (DDL with safe identifiers)."""
-    with psycopg.connect(env.pg_dsn(), autocommit=True) as conn, conn.cursor() as cur:
+    with pg_connection(env) as conn, conn.cursor() as cur:
         cur.execute(query)
 
 
@@ -968,10 +1740,25 @@ def apply_dir(env: Env, directory: Path, *, expect_files: bool = False) -> int:
         die(f"required directory has no *.sql files: {rel(directory)}")
     if not files:
         return 0
-    with psycopg.connect(env.pg_dsn(), autocommit=True) as conn, progress_for(
-        len(files), f"apply {rel(directory)}"
+    return apply_files(env, files, f"apply {rel(directory)}")
+
+
+def apply_files(env: Env, files: Sequence[Path], label: str) -> int:
+    """Apply ``files`` in the given order, each in its own implicit transaction.
+
+    The per-file half of :func:`apply_dir`, for callers that pick the files
+    themselves (e.g. an incremental ``build_stg``). Returns the count applied.
+    """
+    if not files:
+        return 0
+    with psycopg.connect(
+        env.pg_dsn(), autocommit=True, cursor_factory=_AppSchemaCursor
+    ) as conn, progress_for(
+        len(files), label
     ) as p:
         _attach_verbose_notices(conn)
+        _attach_slow_explain(conn)
+        _apply_session_profile(conn)
         for f in files:
             p.step(rel(f))
             debug_log(f"applying {rel(f)}")
@@ -979,6 +1766,11 @@ def apply_dir(env: Env, directory: Path, *, expect_files: bool = False) -> int:
     return len(files)
 
 
+# Rows per chunk handed to COPY by copy_csv_into_table: memory stays flat no
+# matter how large a crosswalk or override CSV grows.
+_CSV_COPY_CHUNK_ROWS = 5000
+
+
 def copy_csv_into_table(
     conn: psycopg.Connection,
     schema: str,
@@ -991,13 +1783,14 @@ def copy_csv_into_table(
 
     The shared CSV-to-Postgres primitive used by the crosswalks phase and the
     filter-override loader. Truncates the target table first (idempotent
-    re-run), then ``COPY ... (<header>) FROM STDIN`` using the CSV header as
-    the column list. Empty cells become NULL.
+    re-run), then streams ``COPY ... (<header>) FROM STDIN (FORMAT csv,
+    NULL '', FORCE_NULL (<header>))`` using the CSV header as the column
+    list, so every empty cell -- quoted or not -- becomes NULL.
 
-    Uses the default TEXT COPY format (tab-separated, ``\\N`` for NULL), which
-    is what psycopg's ``write_row`` serializes; specifying ``FORMAT csv`` in
-    the statement while ``write_row`` emits TEXT-format bytes causes the server
-    to misparse the row (one comma-free line becomes a single field).
+    The file is read row by row and re-emitted as CSV text in chunks of
+    :data:`_CSV_COPY_CHUNK_ROWS` rows, so memory is constant; blank and
+    all-whitespace rows are dropped on the way. The returned count is the
+    server's ``COPY n`` status, not a client-side tally.
 
     Fail-closed: dies if the CSV file is missing or (when ``header_expect`` is
     set) the header does not match exactly. A present-but-malformed file is
@@ -1015,24 +1808,31 @@ def copy_csv_into_table(
                 f"copy_csv_into_table: {rel(csv_path)} header {header!r} does not "
                 f"match expected {list(header_expect)!r}"
             )
-        rows = [r for r in reader if r and any(c.strip() for c in r)]
 
-    ident = psycopg.sql.Identifier(schema, table)
-    conn.execute(psycopg.sql.SQL("TRUNCATE {}").format(ident))
-    if not rows:
-        return 0
-
-    # Empty strings -> None so COPY TEXT format writes \N (NULL), e.g.
-    # sdg_division sentinel 0 -> NULL demos_text_id.
-    typed_rows = [[(c if c != "" else None) for c in r] for r in rows]
-    stmt = psycopg.sql.SQL("COPY {} ({}) FROM STDIN").format(
-        ident,
-        psycopg.sql.SQL(", ").join(psycopg.sql.Identifier(c) for c in header),
-    )
-    with conn.cursor() as cur, cur.copy(stmt) as copy:
-        for r in typed_rows:
-            copy.write_row(r)
-    return len(typed_rows)
+        ident = psycopg.sql.Identifier(schema, table)
+        columns = psycopg.sql.SQL(", ").join(psycopg.sql.Identifier(c) for c in header)
+        conn.execute(psycopg.sql.SQL("TRUNCATE {}").format(ident))
+        stmt = psycopg.sql.SQL(
+            "COPY {} ({}) FROM STDIN (FORMAT csv, NULL '', FORCE_NULL ({}))"
+        ).format(ident, columns, columns)
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        with conn.cursor() as cur:
+            with cur.copy(stmt) as copy:
+                pending = 0
+                for r in reader:
+                    if not (r and any(c.strip() for c in r)):
+                        continue
+                    writer.writerow(r)
+                    pending += 1
+                    if pending == _CSV_COPY_CHUNK_ROWS:
+                        copy.write(buf.getvalue())
+                        buf.seek(0)
+                        buf.truncate()
+                        pending = 0
+                if pending:
+                    copy.write(buf.getvalue())
+            return max(cur.rowcount, 0)
 
 
 def require_schema(env: Env, schema: str) -> None:
@@ -1187,6 +1987,20 @@ R = TypeVar("R")
 PHASE_REQUIRES: dict[str, tuple[str, ...]] = {}
 
 
+@contextmanager
+def phase_scope(name: str) -> Generator[None]:
+    """Run the block as phase ``name``: a ``phase`` span under its session profile.
+
+    The span records the profile's effective settings. Used by :func:`phase`
+    and by the phases that mark their gates inline.
+    """
+    with span("phase", name) as s, session_profile(name) as profile:
+        try:
+            yield
+        finally:
+            s.settings = profile.effective or None
+
+
 def phase(
     name: str,
     *,
@@ -1201,6 +2015,8 @@ def phase(
     - ``name`` is the gate this phase will mark on clean exit. Set
       ``mark=False`` if the phase decides for itself when to mark (e.g.
       parity, which only marks on GREEN/--accept-pending).
+
+    The body runs inside :func:`phase_scope` for the gate's name.
     """
     required = (requires,) if isinstance(requires, str) else tuple(requires)
     PHASE_REQUIRES[name] = required
@@ -1210,7 +2026,8 @@ def phase(
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             for gate in required:
                 require_gate(gate)
-            result = fn(*args, **kwargs)
+            with phase_scope(name):
+                result = fn(*args, **kwargs)
             if mark:
                 mark_gate(name)
             return result
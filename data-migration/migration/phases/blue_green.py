@@ -0,0 +1,230 @@
+"""Opt-in blue/green cutover of ``demos_app`` (``BLUE_GREEN=true``).
+
+A cutover normally rebuilds ``demos_app`` in place: ``build_app`` truncates
+the live tables and the app sees a half-built schema until ``parity`` passes.
+With ``Env.blue_green`` set:
+
+* ``build_stg`` starts with :func:`prepare_shadow`. It recreates
+  ``demos_app_next``, applies the pinned Prisma DDL to it, and records its
+  FKs and seeded tables exactly as ``ddl`` does for ``demos_app``.
+* ``build_stg``, ``build_app``, ``constraints`` and ``parity`` run inside
+  :func:`shadow_scope`. The SQL they send names ``demos_app``, and
+  :func:`migration.lib.app_schema` rewrites that name to ``demos_app_next``.
+  The live schema keeps serving reads throughout.
+* ``flip`` calls :func:`swap_in`. In one transaction it copies the live
+  schema's grants onto the shadow, renames ``demos_app`` to
+  ``demos_app_prev`` and renames ``demos_app_next`` to ``demos_app``.
+* ``migrate rollback`` calls :func:`swap_back`, which reverses the two
+  renames so the previous schema serves again.
+
+``ALTER SCHEMA ... RENAME`` only touches the catalog, so each swap is
+atomic and instant, although it waits for locks held by running queries.
+Views and other objects outside ``demos_app`` that depend on its tables
+bind by OID and follow the renamed schema. Function bodies are text, so
+any that name the shadow are re-created against ``demos_app`` in the same
+transaction. Column-level grants, function grants and default privileges
+are not copied. Re-run DEMOS ``permissions.sql`` after a swap if the
+target relies on them.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, LiteralString, cast
+
+import psycopg
+from psycopg import sql
+
+from migration.lib import (
+    APP_SCHEMA,
+    Env,
+    app_schema,
+    die,
+    log,
+    pg_connection,
+    psql_exec_composed,
+    psql_query,
+)
+
+SHADOW_SCHEMA = "demos_app_next"
+PREVIOUS_SCHEMA = "demos_app_prev"
+
+# Relkinds whose relacl is re-granted ON TABLE / ON SEQUENCE; indexes and
+# composite types carry no privileges of their own.
+_TABLE_RELKINDS = ("r", "p", "v", "m", "f")
+_SEQUENCE_RELKIND = "S"
+
+_RELATION_ACL_SQL = """
+SELECT c.relname, c.relkind, a.privilege_type, a.grantee::regrole::text, a.grantee = 0,
+       a.is_grantable
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+CROSS JOIN LATERAL aclexplode(c.relacl) a
+WHERE n.nspname = %s AND c.relacl IS NOT NULL AND a.grantee <> c.relowner
+  AND c.relkind = ANY(%s)
+  AND EXISTS (
+      SELECT 1 FROM pg_class s JOIN pg_namespace sn ON sn.oid = s.relnamespace
+      WHERE sn.nspname = %s AND s.relname = c.relname AND s.relkind = c.relkind
+  )
+ORDER BY c.relname, a.privilege_type
+"""
+_SCHEMA_ACL_SQL = """
+SELECT a.privilege_type, a.grantee::regrole::text, a.grantee = 0, a.is_grantable
+FROM pg_namespace n CROSS JOIN LATERAL aclexplode(n.nspacl) a
+WHERE n.nspname = %s AND n.nspacl IS NOT NULL AND a.grantee <> n.nspowner
+ORDER BY a.privilege_type
+"""
+_FUNCTIONS_NAMING_SQL = """
+SELECT pg_get_functiondef(p.oid)
+FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+WHERE n.nspname = %s
+  -- CASE keeps pg_get_functiondef, which rejects aggregates, behind the kind test.
+  AND CASE WHEN p.prokind IN ('f', 'p') THEN pg_get_functiondef(p.oid) ~ %s END
+"""
+
+
+def shadow_scope(env: Env) -> Any:
+    """Route ``demos_app`` to the shadow schema when ``env.blue_green``; else a no-op."""
+    return app_schema(SHADOW_SCHEMA if env.blue_green else None)
+
+
+def schema_exists(env: Env, name: str) -> bool:
+    return bool(psql_query(env, "SELECT 1 FROM pg_namespace WHERE nspname = %s", [name]))
+
+
+def prepare_shadow(env: Env) -> None:
+    """Recreate ``demos_app_next`` from the pinned Prisma DDL.
+
+    The shadow gets the live schema's owner (or the current role when there
+    is no live schema yet) and the same ``ddl`` steps that
+    :func:`migration.phases.init_pg.run_ddl` runs against ``demos_app``:
+    Prisma apply, FK capture and drop, and seeded-table capture. The
+    migration-private supplements live outside ``demos_app`` and are not
+    reapplied.
+    """
+    # Deferred: init_pg pulls in the prod-schema guard and its DuckDB deps.
+    from migration.phases.fetch_prisma import ensure_prisma_ddl
+    from migration.phases.init_pg import apply_prisma_ddl, record_seeded_tables
+
+    prisma_sql = ensure_prisma_ddl(env)
+    owner = psql_query(
+        env,
+        "SELECT coalesce((SELECT nspowner::regrole::text FROM pg_namespace "
+        "WHERE nspname = %s), current_user::text)",
+        [APP_SCHEMA],
+    )[0][0]
+    log(f"blue/green: recreating shadow schema {SHADOW_SCHEMA} (owner {owner})")
+    psql_exec_composed(
+        env,
+        sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(SHADOW_SCHEMA)),
+    )
+    psql_exec_composed(
+        env,
+        sql.SQL("CREATE SCHEMA {} AUTHORIZATION {}").format(
+            sql.Identifier(SHADOW_SCHEMA), sql.Identifier(str(owner))
+        ),
+    )
+    with app_schema(SHADOW_SCHEMA):
+        apply_prisma_ddl(env, prisma_sql)
+        record_seeded_tables(env)
+
+
+def _grantee(name: str, is_public: bool) -> sql.Composable:
+    return sql.SQL("PUBLIC") if is_public else sql.Identifier(name)
+
+
+def _copy_grants(cur: psycopg.Cursor[Any], source: str, target: str) -> int:
+    """Re-issue ``source``'s schema and relation grants on ``target``; return the count."""
+    stmts: list[sql.Composed] = []
+    for privilege, grantee, is_public, grantable in cur.execute(
+        _SCHEMA_ACL_SQL, [source]
+    ).fetchall():
+        stmts.append(
+            sql.SQL("GRANT {} ON SCHEMA {} TO {}{}").format(
+                sql.SQL(privilege),
+                sql.Identifier(target),
+                _grantee(grantee, is_public),
+                sql.SQL(" WITH GRANT OPTION" if grantable else ""),
+            )
+        )
+    relkinds = [*_TABLE_RELKINDS, _SEQUENCE_RELKIND]
+    for relname, relkind, privilege, grantee, is_public, grantable in cur.execute(
+        _RELATION_ACL_SQL, [source, relkinds, target]
+    ).fetchall():
+        stmts.append(
+            sql.SQL("GRANT {} ON {} {} TO {}{}").format(
+                sql.SQL(privilege),
+                sql.SQL("SEQUENCE" if relkind == _SEQUENCE_RELKIND else "TABLE"),
+                sql.Identifier(target, relname),
+                _grantee(grantee, is_public),
+                sql.SQL(" WITH GRANT OPTION" if grantable else ""),
+            )
+        )
+    for stmt in stmts:
+        cur.execute(stmt)
+    return len(stmts)
+
+
+def _rename(cur: psycopg.Cursor[Any], old: str, new: str) -> None:
+    cur.execute(
+        sql.SQL("ALTER SCHEMA {} RENAME TO {}").format(sql.Identifier(old), sql.Identifier(new))
+    )
+
+
+def _repoint_functions(cur: psycopg.Cursor[Any], schema: str, stale: str) -> int:
+    """Re-create ``schema``'s functions whose bodies name ``stale`` against ``schema``."""
+    pattern = rf"\m{stale}\M"
+    defs = [str(r[0]) for r in cur.execute(_FUNCTIONS_NAMING_SQL, [schema, pattern]).fetchall()]
+    for definition in defs:
+        cur.execute(cast(LiteralString, re.sub(rf"\b{re.escape(stale)}\b", schema, definition)))
+    return len(defs)
+
+
+def swap_in(env: Env) -> None:
+    """Promote the shadow: ``demos_app`` -> ``demos_app_prev``, ``demos_app_next`` -> ``demos_app``.
+
+    Dies unless the shadow exists. A ``demos_app_prev`` left by an earlier
+    swap is dropped first. Everything runs in one transaction, so the app
+    sees either the old schema or the new one, never neither.
+    """
+    if not schema_exists(env, SHADOW_SCHEMA):
+        die(f"blue/green: no {SHADOW_SCHEMA} schema to swap in; run build_stg with BLUE_GREEN=true")
+    with pg_connection(env, reset=True) as conn, conn.transaction(), conn.cursor() as cur:
+        cur.execute(
+            sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(PREVIOUS_SCHEMA))
+        )
+        live = bool(
+            cur.execute("SELECT 1 FROM pg_namespace WHERE nspname = %s", [APP_SCHEMA]).fetchone()
+        )
+        grants = _copy_grants(cur, APP_SCHEMA, SHADOW_SCHEMA) if live else 0
+        if live:
+            _rename(cur, APP_SCHEMA, PREVIOUS_SCHEMA)
+        _rename(cur, SHADOW_SCHEMA, APP_SCHEMA)
+        functions = _repoint_functions(cur, APP_SCHEMA, SHADOW_SCHEMA)
+    log(
+        f"blue/green: {SHADOW_SCHEMA} is now {APP_SCHEMA} ({grants} grant(s) copied, "
+        f"{functions} function(s) re-pointed); previous schema kept as "
+        f"{PREVIOUS_SCHEMA if live else '(none)'}"
+    )
+
+
+def swap_back(env: Env) -> None:
+    """Restore ``demos_app_prev`` as ``demos_app``, parking the current one as ``demos_app_next``.
+
+    Dies when there is no ``demos_app_prev`` or a ``demos_app_next`` is in
+    the way (a new shadow build started after the swap).
+    """
+    if not schema_exists(env, PREVIOUS_SCHEMA):
+        die(f"blue/green: no {PREVIOUS_SCHEMA} schema to swap back to")
+    if schema_exists(env, SHADOW_SCHEMA):
+        die(
+            f"blue/green: {SHADOW_SCHEMA} already exists; drop it before swapping "
+            f"{PREVIOUS_SCHEMA} back in"
+        )
+    with pg_connection(env, reset=True) as conn, conn.transaction(), conn.cursor() as cur:
+        _rename(cur, APP_SCHEMA, SHADOW_SCHEMA)
+        _rename(cur, PREVIOUS_SCHEMA, APP_SCHEMA)
+    log(
+        f"blue/green: {PREVIOUS_SCHEMA} restored as {APP_SCHEMA}; "
+        f"rolled-back build parked as {SHADOW_SCHEMA}"
+    )
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from pathlib import Path
 
 import psycopg
@@ -13,19 +17,31 @@ from migration.lib import (
     REPORTS_DIR,
     RUNS_DIR,
     SQL_DIR,
+    STATE_DIR,
+    ContextThreadPoolExecutor,
     Env,
-    apply_dir,
+    apply_files,
     copy_csv_into_table,
     die,
     file_stamp,
     log,
     mark_gate,
+    pg_connection,
+    phase_scope,
+    progress_for,
+    psql_exec_composed,
     psql_file,
+    psql_file_tx,
     psql_files,
+    psql_query,
     rel,
     require_gate,
     truncate_schema_data,
 )
+from migration.phases.blue_green import prepare_shadow, shadow_scope
+from migration.phases.replay import read_warm_mark, replay_changed_keys, write_warm_mark
+from migration.phases.unlogged import run_set_logged, set_unlogged, wal_meter
+from migration.sql_graph import SqlGraph, build_graph
 
 # Crosswalk completeness checks re-run against the post-delta source during
 # build_stg. The crosswalks phase runs these once in Week 1, but the cutover
@@ -248,7 +264,255 @@ def emit_filter_report(env: Env) -> Path:
     return report
 
 
-def run_build_stg() -> None:
+# Subdirectories of sql/ applied (in this order) by run_build_stg.
+STG_BUILD_DIRS = ("05_id_maps", "10_stg")
+
+# Fingerprints of every build_stg input as of the last successful build;
+# `build --incremental` diffs against it to pick the files to re-apply.
+STG_FINGERPRINTS_FILE = STATE_DIR / "build_stg_fingerprints.json"
+
+# stg tables filled from operator CSVs after the SQL runs; their content
+# fingerprint is the CSV's, not anything Postgres can count.
+_OVERRIDE_CSVS = {
+    "stg._keep_ids": FILTER_DIR / "keep_ids.csv",
+    "stg._drop_ids": FILTER_DIR / "drop_ids.csv",
+}
+
+
+# stg views snapshotted into UNLOGGED tables (same name) right after the file
+# defining them is applied, unless `build --no-materialize`. Downstream stg
+# views, the 20_app loaders and the 99_parity views then read the snapshot
+# instead of re-running the aggregation over mysql_raw.
+_MATERIALIZED_RE = re.compile(r"^stg\.[a-z0-9_]+_resolved$")
+# `*_id` / `*_uuid` columns of a snapshot are indexed when ANALYZE finds them
+# selective: n_distinct negative (scales with the row count) or at least this.
+_KEY_COLUMN_RE = re.compile(r"^(id|[a-z0-9_]+_(id|uuid))$")
+_KEY_MIN_DISTINCT = 200
+
+
+def _collect_stg_files() -> list[Path]:
+    """Return the ``build_stg`` SQL files in apply order (per dir, lexical)."""
+    files: list[Path] = []
+    for sub in STG_BUILD_DIRS:
+        d = SQL_DIR / sub
+        if d.is_dir():
+            files.extend(sorted(d.glob("*.sql")))
+    return files
+
+
+def _source_fingerprints(env: Env, relations: frozenset[str]) -> dict[str, str]:
+    """Fingerprint each ``mysql_raw`` relation in ``relations`` plus the override CSVs.
+
+    A loaded table's fingerprint is ``<row count>/<max(_loaded_at)>`` --
+    both pgloader and the copy engine stamp ``_loaded_at``, and the
+    incremental delta bumps it on every upsert. Tables without the column
+    (the crosswalk lookups) are small enough to hash outright. A relation
+    absent from ``mysql_raw`` fingerprints as ``missing``.
+    """
+    tables = sorted(r.split(".", 1)[1] for r in relations if r.startswith("mysql_raw."))
+    has_loaded_at = dict(
+        psql_query(
+            env,
+            "SELECT table_name::text, bool_or(column_name = '_loaded_at') "
+            "FROM information_schema.columns "
+            "WHERE table_schema = 'mysql_raw' AND table_name = ANY(%s) GROUP BY table_name",
+            [tables],
+        )
+    )
+    parts: list[sql.Composable] = []
+    for t in tables:
+        if t not in has_loaded_at:
+            continue
+        expr = (
+            "count(*)::text || '/' || coalesce(max(_loaded_at)::text, '')"
+            if has_loaded_at[t]
+            else "count(*)::text || '/' || "
+            "coalesce(md5(string_agg(x::text, '|' ORDER BY x::text)), '')"
+        )
+        parts.append(
+            sql.SQL("SELECT {} AS t, " + expr + " AS fp FROM {} x").format(
+                sql.Literal(f"mysql_raw.{t}"), sql.Identifier("mysql_raw", t)
+            )
+        )
+    fingerprints = {f"mysql_raw.{t}": "missing" for t in tables}
+    if parts:
+        query = sql.SQL(" UNION ALL ").join(parts)
+        fingerprints.update({str(r): str(fp) for r, fp in psql_query(env, query.as_string())})
+    for relation, csv_path in _OVERRIDE_CSVS.items():
+        fingerprints[relation] = (
+            hashlib.sha256(csv_path.read_bytes()).hexdigest() if csv_path.exists() else "absent"
+        )
+    return fingerprints
+
+
+def _missing_outputs(env: Env, graph: SqlGraph) -> set[str]:
+    """Declared outputs that do not exist in the database (e.g. after a schema reset)."""
+    outputs = sorted(frozenset().union(*(n.outputs for n in graph.nodes)))
+    if not outputs:
+        return set()
+    rows = psql_query(
+        env,
+        "SELECT o FROM unnest(%s::text[]) AS o WHERE to_regclass(o) IS NULL",
+        [outputs],
+    )
+    return {str(r[0]) for r in rows}
+
+
+def _plan_incremental_stg(
+    graph: SqlGraph,
+    previous: dict[str, dict[str, str]],
+    current: dict[str, str],
+    missing: set[str],
+) -> tuple[list[Path], list[str]]:
+    """Pick the files to re-apply; return them (apply order) and the changed inputs.
+
+    A file is *dirty* when its own text changed, one of its declared inputs
+    changed fingerprint, or one of its outputs is missing; everything
+    downstream of a dirty file is re-applied too. Files declaring no inputs
+    (the id-map DDL, the override-table bootstrap) are idempotent setup and
+    always run, but only propagate when they themselves are dirty.
+    """
+    old_fps = previous.get("relations", {})
+    old_files = previous.get("files", {})
+    changed = sorted(r for r, fp in current.items() if old_fps.get(r) != fp)
+    changed_set = set(changed)
+    seeds = [
+        n.path
+        for n in graph.nodes
+        if old_files.get(rel(n.path)) != n.sha256 or n.inputs & changed_set or n.outputs & missing
+    ]
+    dirty = graph.downstream(seeds)
+    dirty.update(n.path for n in graph.nodes if not n.inputs)
+    return [n.path for n in graph.nodes if n.path in dirty], changed
+
+
+def _write_stg_fingerprints(
+    graph: SqlGraph, fingerprints: dict[str, str], materialized: bool
+) -> None:
+    STG_FINGERPRINTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    STG_FINGERPRINTS_FILE.write_text(
+        json.dumps(
+            {
+                "relations": fingerprints,
+                "files": {rel(n.path): n.sha256 for n in graph.nodes},
+                "materialized": materialized,
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def _materialized_outputs(graph: SqlGraph, files: list[Path]) -> list[str]:
+    """The ``stg.*_resolved`` relations declared as outputs of ``files``."""
+    chosen = set(files)
+    return [
+        o
+        for n in graph.nodes
+        if n.path in chosen
+        for o in sorted(n.outputs)
+        if _MATERIALIZED_RE.match(o)
+    ]
+
+
+def _drop_materialized(env: Env, relations: list[str]) -> list[str]:
+    """Drop those of ``relations`` that are snapshot tables; return what was dropped.
+
+    The defining file's ``CREATE OR REPLACE VIEW`` cannot replace a table.
+    ``CASCADE`` also drops views built on the snapshot: the downstream stg
+    files re-create theirs, and parity re-applies ``99_parity``.
+    """
+    if not relations:
+        return []
+    rows = psql_query(
+        env,
+        "SELECT o FROM unnest(%s::text[]) AS o JOIN pg_class c ON c.oid = to_regclass(o) "
+        "WHERE c.relkind = 'r'",
+        [relations],
+    )
+    dropped = [str(r[0]) for r in rows]
+    for relation in dropped:
+        schema, name = relation.split(".", 1)
+        psql_exec_composed(
+            env, sql.SQL("DROP TABLE {} CASCADE").format(sql.Identifier(schema, name))
+        )
+    if dropped:
+        log(f"dropped {len(dropped)} stale stg snapshot(s): {', '.join(dropped)}")
+    return dropped
+
+
+def _materialize_view(env: Env, relation: str) -> None:
+    """Swap the view ``relation`` for an UNLOGGED, ANALYZEd, indexed snapshot of itself.
+
+    One transaction: the snapshot is built beside the view, the view dropped
+    (``CASCADE`` -- only stale parity views can depend on it this early in
+    the build), the snapshot renamed into place and analyzed, and its
+    selective ``*_id``/``*_uuid`` columns indexed. A relation that is not a
+    view (a guarded no-op file that created nothing) is left alone.
+    """
+    schema, name = relation.split(".", 1)
+    view = sql.Identifier(schema, name)
+    tmp = sql.Identifier(schema, f"{name}__mat")
+    with pg_connection(env) as conn, conn.transaction():
+        kind = conn.execute(
+            "SELECT c.relkind FROM pg_class c WHERE c.oid = to_regclass(%s)", [relation]
+        ).fetchone()
+        if not kind or kind[0] != "v":
+            return
+        conn.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(tmp))
+        rows = conn.execute(
+            sql.SQL("CREATE UNLOGGED TABLE {} AS SELECT * FROM {}").format(tmp, view)
+        ).rowcount
+        conn.execute(sql.SQL("DROP VIEW {} CASCADE").format(view))
+        conn.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(tmp, sql.Identifier(name)))
+        conn.execute(sql.SQL("ANALYZE {}").format(view))
+        stats = conn.execute(
+            "SELECT attname::text, n_distinct FROM pg_stats "
+            "WHERE schemaname = %s AND tablename = %s ORDER BY attname",
+            [schema, name],
+        ).fetchall()
+        keys = [
+            col
+            for col, distinct in stats
+            if _KEY_COLUMN_RE.match(col) and (distinct < 0 or distinct >= _KEY_MIN_DISTINCT)
+        ]
+        for col in keys:
+            conn.execute(
+                sql.SQL("CREATE INDEX {} ON {} ({})").format(
+                    sql.Identifier(f"{name}_{col}_idx"[:63]), view, sql.Identifier(col)
+                )
+            )
+    log(f"materialized {relation}: {rows} row(s), index(es) on {', '.join(keys) or 'none'}")
+
+
+def _apply_stg(
+    env: Env, graph: SqlGraph, files: list[Path], *, materialize: bool, label: str
+) -> None:
+    """Apply ``files`` in graph order, snapshotting each resolved view as it appears.
+
+    Files run in batches ending at a file that declares a ``stg.*_resolved``
+    output, which is materialized before any later file can build on it.
+    """
+    chosen = set(files)
+    batch: list[Path] = []
+    for node in graph.nodes:
+        if node.path not in chosen:
+            continue
+        batch.append(node.path)
+        views = _materialized_outputs(graph, [node.path]) if materialize else []
+        if views:
+            apply_files(env, batch, label)
+            batch = []
+            for view in views:
+                _materialize_view(env, view)
+    apply_files(env, batch, label)
+
+
+def run_build_stg(
+    incremental: bool = False, materialize: bool = True, replay: bool = False
+) -> None:
     """Run P3a: rebuild ``stg.*`` from ``mysql_raw`` and emit the filter report.
 
     Requires the ``delta`` gate: the cutover chain must not build (and
@@ -260,28 +524,93 @@ def run_build_stg() -> None:
     truncates ``stg`` data tables, applies the id-map and stg SQL
     directories, loads keep/drop ID overrides, writes a timestamped
     filter report, and marks the ``build_stg`` gate.
+
+    With ``incremental=True`` nothing is truncated and only the files
+    affected since the last build are applied (see
+    :func:`_plan_incremental_stg`), using the ``mysql_raw`` fingerprints in
+    ``state/build_stg_fingerprints.json``; without that file the build is
+    full. Every successful build rewrites the fingerprints.
+
+    Each ``stg.*_resolved`` view is materialized into an UNLOGGED, indexed
+    table of the same name as soon as its file has run (see
+    :func:`_materialize_view`), so downstream SQL reads it unchanged.
+    ``materialize=False`` keeps plain views, as the idempotency harness
+    expects. An incremental build whose materialize setting differs from
+    the previous build's runs in full.
+
+    With ``UNLOGGED_BUILD`` set the ``stg`` tables are switched to UNLOGGED
+    first (see :mod:`migration.phases.unlogged`); ``build_app`` sets them
+    LOGGED again before marking its gate.
+
+    With ``BLUE_GREEN`` set the shadow ``demos_app_next`` is recreated from
+    the pinned Prisma DDL first and the build reads its seeded lookups
+    instead of the live schema's (see :mod:`migration.phases.blue_green`).
+
+    ``replay=True`` is the stg half of a cutover-day replay onto a
+    :func:`run_warm_build`: the build is incremental and a blue/green
+    shadow is kept rather than recreated.
     """
     require_gate("delta")
     env = Env.load()
+    _build_stg(env, incremental or replay, materialize, fresh_shadow=not replay)
+    mark_gate("build_stg")
 
-    log("re-validating crosswalk completeness against post-delta data")
-    for rel_path in CROSSWALK_CHECKS:
-        psql_file(env, SQL_DIR / rel_path)
-
-    log("truncating stg.* data tables")
-    truncate_schema_data(env, "stg")
 
-    apply_dir(env, SQL_DIR / "05_id_maps")
-    apply_dir(env, SQL_DIR / "10_stg")
+def _build_stg(env: Env, incremental: bool, materialize: bool, fresh_shadow: bool = True) -> None:
+    """The body of :func:`run_build_stg`, shared with :func:`run_warm_build`."""
+    # Converted before the meter starts; see migration.phases.unlogged.
+    if env.unlogged_build:
+        set_unlogged(env, "stg")
+    with phase_scope("build_stg"), wal_meter(env, "build_stg"), shadow_scope(env):
+        if env.blue_green and fresh_shadow:
+            prepare_shadow(env)
+
+        log("re-validating crosswalk completeness against post-delta data")
+        for rel_path in CROSSWALK_CHECKS:
+            psql_file(env, SQL_DIR / rel_path)
+
+        graph = build_graph(_collect_stg_files())
+        fingerprints = _source_fingerprints(env, graph.relations_read())
+        previous: dict = {}
+        if incremental and STG_FINGERPRINTS_FILE.exists():
+            previous = json.loads(STG_FINGERPRINTS_FILE.read_text(encoding="utf-8"))
+            if previous.get("materialized", False) != materialize:
+                log("materialize setting changed since the last build; running a full build_stg")
+                previous = {}
+        elif incremental:
+            log(f"no {rel(STG_FINGERPRINTS_FILE)} yet; running a full build_stg")
+
+        if previous:
+            # Dropping a stale snapshot cascades to the views built on it; re-plan
+            # until every file whose output went missing is in the set.
+            while True:
+                files, changed = _plan_incremental_stg(
+                    graph, previous, fingerprints, _missing_outputs(env, graph)
+                )
+                if not _drop_materialized(env, _materialized_outputs(graph, files)):
+                    break
+            log(
+                f"incremental build_stg: applying {len(files)} of {len(graph.nodes)} file(s); "
+                f"changed inputs: {', '.join(changed) or 'none'}"
+            )
+            _apply_stg(
+                env, graph, files, materialize=materialize, label="apply build_stg (incremental)"
+            )
+        else:
+            files = [n.path for n in graph.nodes]
+            _drop_materialized(env, _materialized_outputs(graph, files))
+            log("truncating stg.* data tables")
+            truncate_schema_data(env, "stg")
+            _apply_stg(env, graph, files, materialize=materialize, label="apply build_stg")
 
-    # Per-anchor filter views are now defined in stg; CSV overrides are
-    # populated here, after the override tables exist and are truncated by
-    # 00_keep_drop_ids.sql. The filter report is regenerated from the
-    # current state of mysql_raw plus the just-loaded overrides.
-    load_filter_overrides(env)
-    emit_filter_report(env)
+        # Per-anchor filter views are now defined in stg; CSV overrides are
+        # populated here, after the override tables exist and are truncated by
+        # 00_keep_drop_ids.sql. The filter report is regenerated from the
+        # current state of mysql_raw plus the just-loaded overrides.
+        load_filter_overrides(env)
+        emit_filter_report(env)
 
-    mark_gate("build_stg")
+        _write_stg_fingerprints(graph, fingerprints, materialize)
 
 
 def _collect_app_files() -> list[Path]:
@@ -325,7 +654,69 @@ def _drop_demos_app_fks(env: Env) -> None:
     init_pg._drop_fks(env, init_pg._capture_fks(env))
 
 
-def run_build_app() -> None:
+def _truncate_demos_app(env: Env) -> None:
+    """Truncate ``demos_app`` data tables, sparing the Prisma-seeded lookups (B8)."""
+    seeded = _load_seeded_tables()
+    if seeded:
+        log(
+            f"truncating demos_app.* data tables; preserving {len(seeded)} "
+            "Prisma-seeded reference tables"
+        )
+        truncate_schema_data(env, "demos_app", exclude_tables=seeded)
+    else:
+        log(
+            "WARNING: state/prisma_seeded_tables.json missing; run `migrate ddl` "
+            "to refresh it. Falling back to %_status/%_type exclude patterns, "
+            "which may truncate Prisma-seeded lookups (see CODE_REVIEW B8)."
+        )
+        truncate_schema_data(env, "demos_app", exclude_patterns=_FALLBACK_EXCLUDE_PATTERNS)
+
+
+def _apply_app_graph(env: Env, graph: SqlGraph, jobs: int) -> list[str]:
+    """Apply ``graph``'s files up to ``jobs`` at a time; return the files that failed.
+
+    A file starts once every file it depends on has committed, each in its
+    own deferred-constraint transaction on its own connection. After the
+    first failure nothing new is started; files already running finish so
+    no connection is abandoned mid-transaction.
+    """
+    pending = {n.path: set(graph.deps[n.path]) for n in graph.nodes}
+    order = [n.path for n in graph.nodes]
+    done: set[Path] = set()
+    failed: list[str] = []
+    running: dict[Future[None], tuple[Path, float]] = {}
+    with (
+        progress_for(len(order), "apply build files") as p,
+        ContextThreadPoolExecutor(max_workers=jobs, thread_name_prefix="build-app") as pool,
+    ):
+        while True:
+            if not failed:
+                busy = {path for path, _ in running.values()}
+                for path in order:
+                    if len(running) >= jobs:
+                        break
+                    if path not in done and path not in busy and pending[path] <= done:
+                        fut = pool.submit(psql_file_tx, env, path, "SET CONSTRAINTS ALL DEFERRED")
+                        running[fut] = (path, time.perf_counter())
+                        busy.add(path)
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                path, started = running.pop(fut)
+                p.step(rel(path))
+                try:
+                    fut.result()
+                except SystemExit:
+                    # psql_file_tx already logged the SQL error via die().
+                    failed.append(rel(path))
+                    continue
+                done.add(path)
+                log(f"applied {rel(path)} in {time.perf_counter() - started:.1f}s")
+    return failed
+
+
+def run_build_app(jobs: int = 1, replay: bool = False) -> None:
     """Run P3b: rebuild ``demos_app.*`` from ``stg`` in one transaction.
 
     Requires the ``build_stg`` gate. First drops any re-added ``demos_app``
@@ -337,37 +728,97 @@ def run_build_app() -> None:
     every FK at the constraints phase (B8). Then applies every collected SQL
     file in a single deferred-constraint transaction and marks the
     ``build_app`` gate on success.
+
+    With ``jobs > 1`` the files run as a DAG instead (see
+    :func:`_apply_app_graph`): dependencies come from the front-matter via
+    :func:`migration.sql_graph.build_graph` in strict mode, and independent
+    loaders run concurrently, each committing on its own connection. There
+    is no single transaction to roll back, so on any failure the
+    ``demos_app`` data tables are truncated again -- the schema returns to
+    its pre-build state -- and the phase dies without marking the gate.
+
+    With ``BLUE_GREEN`` set every step targets the shadow ``demos_app_next``.
+
+    ``replay=True`` keeps the warm ``demos_app`` left by
+    :func:`run_warm_build`: instead of the truncation, only the rows fed by
+    source rows loaded since then are deleted
+    (:func:`migration.phases.replay.replay_changed_keys`), and the
+    idempotent build files re-insert them. A failed replay resets the data
+    tables like a failed parallel build.
     """
     env = Env.load()
     require_gate("build_stg")
+    built_at = read_warm_mark() if replay else None
+    with phase_scope("build_app"), shadow_scope(env):
+        _build_app(env, jobs, built_at)
+    mark_gate("build_app")
+
 
+def _build_app(env: Env, jobs: int, replay_since: str | None = None) -> None:
+    """The body of :func:`run_build_app`; dies (gate unmarked) on failure."""
     # Drop any re-added demos_app FKs first so the truncation below cannot
     # cascade through a validated FK into an excluded seeded lookup (H1).
     _drop_demos_app_fks(env)
+    if replay_since is None:
+        _truncate_demos_app(env)
+    else:
+        replay_changed_keys(env, replay_since, _load_seeded_tables())
 
-    seeded = _load_seeded_tables()
-    if seeded:
-        log(
-            f"truncating demos_app.* data tables; preserving {len(seeded)} "
-            "Prisma-seeded reference tables"
-        )
-        truncate_schema_data(env, "demos_app", exclude_tables=seeded)
+    files = _collect_app_files()
+    if jobs <= 1:
+        log(f"applying {len(files)} demos_app build files in a single transaction")
+        try:
+            psql_files(env, files, pre_sql="SET CONSTRAINTS ALL DEFERRED")
+        except SystemExit:
+            # The replay deletes committed on their own; do not leave them half-refilled.
+            if replay_since is not None:
+                log("rolling back the partial replay: truncating demos_app data tables")
+                _truncate_demos_app(env)
+            raise
     else:
+        graph = build_graph(files, strict=True)
+        roots = sum(1 for n in graph.nodes if not graph.deps[n.path])
         log(
-            "WARNING: state/prisma_seeded_tables.json missing; run `migrate ddl` "
-            "to refresh it. Falling back to %_status/%_type exclude patterns, "
-            "which may truncate Prisma-seeded lookups (see CODE_REVIEW B8)."
+            f"applying {len(files)} demos_app build files as a dependency graph, "
+            f"{jobs} at a time ({roots} with no upstream file)"
         )
-        truncate_schema_data(env, "demos_app", exclude_patterns=_FALLBACK_EXCLUDE_PATTERNS)
+        failed = _apply_app_graph(env, graph, jobs)
+        if failed:
+            log("rolling back the partial build: truncating demos_app data tables again")
+            _truncate_demos_app(env)
+            die(f"build_app failed in {', '.join(failed)}; demos_app data tables were reset")
 
-    files = _collect_app_files()
-    log(f"applying {len(files)} demos_app build files in a single transaction")
-    psql_files(env, files, pre_sql="SET CONSTRAINTS ALL DEFERRED")
-
-    mark_gate("build_app")
+    # An UNLOGGED build is made crash-safe before the gate is marked.
+    if env.unlogged_build:
+        run_set_logged(env)
 
 
-def run_build() -> None:
+def run_build(
+    incremental: bool = False, jobs: int = 1, materialize: bool = True, replay: bool = False
+) -> None:
     """Run P3 end-to-end: :func:`run_build_stg` followed by :func:`run_build_app`."""
-    run_build_stg()
-    run_build_app()
+    run_build_stg(incremental=incremental, materialize=materialize, replay=replay)
+    run_build_app(jobs=jobs, replay=replay)
+
+
+def run_warm_build(jobs: int = 1, materialize: bool = True) -> None:
+    """Build stg and demos_app ahead of the freeze for a later ``build --replay``.
+
+    Requires the ``load_full`` gate and marks no cutover gate: the chain
+    still runs freeze -> delta (``--incremental``) -> build (``--replay``)
+    -> constraints -> parity. The database time taken before ``build_stg``
+    reads ``mysql_raw`` goes to ``state/warm_build.json``; the replay treats
+    every source row loaded after it as changed (see
+    :mod:`migration.phases.replay`).
+    """
+    require_gate("load_full")
+    env = Env.load()
+    built_at = psql_query(env, "SELECT now()")[0][0]
+    _build_stg(env, incremental=False, materialize=materialize)
+    with phase_scope("build_app"), shadow_scope(env):
+        _build_app(env, jobs)
+    write_warm_mark(built_at, materialize)
+    log(
+        "warm build ready; on cutover day run freeze, delta --incremental, "
+        "build --replay, constraints and parity"
+    )
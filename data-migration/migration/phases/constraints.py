@@ -6,6 +6,12 @@ unconstrained. This phase re-creates them as ``NOT VALID`` and then
 ``VALIDATE``s them, then runs the rest of the P5 pipeline (constraint
 triggers, app triggers, indexes, sequences). Hard-fails if any FK
 remains unvalidated after the loop.
+
+``VALIDATE CONSTRAINT`` takes only ``SHARE UPDATE EXCLUSIVE`` on the
+child table (and ``ROW SHARE`` on the parent), so FKs on *different*
+child tables can validate concurrently. ``--jobs N`` fans the work out
+over N pooled connections, one child table per worker at a time: two
+validations on the same child would just queue on that lock.
 """
 
 from __future__ import annotations
@@ -13,6 +19,10 @@ from __future__ import annotations
 import csv
 import json
 import re
+import time
+from collections import defaultdict
+from concurrent.futures import as_completed
+from dataclasses import dataclass
 from typing import LiteralString, cast
 
 from psycopg import sql as psql
@@ -21,16 +31,19 @@ from migration.lib import (
     PRISMA_FKS_FILE,
     SQL_DIR,
     STATE_DIR,
+    ContextThreadPoolExecutor,
     Env,
     apply_dir,
     die,
     log,
+    pg_connection,
     phase,
     progress_for,
     psql_exec_composed,
     psql_query,
     rel,
 )
+from migration.phases.blue_green import shadow_scope
 
 
 def _list_invalid_fks(env: Env) -> list[tuple[str, str, str]]:
@@ -53,15 +66,214 @@ def _list_invalid_fks(env: Env) -> list[tuple[str, str, str]]:
     return [(str(r[0]), str(r[1]), str(r[2])) for r in rows]
 
 
-def _write_violations(violations: list[tuple[str, str, str]]) -> None:
+@dataclass
+class _FkValidation:
+    """Outcome of one ``VALIDATE CONSTRAINT``.
+
+    ``violations`` is the number of child rows with no matching parent,
+    counted only when the validate failed (``None`` if it passed or the
+    count itself could not run). ``error`` is the first line of the
+    Postgres error, or ``None`` on success.
+    """
+
+    schema: str
+    table: str
+    constraint_name: str
+    duration_s: float
+    violations: int | None = None
+    error: str | None = None
+
+
+def _fk_columns(
+    env: Env, schema: str, table: str, constraint_name: str
+) -> tuple[list[str], str, str, list[str]] | None:
+    """Return (child cols, parent schema, parent table, parent cols) for one FK."""
+    rows = psql_query(
+        env,
+        """
+        SELECT array_agg(ca.attname ORDER BY k.ord),
+               pn.nspname,
+               pc.relname,
+               array_agg(pa.attname ORDER BY k.ord)
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_class pc ON pc.oid = con.confrelid
+        JOIN pg_namespace pn ON pn.oid = pc.relnamespace
+        CROSS JOIN LATERAL unnest(con.conkey, con.confkey)
+            WITH ORDINALITY AS k(child_att, parent_att, ord)
+        JOIN pg_attribute ca ON ca.attrelid = con.conrelid AND ca.attnum = k.child_att
+        JOIN pg_attribute pa ON pa.attrelid = con.confrelid AND pa.attnum = k.parent_att
+        WHERE n.nspname = %s AND c.relname = %s AND con.conname = %s
+        GROUP BY pn.nspname, pc.relname
+        """,
+        (schema, table, constraint_name),
+    )
+    if not rows:
+        return None
+    child_cols, p_schema, p_table, parent_cols = rows[0]
+    return list(child_cols), str(p_schema), str(p_table), list(parent_cols)
+
+
+def _count_fk_violations(env: Env, schema: str, table: str, constraint_name: str) -> int | None:
+    """Count child rows that break one FK (MATCH SIMPLE: any NULL column skips the row).
+
+    Best-effort diagnostics for the CSV: returns ``None`` rather than
+    raising if the catalog lookup or the count fails.
+    """
+    try:
+        cols = _fk_columns(env, schema, table, constraint_name)
+        if cols is None:
+            return None
+        child_cols, p_schema, p_table, parent_cols = cols
+        not_null = psql.SQL(" AND ").join(
+            psql.SQL("c.{} IS NOT NULL").format(psql.Identifier(col)) for col in child_cols
+        )
+        join_on = psql.SQL(" AND ").join(
+            psql.SQL("p.{} = c.{}").format(psql.Identifier(pc), psql.Identifier(cc))
+            for cc, pc in zip(child_cols, parent_cols, strict=True)
+        )
+        query = psql.SQL(
+            "SELECT count(*) FROM {child} c WHERE {not_null} "
+            "AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE {join_on})"
+        ).format(
+            child=psql.Identifier(schema, table),
+            parent=psql.Identifier(p_schema, p_table),
+            not_null=not_null,
+            join_on=join_on,
+        )
+        rows = psql_query(env, query.as_string())
+    except Exception as e:
+        log(f"  could not count violations for {schema}.{table} {constraint_name}: {e}")
+        return None
+    return int(rows[0][0]) if rows else None
+
+
+def _validate_fk(env: Env, schema: str, table: str, constraint_name: str) -> _FkValidation:
+    """``VALIDATE`` one FK, timing it; on failure, count the offending rows."""
+    stmt = psql.SQL("ALTER TABLE {tbl} VALIDATE CONSTRAINT {con}").format(
+        tbl=psql.Identifier(schema, table),
+        con=psql.Identifier(constraint_name),
+    )
+    start = time.perf_counter()
+    try:
+        psql_exec_composed(env, stmt)
+    except Exception as e:
+        elapsed = time.perf_counter() - start
+        log(f"  VIOLATION: {schema}.{table} {constraint_name}: {e}")
+        return _FkValidation(
+            schema,
+            table,
+            constraint_name,
+            elapsed,
+            violations=_count_fk_violations(env, schema, table, constraint_name),
+            error=str(e).splitlines()[0] if str(e) else type(e).__name__,
+        )
+    return _FkValidation(schema, table, constraint_name, time.perf_counter() - start)
+
+
+def _table_sizes(env: Env) -> dict[tuple[str, str], int]:
+    """Return on-disk bytes per demos_app table, used to schedule the biggest first."""
+    rows = psql_query(
+        env,
+        """
+        SELECT n.nspname, c.relname, pg_total_relation_size(c.oid)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'demos_app' AND c.relkind IN ('r', 'p')
+        """,
+    )
+    return {(str(r[0]), str(r[1])): int(r[2]) for r in rows}
+
+
+def _validate_group(env: Env, group: list[tuple[str, str, str]]) -> list[_FkValidation]:
+    """Validate the FKs of one child table, serially, on the calling worker."""
+    return [_validate_fk(env, *fk) for fk in group]
+
+
+def _validate_fks(
+    env: Env, pending: list[tuple[str, str, str]], jobs: int = 1
+) -> list[_FkValidation]:
+    """Validate ``pending`` FKs across up to ``jobs`` workers.
+
+    FKs are grouped by child table and each group runs serially on one
+    worker, so no two workers ever contend for the same child's
+    ``SHARE UPDATE EXCLUSIVE`` lock. Groups are submitted largest table
+    first (longest-job-first), which keeps the tail short when one
+    table dominates. Results come back in ``pending`` order.
+    """
+    groups: dict[tuple[str, str], list[tuple[str, str, str]]] = defaultdict(list)
+    for fk in pending:
+        groups[(fk[0], fk[1])].append(fk)
+    sizes = _table_sizes(env) if jobs > 1 and len(groups) > 1 else {}
+    ordered = sorted(groups, key=lambda k: (-sizes.get(k, 0), -len(groups[k]), k))
+
+    if jobs > env.pg_pool_size:
+        log(
+            f"NOTE: --jobs {jobs} exceeds PG_POOL_SIZE={env.pg_pool_size}; "
+            "workers will queue for pooled connections"
+        )
+    by_fk: dict[tuple[str, str, str], _FkValidation] = {}
+    with (
+        progress_for(len(pending), f"validate FKs ({jobs} jobs)") as p,
+        ContextThreadPoolExecutor(max_workers=jobs, thread_name_prefix="validate") as pool,
+    ):
+        futures = [pool.submit(_validate_group, env, groups[k]) for k in ordered]
+        for fut in as_completed(futures):
+            for res in fut.result():
+                p.step(f"{res.schema}.{res.table} {res.constraint_name}")
+                by_fk[(res.schema, res.table, res.constraint_name)] = res
+    return [by_fk[fk] for fk in pending]
+
+
+def _write_violations(
+    violations: list[tuple[str, str, str]], results: list[_FkValidation] | None = None
+) -> None:
+    """Write ``state/fk_violations.csv`` (one row per still-invalid FK).
+
+    ``violations`` and ``validate_s`` come from this run's validation
+    results; they are blank for an FK this run did not try to validate.
+    """
+    by_fk = {(r.schema, r.table, r.constraint_name): r for r in results or []}
     out = STATE_DIR / "fk_violations.csv"
     with out.open("w", encoding="utf-8", newline="") as f:
         w = csv.writer(f)
-        w.writerow(["schema", "table", "constraint_name"])
-        w.writerows(violations)
+        w.writerow(["schema", "table", "constraint_name", "violations", "validate_s"])
+        for fk in violations:
+            res = by_fk.get(fk)
+            w.writerow(
+                [
+                    *fk,
+                    "" if res is None or res.violations is None else res.violations,
+                    "" if res is None else f"{res.duration_s:.3f}",
+                ]
+            )
     log(f"wrote {rel(out)} ({len(violations)} rows)")
 
 
+def _write_validate_timings(results: list[_FkValidation]) -> None:
+    """Write ``state/fk_validate.csv``: per-FK wall time and outcome, every FK."""
+    out = STATE_DIR / "fk_validate.csv"
+    with out.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(
+            ["schema", "table", "constraint_name", "status", "validate_s", "violations", "error"]
+        )
+        for r in results:
+            w.writerow(
+                [
+                    r.schema,
+                    r.table,
+                    r.constraint_name,
+                    "ok" if r.error is None else "failed",
+                    f"{r.duration_s:.3f}",
+                    "" if r.violations is None else r.violations,
+                    r.error or "",
+                ]
+            )
+    log(f"wrote {rel(out)} ({len(results)} rows)")
+
+
 _FK_DEF_RE = re.compile(r"^FOREIGN KEY\b", re.IGNORECASE)
 
 
@@ -86,8 +298,12 @@ def _readd_captured_fks(env: Env, fks: list[dict[str, str]]) -> None:
     ``pg_get_constraintdef``; only appends ``NOT VALID`` so the bulk
     build's deferred validation pattern is preserved.
 
-    Each FK is dropped (``IF EXISTS``) and re-added in a single
-    ``ALTER TABLE`` so the phase is re-runnable after a partial failure:
+    All FKs on one table fold into a single multi-clause ``ALTER TABLE``
+    (one catalog lock + round-trip per table instead of per FK), and
+    every table's statement runs in one transaction on one pooled
+    connection, so a failure leaves no half-applied set behind. Each
+    FK is dropped (``IF EXISTS``) and re-added within its table's
+    statement so the phase is re-runnable after a partial failure:
     Postgres has no ``ADD CONSTRAINT IF EXISTS``, so a plain re-add would
     abort on the first already-present constraint. This mirrors the
     ``DROP CONSTRAINT IF EXISTS`` symmetry in ``init_pg``.
@@ -97,10 +313,12 @@ def _readd_captured_fks(env: Env, fks: list[dict[str, str]]) -> None:
     ``definition`` is wrapped in ``psql.SQL``; the regex guard below
     is what makes that wrap safe -- it rejects any string that does
     not start with ``FOREIGN KEY``, so a malformed
-    ``state/prisma_fks.json`` cannot smuggle arbitrary SQL.
+    ``state/prisma_fks.json`` cannot smuggle arbitrary SQL. Every
+    definition is checked before anything is executed.
     """
     if not fks:
         return
+    clauses: dict[tuple[str, str], list[psql.Composed]] = defaultdict(list)
     for fk in fks:
         definition = fk["definition"].strip().rstrip(";")
         if not _FK_DEF_RE.match(definition):
@@ -108,64 +326,80 @@ def _readd_captured_fks(env: Env, fks: list[dict[str, str]]) -> None:
                 f"refusing to re-apply unexpected constraint def for "
                 f"{fk['schema']}.{fk['table']} {fk['name']}: {definition!r}"
             )
-        stmt = psql.SQL(
-            "ALTER TABLE {tbl} DROP CONSTRAINT IF EXISTS {con}, "
-            "ADD CONSTRAINT {con} {defn} NOT VALID"
-        ).format(
-            tbl=psql.Identifier(fk["schema"], fk["table"]),
-            con=psql.Identifier(fk["name"]),
-            # `definition` is verbatim pg_get_constraintdef output and has been
-            # regex-guarded above to start with "FOREIGN KEY"; cast documents
-            # that contract to psycopg.sql.SQL's LiteralString-typed overload.
-            defn=psql.SQL(cast(LiteralString, definition)),
+        clauses[(fk["schema"], fk["table"])].append(
+            psql.SQL(
+                "DROP CONSTRAINT IF EXISTS {con}, ADD CONSTRAINT {con} {defn} NOT VALID"
+            ).format(
+                con=psql.Identifier(fk["name"]),
+                # `definition` is verbatim pg_get_constraintdef output and has been
+                # regex-guarded above to start with "FOREIGN KEY"; cast documents
+                # that contract to psycopg.sql.SQL's LiteralString-typed overload.
+                defn=psql.SQL(cast(LiteralString, definition)),
+            )
         )
-        psql_exec_composed(env, stmt)
-    log(f"re-added {len(fks)} FK(s) as NOT VALID")
+
+    start = time.perf_counter()
+    with pg_connection(env) as conn, conn.transaction(), conn.cursor() as cur:
+        for (schema, table), table_clauses in clauses.items():
+            stmt = psql.SQL("ALTER TABLE {tbl} {clauses}").format(
+                tbl=psql.Identifier(schema, table),
+                clauses=psql.SQL(", ").join(table_clauses),
+            )
+            t0 = time.perf_counter()
+            cur.execute(stmt)
+            log(
+                f"  {schema}.{table}: {len(table_clauses)} FK(s) in {time.perf_counter() - t0:.2f}s"
+            )
+    log(
+        f"re-added {len(fks)} FK(s) as NOT VALID on {len(clauses)} table(s) "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
 
 
 @phase("constraints", requires="build_app")
-def run_constraints() -> None:
+def run_constraints(jobs: int = 1) -> None:
     """Run P5: re-apply Prisma FKs (NOT VALID then VALIDATE), triggers, indexes.
 
     Requires the ``build_app`` gate. Reads the captured Prisma FK
     definitions from ``state/prisma_fks.json`` and re-creates them as
     ``NOT VALID`` so violations surface per-constraint instead of
-    batch-failing the apply. Iterates ``VALIDATE CONSTRAINT`` for each.
-    Then applies any remaining (migration-owned) constraint SQL plus
-    constraint triggers, app triggers, indexes, and sequences. Writes
+    batch-failing the apply. Runs ``VALIDATE CONSTRAINT`` for each,
+    across up to ``jobs`` workers grouped by child table, and records
+    per-FK timings in ``state/fk_validate.csv``. Then applies any
+    remaining (migration-owned) constraint SQL plus constraint
+    triggers, app triggers, indexes, and sequences. Writes
     ``state/fk_violations.csv`` and hard-fails if any FK is still
     unvalidated.
+
+    With ``BLUE_GREEN`` set every step targets the shadow ``demos_app_next``.
     """
     env = Env.load()
 
-    fks = _load_captured_fks()
-    log(f"re-applying {len(fks)} captured FK(s) from {rel(PRISMA_FKS_FILE)}")
-    _readd_captured_fks(env, fks)
+    with shadow_scope(env):
+        fks = _load_captured_fks()
+        log(f"re-applying {len(fks)} captured FK(s) from {rel(PRISMA_FKS_FILE)}")
+        _readd_captured_fks(env, fks)
 
-    # Any migration-owned constraint SQL still applies (currently empty
-    # in the supplements model; the directory is kept for future use).
-    apply_dir(env, SQL_DIR / "30_constraints")
+        # Any migration-owned constraint SQL still applies (currently empty
+        # in the supplements model; the directory is kept for future use).
+        apply_dir(env, SQL_DIR / "30_constraints")
 
-    log("validating FKs")
-    pending = _list_invalid_fks(env)
-    with progress_for(len(pending), "validate FKs") as p:
-        for schema, table, constraint_name in pending:
-            p.step(f"{schema}.{table} {constraint_name}")
-            stmt = psql.SQL("ALTER TABLE {tbl} VALIDATE CONSTRAINT {con}").format(
-                tbl=psql.Identifier(schema, table),
-                con=psql.Identifier(constraint_name),
-            )
-            try:
-                psql_exec_composed(env, stmt)
-            except Exception as e:
-                log(f"  VIOLATION: {schema}.{table} {constraint_name}: {e}")
-
-    apply_dir(env, SQL_DIR / "31_constraint_triggers")
-    apply_dir(env, SQL_DIR / "32_app_triggers")
-    apply_dir(env, SQL_DIR / "40_indexes")
-    apply_dir(env, SQL_DIR / "50_sequences")
-
-    remaining = _list_invalid_fks(env)
-    _write_violations(remaining)
-    if remaining:
-        die(f"FK violations remain ({len(remaining)}); see state/fk_violations.csv")
+        log("validating FKs")
+        pending = _list_invalid_fks(env)
+        start = time.perf_counter()
+        results = _validate_fks(env, pending, jobs=jobs)
+        log(
+            f"validated {len(results)} FK(s) in {time.perf_counter() - start:.1f}s "
+            f"({sum(r.error is None for r in results)} ok)"
+        )
+        _write_validate_timings(results)
+
+        apply_dir(env, SQL_DIR / "31_constraint_triggers")
+        apply_dir(env, SQL_DIR / "32_app_triggers")
+        apply_dir(env, SQL_DIR / "40_indexes")
+        apply_dir(env, SQL_DIR / "50_sequences")
+
+        remaining = _list_invalid_fks(env)
+        _write_violations(remaining, results)
+        if remaining:
+            die(f"FK violations remain ({len(remaining)}); see state/fk_violations.csv")
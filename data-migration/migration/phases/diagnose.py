@@ -38,7 +38,7 @@ def _probe_reason(captured: str, exc: BaseException) -> str:
     return f"{type(exc).__name__}: {exc}"
 
 
-def run_diagnose() -> None:
+def run_diagnose(jobs: int = 1) -> None:
     """Aggregate the non-gating probes into ``reports/runs/diagnose_<stamp>.md``.
 
     Each probe is wrapped so a missing DB or unreachable live source is recorded
@@ -46,7 +46,8 @@ def run_diagnose() -> None:
     always-on SQL-failure ``die`` (``SystemExit``) a probe may raise when its
     prerequisite schema is not built yet. The probe's console output is captured
     so the recorded reason carries the real FATAL message, then re-emitted to
-    stderr so the operator still sees it live.
+    stderr so the operator still sees it live. ``jobs`` is forwarded to the
+    parity probe's concurrent check executor.
     """
     env = Env.load()
     RUNS_DIR.mkdir(parents=True, exist_ok=True)
@@ -61,7 +62,7 @@ def run_diagnose() -> None:
     ]
     with console.capture() as cap:
         try:
-            report = parity.build_parity_report(env)
+            report = parity.build_parity_report(env, jobs=jobs)
             probe_error: BaseException | None = None
         except (Exception, SystemExit) as exc:  # best-effort: a missing schema must not abort
             probe_error = exc
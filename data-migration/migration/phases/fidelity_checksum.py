@@ -0,0 +1,316 @@
+"""Row-content checksums for ``load-fidelity --checksum`` -- MySQL vs mysql_raw.
+
+Row counts cannot show a value that a ``casts.load`` coercion (or a copy
+engine bug) changed in flight. This compares content instead. Each table is
+split into primary-key ranges of about ``chunk_rows`` rows, and both engines
+hash each range *server-side* into one row, so only the hashes cross the
+network:
+
+* every column is rendered to a canonical text. The MySQL side goes through
+  the same :func:`migration.phases.load_copy.plan_column` mapping the copy
+  engine loads with, so intended coercions hash equal: zero dates become
+  NULL, ``tinyint(1)`` becomes ``1``/``0``, NUL characters are stripped.
+  Datetimes render as wall-clock time in the target's ``TimeZone``, floats
+  at 6 decimals, and bytes as lowercase hex;
+* a row hashes to the first 60 bits of the MD5 of those texts joined by
+  ``0x1F`` (NULL is ``0x01``);
+* a chunk's digest is ``count(*)`` plus the *sum* of its row hashes, which
+  is order-independent and identical on MySQL (``CONV``/``MD5``) and
+  Postgres (``md5``/``bit(60)``).
+
+Chunks run in parallel on the shared DuckDB session (``src`` + ``pg``). Only a
+chunk whose digests differ is drilled down: its canonical rows on both sides
+are diffed with ``EXCEPT ALL`` inside DuckDB, and the differing rows go to
+``reports/runs/load_fidelity_checksum_<stamp>/<table>_<lo>_<hi>.parquet``
+with a ``side`` column. A table without an integer primary key is hashed as
+one chunk.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from migration.duck import duck_connection, escape_literal, mysql_query, mysql_query_sql
+from migration.lib import RUNS_DIR, Env, file_stamp, log, progress_for, rel
+from migration.phases.load_copy import (
+    SOURCE_COLUMNS_SQL,
+    SOURCE_INDEXES_SQL,
+    ColumnPlan,
+    parse_cast_rules,
+    plan_column,
+    source_columns,
+)
+
+_INTEGER_TYPES = {"tinyint", "smallint", "mediumint", "int", "integer", "bigint"}
+_RAW_COLUMNS_SQL = (
+    "SELECT table_name, column_name, data_type FROM information_schema.columns "
+    "WHERE table_schema = 'mysql_raw'"
+)
+
+# Canonical text per column, keyed by the copy engine's target type (MySQL
+# side) or the landed information_schema.data_type (Postgres side). ``{}`` is
+# the column expression. Types missing here fall back to plain text.
+_MYSQL_CANON: dict[str, str] = {
+    "bool": "CASE WHEN {c} IS NULL THEN NULL WHEN {c} <> 0 THEN '1' ELSE '0' END",
+    "float4": "CAST(CAST({c} AS DECIMAL(38,6)) AS CHAR)",
+    "float8": "CAST(CAST({c} AS DECIMAL(38,6)) AS CHAR)",
+    "bpchar": "CONVERT(REPLACE({c}, CHAR(0 USING utf8mb4), '') USING utf8mb4)",
+    "varchar": "CONVERT(REPLACE({c}, CHAR(0 USING utf8mb4), '') USING utf8mb4)",
+    "text": "CONVERT(REPLACE({c}, CHAR(0 USING utf8mb4), '') USING utf8mb4)",
+    "bytea": "LOWER(HEX({c}))",
+    "time": "TIME_FORMAT({c}, '%H:%i:%s')",
+    "date": "DATE_FORMAT({c}, '%Y-%m-%d')",
+    "timestamptz": "DATE_FORMAT({c}, '%Y-%m-%d %H:%i:%s.%f')",
+}
+_MYSQL_DEFAULT = "CAST({c} AS CHAR)"
+_PG_CANON: dict[str, str] = {
+    "boolean": "CASE WHEN {c} IS NULL THEN NULL WHEN {c} THEN '1' ELSE '0' END",
+    "real": "{c}::float8::numeric(38,6)::text",
+    "double precision": "{c}::numeric(38,6)::text",
+    "bytea": "encode({c}, 'hex')",
+    "time without time zone": "to_char({c}, 'HH24:MI:SS')",
+    "date": "to_char({c}, 'YYYY-MM-DD')",
+    "timestamp with time zone": (
+        "to_char({c} AT TIME ZONE current_setting('TimeZone'), 'YYYY-MM-DD HH24:MI:SS.US')"
+    ),
+    "timestamp without time zone": "to_char({c}, 'YYYY-MM-DD HH24:MI:SS.US')",
+}
+_PG_DEFAULT = "{c}::text"
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One primary-key range ``[lo, hi)`` of a table (both ``None``: the whole table)."""
+
+    table: str
+    lo: int | None = None
+    hi: int | None = None
+
+    @property
+    def label(self) -> str:
+        return "all" if self.lo is None else f"{self.lo}_{self.hi}"
+
+
+@dataclass(frozen=True)
+class TablePlan:
+    """What :func:`_chunk_digest` needs for one table: columns, key and chunks."""
+
+    table: str
+    columns: tuple[ColumnPlan, ...]
+    raw_types: dict[str, str]
+    key: str | None
+    chunks: tuple[Chunk, ...]
+
+
+@dataclass
+class TableChecksum:
+    """Per-table outcome: chunk count, mismatching chunks and column-shape drift."""
+
+    table: str
+    chunks: int = 0
+    keyed: bool = True
+    mismatched: list[tuple[str, int, Path]] = field(default_factory=list)
+    missing_columns: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+def key_ranges(lo: int, hi: int, rows: int, chunk_rows: int) -> list[tuple[int, int]]:
+    """Split ``[lo, hi]`` into about ``rows / chunk_rows`` equal-width half-open ranges."""
+    n = max(1, math.ceil(rows / chunk_rows))
+    width = max(1, math.ceil((hi - lo + 1) / n))
+    return [(start, min(start + width, hi + 1)) for start in range(lo, hi + 1, width)]
+
+
+def mysql_row_sql(columns: Sequence[ColumnPlan]) -> list[str]:
+    """The MySQL canonical-text expression of each planned column."""
+    return [_MYSQL_CANON.get(p.copy_type, _MYSQL_DEFAULT).format(c=p.select_expr) for p in columns]
+
+
+def pg_row_sql(columns: Sequence[ColumnPlan], raw_types: dict[str, str]) -> list[str]:
+    """The Postgres canonical-text expression of each landed column."""
+    return [_PG_CANON.get(raw_types[p.name], _PG_DEFAULT).format(c=f'"{p.name}"') for p in columns]
+
+
+def _where(chunk: Chunk, key: str) -> str:
+    # ``key`` is only read for a ranged chunk, which always has one.
+    return "" if chunk.lo is None else f" WHERE {key} >= {chunk.lo} AND {key} < {chunk.hi}"
+
+
+def digest_sql(plan: TablePlan, chunk: Chunk) -> tuple[str, str]:
+    """The (MySQL, Postgres) statements returning ``(count, sum of row hashes)`` as text."""
+    my_cols = ", ".join(
+        f"COALESCE({e}, CHAR(1 USING utf8mb4))" for e in mysql_row_sql(plan.columns)
+    )
+    pg_cols = ", ".join(f"coalesce({e}, chr(1))" for e in pg_row_sql(plan.columns, plan.raw_types))
+    mysql = (
+        "SELECT CAST(COUNT(*) AS CHAR), CAST(COALESCE(SUM(CAST(CONV(LEFT(MD5("
+        f"CONCAT_WS(CHAR(31 USING utf8mb4), {my_cols})), 15), 16, 10) AS UNSIGNED)), 0) AS CHAR) "
+        f"FROM `{plan.table}`{_where(chunk, f'`{plan.key}`')}"
+    )
+    pg = (
+        "SELECT count(*)::text, coalesce(sum(('x' || left(md5("
+        f"concat_ws(chr(31), {pg_cols})), 15))::bit(60)::bigint), 0)::text "
+        f'FROM mysql_raw."{plan.table.lower()}"{_where(chunk, (plan.key or "").lower())}'
+    )
+    return mysql, pg
+
+
+def rows_sql(plan: TablePlan, chunk: Chunk) -> tuple[str, str]:
+    """The (MySQL, Postgres) statements returning a chunk's canonical rows, named alike."""
+    my_cols = ", ".join(
+        f"{e} AS `{p.name}`" for e, p in zip(mysql_row_sql(plan.columns), plan.columns, strict=True)
+    )
+    pg_cols = ", ".join(
+        f'{e} AS "{p.name}"'
+        for e, p in zip(pg_row_sql(plan.columns, plan.raw_types), plan.columns, strict=True)
+    )
+    mysql = f"SELECT {my_cols} FROM `{plan.table}`{_where(chunk, f'`{plan.key}`')}"
+    pg = (
+        f'SELECT {pg_cols} FROM mysql_raw."{plan.table.lower()}"'
+        f"{_where(chunk, (plan.key or '').lower())}"
+    )
+    return mysql, pg
+
+
+def _pg_passthrough(con: Any, pg_sql: str) -> list[tuple[Any, ...]]:
+    return con.execute(
+        f"SELECT * FROM postgres_query('pg', '{escape_literal(pg_sql)}')"
+    ).fetchall()
+
+
+def _drilldown(con: Any, plan: TablePlan, chunk: Chunk, out_dir: Path) -> tuple[int, Path]:
+    """Write the chunk's differing canonical rows (``EXCEPT ALL`` both ways) to Parquet."""
+    mysql, pg = rows_sql(plan, chunk)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out = out_dir / f"{plan.table}_{chunk.label}.parquet"
+    src = mysql_query_sql(mysql)
+    raw = f"SELECT * FROM postgres_query('pg', '{escape_literal(pg)}')"
+    row = con.execute(
+        f"COPY (WITH s AS ({src}), r AS ({raw}) "
+        "SELECT 'mysql' AS side, * FROM (SELECT * FROM s EXCEPT ALL SELECT * FROM r) "
+        "UNION ALL "
+        "SELECT 'mysql_raw' AS side, * FROM (SELECT * FROM r EXCEPT ALL SELECT * FROM s)) "
+        f"TO '{escape_literal(out)}' (FORMAT parquet)"
+    ).fetchone()
+    return (int(row[0]) if row else 0), out
+
+
+def _check_chunk(env: Env, plan: TablePlan, chunk: Chunk, out_dir: Path) -> tuple[int, Path] | None:
+    """Compare one chunk's digests; drill down and return (differing rows, file) on mismatch."""
+    mysql, pg = digest_sql(plan, chunk)
+    with duck_connection(env, "src", "pg") as con:
+        _, src = mysql_query(con, mysql)
+        raw = _pg_passthrough(con, pg)
+        if tuple(src[0]) == tuple(raw[0]):
+            return None
+        return _drilldown(con, plan, chunk, out_dir)
+
+
+def _plan_table(
+    env: Env,
+    table: str,
+    columns: Sequence[ColumnPlan],
+    raw_types: dict[str, str],
+    key: str | None,
+    rows: int,
+    chunk_rows: int,
+) -> TablePlan:
+    chunks: tuple[Chunk, ...] = (Chunk(table),)
+    if key is not None and rows > chunk_rows:
+        with duck_connection(env, "src") as con:
+            _, bounds = mysql_query(con, f"SELECT MIN(`{key}`), MAX(`{key}`) FROM `{table}`")
+        lo, hi = bounds[0] if bounds else (None, None)
+        if lo is not None and hi is not None:
+            chunks = tuple(
+                Chunk(table, a, b) for a, b in key_ranges(int(lo), int(hi), rows, chunk_rows)
+            )
+    return TablePlan(table, tuple(columns), raw_types, key, chunks)
+
+
+def summarize_checksum(results: Sequence[TableChecksum]) -> list[str]:
+    """Render checksum findings as human messages (empty == every chunk matched)."""
+    issues: list[str] = []
+    for r in results:
+        if r.missing_columns:
+            issues.append(
+                f"{r.table}: columns missing in mysql_raw: {', '.join(r.missing_columns)}"
+            )
+        issues.extend(f"{r.table}: checksum failed ({e})" for e in r.errors)
+        for label, n, path in r.mismatched:
+            issues.append(f"{r.table}: chunk {label} content differs ({n} row(s); {rel(path)})")
+    return issues
+
+
+def run_checksums(
+    env: Env, row_counts: dict[str, int], *, jobs: int, chunk_rows: int
+) -> list[TableChecksum]:
+    """Checksum every table in ``row_counts`` (source row count per table) chunk by chunk."""
+    with duck_connection(env, "src", "pg") as con:
+        _, column_rows = mysql_query(con, SOURCE_COLUMNS_SQL)
+        _, index_rows = mysql_query(con, SOURCE_INDEXES_SQL)
+        raw_rows = _pg_passthrough(con, _RAW_COLUMNS_SQL)
+    rules = parse_cast_rules()
+    source = source_columns(column_rows, set(row_counts))
+    raw_types: dict[str, dict[str, str]] = {}
+    for t, c, data_type in raw_rows:
+        raw_types.setdefault(str(t), {})[str(c)] = str(data_type)
+    keys: dict[str, list[str]] = {}
+    for t, index_name, _, column, _ in index_rows:
+        if str(index_name) == "PRIMARY":
+            keys.setdefault(str(t), []).append(str(column))
+    types = {(t, c.name): c.data_type.lower() for t, cols in source.items() for c in cols}
+
+    results: dict[str, TableChecksum] = {}
+    plans: list[tuple[str, list[ColumnPlan], dict[str, str], str | None]] = []
+    for table in sorted(row_counts):
+        result = results[table] = TableChecksum(table)
+        landed = raw_types.get(table.lower(), {})
+        planned = [plan_column(c, rules) for c in source.get(table, [])]
+        result.missing_columns = [p.name for p in planned if p.name not in landed]
+        common = [p for p in planned if p.name in landed]
+        pk = keys.get(table, [])
+        key = pk[0] if pk and types.get((table, pk[0])) in _INTEGER_TYPES else None
+        result.keyed = key is not None
+        if common:
+            plans.append((table, common, landed, key))
+
+    out_dir = RUNS_DIR / f"load_fidelity_checksum_{file_stamp()}"
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="checksum") as pool:
+        table_plans: list[TablePlan] = list(
+            pool.map(
+                lambda p: _plan_table(env, *p, row_counts[p[0]], chunk_rows),
+                plans,
+            )
+        )
+        chunks = [(plan, chunk) for plan in table_plans for chunk in plan.chunks]
+        for plan in table_plans:
+            results[plan.table].chunks = len(plan.chunks)
+        with progress_for(len(chunks), f"checksum chunks ({jobs} jobs)") as p:
+            futures = {
+                pool.submit(_check_chunk, env, plan, chunk, out_dir): (plan, chunk)
+                for plan, chunk in chunks
+            }
+            for future in as_completed(futures):
+                plan, chunk = futures[future]
+                try:
+                    diff = future.result()
+                except Exception as e:
+                    results[plan.table].errors.append(
+                        f"chunk {chunk.label}: {str(e).splitlines()[0] if str(e) else type(e).__name__}"
+                    )
+                else:
+                    if diff is not None:
+                        results[plan.table].mismatched.append((chunk.label, *diff))
+                p.step(f"{plan.table} {chunk.label}")
+    ordered = [results[t] for t in sorted(results)]
+    bad = sum(len(r.mismatched) for r in ordered)
+    log(
+        f"checksum: {len(chunks)} chunk(s) over {len(ordered)} table(s); "
+        f"{bad} mismatched" + (f", rows in {rel(out_dir)}" if bad else "")
+    )
+    return ordered
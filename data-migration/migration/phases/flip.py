@@ -2,7 +2,8 @@
 
 PMDA (legacy) and DEMOS (new) are separate apps served on separate URLs;
 the dev team owns the URL/redirect work outside this repo. This phase
-therefore does **not** perform a DNS or load-balancer swap. Its job is
+therefore does **not** perform a DNS or load-balancer swap; the only swap
+is the opt-in blue/green schema rename (``BLUE_GREEN``). Its job is
 to verify the new app is reachable and responsive at its own healthz
 endpoint and to record operator confirmation that the legacy app has
 been placed in read-only mode.
@@ -18,6 +19,7 @@ from urllib.parse import urlparse
 from tenacity import RetryError, Retrying, stop_after_attempt, wait_fixed
 
 from migration.lib import Env, confirm, die, log, phase
+from migration.phases.blue_green import swap_in
 
 HEALTHZ_RETRIES = 5
 HEALTHZ_BACKOFF_SECONDS = 2.0
@@ -78,16 +80,21 @@ def run_flip() -> None:
     Requires the ``parity`` gate. Prompts the operator to confirm PMDA is
     in read-only mode, then verifies the DEMOS healthz endpoint
     (``NEW_APP_HEALTHZ_URL`` env) via :func:`_check_healthz`. Dies if the
-    endpoint is unset rather than probing a placeholder. Marks the
-    ``flip`` gate on success.
+    endpoint is unset rather than probing a placeholder. With
+    ``BLUE_GREEN`` set, renames the shadow ``demos_app_next`` into place
+    (:func:`migration.phases.blue_green.swap_in`) before the probe. Marks
+    the ``flip`` gate on success.
     """
     log("P7 flip: verifying DEMOS is live and PMDA is read-only")
     log("  (PMDA and DEMOS are separate apps on separate URLs; no DNS swap needed)")
     if not confirm("confirm PMDA is in read-only mode (y/N)?"):
         die("flip not confirmed: legacy app not in read-only mode")
 
-    healthz = Env.load().new_app_healthz_url
+    env = Env.load()
+    healthz = env.new_app_healthz_url
     if not healthz:
         die("NEW_APP_HEALTHZ_URL not set; set the DEMOS healthz endpoint in .env before flip")
+    if env.blue_green:
+        swap_in(env)
     log(f"verifying DEMOS healthz at {healthz}")
     _check_healthz(healthz)
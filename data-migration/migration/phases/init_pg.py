@@ -17,6 +17,7 @@ import yaml
 from psycopg import sql as psql
 
 from migration.lib import (
+    APP_SCHEMA,
     INIT_SCHEMAS_SQL,
     PRISMA_FKS_FILE,
     PRISMA_SEEDED_TABLES_FILE,
@@ -25,6 +26,7 @@ from migration.lib import (
     STATE_DIR,
     Env,
     apply_dir,
+    canonical_app_schema,
     copy_csv_into_table,
     log,
     progress_for,
@@ -113,10 +115,12 @@ def _capture_fks(env: Env) -> list[dict[str, str]]:
     )
     return [
         {
-            "schema": str(r[0]),
+            "schema": APP_SCHEMA,
             "table": str(r[1]),
             "name": str(r[2]),
-            "definition": str(r[3]),
+            # A shadow build's catalog names the shadow schema; persist the
+            # canonical name so the file stays valid after the swap.
+            "definition": canonical_app_schema(str(r[3]), str(r[0])),
         }
         for r in rows
     ]
@@ -237,6 +241,20 @@ def run_ddl() -> None:
     log("(re)creating demos_app schema before Prisma apply")
     psql_file(env, INIT_SCHEMAS_SQL)
 
+    apply_prisma_ddl(env, prisma_sql)
+
+    apply_dir(env, SQL_DIR / "01_ddl_supplements", expect_files=True)
+
+    record_seeded_tables(env)
+
+
+def apply_prisma_ddl(env: Env, prisma_sql: Path) -> None:
+    """Apply the Prisma artifact to an empty ``demos_app``, then capture and drop its FKs.
+
+    Shared by :func:`run_ddl` and the blue/green shadow build
+    (:func:`migration.phases.blue_green.prepare_shadow`), which runs it
+    under :func:`migration.lib.app_schema`.
+    """
     log(f"applying prisma ddl: {rel(prisma_sql)}")
     psql_file(env, prisma_sql)
 
@@ -245,8 +263,9 @@ def run_ddl() -> None:
     _write_fks(fks)
     _drop_fks(env, fks)
 
-    apply_dir(env, SQL_DIR / "01_ddl_supplements", expect_files=True)
 
+def record_seeded_tables(env: Env) -> None:
+    """Write ``state/prisma_seeded_tables.json`` from the freshly applied schema."""
     # Record the Prisma-seeded reference tables (non-empty demos_app.*
     # tables at ddl time) so build_app can skip them when truncating; otherwise the
     # bulk build would wipe lookups the migration never re-seeds. Runs
@@ -0,0 +1,606 @@
+"""In-process MySQL -> mysql_raw full load over Postgres binary COPY (``--engine=copy``).
+
+An alternative to pgloader for ``migrate load-full`` with no external
+binary or JVM heap to size. The source is read the way the rest of the
+toolkit reads it -- the process DuckDB session's ``src`` catalog
+(:func:`migration.duck.duck_connection`) with a ``mysql_query``
+passthrough -- and each result is pulled ``COPY_BATCH_ROWS`` at a time and
+written with ``COPY mysql_raw.<t> FROM STDIN (FORMAT binary)``, so memory
+stays bounded by one batch per worker.
+
+Type mapping is read from the same ``pgloader/casts.load`` the pgloader
+runs render (:func:`parse_cast_rules`), with pgloader's own defaults for
+types that file does not mention; the drop list is applied; identifiers
+are downcased; and every table gets the ``_loaded_at`` column the
+pgloader ``AFTER LOAD`` block adds. Columns keep their source ``NOT NULL``
+and literal defaults unless the cast rule says ``drop not null`` / ``drop
+default``; expression defaults (``CURRENT_TIMESTAMP``, ``(uuid())``) are not
+carried over. Indexes with an expression key part are skipped and prefix
+(``col(10)``) key parts are indexed on the whole column, both with a
+warning. Each table is dropped, re-created, loaded, and indexed in its own
+transaction, and tables run in parallel
+(largest first) across pooled connections. Per-table rows/s go to the log
+and ``reports/runs/copy_load_<stamp>.csv``.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime as dt
+import json
+import re
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, LiteralString, cast
+from zoneinfo import ZoneInfo
+
+from psycopg import sql as psql
+
+from migration.duck import duck_connection, mysql_batches, mysql_query
+from migration.lib import (
+    RUNS_DIR,
+    Env,
+    cast_block,
+    die,
+    file_stamp,
+    is_safe_identifier,
+    log,
+    pg_connection,
+    progress_for,
+    psql_query,
+    read_drop_list,
+    rel,
+)
+
+COPY_BATCH_ROWS = 10_000
+
+_SOURCE_TABLES_SQL = (
+    "SELECT table_name, table_rows FROM information_schema.tables "
+    "WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE' "
+    "ORDER BY table_name"
+)
+SOURCE_COLUMNS_SQL = (
+    "SELECT table_name, column_name, data_type, column_type, "
+    "character_maximum_length, numeric_precision, numeric_scale, "
+    "is_nullable, column_default, extra "
+    "FROM information_schema.columns WHERE table_schema = DATABASE() "
+    "ORDER BY table_name, ordinal_position"
+)
+# column_name is NULL for an expression key part (MySQL 8 functional index);
+# sub_part is the prefix length of a ``col(10)`` key part.
+SOURCE_INDEXES_SQL = (
+    "SELECT table_name, index_name, non_unique, column_name, sub_part "
+    "FROM information_schema.statistics WHERE table_schema = DATABASE() "
+    "ORDER BY table_name, index_name, seq_in_index"
+)
+
+
+@dataclass(frozen=True)
+class CastRule:
+    """One ``type <src> [when (= precision N)] to <dst> ...`` line of casts.load."""
+
+    source: str
+    target: str
+    precision: int | None = None
+    keep_typemod: bool = False
+    drop_default: bool = False
+    drop_not_null: bool = False
+    using: str | None = None
+
+
+_CAST_RULE_RE = re.compile(
+    r"^type\s+(?P<source>\w+)"
+    r"(?:\s+when\s+\(=\s*precision\s+(?P<precision>\d+)\))?"
+    r"\s+to\s+(?P<target>\w+)"
+    r"(?P<options>.*)$"
+)
+_USING_RE = re.compile(r"\busing\s+([\w-]+)")
+
+
+def parse_cast_rules(text: str | None = None) -> list[CastRule]:
+    """Parse the pgloader CAST block (default: :func:`migration.lib.cast_block`).
+
+    Understands the subset of pgloader's CAST grammar that ``casts.load``
+    uses -- a source type, an optional ``(= precision N)`` guard, a target
+    type, ``keep``/``drop typemod``, ``drop default``, ``drop not null`` and
+    ``using <fn>``. A line it cannot
+    parse is fatal, so the two engines can never silently disagree.
+    """
+    body = (text if text is not None else cast_block()).strip()
+    body = re.sub(r"^CAST\s+", "", body, flags=re.IGNORECASE)
+    rules: list[CastRule] = []
+    for raw in body.split(","):
+        line = " ".join(raw.split())
+        if not line:
+            continue
+        m = _CAST_RULE_RE.match(line)
+        if m is None:
+            die(f"cannot parse pgloader cast rule for the copy engine: {line!r}")
+        using = _USING_RE.search(m["options"])
+        rules.append(
+            CastRule(
+                source=m["source"].lower(),
+                target=m["target"].lower(),
+                precision=int(m["precision"]) if m["precision"] else None,
+                keep_typemod="keep typemod" in m["options"],
+                drop_default="drop default" in m["options"],
+                drop_not_null="drop not null" in m["options"],
+                using=using.group(1) if using else None,
+            )
+        )
+    return rules
+
+
+# pgloader's built-in MySQL mappings for the types casts.load leaves alone.
+# Unsigned integers widen so the full unsigned range fits.
+_DEFAULT_PG_TYPES: dict[str, str] = {
+    "tinyint": "smallint",
+    "smallint": "smallint",
+    "mediumint": "integer",
+    "int": "integer",
+    "integer": "integer",
+    "bigint": "bigint",
+    "float": "real",
+    "double": "double precision",
+    "decimal": "numeric",
+    "char": "char",
+    "varchar": "varchar",
+    "text": "text",
+    "enum": "text",
+    "set": "text",
+    "json": "jsonb",
+    "binary": "bytea",
+    "varbinary": "bytea",
+    "bit": "bytea",
+    "time": "time",
+}
+_UNSIGNED_PG_TYPES: dict[str, str] = {
+    "smallint": "integer",
+    "mediumint": "integer",
+    "int": "bigint",
+    "integer": "bigint",
+    "bigint": "numeric",
+}
+# psycopg binary-dumper names for each target type.
+_COPY_TYPES: dict[str, str] = {
+    "boolean": "bool",
+    "smallint": "int2",
+    "integer": "int4",
+    "bigint": "int8",
+    "real": "float4",
+    "double precision": "float8",
+    "numeric": "numeric",
+    "char": "bpchar",
+    "varchar": "varchar",
+    "text": "text",
+    "jsonb": "jsonb",
+    "bytea": "bytea",
+    "time": "time",
+    "date": "date",
+    "timestamptz": "timestamptz",
+}
+_WIDTH_RE = re.compile(r"^\w+\((\d+)")
+
+
+@dataclass(frozen=True)
+class SourceColumn:
+    """One MySQL column, as read from ``information_schema.columns``."""
+
+    name: str
+    data_type: str
+    column_type: str
+    char_length: int | None = None
+    precision: int | None = None
+    scale: int | None = None
+    nullable: bool = True
+    default: str | None = None
+    # A default MySQL evaluates (DEFAULT_GENERATED / CURRENT_TIMESTAMP), not a literal.
+    default_is_expression: bool = False
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """How one MySQL column is selected, typed, and converted for COPY."""
+
+    name: str
+    select_expr: str
+    pg_type: str
+    copy_type: str
+    convert: Callable[[Any], Any] | None = None
+    not_null: bool = False
+    default: psql.Composable | None = None
+
+
+@dataclass
+class SourceIndex:
+    """One MySQL index, as read from ``information_schema.statistics``.
+
+    ``columns`` holds ``None`` for an expression key part; ``prefixed`` names
+    the key parts MySQL indexes by a length prefix.
+    """
+
+    unique: bool
+    columns: list[str | None] = field(default_factory=list)
+    prefixed: list[str] = field(default_factory=list)
+
+
+def _strip_nul(v: Any) -> Any:
+    # Postgres text cannot hold NUL; pgloader's remove-null-characters does the same.
+    return v.replace("\x00", "") if isinstance(v, str) else v
+
+
+def _to_decimal(v: Any) -> Any:
+    return v if isinstance(v, Decimal) else Decimal(str(v))
+
+
+def _to_json(v: Any) -> Any:
+    return json.loads(v) if isinstance(v, (str, bytes)) else v
+
+
+_NUMERIC_LITERAL_RE = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+_NUMBER_BASES = {"smallint", "integer", "bigint", "real", "double precision", "numeric"}
+
+
+def _default_expr(col: SourceColumn, base: str) -> psql.Composable | None:
+    """The Postgres ``DEFAULT`` for a MySQL literal default, else ``None``.
+
+    MySQL reports literal defaults unquoted; they are re-quoted as Postgres
+    literals and left to the column type's input function. Expression
+    defaults and literals the target type cannot hold are not carried.
+    """
+    raw = col.default
+    if raw is None or col.default_is_expression:
+        return None
+    if base == "boolean":
+        return psql.SQL("false" if raw in {"0", "b'0'"} else "true")
+    if base in _NUMBER_BASES:
+        return psql.Literal(raw) if _NUMERIC_LITERAL_RE.match(raw) else None
+    if base in {"char", "varchar", "text", "time"}:
+        return psql.Literal(raw.replace("\x00", ""))
+    return None
+
+
+def plan_column(col: SourceColumn, rules: Sequence[CastRule]) -> ColumnPlan:
+    """Map one MySQL column to its mysql_raw type via casts.load, else pgloader defaults."""
+    data_type = col.data_type.lower()
+    width_m = _WIDTH_RE.match(col.column_type.lower())
+    width = int(width_m.group(1)) if width_m else None
+    unsigned = "unsigned" in col.column_type.lower()
+
+    rule = next(
+        (
+            r
+            for r in rules
+            if r.source == data_type and (r.precision is None or r.precision == width)
+        ),
+        None,
+    )
+    if rule is not None:
+        base = rule.target
+        keep_typemod = rule.keep_typemod
+        using = rule.using
+        drop_default, drop_not_null = rule.drop_default, rule.drop_not_null
+    else:
+        drop_default = drop_not_null = False
+        base = (_UNSIGNED_PG_TYPES if unsigned else {}).get(data_type) or _DEFAULT_PG_TYPES.get(
+            data_type, "text"
+        )
+        keep_typemod = base in {"char", "varchar"}
+        using = None
+
+    pg_type = base
+    if keep_typemod and base == "numeric" and col.precision is not None:
+        pg_type = f"numeric({col.precision},{col.scale or 0})"
+    elif keep_typemod and base in {"char", "varchar"} and col.char_length:
+        pg_type = f"{base}({col.char_length})"
+
+    ident = f"`{col.name}`"
+    select_expr = ident
+    if using == "zero-dates-to-null":
+        select_expr = f"IF(CAST({ident} AS CHAR) LIKE '0000-00-00%', NULL, {ident})"
+
+    convert: Callable[[Any], Any] | None = None
+    if base == "boolean":
+        convert = bool
+    elif base == "numeric":
+        convert = _to_decimal
+    elif base in {"char", "varchar", "text"}:
+        convert = _strip_nul
+    elif base == "jsonb":
+        convert = _to_json
+    elif base in {"smallint", "integer", "bigint"}:
+        convert = int
+    if base not in _COPY_TYPES:
+        die(f"copy engine has no binary COPY type for {col.name} -> {base}")
+    return ColumnPlan(
+        col.name.lower(),
+        select_expr,
+        pg_type,
+        _COPY_TYPES[base],
+        convert,
+        not_null=not (col.nullable or drop_not_null),
+        default=None if drop_default else _default_expr(col, base),
+    )
+
+
+def _localizer(tz: dt.tzinfo) -> Callable[[Any], Any]:
+    """Attach ``tz`` to naive datetimes, as Postgres does when parsing pgloader's text."""
+
+    def _localize(v: Any) -> Any:
+        if isinstance(v, dt.datetime) and v.tzinfo is None:
+            return v.replace(tzinfo=tz)
+        return v
+
+    return _localize
+
+
+def _row_converter(
+    plans: Sequence[ColumnPlan], tz: dt.tzinfo
+) -> Callable[[Sequence[Any]], list[Any]]:
+    """Return a function mapping one source row to COPY-ready values."""
+    localize = _localizer(tz)
+    fns: list[Callable[[Any], Any] | None] = [
+        localize if p.copy_type == "timestamptz" else p.convert for p in plans
+    ]
+
+    def _convert(row: Sequence[Any]) -> list[Any]:
+        return [v if v is None or fn is None else fn(v) for v, fn in zip(row, fns, strict=True)]
+
+    return _convert
+
+
+def column_defs(plans: Sequence[ColumnPlan], *, constraints: bool = True) -> list[psql.Composable]:
+    """``<name> <pg_type> [DEFAULT ..] [NOT NULL]`` per planned column, ready for DDL.
+
+    ``constraints=False`` leaves out the default and ``NOT NULL`` (staging
+    tables that only hold rows on their way elsewhere).
+    """
+    defs: list[psql.Composable] = []
+    for p in plans:
+        # `pg_type` is assembled in plan_column from the fixed type names above
+        # plus integer typmods, never from source text; cast documents that.
+        parts: list[psql.Composable] = [
+            psql.Identifier(p.name),
+            psql.SQL(cast(LiteralString, p.pg_type)),
+        ]
+        if constraints and p.default is not None:
+            parts += [psql.SQL("DEFAULT"), p.default]
+        if constraints and p.not_null:
+            parts.append(psql.SQL("NOT NULL"))
+        defs.append(psql.SQL(" ").join(parts))
+    return defs
+
+
+def create_table_sql(
+    table: str, plans: Sequence[ColumnPlan], *, unlogged: bool = False
+) -> psql.Composed:
+    """``CREATE [UNLOGGED] TABLE mysql_raw.<t>`` with the mapped columns plus ``_loaded_at``."""
+    cols = column_defs(plans)
+    cols.append(psql.SQL("_loaded_at timestamptz NOT NULL DEFAULT now()"))
+    create = "CREATE UNLOGGED TABLE {} ({})" if unlogged else "CREATE TABLE {} ({})"
+    return psql.SQL(create).format(
+        psql.Identifier("mysql_raw", table.lower()), psql.SQL(", ").join(cols)
+    )
+
+
+def index_sql(table: str, indexes: dict[str, SourceIndex]) -> list[psql.Composed]:
+    """Re-create the source's primary key and secondary indexes on the landed table.
+
+    An index with an expression key part is skipped (its expression is not in
+    the catalog rows read here); a prefix key part is indexed on the whole
+    column. Both are logged so the difference from the source is visible.
+    """
+    tbl = psql.Identifier("mysql_raw", table.lower())
+    out: list[psql.Composed] = []
+    for name, idx in sorted(indexes.items()):
+        if any(c is None for c in idx.columns):
+            log(f"WARNING: {table}: skipping expression index {name!r} (not re-created)")
+            continue
+        if idx.prefixed:
+            log(
+                f"WARNING: {table}: index {name!r} is a prefix index on "
+                f"{', '.join(idx.prefixed)}; re-creating it on the full column(s)"
+            )
+        col_list = psql.SQL(", ").join(psql.Identifier(str(c).lower()) for c in idx.columns)
+        if name == "PRIMARY":
+            out.append(psql.SQL("ALTER TABLE {} ADD PRIMARY KEY ({})").format(tbl, col_list))
+        else:
+            kind = psql.SQL("UNIQUE INDEX" if idx.unique else "INDEX")
+            out.append(psql.SQL("CREATE {} ON {} ({})").format(kind, tbl, col_list))
+    return out
+
+
+def source_indexes(
+    index_rows: Sequence[Sequence[Any]], tables: set[str]
+) -> dict[str, dict[str, SourceIndex]]:
+    """Group ``SOURCE_INDEXES_SQL`` rows into ``{table: {index: SourceIndex}}`` for ``tables``."""
+    indexes: dict[str, dict[str, SourceIndex]] = defaultdict(dict)
+    for t, index_name, non_unique, column, sub_part in index_rows:
+        if str(t) in tables:
+            idx = indexes[str(t)].setdefault(str(index_name), SourceIndex(not int(non_unique)))
+            idx.columns.append(None if column is None else str(column))
+            if column is not None and sub_part is not None:
+                idx.prefixed.append(str(column))
+    return indexes
+
+
+def copy_rows(
+    cur: Any,
+    table: str,
+    plans: Sequence[ColumnPlan],
+    batches: Iterator[Sequence[Sequence[Any]]],
+    tz: dt.tzinfo,
+    *,
+    schema: str = "mysql_raw",
+) -> int:
+    """Stream ``batches`` into ``<schema>.<table>`` with binary COPY; return rows written."""
+    stmt = psql.SQL("COPY {} ({}) FROM STDIN (FORMAT binary)").format(
+        psql.Identifier(schema, table.lower()),
+        psql.SQL(", ").join(psql.Identifier(p.name) for p in plans),
+    )
+    convert = _row_converter(plans, tz)
+    rows = 0
+    with cur.copy(stmt) as cp:
+        cp.set_types([p.copy_type for p in plans])
+        for batch in batches:
+            for row in batch:
+                cp.write_row(convert(row))
+            rows += len(batch)
+    return rows
+
+
+def source_columns(
+    column_rows: Sequence[Sequence[Any]], tables: set[str]
+) -> dict[str, list[SourceColumn]]:
+    """Group ``SOURCE_COLUMNS_SQL`` rows into :class:`SourceColumn` lists for ``tables``.
+
+    Dies on a column name outside the safe identifier charset, since names
+    are spliced into the MySQL ``SELECT``.
+    """
+    columns: dict[str, list[SourceColumn]] = defaultdict(list)
+    for row in column_rows:
+        t, name, data_type, column_type, char_len, prec, scale, nullable, default, extra = row
+        if str(t) in tables:
+            if not is_safe_identifier(str(name)):
+                die(f"refusing to copy-load unexpected column name {t}.{name!r}")
+            extra = str(extra or "").upper()
+            columns[str(t)].append(
+                SourceColumn(
+                    str(name),
+                    str(data_type),
+                    str(column_type),
+                    int(char_len) if char_len is not None else None,
+                    int(prec) if prec is not None else None,
+                    int(scale) if scale is not None else None,
+                    nullable=str(nullable).upper() != "NO",
+                    default=None if default is None else str(default),
+                    default_is_expression="DEFAULT_GENERATED" in extra
+                    or str(default).upper().startswith("CURRENT_TIMESTAMP"),
+                )
+            )
+    return columns
+
+
+@dataclass
+class TableLoad:
+    """Outcome of loading one table."""
+
+    table: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _load_table(
+    env: Env,
+    table: str,
+    columns: list[SourceColumn],
+    indexes: dict[str, SourceIndex],
+    rules: Sequence[CastRule],
+    tz: dt.tzinfo,
+) -> TableLoad:
+    """Drop, re-create, COPY and index one table in a single transaction."""
+    result = TableLoad(table)
+    start = time.perf_counter()
+    try:
+        plans = [plan_column(c, rules) for c in columns]
+        select = f"SELECT {', '.join(p.select_expr for p in plans)} FROM `{table}`"
+        with (
+            duck_connection(env, "src") as con,
+            pg_connection(env) as conn,
+            conn.transaction(),
+            conn.cursor() as cur,
+        ):
+            cur.execute(
+                psql.SQL("DROP TABLE IF EXISTS {}").format(
+                    psql.Identifier("mysql_raw", table.lower())
+                )
+            )
+            cur.execute(create_table_sql(table, plans, unlogged=env.unlogged_build))
+            batches = mysql_batches(con, select, COPY_BATCH_ROWS)
+            result.rows = copy_rows(cur, table, plans, batches, tz)
+            for stmt in index_sql(table, indexes):
+                cur.execute(stmt)
+    except Exception as e:
+        result.error = str(e).splitlines()[0] if str(e) else type(e).__name__
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _write_report(results: list[TableLoad]) -> Path:
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RUNS_DIR / f"copy_load_{file_stamp()}.csv"
+    with out.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["table", "rows", "seconds", "rows_per_s", "error"])
+        for r in results:
+            w.writerow([r.table, r.rows, f"{r.seconds:.3f}", f"{r.rows_per_s:.0f}", r.error or ""])
+    return out
+
+
+def run_copy_load(env: Env, parallel: int) -> None:
+    """Load every non-dropped source table into ``mysql_raw`` with binary COPY.
+
+    Dies (after every table has been attempted) if any table failed, so
+    the caller marks the ``load_full`` gate only on a complete load.
+    """
+    rules = parse_cast_rules()
+    drop = {d.lower() for d in read_drop_list()}
+    try:
+        with duck_connection(env, "src") as con:
+            _, table_rows = mysql_query(con, _SOURCE_TABLES_SQL)
+            _, column_rows = mysql_query(con, SOURCE_COLUMNS_SQL)
+            _, index_rows = mysql_query(con, SOURCE_INDEXES_SQL)
+    except Exception as e:
+        die(f"could not read the MySQL source catalog via DuckDB: {e}")
+
+    sizes: dict[str, int] = {}
+    for name, est in table_rows:
+        name = str(name)
+        if name.lower() in drop:
+            continue
+        if not is_safe_identifier(name):
+            die(f"refusing to copy-load unexpected table name {name!r}")
+        sizes[name] = int(est or 0)
+    columns = source_columns(column_rows, set(sizes))
+    indexes = source_indexes(index_rows, set(sizes))
+
+    tz = ZoneInfo(str(psql_query(env, "SHOW TimeZone")[0][0]))
+    tables = sorted(sizes, key=lambda t: (-sizes[t], t))
+    log(f"copy engine: {len(tables)} table(s), {parallel} at a time")
+    results: list[TableLoad] = []
+    with (
+        progress_for(len(tables), "copy load") as p,
+        ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="copy") as pool,
+    ):
+        futures = [
+            pool.submit(_load_table, env, t, columns[t], indexes.get(t, {}), rules, tz)
+            for t in tables
+        ]
+        for fut in as_completed(futures):
+            r = fut.result()
+            p.step(r.table)
+            if r.error:
+                log(f"  FAILED: {r.table}: {r.error}")
+            else:
+                log(
+                    f"  {r.table}: {r.rows} row(s) in {r.seconds:.1f}s ({r.rows_per_s:,.0f} rows/s)"
+                )
+            results.append(r)
+
+    results.sort(key=lambda r: r.table)
+    out = _write_report(results)
+    total_rows = sum(r.rows for r in results)
+    log(f"wrote {rel(out)} ({total_rows} row(s) across {len(results)} table(s))")
+    failed = [r.table for r in results if r.error]
+    if failed:
+        die(f"copy load failed for {len(failed)} table(s): {', '.join(failed)}; see {rel(out)}")
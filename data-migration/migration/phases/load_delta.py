@@ -5,14 +5,33 @@ every table named in pgloader/delta_tables.tsv with TRUNCATE FIRST, so
 mysql_raw is the post-freeze snapshot. There is no per-row WHERE cutoff
 because the freeze itself is the cutoff; if writes are not actually
 paused the operator should hold (see the `delta` gate in the runbook).
+
+``--incremental`` instead treats each manifest row's ``updated_col`` as a
+high-water mark: only source rows at or past the mark, or with no mark
+value at all, are fetched (over the copy engine's DuckDB + binary COPY
+path) and upserted into mysql_raw by primary key, and the new mark is
+recorded per table, typed, in ``mysql_raw._delta_log.high_water``. A
+``creatd_dt``-style mark only sees inserts, so such manifest rows are
+refused unless the caller opts in. Rows deleted in MySQL since the full
+load are *not* removed in this mode.
 """
 
 from __future__ import annotations
 
 import csv
+import datetime as dt
+import json
 import re
+import time
+from dataclasses import dataclass
+from decimal import Decimal
 from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from psycopg import sql as psql
 
+from migration.duck import duck_connection, mysql_batches, mysql_query
 from migration.lib import (
     PGLOADER_DIR,
     RUNS_DIR,
@@ -23,17 +42,36 @@ from migration.lib import (
     die,
     excluding_block,
     file_stamp,
+    is_safe_identifier,
     log,
+    pg_connection,
     pgloader_argv,
     phase,
+    progress_for,
+    psql_command,
+    psql_query,
     rel,
     render_template,
     require_pgloader,
     run,
 )
+from migration.phases.load_copy import (
+    COPY_BATCH_ROWS,
+    SOURCE_COLUMNS_SQL,
+    ColumnPlan,
+    column_defs,
+    copy_rows,
+    parse_cast_rules,
+    plan_column,
+    source_columns,
+)
+from migration.phases.raw_indexes import run_raw_indexes
+from migration.phases.unlogged import set_unlogged, wal_meter
 
 DELTA_TABLES_TSV = PGLOADER_DIR / "delta_tables.tsv"
 _FREEZE_INSTANT_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+# Creation-time columns (the source's creatd_dt): they never move on an in-place update.
+_INSERT_ONLY_MARK_RE = re.compile(r"^creat", re.IGNORECASE)
 
 
 def _validate_freeze_instant(s: str) -> str:
@@ -51,20 +89,25 @@ def _validate_freeze_instant(s: str) -> str:
     return s
 
 
-def _read_delta_tables(path: Path = DELTA_TABLES_TSV) -> list[str]:
-    """Return table names from the TSV manifest; empty list if missing."""
+def _read_delta_manifest(path: Path = DELTA_TABLES_TSV) -> list[tuple[str, str]]:
+    """Return ``(table_name, updated_col)`` pairs from the TSV manifest; empty if missing."""
     if not path.exists():
         log(f"no delta manifest at {path}; nothing to delta-load")
         return []
-    names: list[str] = []
+    entries: list[tuple[str, str]] = []
     with path.open(encoding="utf-8") as f:
         reader = csv.DictReader(f, delimiter="\t")
         for row in reader:
             tbl = row["table_name"].strip()
             if not tbl or tbl.startswith("#"):
                 continue
-            names.append(tbl)
-    return names
+            entries.append((tbl, (row.get("updated_col") or "").strip()))
+    return entries
+
+
+def _read_delta_tables(path: Path = DELTA_TABLES_TSV) -> list[str]:
+    """Return table names from the TSV manifest; empty list if missing."""
+    return [tbl for tbl, _ in _read_delta_manifest(path)]
 
 
 def _build_tables_block(table_names: list[str]) -> str:
@@ -80,8 +123,315 @@ def _build_tables_block(table_names: list[str]) -> str:
     return f"INCLUDING ONLY TABLE NAMES MATCHING {quoted}"
 
 
+@dataclass(frozen=True)
+class HighWater:
+    """A typed high-water mark, as recorded in ``_delta_log.high_water``.
+
+    ``value`` is the mark's canonical text (ISO 8601 for dates and
+    datetimes) and ``kind`` says how to read it back: ``datetime``,
+    ``date``, ``integer``, ``decimal`` or ``text``.
+    """
+
+    kind: str
+    value: str
+
+
+def _high_water(value: Any, tz: dt.tzinfo) -> HighWater:
+    """Type a mark read back from Postgres.
+
+    ``timestamptz`` marks are shifted into the session time zone the load
+    localized naive MySQL datetimes with, then made naive again, so the
+    comparison happens in MySQL's own terms.
+    """
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(tz).replace(tzinfo=None)
+        return HighWater("datetime", value.isoformat())
+    if isinstance(value, dt.date):
+        return HighWater("date", value.isoformat())
+    if isinstance(value, bool | int):
+        return HighWater("integer", str(int(value)))
+    if isinstance(value, Decimal | float):
+        return HighWater("decimal", str(value))
+    return HighWater("text", str(value))
+
+
+def _mark_value(mark: HighWater) -> Any:
+    """Decode a mark back to the Python value it was taken from; dies on a malformed one."""
+    parse: dict[str, Any] = {
+        "datetime": dt.datetime.fromisoformat,
+        "date": dt.date.fromisoformat,
+        "integer": int,
+        "decimal": Decimal,
+        "text": str,
+    }
+    try:
+        value = parse[mark.kind](mark.value)
+    except (KeyError, ArithmeticError, ValueError):
+        die(f"malformed high-water mark in _delta_log: {mark!r}")
+    if isinstance(value, Decimal) and not value.is_finite():
+        die(f"malformed high-water mark in _delta_log: {mark!r}")
+    return value
+
+
+def _mark_predicate(column: str, mark: HighWater | None) -> str:
+    """The MySQL ``WHERE`` for rows at/after ``mark`` or with no mark value.
+
+    ``mysql_query`` passes its text through to MySQL and takes no bind
+    parameters, so the mark is bound here from its decoded value --
+    datetimes, dates and numbers are re-rendered from the parsed object,
+    never from the stored text -- and only ``text`` marks need escaping.
+    """
+    if mark is None:
+        return ""
+    value = _mark_value(mark)
+    if isinstance(value, dt.datetime):
+        bound = f"'{value.isoformat(sep=' ')}'"
+    elif isinstance(value, dt.date):
+        bound = f"'{value.isoformat()}'"
+    elif isinstance(value, int | Decimal):
+        bound = str(value)
+    else:
+        bound = "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+    return f" WHERE (`{column}` >= {bound} OR `{column}` IS NULL)"
+
+
+def _recorded_mark(env: Env, table: str) -> HighWater | None:
+    """Return the mark the current cutover's ``_delta_log`` row holds for ``table``.
+
+    An entry whose ``value`` is null (the table was empty, or its mark
+    column all NULL, when it was last pulled) holds no mark.
+    """
+    rows = psql_query(
+        env,
+        "SELECT high_water -> %s FROM mysql_raw._delta_log ORDER BY id DESC LIMIT 1",
+        [table],
+    )
+    entry = rows[0][0] if rows else None
+    if not entry:
+        return None
+    if "type" not in entry or "value" not in entry:
+        die(f"malformed high-water mark in _delta_log for {table}: {entry!r}")
+    if entry["value"] is None:
+        return None
+    return HighWater(str(entry["type"]), str(entry["value"]))
+
+
+def _baseline_mark(env: Env, table: str, column: str, tz: dt.tzinfo) -> HighWater | None:
+    """Derive a first mark from what the full load landed: ``max(<column>)`` in mysql_raw."""
+    query = psql.SQL("SELECT max({}) FROM {}").format(
+        psql.Identifier(column.lower()), psql.Identifier("mysql_raw", table.lower())
+    )
+    rows = psql_query(env, query.as_string())
+    value = rows[0][0] if rows else None
+    return None if value is None else _high_water(value, tz)
+
+
+def _primary_key(env: Env, table: str) -> list[str]:
+    """Return the primary-key columns of ``mysql_raw.<table>`` in key order."""
+    rows = psql_query(
+        env,
+        "SELECT a.attname FROM pg_index i "
+        "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+        "WHERE i.indrelid = to_regclass(%s) AND i.indisprimary "
+        "ORDER BY array_position(i.indkey::int2[], a.attnum)",
+        [f"mysql_raw.{table.lower()}"],
+    )
+    return [str(r[0]) for r in rows]
+
+
+@dataclass
+class TableDelta:
+    """Outcome of one table's incremental delta."""
+
+    table: str
+    column: str
+    mark_from: HighWater | None = None
+    mark_to: HighWater | None = None
+    fetched: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+
+def _upsert_sql(table: str, stage: str, plans: list[ColumnPlan], pk: list[str]) -> psql.Composed:
+    """``INSERT ... SELECT FROM <stage> ON CONFLICT (<pk>) DO UPDATE`` for one table.
+
+    Every non-key column is overwritten, and ``_loaded_at`` is bumped so
+    the re-pulled rows are distinguishable from the full load's.
+    """
+    cols = psql.SQL(", ").join(psql.Identifier(p.name) for p in plans)
+    sets: list[psql.Composable] = [
+        psql.SQL("{0} = EXCLUDED.{0}").format(psql.Identifier(p.name))
+        for p in plans
+        if p.name not in pk
+    ]
+    sets.append(psql.SQL("_loaded_at = now()"))
+    return psql.SQL(
+        "INSERT INTO {tbl} ({cols}) SELECT {cols} FROM {stage} "
+        "ON CONFLICT ({pk}) DO UPDATE SET {sets}"
+    ).format(
+        tbl=psql.Identifier("mysql_raw", table.lower()),
+        cols=cols,
+        stage=psql.Identifier("pg_temp", stage),
+        pk=psql.SQL(", ").join(psql.Identifier(c) for c in pk),
+        sets=psql.SQL(", ").join(sets),
+    )
+
+
+def _delta_table(
+    env: Env, con: Any, table: str, column: str, plans: list[ColumnPlan], tz: dt.tzinfo
+) -> TableDelta:
+    """Fetch ``table``'s rows at/after its mark, upsert them, and record the new mark.
+
+    The boundary uses ``>=``: rows sharing the old mark are re-fetched
+    rather than risk missing a same-second update, and rows whose mark
+    column is NULL are re-fetched every run since no mark can pass them;
+    the upsert makes both idempotent. Stage, upsert and ``_delta_log``
+    update share one transaction, so a failure leaves the previous mark in
+    place.
+    """
+    result = TableDelta(table, column)
+    start = time.perf_counter()
+    pk = _primary_key(env, table)
+    if not pk:
+        die(f"mysql_raw.{table.lower()} has no primary key; it cannot be upserted incrementally")
+    if column.lower() not in {p.name for p in plans}:
+        die(f"delta manifest: {table} has no column {column!r} to use as a high-water mark")
+    result.mark_from = _recorded_mark(env, table) or _baseline_mark(env, table, column, tz)
+    where = _mark_predicate(column, result.mark_from)
+    select = f"SELECT {', '.join(p.select_expr for p in plans)} FROM `{table}`{where}"
+    _, count_rows = mysql_query(con, f"SELECT COUNT(*) FROM `{table}`")
+    total = int(count_rows[0][0])
+
+    stage = f"_delta_{table.lower()}"
+    with pg_connection(env) as conn, conn.transaction(), conn.cursor() as cur:
+        cur.execute(
+            psql.SQL("CREATE TEMP TABLE {} ({}) ON COMMIT DROP").format(
+                psql.Identifier(stage),
+                psql.SQL(", ").join(column_defs(plans, constraints=False)),
+            )
+        )
+        result.fetched = copy_rows(
+            cur, stage, plans, mysql_batches(con, select, COPY_BATCH_ROWS), tz, schema="pg_temp"
+        )
+        cur.execute(_upsert_sql(table, stage, plans, pk))
+        cur.execute(
+            psql.SQL("SELECT max({}) FROM {}").format(
+                psql.Identifier(column.lower()), psql.Identifier("pg_temp", stage)
+            )
+        )
+        newest = cur.fetchone()
+        result.mark_to = (
+            _high_water(newest[0], tz) if newest and newest[0] is not None else result.mark_from
+        )
+        result.skipped = max(total - result.fetched, 0)
+        cur.execute(
+            "UPDATE mysql_raw._delta_log "
+            "SET high_water = high_water || jsonb_build_object(%s::text, %s::jsonb) "
+            "WHERE id = (SELECT max(id) FROM mysql_raw._delta_log)",
+            [
+                table,
+                json.dumps(
+                    {
+                        "column": column,
+                        "type": result.mark_to.kind if result.mark_to else None,
+                        "value": result.mark_to.value if result.mark_to else None,
+                        "fetched": result.fetched,
+                        "skipped": result.skipped,
+                    }
+                ),
+            ],
+        )
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _write_incremental_report(results: list[TableDelta]) -> Path:
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RUNS_DIR / f"delta_incremental_{file_stamp()}.csv"
+    with out.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["table", "column", "mark_from", "mark_to", "fetched", "skipped", "seconds"])
+        for r in results:
+            w.writerow(
+                [
+                    r.table,
+                    r.column,
+                    r.mark_from.value if r.mark_from else "",
+                    r.mark_to.value if r.mark_to else "",
+                    r.fetched,
+                    r.skipped,
+                    f"{r.seconds:.3f}",
+                ]
+            )
+    return out
+
+
+def _run_incremental(env: Env, freeze_instant: str, allow_insert_only: bool = False) -> None:
+    """Upsert each manifest table's rows past its high-water mark into ``mysql_raw``.
+
+    Dies before fetching anything if a manifest mark is a creation-time
+    column (rows updated in place would be missed) unless
+    ``allow_insert_only``.
+    """
+    if not env.mysql_url:
+        die("MYSQL_URL is not set; point it at the source MySQL before loading")
+    manifest = _read_delta_manifest(DELTA_TABLES_TSV)
+    if not manifest:
+        die(
+            f"--incremental needs a curated manifest with an updated_col per table "
+            f"({rel(DELTA_TABLES_TSV)})"
+        )
+    for table, column in manifest:
+        if not (is_safe_identifier(table) and is_safe_identifier(column)):
+            die(f"delta manifest: unsafe table/column {table!r}/{column!r}")
+    insert_only = [f"{t}.{c}" for t, c in manifest if _INSERT_ONLY_MARK_RE.match(c)]
+    if insert_only and not allow_insert_only:
+        die(
+            f"--incremental: {len(insert_only)} manifest mark(s) only move on insert "
+            f"({', '.join(insert_only)}), so in-place updates there would be missed; "
+            "pass --allow-insert-only-marks to accept that, or run the pgloader delta"
+        )
+    for mark in insert_only:
+        log(f"WARNING: {mark} is an insert-only mark; in-place updates are not fetched")
+
+    rules = parse_cast_rules()
+    tz = ZoneInfo(str(psql_query(env, "SHOW TimeZone")[0][0]))
+    results: list[TableDelta] = []
+    with duck_connection(env, "src") as con:
+        _, column_rows = mysql_query(con, SOURCE_COLUMNS_SQL)
+        columns = source_columns(column_rows, {t for t, _ in manifest})
+        with progress_for(len(manifest), "delta tables") as p:
+            for table, column in manifest:
+                if table not in columns:
+                    die(f"delta manifest: {table} is not a MySQL table")
+                plans = [plan_column(c, rules) for c in columns[table]]
+                r = _delta_table(env, con, table, column, plans, tz)
+                since = r.mark_from.value if r.mark_from else "beginning"
+                log(
+                    f"{table}: fetched {r.fetched}, skipped {r.skipped} "
+                    f"({column} >= {since} or NULL) in {r.seconds:.1f}s"
+                )
+                results.append(r)
+                p.step(table)
+
+    psql_command(
+        env,
+        "UPDATE mysql_raw._delta_log SET delta_applied_at = now(), "
+        "freeze_instant = %s::timestamptz "
+        "WHERE id = (SELECT max(id) FROM mysql_raw._delta_log);",
+        [freeze_instant],
+    )
+    report = _write_incremental_report(results)
+    fetched = sum(r.fetched for r in results)
+    skipped = sum(r.skipped for r in results)
+    log(f"incremental delta: fetched {fetched} row(s), skipped {skipped}; report: {rel(report)}")
+
+
 @phase("delta", requires="freeze")
-def run_load_delta() -> None:
+def run_load_delta(
+    incremental: bool = False, raw_indexes: bool = True, allow_insert_only_marks: bool = False
+) -> None:
     """Run P2: pgloader delta load from the frozen MySQL into ``mysql_raw``.
 
     Requires the ``freeze`` gate. Reads the validated freeze instant
@@ -89,15 +439,40 @@ def run_load_delta() -> None:
     the connection strings and table manifest, invokes pgloader with
     output streamed to ``reports/runs/pgloader_delta_<stamp>.log``, and marks
     the ``delta`` gate.
+
+    ``incremental=True`` skips pgloader: each manifest table is upserted
+    from its high-water mark (see :func:`_delta_table`) and per-table
+    fetched/skipped counts go to the log and
+    ``reports/runs/delta_incremental_<stamp>.csv``. Manifest marks that
+    only move on insert are refused unless ``allow_insert_only_marks``.
+
+    Either way the load ends with
+    :func:`migration.phases.raw_indexes.run_raw_indexes` unless
+    ``raw_indexes=False``. With ``UNLOGGED_BUILD`` any still-logged
+    ``mysql_raw`` table is set UNLOGGED first and the delta's WAL is metered
+    (see :mod:`migration.phases.unlogged`).
     """
     env = Env.load()
-    require_pgloader(env)
+    if not incremental:
+        require_pgloader(env)
 
     freeze_file = STATE_DIR / "freeze_instant.txt"
     if not freeze_file.exists():
         die("no freeze_instant.txt; run freeze first")
     freeze_instant = _validate_freeze_instant(freeze_file.read_text(encoding="utf-8").strip())
+    if env.unlogged_build:
+        set_unlogged(env, "mysql_raw")
+    with wal_meter(env, "delta"):
+        if incremental:
+            _run_incremental(env, freeze_instant, allow_insert_only_marks)
+        else:
+            _run_pgloader_delta(env, freeze_instant)
+    if raw_indexes:
+        run_raw_indexes(env)
+
 
+def _run_pgloader_delta(env: Env, freeze_instant: str) -> None:
+    """Render ``delta.tmpl.load`` and run pgloader; dies unless its log is clean."""
     template = PGLOADER_DIR / "delta.tmpl.load"
     if not template.exists():
         die(f"missing {template}")
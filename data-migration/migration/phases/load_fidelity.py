@@ -22,14 +22,15 @@ mismatch (useful in CI against a frozen fixture).
 from __future__ import annotations
 
 import json
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import Any
 from urllib.parse import urlparse
 
-if TYPE_CHECKING:
-    import duckdb
-
+from migration.duck import duck_connection, mysql_query
 from migration.lib import (
     REPORTS_DIR,
     RUNS_DIR,
@@ -37,12 +38,12 @@ from migration.lib import (
     Env,
     die,
     file_stamp,
+    is_safe_identifier,
     log,
     read_drop_list,
     rel,
     ts,
 )
-from migration.phases.schema_snapshot import _mysql_attach_dsn, _passthrough
 
 # Source base-table inventory (scoped to the attached database via DATABASE()).
 _SOURCE_TABLES_SQL = (
@@ -51,53 +52,55 @@ _SOURCE_TABLES_SQL = (
     "ORDER BY table_name"
 )
 
-_SAFE_IDENTIFIER_CHARS = set(
-    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_" # pragma: allowlist secret
+# --fast triage: catalog row estimates per source table / mysql_raw table.
+# raw_indexes ANALYZEs mysql_raw after every load, so reltuples is fresh there;
+# InnoDB's TABLE_ROWS is a sampled estimate, hence the tolerance.
+_SOURCE_ESTIMATES_SQL = (
+    "SELECT table_name, table_rows FROM information_schema.tables "
+    "WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE'"
 )
+_RAW_ESTIMATES_SQL = (
+    "SELECT c.relname, c.reltuples::bigint FROM pg_class c "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "WHERE n.nspname = 'mysql_raw' AND c.relkind IN ('r', 'p')"
+)
+_FAST_TOLERANCE = 0.10
 
-
-def _is_safe_identifier(name: str) -> bool:
-    """True when ``name`` is a bare identifier safe to inline into SQL."""
-    return bool(name) and all(c in _SAFE_IDENTIFIER_CHARS for c in name)
-
-
-def _scalar_int(con: duckdb.DuckDBPyConnection, sql: str) -> int:
-    """Run ``sql`` (which already yields a single aggregate row) and return its
-    first column as an int; 0 when the result set is empty.
-
-    Reads the value the query computed. It must NOT wrap ``sql`` in another
-    ``count(*)`` -- that counts the single aggregate row (always 1) instead of
-    returning the aggregate, which was the original load-fidelity bug.
-    """
-    con.execute(sql)
-    rows = con.fetchall()
-    if not rows or rows[0][0] is None:
-        return 0
-    return int(rows[0][0])
+# Tables per UNION ALL count query: a handful of round trips per side instead
+# of one per table, with each statement still a reasonable size.
+_COUNT_BATCH = 50
 
 
 @dataclass(frozen=True)
 class CountRow:
-    """Per-table row-count comparison between the source and ``mysql_raw``."""
+    """Per-table row-count comparison between the source and ``mysql_raw``.
+
+    ``estimated`` rows (``--fast``) carry catalog estimates that agreed
+    within tolerance. They are unverified, not matching: an estimate cannot
+    tell a faithful load from one that lost a few percent of its rows.
+    """
 
     table: str
     source_count: int
     raw_count: int
+    estimated: bool = False
 
     @property
     def matches(self) -> bool:
-        return self.source_count == self.raw_count
+        return not self.estimated and self.source_count == self.raw_count
 
 
 def summarize_load_fidelity(rows: list[CountRow]) -> list[str]:
-    """Render mismatching :class:`CountRow`s as human messages (empty == clean).
+    """Render mismatching :class:`CountRow`s as human messages (empty == no mismatch).
 
-    Pure function over already-collected counts so the pass/fail logic is
-    unit-testable without a live MySQL or Postgres.
+    Estimated rows are unverified rather than mismatching and are left out;
+    :func:`run_load_fidelity` reports them separately. Pure function over
+    already-collected counts so the pass/fail logic is unit-testable without
+    a live MySQL or Postgres.
     """
     issues: list[str] = []
     for r in rows:
-        if not r.matches:
+        if not r.estimated and not r.matches:
             issues.append(
                 f"{r.table}: source={r.source_count} mysql_raw={r.raw_count} "
                 f"(delta {r.raw_count - r.source_count:+d})"
@@ -113,52 +116,167 @@ def _freeze_instant() -> str | None:
     return p.read_text(encoding="utf-8").strip() or None
 
 
-def _collect_counts(env: Env, tables: list[str]) -> list[CountRow]:
-    """Attach MySQL + Postgres READ_ONLY via DuckDB and count each table.
+def _union_count_sql(tables: Sequence[str], quote: Callable[[str], str]) -> str:
+    """One ``UNION ALL`` query yielding ``(table, count)`` per (safe) table name."""
+    return " UNION ALL ".join(f"SELECT '{t}' AS t, COUNT(*) AS n FROM {quote(t)}" for t in tables)
+
+
+def _count_batched(
+    run: Callable[[str], list[tuple[Any, ...]]], tables: Sequence[str], quote: Callable[[str], str]
+) -> dict[str, int]:
+    """Exact counts for ``tables``, :data:`_COUNT_BATCH` tables per query.
+
+    A failing batch is retried one table at a time, so a single unreadable
+    table records -1 instead of sinking its neighbours.
+    """
+    counts: dict[str, int] = {}
+    for i in range(0, len(tables), _COUNT_BATCH):
+        batch = tables[i : i + _COUNT_BATCH]
+        try:
+            counts.update((str(t), int(n)) for t, n in run(_union_count_sql(batch, quote)))
+        except Exception as e:
+            if len(batch) > 1:
+                for table in batch:
+                    counts.update(_count_batched(run, [table], quote))
+                continue
+            log(f"WARNING: {batch[0]} unreadable ({str(e).splitlines()[0]}); recording as -1")
+            counts[batch[0]] = -1
+    return counts
+
+
+def _source_runner(con: Any) -> Callable[[str], list[tuple[Any, ...]]]:
+    return lambda mysql_sql: mysql_query(con, mysql_sql)[1]
+
+
+def _raw_runner(con: Any) -> Callable[[str], list[tuple[Any, ...]]]:
+    def run(pg_sql: str) -> list[tuple[Any, ...]]:
+        escaped = pg_sql.replace("'", "''")
+        return con.execute(f"SELECT * FROM postgres_query('pg', '{escaped}')").fetchall()
+
+    return run
+
+
+def _mysql_ident(table: str) -> str:
+    return f"`{table}`"
+
+
+def _raw_ident(table: str) -> str:
+    return f'mysql_raw."{table}"'
+
+
+def _count_source(env: Env, tables: Sequence[str]) -> dict[str, int]:
+    with duck_connection(env, "src") as con:
+        return _count_batched(_source_runner(con), tables, _mysql_ident)
+
+
+def _count_raw(env: Env, tables: Sequence[str]) -> dict[str, int]:
+    """Exact ``mysql_raw`` counts; a table missing there records -1 without a query."""
+    with duck_connection(env, "pg") as con:
+        run = _raw_runner(con)
+        present = {str(r[0]) for r in run(_RAW_ESTIMATES_SQL)}
+        counts = _count_batched(run, [t for t in tables if t in present], _raw_ident)
+    for table in tables:
+        if table not in present:
+            log(f"WARNING: mysql_raw.{table} does not exist; recording as -1")
+            counts[table] = -1
+    return counts
+
+
+def _estimates(env: Env, alias: str, sql: str) -> dict[str, int]:
+    with duck_connection(env, alias) as con:
+        run = _source_runner(con) if alias == "src" else _raw_runner(con)
+        return {str(t): -1 if n is None else int(n) for t, n in run(sql)}
+
+
+def _both_sides(
+    source: Callable[[], dict[str, int]], raw: Callable[[], dict[str, int]]
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Run the MySQL and Postgres halves of a probe concurrently."""
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="fidelity") as pool:
+        src, dst = pool.submit(source), pool.submit(raw)
+        return src.result(), dst.result()
+
+
+def needs_exact_count(source_est: int, raw_est: int, tolerance: float = _FAST_TOLERANCE) -> bool:
+    """True unless both estimates are known and agree within ``tolerance`` (a fraction).
+
+    ``-1`` is an unknown estimate: MySQL reported NULL, or Postgres has
+    never analyzed the table (``reltuples = -1``).
+    """
+    if source_est < 0 or raw_est < 0:
+        return True
+    return abs(source_est - raw_est) > tolerance * max(source_est, raw_est)
+
+
+def _collect_counts(env: Env, tables: list[str], *, fast: bool = False) -> list[CountRow]:
+    """Count each table on both sides through the session's ``src`` + ``pg`` catalogs.
+
+    The MySQL and ``mysql_raw`` sides run concurrently, each as a few
+    batched ``UNION ALL`` queries. With ``fast`` the catalog estimates
+    (``information_schema.TABLES.TABLE_ROWS`` vs ``pg_class.reltuples``) are
+    read first and only the tables whose estimates disagree (see
+    :func:`needs_exact_count`) are counted exactly; the rest are reported as
+    estimated.
 
     Live-only (needs a reachable MySQL source and Postgres ``mysql_raw``);
     exercised in the integration tier, not the unit suite.
     """
-    import duckdb
-
-    con = duckdb.connect()
+    safe = []
+    for table in tables:
+        if is_safe_identifier(table):
+            safe.append(table)
+        else:
+            log(f"WARNING: skipping unsafe table name: {table!r}")
+
+    estimated: dict[str, tuple[int, int]] = {}
+    exact = safe
+    if fast:
+        src_est, raw_est = _both_sides(
+            lambda: _estimates(env, "src", _SOURCE_ESTIMATES_SQL),
+            lambda: _estimates(env, "pg", _RAW_ESTIMATES_SQL),
+        )
+        exact = []
+        for table in safe:
+            pair = (src_est.get(table, -1), raw_est.get(table, -1))
+            if needs_exact_count(*pair):
+                exact.append(table)
+            else:
+                estimated[table] = pair
+        log(
+            f"load-fidelity --fast: {len(estimated)} table(s) agree by estimate; "
+            f"counting {len(exact)} exactly"
+        )
+
+    src_counts, raw_counts = _both_sides(
+        lambda: _count_source(env, exact) if exact else {},
+        lambda: _count_raw(env, exact) if exact else {},
+    )
     out: list[CountRow] = []
-    try:
-        con.execute("INSTALL mysql_scanner; LOAD mysql_scanner;")
-        con.execute("INSTALL postgres_scanner; LOAD postgres_scanner;")
-        mysql_dsn = _mysql_attach_dsn(env.mysql_url, env.mysql_db).replace("'", "''")
-        pg_dsn = env.pg_dsn().replace("'", "''")
-        con.execute(f"ATTACH '{mysql_dsn}' AS src (TYPE mysql, READ_ONLY)")
-        con.execute(f"ATTACH '{pg_dsn}' AS pg (TYPE postgres, READ_ONLY)")
-
-        for table in tables:
-            if not _is_safe_identifier(table):
-                log(f"WARNING: skipping unsafe table name: {table!r}")
-                continue
-            _, src = _passthrough(con, f"SELECT count(*) FROM {table}")
-            source_count = int(src[0][0]) if src else 0
-            try:
-                raw_count = _scalar_int(
-                    con,
-                    "SELECT * FROM "
-                    f"postgres_query('pg', 'SELECT count(*) FROM mysql_raw.\"{table}\"')",
-                )
-            except Exception as e:
-                log(f"WARNING: mysql_raw.{table} unreadable ({e}); recording as -1")
-                raw_count = -1
-            out.append(CountRow(table=table, source_count=source_count, raw_count=raw_count))
-    finally:
-        con.close()
+    for table in safe:
+        if table in estimated:
+            source_count, raw_count = estimated[table]
+            out.append(CountRow(table, source_count, raw_count, estimated=True))
+        else:
+            out.append(CountRow(table, src_counts.get(table, -1), raw_counts.get(table, -1)))
     return out
 
 
-def run_load_fidelity(strict: bool = False) -> None:
+def run_load_fidelity(
+    strict: bool = False,
+    fast: bool = False,
+    checksum: bool = False,
+    jobs: int = 4,
+    chunk_rows: int = 100_000,
+) -> None:
     """Compare live MySQL vs ``mysql_raw`` row counts; write a report.
 
     Lists the source base tables, drops the pgloader drop list, counts each
     side via DuckDB dual-attach, and writes ``reports/runs/load_fidelity_<stamp>.md``
     plus a ``_manifest.json`` (with ``duckdb_version`` and the freeze instant).
     Informational by default; with ``strict=True`` a mismatch exits non-zero.
+    ``fast=True`` triages on catalog estimates first (see :func:`_collect_counts`).
+    ``checksum=True`` also compares row content in ``chunk_rows`` key ranges,
+    ``jobs`` at a time (see :mod:`migration.phases.fidelity_checksum`).
     """
     import duckdb
 
@@ -166,21 +284,31 @@ def run_load_fidelity(strict: bool = False) -> None:
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
     drop = set(read_drop_list())
-    con = duckdb.connect()
-    try:
-        con.execute("INSTALL mysql_scanner; LOAD mysql_scanner;")
-        mysql_dsn = _mysql_attach_dsn(env.mysql_url, env.mysql_db).replace("'", "''")
-        con.execute(f"ATTACH '{mysql_dsn}' AS src (TYPE mysql, READ_ONLY)")
-        _, table_rows = _passthrough(con, _SOURCE_TABLES_SQL)
-    finally:
-        con.close()
+    with duck_connection(env, "src") as con:
+        _, table_rows = mysql_query(con, _SOURCE_TABLES_SQL)
     tables = [str(r[0]) for r in table_rows if str(r[0]) not in drop]
 
-    rows = _collect_counts(env, tables)
+    started = time.perf_counter()
+    rows = _collect_counts(env, tables, fast=fast)
+    seconds = time.perf_counter() - started
+    estimated = sum(r.estimated for r in rows)
     issues = summarize_load_fidelity(rows)
+    checksums = None
+    if checksum:
+        # Deferred: fidelity_checksum builds on load_copy, which imports this module.
+        from migration.phases import fidelity_checksum
+
+        checksums = fidelity_checksum.run_checksums(
+            env,
+            {r.table: r.source_count for r in rows if r.source_count >= 0},
+            jobs=jobs,
+            chunk_rows=chunk_rows,
+        )
+        issues += fidelity_checksum.summarize_checksum(checksums)
 
     frozen = _freeze_instant()
-    status = "CLEAN" if not issues else "MISMATCH"
+    # Tables that only agreed by estimate keep a run from reading CLEAN.
+    status = "MISMATCH" if issues else "UNVERIFIED" if estimated else "CLEAN"
     RUNS_DIR.mkdir(parents=True, exist_ok=True)
     out: Path = RUNS_DIR / f"load_fidelity_{file_stamp()}.md"
     body = [
@@ -189,14 +317,46 @@ def run_load_fidelity(strict: bool = False) -> None:
         f"Generated: {ts()}",
         f"Freeze instant: {frozen or '(none recorded -- results may include live drift)'}",
         f"Tables compared: {len(rows)} (drop list excluded: {len(drop)})",
+        (
+            f"Mode: --fast ({estimated} table(s) agreed within "
+            f"{_FAST_TOLERANCE:.0%} by catalog estimate and are unverified; "
+            "the rest counted exactly)"
+            if fast
+            else "Mode: exact counts"
+        ),
+        *(
+            [
+                f"Checksum: {sum(c.chunks for c in checksums)} chunk(s) of <= ~{chunk_rows} "
+                f"row(s), {jobs} job(s); "
+                f"{sum(not c.keyed for c in checksums)} table(s) without an integer "
+                "primary key hashed whole"
+            ]
+            if checksums is not None
+            else []
+        ),
         "",
         f"**OVERALL: {status}**",
         "",
     ]
     if issues:
         body.extend(f"- {i}" for i in issues)
+    elif estimated:
+        body.append("- every exactly counted table matches")
     else:
         body.append("- every compared table matches")
+    if estimated:
+        body.extend(
+            [
+                "",
+                "Unverified (estimates only; rerun without --fast to count them):",
+                "",
+                *(
+                    f"- {r.table}: source~{r.source_count} mysql_raw~{r.raw_count}"
+                    for r in rows
+                    if r.estimated
+                ),
+            ]
+        )
     out.write_text("\n".join(body) + "\n", encoding="utf-8")
 
     manifest = {
@@ -206,17 +366,28 @@ def run_load_fidelity(strict: bool = False) -> None:
         "freeze_instant": frozen,
         "mysql_db": env.mysql_db or urlparse(env.mysql_url).path.lstrip("/"),
         "tables_compared": len(rows),
+        "mode": "fast" if fast else "exact",
+        "tables_estimated": estimated,
+        "checksum_chunks": sum(c.chunks for c in checksums) if checksums is not None else None,
+        "checksum_mismatched_chunks": (
+            sum(len(c.mismatched) for c in checksums) if checksums is not None else None
+        ),
         "mismatches": len(issues),
     }
     (REPORTS_DIR / "generated" / "load_fidelity_manifest.json").write_text(
         json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8"
     )
-    log(f"wrote {rel(out)} -- {status}")
+    log(f"wrote {rel(out)} -- {status} ({len(rows)} table(s) in {seconds:.1f}s)")
 
     if not frozen:
         log("WARNING: no freeze instant recorded; run after `migrate freeze` for a trustworthy comparison")
     if issues:
-        msg = f"load-fidelity found {len(issues)} table mismatch(es); see {rel(out)}"
+        msg = f"load-fidelity found {len(issues)} mismatch(es); see {rel(out)}"
         if strict:
             die(msg)
         log(f"WARNING: {msg} (informational; use --strict to fail)")
+    elif estimated and strict:
+        die(
+            f"load-fidelity --strict: {estimated} table(s) were only estimated (--fast); "
+            f"rerun without --fast to verify them; see {rel(out)}"
+        )
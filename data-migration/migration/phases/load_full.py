@@ -1,10 +1,31 @@
-"""C/Wednesday-Week-1: full MySQL -> mysql_raw load via pgloader, applying drop list."""
+"""C/Wednesday-Week-1: full MySQL -> mysql_raw load via pgloader, applying drop list.
+
+By default one pgloader process loads the whole schema. ``--shards N``
+splits the source tables into N row-count-balanced buckets (sizes from
+``reports/schema_snapshot/table_stats.csv``) and runs one pgloader per
+bucket, up to ``--parallel`` at a time, so the largest PMDA tables no
+longer share a single SBCL/JVM heap. Tables joined by a source foreign key
+(``foreign_keys.csv``) always share a bucket: each shard runs with
+``include drop`` (``DROP TABLE ... CASCADE``) and ``foreign keys``, so an
+FK spanning two concurrent shards would be dropped by one and created
+against a half-built table by the other. ``--engine=copy`` skips pgloader
+entirely and loads over binary COPY in-process (see
+:mod:`migration.phases.load_copy`).
+"""
 
 from __future__ import annotations
 
+import csv
+import heapq
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import StrEnum
+from pathlib import Path
+
 from migration.lib import (
     PGLOADER_DIR,
     RUNS_DIR,
+    SCHEMA_SNAPSHOT_DIR,
     STATE_DIR,
     Env,
     assert_pgloader_ok,
@@ -15,24 +36,296 @@ from migration.lib import (
     log,
     mark_gate,
     pgloader_argv,
+    phase_scope,
+    progress_for,
     progress_spinner,
+    read_drop_list,
     rel,
     render_template,
     require_pgloader,
     require_schema,
     run_teed,
 )
+from migration.phases.load_copy import run_copy_load
+from migration.phases.raw_indexes import run_raw_indexes
+from migration.phases.unlogged import wal_meter
+
+# Table names are spliced into the pgloader command file and the AFTER LOAD
+# SQL as quoted literals; anything outside MySQL's unquoted-identifier charset
+# is refused rather than escaped.
+_TABLE_NAME_RE = re.compile(r"^[A-Za-z0-9_$]+$")
+
+
+def _read_table_sizes(path: Path | None = None) -> dict[str, int]:
+    """Return ``{table_name: table_rows}`` from the schema snapshot's table_stats.csv.
+
+    ``table_rows`` is InnoDB's estimate; it only has to rank tables, not
+    count them. A blank estimate counts as 0. Dies when the snapshot is
+    missing (run ``migrate schema-snapshot`` first) or a name is unsafe.
+    """
+    stats = path or (SCHEMA_SNAPSHOT_DIR / "table_stats.csv")
+    if not stats.exists():
+        die(
+            f"missing {rel(stats)}; run `migrate schema-snapshot` before a sharded "
+            "load-full (the shard planner sizes buckets from it)"
+        )
+    sizes: dict[str, int] = {}
+    with stats.open(encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            name = row["table_name"].strip()
+            if not _TABLE_NAME_RE.match(name):
+                die(f"refusing to shard on unexpected table name {name!r} in {rel(stats)}")
+            raw = (row.get("table_rows") or "").strip()
+            sizes[name] = int(raw) if raw.isdigit() else 0
+    return sizes
+
+
+def _read_fk_edges(path: Path | None = None) -> list[tuple[str, str]]:
+    """Return ``(table, referenced_table)`` pairs from the snapshot's foreign_keys.csv.
+
+    One pair per FK column; duplicates are harmless to the planner. Dies
+    when the snapshot is missing, like :func:`_read_table_sizes`.
+    """
+    fks = path or (SCHEMA_SNAPSHOT_DIR / "foreign_keys.csv")
+    if not fks.exists():
+        die(
+            f"missing {rel(fks)}; run `migrate schema-snapshot` before a sharded "
+            "load-full (the shard planner keeps FK-linked tables together)"
+        )
+    with fks.open(encoding="utf-8", newline="") as f:
+        return [
+            (row["table_name"].strip(), row["referenced_table_name"].strip())
+            for row in csv.DictReader(f)
+        ]
+
+
+def _fk_groups(tables: list[str], fks: list[tuple[str, str]]) -> list[list[str]]:
+    """Partition ``tables`` into groups no FK in ``fks`` crosses (union-find).
+
+    Edges naming a table outside ``tables`` (dropped, or gone since the
+    snapshot) are ignored: pgloader does not create that FK either.
+    """
+    parent = {t.lower(): t.lower() for t in tables}
+
+    def find(t: str) -> str:
+        while parent[t] != t:
+            parent[t] = parent[parent[t]]
+            t = parent[t]
+        return t
+
+    for child, ref in fks:
+        a, b = child.lower(), ref.lower()
+        if a in parent and b in parent:
+            parent[find(a)] = find(b)
+    groups: dict[str, list[str]] = {}
+    for t in tables:
+        groups.setdefault(find(t.lower()), []).append(t)
+    return list(groups.values())
+
+
+def _plan_shards(
+    sizes: dict[str, int],
+    drop: list[str],
+    shards: int,
+    fks: list[tuple[str, str]] | None = None,
+) -> list[list[str]]:
+    """Split the non-dropped tables into at most ``shards`` row-balanced buckets.
+
+    Tables linked by any chain of ``fks`` form one unit that never spans
+    two buckets (see the module docstring). Greedy longest-processing-time:
+    units go largest first onto the currently lightest bucket. Empty buckets
+    are dropped -- a schema whose tables are all FK-linked yields a single
+    bucket -- and each bucket's tables are returned sorted for a stable
+    rendered file.
+    """
+    dropped = {d.lower() for d in drop}
+    tables = [t for t in sizes if t.lower() not in dropped]
+    units = sorted(
+        (sorted(g) for g in _fk_groups(tables, fks or [])),
+        key=lambda g: (-sum(sizes[t] for t in g), g[0]),
+    )
+    heap = [(0, i) for i in range(min(shards, len(units)))]
+    buckets: list[list[str]] = [[] for _ in heap]
+    for unit in units:
+        load, i = heapq.heappop(heap)
+        buckets[i].extend(unit)
+        heapq.heappush(heap, (load + sum(sizes[t] for t in unit), i))
+    return [sorted(b) for b in buckets if b]
+
+
+def _quoted(names: list[str]) -> str:
+    return ", ".join(f"'{n}'" for n in names)
+
+
+def _shard_blocks(buckets: list[list[str]], index: int, drop: list[str]) -> dict[str, str]:
+    """Return the INCLUDING/EXCLUDING/LOADED_AT_SCOPE substitutions for one bucket.
 
+    Bucket 0 is the catch-all: rather than ``INCLUDING ONLY`` its own
+    tables it *excludes* every other bucket (plus the drop list), so a
+    table created since the last schema snapshot is still loaded. Such a
+    table's FKs are unknown to the planner; refresh the snapshot before a
+    sharded load when the source schema has changed.
+    """
+    others = [t for i, b in enumerate(buckets) if i != index for t in b]
+    if index == 0:
+        excluded = drop + others
+        return {
+            "INCLUDING_BLOCK": "",
+            "EXCLUDING_BLOCK": f"EXCLUDING TABLE NAMES MATCHING {_quoted(excluded)}"
+            if excluded
+            else "",
+            "LOADED_AT_SCOPE": (
+                f"AND table_name NOT IN ({_quoted([t.lower() for t in others])})" if others else ""
+            ),
+        }
+    own = buckets[index]
+    return {
+        "INCLUDING_BLOCK": f"INCLUDING ONLY TABLE NAMES MATCHING {_quoted(own)}",
+        "EXCLUDING_BLOCK": excluding_block(),
+        "LOADED_AT_SCOPE": f"AND table_name IN ({_quoted([t.lower() for t in own])})",
+    }
+
+
+def _base_substitutions(env: Env) -> dict[str, str]:
+    return {
+        "MYSQL_URL": env.mysql_url,
+        "PG_URL": env.pg_url_pgloader(),
+        "MYSQL_DB": env.mysql_db,
+        "CAST_BLOCK": cast_block(),
+        "EXCLUDING_BLOCK": excluding_block(),
+        "INCLUDING_BLOCK": "",
+        "LOADED_AT_SCOPE": "",
+    }
+
+
+def _run_sharded(env: Env, template: Path, shards: int, parallel: int) -> list[Path] | None:
+    """Render and run one pgloader per bucket; return every shard's log path.
+
+    Returns ``None`` without running anything when the FK-aware plan
+    collapses to one bucket; the caller then does a single unsharded run.
+    """
+    drop = read_drop_list()
+    sizes = _read_table_sizes()
+    buckets = _plan_shards(sizes, drop, shards, _read_fk_edges())
+    if not buckets:
+        die("no tables to load: table_stats.csv is empty or every table is dropped")
+    if len(buckets) == 1:
+        log(
+            f"--shards {shards}: every table is FK-linked into one group; "
+            "falling back to a single pgloader run"
+        )
+        return None
+    if len(buckets) < shards:
+        log(f"--shards {shards}: FK-linked tables share a bucket; running {len(buckets)} shard(s)")
+    stamp = file_stamp()
+    jobs: list[tuple[Path, Path]] = []
+    for i, bucket in enumerate(buckets):
+        rendered = STATE_DIR / f"schema.shard{i}.rendered.load"
+        render_template(
+            template, rendered, {**_base_substitutions(env), **_shard_blocks(buckets, i, drop)}
+        )
+        log_file = RUNS_DIR / f"pgloader_run_{stamp}_shard{i}.log"
+        rows = sum(sizes[t] for t in bucket)
+        extra = " + any table not in the snapshot" if i == 0 else ""
+        log(f"shard {i}: {len(bucket)} table(s), ~{rows} row(s){extra} -> {rel(log_file)}")
+        jobs.append((rendered, log_file))
+
+    parallel = min(parallel, len(jobs))
+    log(
+        f"running {len(jobs)} pgloader shard(s), {parallel} at a time; each gets "
+        "its own PGLOADER_DYNAMIC_SPACE_MB heap"
+    )
+    failed: list[str] = []
+    with (
+        progress_for(len(jobs), "pgloader shards") as p,
+        ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="pgloader") as pool,
+    ):
+        futures = {
+            pool.submit(run_teed, pgloader_argv(rendered, env), log_file): log_file
+            for rendered, log_file in jobs
+        }
+        for fut in as_completed(futures):
+            log_file = futures[fut]
+            p.step(log_file.name)
+            try:
+                fut.result()
+            except SystemExit:
+                # run_teed already logged the non-zero exit; keep waiting for
+                # the other shards so every log is complete before the verdict.
+                failed.append(rel(log_file))
+    if failed:
+        die(f"{len(failed)} pgloader shard(s) exited non-zero: {', '.join(sorted(failed))}")
+    return [log_file for _, log_file in jobs]
+
+
+class LoadEngine(StrEnum):
+    """The ``load-full --engine`` choices."""
+
+    PGLOADER = "pgloader"
+    COPY = "copy"
 
-def run_load_full() -> None:
+
+def run_load_full(
+    shards: int = 1,
+    parallel: int | None = None,
+    engine: str = LoadEngine.PGLOADER,
+    raw_indexes: bool = True,
+) -> None:
     """Run the initial full pgloader MySQL -> ``mysql_raw`` load.
 
     Requires the ``mysql_raw`` schema to already exist. Renders
     ``schema.load`` with the connection strings and the drop-list
     EXCLUDING block, invokes pgloader with output captured to
     ``reports/runs/pgloader_run_<stamp>.log``, and marks the ``load_full`` gate.
+
+    With ``shards > 1`` the load is split into row-balanced buckets that no
+    source FK crosses (see :func:`_plan_shards`), one rendered
+    ``state/schema.shard<i>.rendered.load`` and one
+    ``pgloader_run_<stamp>_shard<i>.log`` per bucket, run at most
+    ``parallel`` (default: ``shards``) at a time. The gate is marked only if
+    every shard's log passes :func:`migration.lib.assert_pgloader_ok`.
+
+    ``engine="copy"`` loads through :func:`migration.phases.load_copy.run_copy_load`
+    instead, ``parallel`` (default ``PG_POOL_SIZE``) tables at a time; it
+    needs no pgloader runner and already loads per table, so ``shards > 1``
+    is rejected with it.
+
+    Every engine finishes with :func:`migration.phases.raw_indexes.run_raw_indexes`
+    (``ANALYZE`` + join-key indexes) before the gate is marked, unless
+    ``raw_indexes=False``. ``UNLOGGED_BUILD`` needs the copy engine, which
+    creates the tables UNLOGGED; the load's WAL is metered (see
+    :mod:`migration.phases.unlogged`). pgloader creates logged tables, so the
+    copy would be WAL-logged in full and converting afterwards only adds a
+    rewrite: that combination dies.
     """
+    try:
+        chosen = LoadEngine(engine)
+    except ValueError:
+        die(f"unknown load engine {engine!r}; expected one of {', '.join(LoadEngine)}")
+    if chosen is LoadEngine.COPY and shards > 1:
+        die("--shards splits pgloader runs and does not apply to --engine copy; use --parallel")
     env = Env.load()
+    if env.unlogged_build and chosen is LoadEngine.PGLOADER:
+        die(
+            "UNLOGGED_BUILD needs --engine copy: pgloader creates logged tables, "
+            "so its load would be WAL-logged in full"
+        )
+    with phase_scope("load_full"):
+        with wal_meter(env, "load_full"):
+            _load(env, shards, parallel, chosen)
+        if raw_indexes:
+            run_raw_indexes(env)
+    mark_gate("load_full")
+
+
+def _load(env: Env, shards: int, parallel: int | None, engine: LoadEngine) -> None:
+    """Run the chosen engine; dies on any failure so the gate stays unmarked."""
+    if engine is LoadEngine.COPY:
+        if not env.mysql_url:
+            die("MYSQL_URL is not set; point it at the source MySQL before loading")
+        require_schema(env, "mysql_raw")
+        run_copy_load(env, parallel or env.pg_pool_size)
+        return
     require_pgloader(env)
     require_schema(env, "mysql_raw")
 
@@ -40,21 +333,17 @@ def run_load_full() -> None:
     if not template.exists():
         die(f"missing {template}")
 
+    STATE_DIR.mkdir(exist_ok=True)
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    if shards > 1:
+        logs = _run_sharded(env, template, shards, parallel or shards)
+        if logs is not None:
+            assert_pgloader_ok(*logs)
+            return
+
     rendered = STATE_DIR / "schema.rendered.load"
-    rendered.parent.mkdir(exist_ok=True)
-    render_template(
-        template,
-        rendered,
-        {
-            "MYSQL_URL": env.mysql_url,
-            "PG_URL": env.pg_url_pgloader(),
-            "MYSQL_DB": env.mysql_db,
-            "CAST_BLOCK": cast_block(),
-            "EXCLUDING_BLOCK": excluding_block(),
-        },
-    )
+    render_template(template, rendered, _base_substitutions(env))
 
-    RUNS_DIR.mkdir(parents=True, exist_ok=True)
     log_file = RUNS_DIR / f"pgloader_run_{file_stamp()}.log"
     log(f"running pgloader; output: {rel(log_file)}")
     with progress_spinner("pgloader") as sp:
@@ -64,5 +353,3 @@ def run_load_full() -> None:
             on_line=lambda line: sp.note(f"pgloader: {line}") if line.strip() else None,
         )
     assert_pgloader_ok(log_file)
-
-    mark_gate("load_full")
@@ -66,6 +66,7 @@ import csv
 import json
 from collections.abc import Callable
 from collections.abc import Set as AbstractSet
+from concurrent.futures import as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -76,6 +77,7 @@ from migration.lib import (
     REPORTS_DIR,
     RUNS_DIR,
     SQL_DIR,
+    ContextThreadPoolExecutor,
     Env,
     apply_dir,
     copy_csv_into_table,
@@ -83,12 +85,16 @@ from migration.lib import (
     file_stamp,
     log,
     mark_gate,
+    pg_connection,
+    phase_scope,
     progress_for,
     psql_query,
     rel,
     require_gate,
+    span,
     ts,
 )
+from migration.phases.blue_green import shadow_scope
 
 # Reconstructed-FK candidates (source had no declared FKs); see
 # migration/phases/fk_candidates.py. Header-only until the scanner + overrides
@@ -145,11 +151,14 @@ class CheckResult:
     """Outcome of a single parity check.
 
     ``status`` is one of ``"GREEN"``, ``"RED"``, or ``"PENDING"``.
+    ``elapsed_s`` is the check's wall time, stamped by
+    :func:`build_parity_report` (``None`` for results built elsewhere).
     """
 
     name: str
     status: str  # "GREEN" | "RED" | "PENDING"
     detail: str = ""
+    elapsed_s: float | None = None
 
 
 @dataclass
@@ -184,7 +193,10 @@ class ParityReport:
             "",
         ]
         for c in self.checks:
-            lines.extend([f"## {c.name} -- **{c.status}**", "", c.detail or "(no detail)", ""])
+            lines.extend([f"## {c.name} -- **{c.status}**", ""])
+            if c.elapsed_s is not None:
+                lines.extend([f"_Wall time: {c.elapsed_s:.2f}s_", ""])
+            lines.extend([c.detail or "(no detail)", ""])
         lines.extend(["---", "", f"**OVERALL STATUS: {self.overall}**", ""])
         return "\n".join(lines)
 
@@ -477,6 +489,173 @@ def _existing_columns(env: Env) -> set[tuple[str, str, str]]:
     return {(str(r[0]), str(r[1]), str(r[2])) for r in rows}
 
 
+_ORPHAN_CSV_HEADER = (
+    "from_schema",
+    "from_table",
+    "from_column",
+    "to_schema",
+    "to_table",
+    "to_column",
+    "orphan_value",
+)
+
+
+@dataclass
+class _OrphanScan:
+    """Outcome of an orphan scan, keyed by index into the scanned edge list.
+
+    ``counts`` holds the orphan-row count of every edge that has orphans;
+    ``failed`` maps each edge whose query raised to the first line of the
+    error.
+    """
+
+    counts: dict[int, int] = field(default_factory=dict)
+    failed: dict[int, str] = field(default_factory=dict)
+
+
+def _orphan_scan_query(edges: list[_ReconstructedFK]) -> sql.Composed:
+    """Compose the single-pass orphan scan over every edge in ``edges``.
+
+    Edges are grouped by parent ``(schema, table, column)``: each parent's key
+    column is read once into a ``MATERIALIZED`` CTE, and every edge pointing at
+    it contributes one anti-join branch to a ``UNION ALL``. Each branch yields
+    ``(edge_id, orphan_value)`` where ``edge_id`` is the edge's index in
+    ``edges``; the value is cast to text so every branch shares one row type.
+    Identifiers go through ``sql.Identifier`` as in :func:`_orphan_rows_query`.
+    """
+    parents: dict[tuple[str, str, str], list[int]] = {}
+    for i, fk in enumerate(edges):
+        parents.setdefault((fk.to_schema, fk.to_table, fk.to_column), []).append(i)
+    ctes: list[sql.Composable] = []
+    branches: list[sql.Composable] = []
+    for p_idx, ((to_schema, to_table, to_column), members) in enumerate(parents.items()):
+        cte = sql.Identifier(f"p{p_idx}")
+        ctes.append(
+            sql.SQL("{cte} AS MATERIALIZED (SELECT {tc} AS k FROM {tt})").format(
+                cte=cte,
+                tc=sql.Identifier(to_column),
+                tt=sql.Identifier(to_schema, to_table),
+            )
+        )
+        for i in members:
+            fk = edges[i]
+            branches.append(
+                sql.SQL(
+                    "SELECT {edge_id} AS edge_id, f.{fc}::text AS orphan_value FROM {ft} f "
+                    "WHERE f.{fc} IS NOT NULL "
+                    "AND NOT EXISTS (SELECT 1 FROM {cte} p WHERE p.k = f.{fc})"
+                ).format(
+                    edge_id=sql.Literal(i),
+                    fc=sql.Identifier(fk.from_column),
+                    ft=sql.Identifier(fk.from_schema, fk.from_table),
+                    cte=cte,
+                )
+            )
+    return sql.SQL("WITH {} {}").format(
+        sql.SQL(", ").join(ctes), sql.SQL(" UNION ALL ").join(branches)
+    )
+
+
+def _scan_orphans_batched(env: Env, edges: list[_ReconstructedFK], out_path: Path) -> _OrphanScan:
+    """Run the orphan scan for ``edges`` in one server-side pass.
+
+    Loads the edge list into a temp table, materializes the
+    :func:`_orphan_scan_query` hits into a second temp table, reads back the
+    per-edge counts, and -- when any edge has
+    orphans -- streams the joined per-row CSV straight from ``COPY ... TO
+    STDOUT`` into ``out_path`` without building Python rows. Raises
+    ``psycopg.Error`` when any edge cannot be evaluated (e.g. incompatible key
+    types); the caller then falls back to the per-edge path.
+    """
+    with pg_connection(env, reset=True) as conn, conn.transaction():
+        conn.execute(
+            "CREATE TEMP TABLE _orphan_edges ("
+            " edge_id int PRIMARY KEY, from_schema text, from_table text,"
+            " from_column text, to_schema text, to_table text, to_column text"
+            ") ON COMMIT DROP"
+        )
+        with conn.cursor() as cur, cur.copy("COPY _orphan_edges FROM STDIN") as copy:
+            for i, fk in enumerate(edges):
+                copy.write_row(
+                    (
+                        i,
+                        fk.from_schema,
+                        fk.from_table,
+                        fk.from_column,
+                        fk.to_schema,
+                        fk.to_table,
+                        fk.to_column,
+                    )
+                )
+        conn.execute(
+            sql.SQL("CREATE TEMP TABLE _orphan_hits ON COMMIT DROP AS {}").format(
+                _orphan_scan_query(edges)
+            )
+        )
+        counts = {
+            int(edge_id): int(n)
+            for edge_id, n in conn.execute(
+                "SELECT edge_id, count(*) FROM _orphan_hits GROUP BY edge_id"
+            ).fetchall()
+        }
+        if counts:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            with out_path.open("wb") as f, conn.cursor() as cur, cur.copy(
+                "COPY (SELECT e.from_schema, e.from_table, e.from_column, e.to_schema,"
+                " e.to_table, e.to_column, h.orphan_value"
+                " FROM _orphan_hits h JOIN _orphan_edges e USING (edge_id)"
+                " ORDER BY h.edge_id, h.orphan_value"
+                ") TO STDOUT (FORMAT csv, HEADER)"
+            ) as copy:
+                for block in copy:
+                    f.write(block)
+    return _OrphanScan(counts)
+
+
+def _scan_orphans_per_edge(
+    env: Env, edges: list[_ReconstructedFK], out_path: Path
+) -> _OrphanScan:
+    """Fallback: one :func:`_orphan_rows_query` per edge, isolating bad edges.
+
+    Every edge whose query raises lands in ``failed`` instead of aborting the
+    scan. Orphan rows are written to ``out_path`` in the same shape as the
+    batched engine.
+    """
+    scan = _OrphanScan()
+    orphan_rows: list[tuple[object, ...]] = []
+    for i, fk in enumerate(edges):
+        try:
+            rows = psql_query(env, _orphan_rows_query(fk).as_string())
+        except psycopg.Error as e:
+            # A heuristic candidate may pair columns of incompatible types
+            # (e.g. an integer child key against a text *_cd parent), which
+            # makes the equality uncheckable. Report it rather than aborting.
+            scan.failed[i] = str(e).splitlines()[0]
+            continue
+        if rows:
+            scan.counts[i] = len(rows)
+            orphan_rows.extend(
+                (
+                    fk.from_schema,
+                    fk.from_table,
+                    fk.from_column,
+                    fk.to_schema,
+                    fk.to_table,
+                    fk.to_column,
+                    r[0],
+                )
+                for r in rows
+            )
+    if orphan_rows:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with out_path.open("w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(_ORPHAN_CSV_HEADER)
+            for row in orphan_rows:
+                w.writerow(["" if v is None else v for v in row])
+    return scan
+
+
 def _orphans(env: Env) -> CheckResult:
     """Check 5: reconstructed-FK orphan review (non-gating, load-surface scoped).
 
@@ -498,9 +677,19 @@ def _orphans(env: Env) -> CheckResult:
     * edges naming an absent column (a heuristic PK guess) or pairing
       incompatible types are reported uncheckable in the detail.
 
+    A CSV left by an earlier run is removed first, so the file exists only
+    when this run found orphans.
+
+    The in-scope edges are scanned in a single server-side pass
+    (:func:`_scan_orphans_batched`); only when that pass fails on an
+    unevaluable edge does the check fall back to one query per edge
+    (:func:`_scan_orphans_per_edge`) to isolate it.
+
     Vacuously GREEN when the candidates file is header-only.
     """
     name = "5. Reconstructed-FK orphan checks"
+    out_path = REPORTS_DIR / "orphans" / "reconstructed_fk_orphans.csv"
+    out_path.unlink(missing_ok=True)
     edges = _read_reconstructed_fks()
     if not edges:
         return CheckResult(
@@ -509,11 +698,9 @@ def _orphans(env: Env) -> CheckResult:
             detail="no HIGH/MED reconstructed-FK candidates to check (vacuously green)",
         )
     cols = _existing_columns(env)
-    orphan_rows: list[tuple[object, ...]] = []
-    offenders: list[str] = []
     uncheckable: list[str] = []
+    checkable: list[_ReconstructedFK] = []
     out_of_scope = 0
-    checked = 0
     for fk in edges:
         if fk.from_table not in _MIGRATION_SOURCE_TABLES:
             out_of_scope += 1
@@ -531,55 +718,35 @@ def _orphans(env: Env) -> CheckResult:
                 f"{fk.to_schema}.{fk.to_table}.{fk.to_column} (absent: {', '.join(absent)})"
             )
             continue
+        checkable.append(fk)
+
+    scan = _OrphanScan()
+    if checkable:
         try:
-            rows = psql_query(env, _orphan_rows_query(fk).as_string())
+            scan = _scan_orphans_batched(env, checkable, out_path)
         except psycopg.Error as e:
-            # A heuristic candidate may pair columns of incompatible types
-            # (e.g. an integer child key against a text *_cd parent), which
-            # makes the equality uncheckable. Report it rather than aborting.
-            reason = str(e).splitlines()[0]
-            uncheckable.append(
-                f"{fk.from_schema}.{fk.from_table}.{fk.from_column} -> "
-                f"{fk.to_schema}.{fk.to_table}.{fk.to_column} (uncheckable: {reason})"
-            )
-            continue
-        checked += 1
-        if rows:
-            offenders.append(
-                f"{fk.from_schema}.{fk.from_table}.{fk.from_column} -> "
-                f"{fk.to_schema}.{fk.to_table}.{fk.to_column}: {len(rows)} orphan(s)"
-            )
-            for r in rows:
-                orphan_rows.append(
-                    (
-                        fk.from_schema,
-                        fk.from_table,
-                        fk.from_column,
-                        fk.to_schema,
-                        fk.to_table,
-                        fk.to_column,
-                        r[0],
-                    )
-                )
-
-    out_path = REPORTS_DIR / "orphans" / "reconstructed_fk_orphans.csv"
-    if orphan_rows:
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        with out_path.open("w", encoding="utf-8", newline="") as f:
-            w = csv.writer(f)
-            w.writerow(
-                [
-                    "from_schema",
-                    "from_table",
-                    "from_column",
-                    "to_schema",
-                    "to_table",
-                    "to_column",
-                    "orphan_value",
-                ]
+            log(
+                "orphan scan: batched pass failed "
+                f"({str(e).splitlines()[0]}); falling back to per-edge queries"
             )
-            for row in orphan_rows:
-                w.writerow(["" if v is None else v for v in row])
+            # A pass that failed mid-COPY may have left a partial file.
+            out_path.unlink(missing_ok=True)
+            scan = _scan_orphans_per_edge(env, checkable, out_path)
+    uncheckable.extend(
+        f"{fk.from_schema}.{fk.from_table}.{fk.from_column} -> "
+        f"{fk.to_schema}.{fk.to_table}.{fk.to_column} (uncheckable: {scan.failed[i]})"
+        for i, fk in enumerate(checkable)
+        if i in scan.failed
+    )
+    counts = scan.counts
+    checked = len(checkable) - len(scan.failed)
+    offenders = [
+        f"{fk.from_schema}.{fk.from_table}.{fk.from_column} -> "
+        f"{fk.to_schema}.{fk.to_table}.{fk.to_column}: {counts[i]} orphan(s)"
+        for i, fk in enumerate(checkable)
+        if counts.get(i)
+    ]
+    orphan_total = sum(counts.values())
 
     def _sample(items: list[str], limit: int = 5) -> str:
         head = "; ".join(items[:limit])
@@ -589,7 +756,7 @@ def _orphans(env: Env) -> CheckResult:
     if offenders:
         parts.append(
             f"{len(offenders)} in-scope reconstructed-FK edge(s) with orphans "
-            f"({len(orphan_rows)} row(s)) logged to {rel(out_path)} (non-gating): "
+            f"({orphan_total} row(s)) logged to {rel(out_path)} (non-gating): "
             + _sample(offenders)
         )
     else:
@@ -2194,7 +2361,15 @@ def _read_snapshot_date(manifest_path: Path) -> str:
         return "unknown"
 
 
-def build_parity_report(env: Env) -> ParityReport:
+def _timed(label: str, check: Callable[[Env], CheckResult], env: Env) -> CheckResult:
+    """Run one check, stamp its wall time onto the result and record a span."""
+    with span("parity_check", label) as s:
+        result = check(env)
+    result.elapsed_s = s.seconds
+    return result
+
+
+def build_parity_report(env: Env, jobs: int = 1) -> ParityReport:
     """Apply parity SQL, run every check, write the report, and return it.
 
     Applies ``sql/99_parity/*`` so the views the Python checks read are
@@ -2203,6 +2378,12 @@ def build_parity_report(env: Env) -> ParityReport:
     gate: it marks no gate and never :func:`die`s, so it is safe to call from
     the read-only ``diagnose`` command. The gating decision lives in
     :func:`run_parity`.
+
+    Every check is an independent read-only query (each writes only its own
+    ``reports/orphans``/``generated`` CSV), so ``jobs > 1`` fans them out over a
+    thread pool sharing the pooled Postgres connections. Report order is the
+    ``checks`` tuple order regardless of completion order, and each check's
+    wall time is recorded in the markdown.
     """
     apply_dir(env, SQL_DIR / "99_parity")
 
@@ -2241,10 +2422,25 @@ def build_parity_report(env: Env) -> ParityReport:
         ("medicaid.gov 1115 parity", _medicaid_gov_1115_parity),
         ("demonstration dup-medicaid hold-back", _demonstration_held_dup_medicaid),
     )
-    with progress_for(len(checks), "parity") as p:
-        for label, check in checks:
-            p.step(label)
-            report.checks.append(check(env))
+    if jobs <= 1:
+        with progress_for(len(checks), "parity") as p:
+            for label, check in checks:
+                p.step(label)
+                report.checks.append(_timed(label, check, env))
+    else:
+        if jobs > env.pg_pool_size:
+            log(
+                f"NOTE: --jobs {jobs} exceeds PG_POOL_SIZE={env.pg_pool_size}; "
+                "workers will queue for pooled connections"
+            )
+        with progress_for(len(checks), f"parity ({jobs} jobs)") as p, ContextThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="parity"
+        ) as pool:
+            futures = {pool.submit(_timed, label, check, env): label for label, check in checks}
+            for fut in as_completed(futures):
+                p.step(futures[fut])
+            # dicts keep insertion order, so the report follows `checks`.
+            report.checks.extend(fut.result() for fut in futures)
 
     RUNS_DIR.mkdir(parents=True, exist_ok=True)
     out: Path = RUNS_DIR / f"parity_{file_stamp()}.md"
@@ -2254,11 +2450,12 @@ def build_parity_report(env: Env) -> ParityReport:
     return report
 
 
-def run_parity(accept_pending: bool = False) -> None:
+def run_parity(accept_pending: bool = False, jobs: int = 1) -> None:
     """Run P6: build the parity report, then conditionally mark the gate.
 
     Requires the ``constraints`` gate. Delegates the SQL apply + checks +
-    report write to :func:`build_parity_report`, then gates on the rollup.
+    report write to :func:`build_parity_report` (``jobs`` checks at a time),
+    then gates on the rollup.
 
     The ``parity`` gate is marked when the overall status is GREEN, or
     when ``accept_pending`` is true and the overall status is PENDING
@@ -2267,11 +2464,14 @@ def run_parity(accept_pending: bool = False) -> None:
     :func:`die` so a RED parity (or a PENDING one run without
     ``--accept-pending``) cannot exit 0 and let ``make rebuild`` or a CI
     job declare success over it (CODE_REVIEW H2).
+
+    With ``BLUE_GREEN`` set the checks run against the shadow ``demos_app_next``.
     """
     env = Env.load()
     require_gate("constraints")
 
-    report = build_parity_report(env)
+    with phase_scope("parity"), shadow_scope(env):
+        report = build_parity_report(env, jobs=jobs)
 
     if report.overall == "GREEN":
         mark_gate("parity")
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import shutil
 
+from migration.duck import install_extensions
 from migration.lib import (
     PRISMA_CACHE_DIR,
     PRISMA_PIN_FILE,
@@ -27,7 +28,8 @@ def run_preflight() -> None:
     ``pgloader`` is on ``PATH``, the pinned Prisma artifact is cached, and
     (when the earlier checks pass) re-runs the prod-schema guard with the
     emptiness check so the target demos_app still matches the reference and
-    holds no data before ``build_app`` writes. Logs a reminder to manually
+    holds no data before ``build_app`` writes (``BLUE_GREEN`` skips the
+    emptiness check: the build writes to the shadow schema). Logs a reminder to manually
     confirm the backup operator + on-call rotation. Hard-fails via
     :func:`die` if any automated check fails so the operator never
     proceeds to ``freeze`` with a broken toolchain.
@@ -60,11 +62,9 @@ def run_preflight() -> None:
         ok = False
     else:
         try:
-            import duckdb
-
-            conn = duckdb.connect(":memory:")
-            conn.execute("INSTALL mysql_scanner; INSTALL postgres_scanner;")
-            conn.close()
+            # Into DUCKDB_EXTENSION_DIR when set, so the cutover-day session
+            # loads the scanners without network access.
+            install_extensions(env)
         except Exception as e:
             log(f"FAIL: DuckDB scanners not installable: {e}")
             ok = False
@@ -96,8 +96,10 @@ def run_preflight() -> None:
                 log(f"  cached: {rel(cached)}")
 
     if ok:
+        # A blue/green cutover builds into demos_app_next, so the live
+        # demos_app is expected to hold data; only its schema is guarded.
         log("P0.6 prod demos_app schema/seed/emptiness guard (live target vs reference)")
-        run_prod_schema_guard(require_empty=True, label="preflight")
+        run_prod_schema_guard(require_empty=not env.blue_green, label="preflight")
     else:
         log("P0.6 prod-schema guard skipped (earlier checks failed)")
 
@@ -21,6 +21,18 @@ instances READ_ONLY and diff them. Three comparisons over schema
   4. emptiness    -- every non-seeded demos_app base table in the TARGET must
                      hold 0 rows (nothing pre-populated what we will write)
 
+Each cluster first returns one small digest per comparison, computed
+server-side in a single query (:func:`digest_sql`): a row count plus the md5
+of the sorted row md5s. Equal digests are equal content, so an undrifted
+guard moves a few dozen bytes per side. Only a differing catalog is fetched,
+once per side, and kept in a content-addressed cache for the rest of the
+process (:data:`_CATALOG_CACHE`) -- ``preflight`` and the ``ddl`` pre-rebuild
+guard share it. A differing seeded table is split into 256 buckets by the
+first byte of each row's md5 (:func:`bucket_sql`), and only the rows of the
+buckets whose digests differ are pulled into the DuckDB ``EXCEPT``. Row text
+follows each cluster's session settings, so a ``TimeZone`` difference can
+only widen that fetch, never hide or invent drift.
+
 Any drift -> ``die`` (HOLD the cutover). This is a cross-*instance* compare
 (two different PG clusters), which is exactly where ``postgres_scanner``
 dual-attach earns its keep; the same-instance parity gate stays pure-PG.
@@ -34,6 +46,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from migration.duck import duck_connection
 from migration.lib import (
     PRISMA_SEEDED_TABLES_FILE,
     RUNS_DIR,
@@ -67,6 +80,31 @@ _FKS_SQL = (
     "WHERE n.nspname = 'demos_app' AND c.contype = 'f'"
 )
 
+# Digest of one result set: row count + md5 of its sorted row md5s. ``{rows}``
+# is a subquery whose single column ``r`` holds each row's canonical text.
+_DIGEST_SQL = (
+    "SELECT {item} AS item, count(*)::bigint AS n, "
+    "md5(coalesce(string_agg(h, '' ORDER BY h), '')) AS digest "
+    "FROM (SELECT md5(r) AS h FROM ({rows}) AS q) AS d"
+)
+_COLUMN_ROWS_SQL = (
+    "SELECT concat_ws(chr(31), table_name, column_name, data_type, is_nullable, "
+    "coalesce(column_default, '')) AS r "
+    "FROM information_schema.columns WHERE table_schema = 'demos_app'"
+)
+_FK_ROWS_SQL = (
+    "SELECT concat_ws(chr(31), c.conname, rel.relname, pg_get_constraintdef(c.oid)) AS r "
+    "FROM pg_constraint c "
+    "JOIN pg_class rel ON rel.oid = c.conrelid "
+    "JOIN pg_namespace n ON n.oid = rel.relnamespace "
+    "WHERE n.nspname = 'demos_app' AND c.contype = 'f'"
+)
+_CATALOG_SQL = {"columns": _COLUMNS_SQL, "fks": _FKS_SQL}
+
+# (catalog item, digest) -> its rows. Keyed on content, so a cached entry can
+# never be stale: a changed catalog has a new digest.
+_CATALOG_CACHE: dict[tuple[str, str], list[tuple[Any, ...]]] = {}
+
 # Per-table row counts for every demos_app base table, computed in one query
 # (same query_to_xml trick init_pg uses for the seeded-table capture).
 _TABLE_COUNTS_SQL = (
@@ -159,9 +197,32 @@ def summarize_guard(diffs: GuardDiffs) -> list[str]:
     return issues
 
 
-def _quote(dsn: str) -> str:
-    """Single-quote-escape a DSN for inlining into a DuckDB ATTACH statement."""
-    return dsn.replace("'", "''")
+def _seed_rows_sql(table: str) -> str:
+    return f'SELECT t::text AS r FROM demos_app."{table}" AS t'
+
+
+def digest_sql(seeded: list[str]) -> str:
+    """One Postgres query returning ``(item, n, digest)`` for both catalogs and each seed table."""
+    parts = [
+        _DIGEST_SQL.format(item="'columns'", rows=_COLUMN_ROWS_SQL),
+        _DIGEST_SQL.format(item="'fks'", rows=_FK_ROWS_SQL),
+        *(_DIGEST_SQL.format(item=f"'seed:{t}'", rows=_seed_rows_sql(t)) for t in seeded),
+    ]
+    return " UNION ALL ".join(parts)
+
+
+def bucket_sql(table: str) -> str:
+    """Per-bucket ``(bucket, n, digest)`` of one seeded table; the bucket is a row-md5 prefix."""
+    return (
+        "SELECT left(h, 2) AS bucket, count(*)::bigint AS n, "
+        "md5(string_agg(h, '' ORDER BY h)) AS digest "
+        f"FROM (SELECT md5(r) AS h FROM ({_seed_rows_sql(table)}) AS q) AS d GROUP BY 1"
+    )
+
+
+def differing_keys(ref: dict[str, tuple[int, str]], tgt: dict[str, tuple[int, str]]) -> list[str]:
+    """Keys whose ``(n, digest)`` differ or that exist on one side only, sorted."""
+    return sorted(k for k in ref.keys() | tgt.keys() if ref.get(k) != tgt.get(k))
 
 
 def _passthrough(con: Any, alias: str, pg_sql: str) -> str:
@@ -176,52 +237,75 @@ def _except_rows(con: Any, left_sql: str, right_sql: str) -> list[tuple[Any, ...
     return [tuple(r) for r in con.fetchall()]
 
 
-def _collect_diffs(
-    target_dsn: str, reference_dsn: str, seeded: list[str], *, require_empty: bool
-) -> GuardDiffs:
-    """Attach both PG instances READ_ONLY via DuckDB and compute drift.
+def _digests(con: Any, alias: str, sql: str) -> dict[str, tuple[int, str]]:
+    con.execute(_passthrough(con, alias, sql))
+    return {str(k): (int(n), str(d)) for k, n, d in con.fetchall()}
+
+
+def _catalog_rows(con: Any, alias: str, item: str, digest: str) -> set[tuple[Any, ...]]:
+    """The ``item`` catalog of ``alias``, fetched at most once per digest per process."""
+    key = (item, digest)
+    if key not in _CATALOG_CACHE:
+        con.execute(_passthrough(con, alias, _CATALOG_SQL[item]))
+        _CATALOG_CACHE[key] = [tuple(r) for r in con.fetchall()]
+    return set(_CATALOG_CACHE[key])
+
+
+def _seed_diff(con: Any, table: str) -> tuple[int, int]:
+    """(rows only in ref, rows only in tgt) of a seeded table whose digests differ."""
+    buckets = differing_keys(
+        _digests(con, "ref", bucket_sql(table)), _digests(con, "pg", bucket_sql(table))
+    )
+    if not buckets:
+        return 0, 0
+    in_buckets = ", ".join(f"'{b}'" for b in buckets)
+    sql = f'SELECT * FROM demos_app."{table}" AS t WHERE left(md5(t::text), 2) IN ({in_buckets})'
+    ref_rows = _passthrough(con, "ref", sql)
+    tgt_rows = _passthrough(con, "pg", sql)
+    return (
+        len(_except_rows(con, ref_rows, tgt_rows)),
+        len(_except_rows(con, tgt_rows, ref_rows)),
+    )
+
+
+def _collect_diffs(env: Env, seeded: list[str], *, require_empty: bool) -> GuardDiffs:
+    """Diff the session's ``pg`` (target) and ``ref`` catalogs and compute drift.
 
     Live-only (needs two reachable Postgres clusters); exercised in the
     integration tier, not the unit suite.
     """
-    import duckdb
-
-    con = duckdb.connect()
     diffs = GuardDiffs()
-    try:
-        con.execute("INSTALL postgres_scanner; LOAD postgres_scanner;")
-        con.execute(f"ATTACH '{_quote(reference_dsn)}' AS ref (TYPE postgres, READ_ONLY)")
-        con.execute(f"ATTACH '{_quote(target_dsn)}' AS tgt (TYPE postgres, READ_ONLY)")
-
-        ref_cols = _passthrough(con, "ref", _COLUMNS_SQL)
-        tgt_cols = _passthrough(con, "tgt", _COLUMNS_SQL)
-        diffs.columns_only_ref = _except_rows(con, ref_cols, tgt_cols)
-        diffs.columns_only_tgt = _except_rows(con, tgt_cols, ref_cols)
-
-        ref_fks = _passthrough(con, "ref", _FKS_SQL)
-        tgt_fks = _passthrough(con, "tgt", _FKS_SQL)
-        diffs.fks_only_ref = _except_rows(con, ref_fks, tgt_fks)
-        diffs.fks_only_tgt = _except_rows(con, tgt_fks, ref_fks)
-
-        for table in seeded:
-            if not _SAFE_IDENTIFIER.match(table):
-                log(f"WARNING: skipping unsafe seeded table name: {table!r}")
-                continue
-            sql = f'SELECT * FROM demos_app."{table}"'
-            ref_rows = _passthrough(con, "ref", sql)
-            tgt_rows = _passthrough(con, "tgt", sql)
-            only_ref = len(_except_rows(con, ref_rows, tgt_rows))
-            only_tgt = len(_except_rows(con, tgt_rows, ref_rows))
-            diffs.seed_diffs[table] = (only_ref, only_tgt)
+    safe: list[str] = []
+    for table in seeded:
+        if not _SAFE_IDENTIFIER.match(table):
+            log(f"WARNING: skipping unsafe seeded table name: {table!r}")
+            continue
+        safe.append(table)
+    with duck_connection(env, "ref", "pg") as con:
+        ref = _digests(con, "ref", digest_sql(safe))
+        tgt = _digests(con, "pg", digest_sql(safe))
+        drifted = set(differing_keys(ref, tgt))
+
+        for item, only_ref, only_tgt in (
+            ("columns", "columns_only_ref", "columns_only_tgt"),
+            ("fks", "fks_only_ref", "fks_only_tgt"),
+        ):
+            if item in drifted:
+                ref_rows = _catalog_rows(con, "ref", item, ref[item][1])
+                tgt_rows = _catalog_rows(con, "pg", item, tgt[item][1])
+                setattr(diffs, only_ref, sorted(ref_rows - tgt_rows))
+                setattr(diffs, only_tgt, sorted(tgt_rows - ref_rows))
+
+        for table in safe:
+            drift = f"seed:{table}" in drifted
+            diffs.seed_diffs[table] = _seed_diff(con, table) if drift else (0, 0)
 
         if require_empty:
-            con.execute(_passthrough(con, "tgt", _TABLE_COUNTS_SQL))
+            con.execute(_passthrough(con, "pg", _TABLE_COUNTS_SQL))
             seeded_set = set(seeded)
             for name, cnt in con.fetchall():
                 if str(name) not in seeded_set and int(cnt) > 0:
                     diffs.nonempty_tgt_tables[str(name)] = int(cnt)
-    finally:
-        con.close()
     return diffs
 
 
@@ -243,9 +327,7 @@ def run_prod_schema_guard(*, require_empty: bool = True, label: str = "guard") -
     if not seeded:
         log("prod-schema guard: state/prisma_seeded_tables.json absent; seed-row parity skipped")
 
-    diffs = _collect_diffs(
-        env.pg_dsn(), env.reference_pg_url, seeded, require_empty=require_empty
-    )
+    diffs = _collect_diffs(env, seeded, require_empty=require_empty)
     issues = summarize_guard(diffs)
 
     out: Path = RUNS_DIR / f"prod_schema_guard_{file_stamp()}.md"
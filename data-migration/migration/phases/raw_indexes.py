@@ -0,0 +1,323 @@
+"""Post-load ``ANALYZE`` + join-key index advisor for ``mysql_raw``.
+
+pgloader (and ``--engine=copy``) re-create the indexes MySQL declared, but
+the stg SQL joins ``mysql_raw`` on columns MySQL never indexed: ``*_cd``
+codes matched against the crosswalks and the FK candidates that
+``scripts/generate_fk_candidates.sql`` infers. Right after a bulk load the
+planner also has no statistics for any of it, which is how ``build_stg``
+ends up with nested loops over sequential scans.
+
+:func:`run_raw_indexes` runs at the end of ``load-full`` and ``delta``
+(``--no-raw-indexes`` skips it) and as ``migrate raw-indexes``:
+
+1. ``ANALYZE`` every ``mysql_raw`` table.
+2. Collect join-key candidates from the ``HIGH``-confidence rows of
+   ``reports/generated/fk_candidates.csv`` (both ends) and the
+   ``a.col = b.col`` predicates of the ``05_id_maps``/``10_stg`` SQL.
+3. ``CREATE INDEX CONCURRENTLY`` a btree on each candidate column that no
+   valid index leads with, skipping small tables and unselective columns
+   (soft-delete flags and other low-cardinality codes, where a btree does
+   not beat a scan).
+4. Price a single-key lookup on each new index's column with ``EXPLAIN``
+   before and after, and write every candidate's verdict to
+   ``reports/runs/raw_indexes_<stamp>.csv``.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import psycopg
+from psycopg import sql
+
+from migration.lib import (
+    RUNS_DIR,
+    SQL_DIR,
+    Env,
+    file_stamp,
+    log,
+    progress_for,
+    psql_exec_composed,
+    psql_query,
+    rel,
+)
+from migration.phases.build import STG_BUILD_DIRS
+from migration.phases.fk_candidates import OUT_CSV as FK_CANDIDATES_CSV
+
+# Tables below this many rows are scanned faster than they are probed.
+MIN_ROWS = 1_000
+# A column needs at least this many distinct values (or a negative,
+# row-count-relative n_distinct) before a btree on it is worth building.
+MIN_DISTINCT = 50
+
+_TABLE_REF_RE = re.compile(
+    r"\b(?:FROM|JOIN)\s+mysql_raw\.(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE
+)
+_EQUI_JOIN_RE = re.compile(r"(?<![\w.])(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)(?![\w.(])")
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+# Words that can follow a table reference where an alias would go.
+_NOT_ALIAS_RE = re.compile(
+    r"^(on|using|where|join|left|right|inner|full|cross|natural|lateral|group|order|limit"
+    r"|union|except|intersect|having|window|returning|set|for)$"
+)
+
+_CATALOG_SQL = """
+SELECT c.relname::text, a.attname::text, greatest(c.reltuples, 0)::bigint,
+       s.n_distinct,
+       EXISTS (SELECT 1 FROM pg_index i
+               WHERE i.indrelid = c.oid AND i.indisvalid AND i.indkey[0] = a.attnum)
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = 'mysql_raw'
+JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+LEFT JOIN pg_stats s
+  ON s.schemaname = 'mysql_raw' AND s.tablename = c.relname AND s.attname = a.attname
+WHERE c.relkind IN ('r', 'p')
+"""
+
+
+@dataclass
+class JoinKey:
+    """One candidate ``mysql_raw`` join column and what the advisor did with it."""
+
+    table: str
+    column: str
+    sources: set[str] = field(default_factory=set)
+    rows: int = 0
+    n_distinct: float | None = None
+    status: str = ""
+    index: str = ""
+    cost_before: float | None = None
+    cost_after: float | None = None
+    seconds: float = 0.0
+
+    @property
+    def cost_saved(self) -> float | None:
+        if self.cost_before is None or self.cost_after is None:
+            return None
+        return self.cost_before - self.cost_after
+
+
+def fk_candidate_keys(path: Path | None = None) -> dict[tuple[str, str], set[str]]:
+    """``(table, column)`` join keys from the HIGH-confidence FK candidates, both ends."""
+    csv_path = path or FK_CANDIDATES_CSV
+    out: dict[tuple[str, str], set[str]] = {}
+    if not csv_path.exists():
+        log(f"no {rel(csv_path)}; join keys come from the stg SQL only")
+        return out
+    with csv_path.open(encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if (row.get("confidence") or "").strip().upper() != "HIGH":
+                continue
+            ends = [
+                (row.get("from_table_qual") or "", row.get("from_column") or ""),
+                (row.get("to_table") or "", row.get("to_column") or ""),
+            ]
+            for table, column in ends:
+                table = table.strip().lower().removeprefix("mysql_raw.")
+                column = column.strip().lower()
+                if table and column:
+                    out.setdefault((table, column), set()).add("fk_candidates")
+    return out
+
+
+def sql_join_keys(files: list[Path]) -> dict[tuple[str, str], set[str]]:
+    """``(table, column)`` keys on either side of an ``a.col = b.col`` predicate.
+
+    Aliases are resolved per file from ``FROM``/``JOIN mysql_raw.<t> [AS] <a>``;
+    an alias reused for several tables maps to all of them, and the catalog
+    check in :func:`run_raw_indexes` discards the pairs that do not exist.
+    """
+    out: dict[tuple[str, str], set[str]] = {}
+    for path in files:
+        text = _COMMENT_RE.sub(" ", path.read_text(encoding="utf-8")).lower()
+        aliases: dict[str, set[str]] = {}
+        for table, alias in _TABLE_REF_RE.findall(text):
+            aliases.setdefault(table, set()).add(table)
+            if alias and not _NOT_ALIAS_RE.match(alias):
+                aliases.setdefault(alias, set()).add(table)
+        for m in _EQUI_JOIN_RE.finditer(text):
+            for alias, column in ((m[1], m[2]), (m[3], m[4])):
+                for table in aliases.get(alias, ()):
+                    out.setdefault((table, column), set()).add(rel(path))
+    return out
+
+
+def _stg_sql_files() -> list[Path]:
+    return [f for sub in STG_BUILD_DIRS for f in sorted((SQL_DIR / sub).glob("*.sql"))]
+
+
+def index_name(table: str, column: str) -> str:
+    """``<table>_<column>_jk``, shortened with a digest to Postgres' 63-byte limit."""
+    name = f"{table}_{column}_jk"
+    if len(name) <= 63:
+        return name
+    digest = hashlib.sha256(name.encode()).hexdigest()[:8]
+    return f"{name[:54]}_{digest}"
+
+
+def _lookup_cost(env: Env, table: str, column: str) -> float:
+    """Planner cost of fetching the rows for one key value of ``table.column``."""
+    ident = sql.Identifier("mysql_raw", table)
+    col = sql.Identifier(column)
+    query = sql.SQL(
+        "EXPLAIN (FORMAT JSON) SELECT * FROM {t} WHERE {c} = "
+        "(SELECT {c} FROM {t} WHERE {c} IS NOT NULL LIMIT 1)"
+    ).format(t=ident, c=col)
+    plan = psql_query(env, query.as_string())[0][0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return float(plan[0]["Plan"]["Total Cost"])
+
+
+def _create_index(env: Env, key: JoinKey) -> None:
+    """Build ``key``'s index concurrently; a failed build leaves no INVALID index."""
+    name = sql.Identifier("mysql_raw", key.index)
+    start = time.perf_counter()
+    try:
+        # Any index already under this name is an INVALID leftover of an
+        # interrupted build: a valid one would have put the key in "exists".
+        psql_exec_composed(env, sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(name))
+        psql_exec_composed(
+            env,
+            sql.SQL("CREATE INDEX CONCURRENTLY {} ON {} ({})").format(
+                sql.Identifier(key.index),
+                sql.Identifier("mysql_raw", key.table),
+                sql.Identifier(key.column),
+            ),
+        )
+    except psycopg.Error as e:
+        key.status = f"failed: {str(e).splitlines()[0] if str(e) else type(e).__name__}"
+        psql_exec_composed(env, sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(name))
+    else:
+        key.status = "created"
+    key.seconds = time.perf_counter() - start
+
+
+def _classify(key: JoinKey, indexed: bool) -> str:
+    if indexed:
+        return "exists"
+    if key.rows < MIN_ROWS:
+        return "small"
+    if key.n_distinct is not None and 0 <= key.n_distinct < MIN_DISTINCT:
+        return "unselective"
+    return "missing"
+
+
+def _write_report(keys: list[JoinKey]) -> Path:
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RUNS_DIR / f"raw_indexes_{file_stamp()}.csv"
+
+    def num(v: float | None) -> str:
+        return "" if v is None else f"{v:.2f}"
+
+    with out.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(
+            [
+                "table",
+                "column",
+                "rows",
+                "n_distinct",
+                "status",
+                "index",
+                "cost_before",
+                "cost_after",
+                "cost_saved",
+                "seconds",
+                "sources",
+            ]
+        )
+        for k in keys:
+            w.writerow(
+                [
+                    k.table,
+                    k.column,
+                    k.rows,
+                    num(k.n_distinct),
+                    k.status,
+                    k.index,
+                    num(k.cost_before),
+                    num(k.cost_after),
+                    num(k.cost_saved),
+                    f"{k.seconds:.3f}",
+                    ";".join(sorted(k.sources)),
+                ]
+            )
+    return out
+
+
+def run_raw_indexes(env: Env | None = None, *, dry_run: bool = False) -> Path:
+    """``ANALYZE`` ``mysql_raw`` and index its unindexed join keys; return the report.
+
+    ``dry_run`` analyzes and reports, marking the keys it would index as
+    ``would create``, without building anything. A failed index build is
+    recorded in the report and does not stop the run.
+    """
+    env = env or Env.load()
+    tables = [
+        str(r[0])
+        for r in psql_query(
+            env,
+            "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = 'mysql_raw' AND c.relkind IN ('r', 'p') ORDER BY c.relname",
+        )
+    ]
+    start = time.perf_counter()
+    with progress_for(len(tables), "analyze mysql_raw") as p:
+        for table in tables:
+            p.step(table)
+            psql_exec_composed(
+                env, sql.SQL("ANALYZE {}").format(sql.Identifier("mysql_raw", table))
+            )
+    log(f"analyzed {len(tables)} mysql_raw table(s) in {time.perf_counter() - start:.1f}s")
+
+    wanted = fk_candidate_keys()
+    for pair, sources in sql_join_keys(_stg_sql_files()).items():
+        wanted.setdefault(pair, set()).update(sources)
+    keys: list[JoinKey] = []
+    for table, column, rows, n_distinct, indexed in psql_query(env, _CATALOG_SQL):
+        sources = wanted.get((table, column))
+        if sources is None:
+            continue
+        key = JoinKey(
+            table,
+            column,
+            sources,
+            rows=int(rows),
+            n_distinct=None if n_distinct is None else float(n_distinct),
+        )
+        key.status = _classify(key, bool(indexed))
+        keys.append(key)
+    keys.sort(key=lambda k: (k.table, k.column))
+
+    missing = [k for k in keys if k.status == "missing"]
+    log(f"{len(keys)} join key(s) in mysql_raw; {len(missing)} without an index")
+    with progress_for(len(missing), "index mysql_raw join keys") as p:
+        for key in missing:
+            p.step(f"{key.table}.{key.column}")
+            key.index = index_name(key.table, key.column)
+            key.cost_before = _lookup_cost(env, key.table, key.column)
+            if dry_run:
+                key.status = "would create"
+                continue
+            _create_index(env, key)
+            if key.status == "created":
+                key.cost_after = _lookup_cost(env, key.table, key.column)
+                log(
+                    f"  {key.index}: {key.seconds:.1f}s, lookup cost "
+                    f"{key.cost_before:,.0f} -> {key.cost_after:,.0f}"
+                )
+            else:
+                log(f"  WARNING: {key.table}.{key.column}: {key.status}")
+
+    out = _write_report(keys)
+    created = [k for k in keys if k.status == "created"]
+    saved = sum(k.cost_saved or 0.0 for k in created)
+    log(f"raw indexes: {len(created)} created, lookup cost saved {saved:,.0f}; report: {rel(out)}")
+    return out
@@ -15,7 +15,9 @@ depends on: it attaches the source MySQL database ``READ_ONLY`` and runs each
 ``SELECT`` through DuckDB's ``mysql_query`` passthrough. Nothing is written
 back to MySQL and no credentials are persisted to disk. It does not require a
 prior ``load_full`` -- the point is to author crosswalks *before* the bulk
-load. Each artifact is a deterministic, diff-friendly CSV; a per-table or
+load. Each object is streamed by DuckDB ``COPY`` into a Parquet file and a
+deterministic, diff-friendly CSV, several at a time (the snapshot's
+:func:`~migration.phases.schema_snapshot.capture_all`); a per-table or
 per-view failure is logged and skipped so one bad object never aborts the run.
 """
 
@@ -23,25 +25,20 @@ from __future__ import annotations
 
 import json
 import re
+import time
 from pathlib import Path
-from urllib.parse import urlparse
 
+from migration.duck import duck_connection, mysql_query
 from migration.lib import (
     REFERENCE_DATA_DIR,
     Env,
     die,
-    file_stamp,
     log,
     rel,
-    ts,
 )
 
-# Reuse the snapshot's tested DuckDB/CSV helpers rather than duplicate them.
-from migration.phases.schema_snapshot import (
-    _mysql_attach_dsn,
-    _passthrough,
-    _write_csv,
-)
+# Reuse the snapshot's tested DuckDB capture helpers rather than duplicate them.
+from migration.phases.schema_snapshot import capture_all, capture_manifest
 
 # The source views worth materializing as reference data. Their result sets
 # (not their DDL, which the snapshot already captures) encode business rules:
@@ -84,65 +81,40 @@ def _dump_sql(name: str) -> str:
     return f"SELECT * FROM {name} ORDER BY 1"
 
 
-def run_reference_data_dump() -> None:
+def run_reference_data_dump(jobs: int = 4) -> None:
     """Dump every `*_rfrnc` table and the source views to reports/reference_data/.
 
-    Attaches the source database READ_ONLY through the DuckDB MySQL scanner,
-    discovers the lookup tables by name, and writes one CSV per table and per
-    view plus a ``_manifest.json`` audit record. A failure to attach (MySQL
-    unreachable) is fatal; an individual object that errors is logged and
-    skipped so the rest of the dump still completes.
+    Reads the source database through the process DuckDB session's READ_ONLY
+    ``src`` catalog (:func:`migration.duck.duck_connection`),
+    discovers the lookup tables by name, and writes a CSV + Parquet pair per
+    table and per view, ``jobs`` at a time, plus a ``_manifest.json`` audit
+    record with rows, bytes and seconds per object. A failure to attach
+    (MySQL unreachable) is fatal; an individual object that errors is logged
+    and skipped so the rest of the dump still completes.
     """
-    import duckdb
-
     env = Env.load()
     REFERENCE_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    dsn = _mysql_attach_dsn(env.mysql_url, env.mysql_db)
+    started = time.perf_counter()
 
-    con = duckdb.connect()
-    try:
-        con.execute("INSTALL mysql_scanner; LOAD mysql_scanner;")
-        dsn_literal = dsn.replace("'", "''")
+    with duck_connection(env, "src") as con:
         try:
-            con.execute(f"ATTACH '{dsn_literal}' AS src (TYPE mysql, READ_ONLY)")
-        except Exception as e:
-            die(f"could not attach MySQL source via DuckDB: {e}")
-
-        try:
-            _, rfrnc_rows = _passthrough(con, _RFRNC_LIST_SQL)
+            _, rfrnc_rows = mysql_query(con, _RFRNC_LIST_SQL)
         except Exception as e:
             die(f"could not list reference tables: {e}")
-        rfrnc_tables = [str(r[0]) for r in rfrnc_rows]
-        log(f"found {len(rfrnc_tables)} reference (*_rfrnc) tables")
-
-        counts: dict[str, int] = {}
-        for name in [*rfrnc_tables, *_VIEWS]:
-            if not _is_safe_identifier(name):
-                log(f"WARNING: skipping unsafe object name: {name!r}")
-                continue
-            out = REFERENCE_DATA_DIR / f"{name}.csv"
-            try:
-                header, rows = _passthrough(con, _dump_sql(name))
-            except Exception as e:
-                log(f"WARNING: dump of {name} failed, skipping: {e}")
-                continue
-            counts[f"{name}.csv"] = _write_csv(out, header, rows)
-            log(f"wrote {rel(out)} ({counts[f'{name}.csv']} rows)")
-    finally:
-        con.close()
-
-    manifest = {
-        "captured_at": ts(),
-        "stamp": file_stamp(),
-        "mysql_db": env.mysql_db or urlparse(env.mysql_url).path.lstrip("/"),
-        "duckdb_version": duckdb.__version__,
-        "row_counts": counts,
-    }
+    rfrnc_tables = [str(r[0]) for r in rfrnc_rows]
+    log(f"found {len(rfrnc_tables)} reference (*_rfrnc) tables")
+
+    dumps: list[tuple[str, str]] = []
+    for name in [*rfrnc_tables, *_VIEWS]:
+        if not _is_safe_identifier(name):
+            log(f"WARNING: skipping unsafe object name: {name!r}")
+            continue
+        dumps.append((f"{name}.csv", _dump_sql(name)))
+    captures = capture_all(env, REFERENCE_DATA_DIR, dumps, jobs=jobs)
+
+    manifest = capture_manifest(env, captures, time.perf_counter() - started)
     manifest_path: Path = REFERENCE_DATA_DIR / "_manifest.json"
     manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-    log(f"wrote {rel(manifest_path)}")
-
-    # Columnar companions for offline DuckDB analysis (role B); additive.
-    from migration.duck import csv_dir_to_parquet
-
-    csv_dir_to_parquet(REFERENCE_DATA_DIR)
+    log(
+        f"wrote {rel(manifest_path)} ({len(captures)} objects in {manifest['elapsed_seconds']:.1f}s)"
+    )
@@ -0,0 +1,262 @@
+"""Cutover-day delta replay onto a warm ``demos_app`` (``build --replay``).
+
+``migrate warm-build`` runs ``build_stg`` + ``build_app`` before the freeze,
+from a pre-freeze load, and records the database time it started in
+``state/warm_build.json``. On cutover day ``delta --incremental`` upserts
+only the changed source rows into ``mysql_raw``, bumping their
+``_loaded_at``. ``build --replay`` then rebuilds only what those rows feed:
+
+1. ``build_stg`` runs incrementally, so only the stg files whose inputs
+   changed are re-applied. The ``migration._id_map_*`` tables are
+   append-only (``ON CONFLICT DO NOTHING``), so every surviving legacy id
+   keeps its UUID.
+2. :func:`replay_changed_keys` deletes the ``demos_app`` rows keyed by the
+   UUID of any source row loaded after the warm build (:data:`REPLAY_KEYS`).
+   It then follows the captured Prisma FKs (``state/prisma_fks.json``) and
+   deletes every row left pointing at a key it deleted, so a changed
+   demonstration takes its deliverables, comments and role assignments with
+   it. Rows that were already orphaned in the warm build are left for
+   ``constraints`` to report.
+3. The ``demos_app`` build files are re-applied unchanged. They are
+   idempotent (``NOT EXISTS`` + ``ON CONFLICT DO NOTHING``), so they insert
+   exactly the deleted keys, with the post-freeze values and the same UUIDs,
+   plus any new rows. Delete-then-insert is the keyed upsert.
+
+Rows deleted in MySQL are not replayed, just as ``delta --incremental``
+does not remove them. Minted ``chip_id`` values of replayed demonstrations
+are minted again. ``constraints`` and ``parity`` then run as usual against
+the result.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime as dt
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from psycopg import sql
+
+from migration.lib import (
+    APP_SCHEMA,
+    PRISMA_FKS_FILE,
+    RUNS_DIR,
+    STATE_DIR,
+    Env,
+    die,
+    file_stamp,
+    log,
+    pg_connection,
+    rel,
+)
+
+WARM_BUILD_FILE: Path = STATE_DIR / "warm_build.json"
+
+# Every row the replay deletes, as (table, to_jsonb(row)); the FK cascade
+# starts only from these, never from rows orphaned before the replay.
+_GONE = sql.Identifier("pg_temp", "_replay_gone")
+
+_DEMONSTRATION = {"_id_map_mdcd_demo": (("application", "id"), ("demonstration", "id"))}
+_COMMENT = (("private_comment", "id"), ("public_comment", "id"))
+
+# Delta manifest table (pgloader/delta_tables.tsv) -> (the mysql_raw column
+# holding the legacy id an id map is keyed on, {id map: the demos_app
+# (table, column) pairs that carry that map's UUID}). Child tables reached
+# through a Prisma FK (application_date, tag and role assignments, ...) are
+# not listed: the cascade in replay_changed_keys covers them.
+REPLAY_KEYS: dict[str, tuple[str, dict[str, tuple[tuple[str, str], ...]]]] = {
+    "mdcd_demo": ("mdcd_demo_id", _DEMONSTRATION),
+    # Pending demos never load into demos_app (parity check 4); a change can
+    # only move the filter report and parity, which both re-run in full.
+    "mdcd_pendg_demo": ("mdcd_pendg_demo_id", {}),
+    "mdcd_demo_aplctn": ("mdcd_demo_id", _DEMONSTRATION),
+    "mdcd_demo_amndmt": (
+        "mdcd_demo_amndmt_id",
+        {"_id_map_mdcd_demo_amndmt": (("application", "id"), ("amendment", "id"))},
+    ),
+    "mdcd_demo_rnwl": ("mdcd_demo_id", _DEMONSTRATION),
+    "mdcd_dlvrbl": (
+        "mdcd_dlvrbl_id",
+        {
+            "_id_map_mdcd_dlvrbl": (("deliverable", "id"),),
+            "_id_map_override_note": (("private_comment", "id"),),
+        },
+    ),
+    "mdcd_dlvrbl_cmt": ("mdcd_dlvrbl_cmt_id", {"_id_map_mdcd_dlvrbl_cmt": _COMMENT}),
+    "mdcd_dlvrbl_paper_cmt": (
+        "mdcd_dlvrbl_paper_cmt_id",
+        {"_id_map_mdcd_dlvrbl_paper_cmt": _COMMENT},
+    ),
+    # Contacts only feed the stg filter today (the contact loader is deferred).
+    "mdcd_demo_cntct": ("mdcd_demo_id", {}),
+    "mdcd_pendg_demo_cntct": ("mdcd_pendg_demo_id", {}),
+    "users": ("id", {"_id_map_users": (("person", "id"), ("users", "id"))}),
+}
+
+_FK_RE = re.compile(
+    r"^FOREIGN KEY \((?P<cols>[^)]*)\) REFERENCES (?P<ref>[^(]+)\((?P<refcols>[^)]*)\)"
+)
+
+
+def _unquote(name: str) -> str:
+    name = name.strip()
+    if name.startswith('"') and name.endswith('"'):
+        return name[1:-1].replace('""', '"')
+    return name
+
+
+def parse_fk(definition: str) -> tuple[list[str], str, list[str]]:
+    """Split a ``pg_get_constraintdef`` FK into (columns, parent table, parent columns)."""
+    m = _FK_RE.match(definition)
+    if m is None:
+        die(f"cannot parse captured FK definition: {definition!r}")
+    cols = [_unquote(c) for c in m["cols"].split(",")]
+    parent = _unquote(m["ref"].strip().split(".")[-1])
+    refcols = [_unquote(c) for c in m["refcols"].split(",")]
+    return cols, parent, refcols
+
+
+def write_warm_mark(built_at: dt.datetime, materialized: bool) -> None:
+    STATE_DIR.mkdir(exist_ok=True)
+    WARM_BUILD_FILE.write_text(
+        json.dumps({"built_at": built_at.isoformat(), "materialized": materialized}, indent=2)
+        + "\n",
+        encoding="utf-8",
+    )
+    log(f"wrote {rel(WARM_BUILD_FILE)} (warm build started {built_at.isoformat()})")
+
+
+def read_warm_mark() -> str:
+    """Return the warm build's start time; dies when there has been no warm build."""
+    if not WARM_BUILD_FILE.exists():
+        die(f"no {rel(WARM_BUILD_FILE)}; run `migrate warm-build` before the freeze")
+    return str(json.loads(WARM_BUILD_FILE.read_text(encoding="utf-8"))["built_at"])
+
+
+def _record_gone(table: str, delete: sql.Composed) -> sql.Composed:
+    """Log the rows ``delete`` removes in :data:`_GONE` under ``table``.
+
+    ``delete`` must end ``RETURNING to_jsonb(<alias>) AS row``. The wrapped
+    statement's rowcount is still the number of rows deleted.
+    """
+    return sql.SQL(
+        "WITH gone AS ({delete}) INSERT INTO {gone} (tbl, row) SELECT {table}, row FROM gone"
+    ).format(delete=delete, gone=_GONE, table=sql.Literal(table))
+
+
+def _key_deletes(cur: Any, built_at: str) -> list[tuple[str, int, str, int]]:
+    """Delete every demos_app row keyed by a source row loaded after ``built_at``."""
+    rows: list[tuple[str, int, str, int]] = []
+    for source, (key, maps) in REPLAY_KEYS.items():
+        changed = cur.execute(
+            sql.SQL("SELECT count(*) FROM {} WHERE _loaded_at > %s::timestamptz").format(
+                sql.Identifier("mysql_raw", source)
+            ),
+            [built_at],
+        ).fetchone()[0]
+        if not changed:
+            continue
+        for id_map, targets in maps.items():
+            for table, column in targets:
+                delete = sql.SQL(
+                    "DELETE FROM {tbl} t USING {map} m "
+                    "WHERE t.{col} = m.new_uuid AND m.legacy_int_id IN "
+                    "(SELECT s.{key} FROM {src} s WHERE s._loaded_at > %s::timestamptz) "
+                    "RETURNING to_jsonb(t) AS row"
+                ).format(
+                    tbl=sql.Identifier(APP_SCHEMA, table),
+                    map=sql.Identifier("migration", id_map),
+                    col=sql.Identifier(column),
+                    key=sql.Identifier(key),
+                    src=sql.Identifier("mysql_raw", source),
+                )
+                cur.execute(_record_gone(table, delete), [built_at])
+                rows.append((source, int(changed), f"{table}.{column}", cur.rowcount))
+        if not maps:
+            rows.append((source, int(changed), "", 0))
+    return rows
+
+
+def _cascade_deletes(cur: Any, fks: list[dict[str, str]], seeded: set[str]) -> Counter[str]:
+    """Delete child rows whose FK parent the replay deleted, until a full pass deletes nothing.
+
+    Only parents recorded in :data:`_GONE` (by :func:`_key_deletes` or an
+    earlier pass) are followed, and only when no parent row with that key
+    remains; rows orphaned before the replay stay. Mirrors the captured FKs
+    (``MATCH SIMPLE``: a row with a NULL key column is never an orphan).
+    Prisma-seeded lookups are never deleted from.
+    """
+    deletes: list[tuple[str, sql.Composed]] = []
+    for fk in fks:
+        if fk["table"] in seeded:
+            continue
+        cols, parent, refcols = parse_fk(fk["definition"])
+        delete = sql.SQL(
+            "DELETE FROM {child} c USING "
+            "(SELECT (jsonb_populate_record(NULL::{parent}, row)).* FROM {gone} "
+            "WHERE tbl = {parent_name}) g "
+            "WHERE {via_gone} AND NOT EXISTS (SELECT 1 FROM {parent} p WHERE {match}) "
+            "RETURNING to_jsonb(c) AS row"
+        ).format(
+            child=sql.Identifier(APP_SCHEMA, fk["table"]),
+            parent=sql.Identifier(APP_SCHEMA, parent),
+            gone=_GONE,
+            parent_name=sql.Literal(parent),
+            via_gone=sql.SQL(" AND ").join(
+                sql.SQL("c.{} = g.{}").format(sql.Identifier(c), sql.Identifier(r))
+                for c, r in zip(cols, refcols, strict=True)
+            ),
+            match=sql.SQL(" AND ").join(
+                sql.SQL("p.{} = c.{}").format(sql.Identifier(r), sql.Identifier(c))
+                for c, r in zip(cols, refcols, strict=True)
+            ),
+        )
+        deletes.append((fk["table"], _record_gone(fk["table"], delete)))
+    deleted: Counter[str] = Counter()
+    while True:
+        removed = 0
+        for table, stmt in deletes:
+            cur.execute(stmt)
+            deleted[table] += cur.rowcount
+            removed += cur.rowcount
+        if not removed:
+            return +deleted
+
+
+def replay_changed_keys(env: Env, built_at: str, seeded: list[str]) -> Path:
+    """Delete the demos_app rows the post-``built_at`` source rows feed; return the report.
+
+    Key deletes and the FK cascade share one transaction. The per-source
+    counts go to ``reports/runs/warm_replay_<stamp>.csv``.
+    """
+    if not PRISMA_FKS_FILE.exists():
+        die(f"missing {rel(PRISMA_FKS_FILE)}; run `migrate ddl` first")
+    fks = json.loads(PRISMA_FKS_FILE.read_text(encoding="utf-8"))
+    with pg_connection(env) as conn, conn.transaction(), conn.cursor() as cur:
+        cur.execute(
+            sql.SQL(
+                "CREATE TEMP TABLE {} (tbl text NOT NULL, row jsonb NOT NULL) ON COMMIT DROP"
+            ).format(_GONE)
+        )
+        keyed = _key_deletes(cur, built_at)
+        cascaded = _cascade_deletes(cur, fks, set(seeded))
+
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RUNS_DIR / f"warm_replay_{file_stamp()}.csv"
+    with out.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["kind", "source", "changed_rows", "target", "deleted"])
+        for source, changed, target, n in keyed:
+            w.writerow(["key", source, changed, target, n])
+        for table, n in sorted(cascaded.items()):
+            w.writerow(["cascade", "", "", table, n])
+    changed_rows = sum({s: c for s, c, _, _ in keyed}.values())
+    log(
+        f"replay: {changed_rows} source row(s) loaded since {built_at}; deleted "
+        f"{sum(n for *_, n in keyed)} keyed and {sum(cascaded.values())} dependent "
+        f"demos_app row(s); report: {rel(out)}"
+    )
+    return out
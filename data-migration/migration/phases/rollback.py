@@ -2,14 +2,16 @@
 
 PMDA (legacy) and DEMOS (new) are separate apps on separate URLs, so
 rollback does not involve a DNS or load-balancer revert; the dev team
-owns the URL/redirect work outside this repo. This phase records the
+owns the URL/redirect work outside this repo. A blue/green cutover
+(``BLUE_GREEN``) also renames the previous ``demos_app`` back into place. This phase records the
 operator decision and walks the operator through the manual coordination
 steps with the DBA and dev team.
 """
 
 from __future__ import annotations
 
-from migration.lib import clear_gate, confirm, die, log
+from migration.lib import APP_SCHEMA, Env, clear_gate, confirm, die, log
+from migration.phases.blue_green import PREVIOUS_SCHEMA, schema_exists, swap_back
 
 
 def run_rollback() -> None:
@@ -20,11 +22,22 @@ def run_rollback() -> None:
     ``flip`` and ``smoke`` gates so the cutover is no longer marked
     complete. ``freeze``, ``delta``, ``build``, and ``parity`` remain
     satisfied because their on-disk state is still valid.
+
+    With ``BLUE_GREEN`` set and a ``demos_app_prev`` left by ``flip``, the
+    previous schema is renamed back to ``demos_app`` first
+    (:func:`migration.phases.blue_green.swap_back`).
     """
     log("ROLLBACK: this restores PMDA to read-write and places DEMOS in read-only.")
+    env = Env.load()
+    swap = env.blue_green and schema_exists(env, PREVIOUS_SCHEMA)
+    if swap:
+        log(f"  blue/green: {PREVIOUS_SCHEMA} will be renamed back to {APP_SCHEMA}")
     if not confirm("type 'rollback' to proceed:", expected="rollback"):
         die("rollback not confirmed")
 
+    if swap:
+        swap_back(env)
+
     log("1. PMDA restored to read-write mode (manual; coordinate with DBA)")
     log("2. DEMOS placed in read-only with banner (manual; coordinate with dev team)")
     log("3. Send rollback comms (use runbooks/comms/rollback.md)")
@@ -17,10 +17,12 @@ to MySQL, and -- unlike the rendered pgloader ``.load`` file -- no
 credentials are persisted to disk.
 
 The full source is captured (the pgloader drop list is *not* applied) so
-tables slated for exclusion remain visible for review. Each artifact is a
-deterministic, diff-friendly CSV; a missing or empty result (e.g. a source
-with no declared FKs) yields a header-only file plus a log note rather than
-an error.
+tables slated for exclusion remain visible for review. Each capture is
+streamed by DuckDB ``COPY`` straight into a typed Parquet file and a
+deterministic, diff-friendly CSV (:func:`migration.duck.copy_to_files`), and
+the captures run ``jobs`` at a time on their own session cursors
+(:func:`capture_all`). A missing or empty result (e.g. a source with no
+declared FKs) yields a header-only file plus a log note rather than an error.
 """
 
 from __future__ import annotations
@@ -28,14 +30,24 @@ from __future__ import annotations
 import csv
 import json
 import re
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
-from urllib.parse import unquote, urlparse
+from urllib.parse import urlparse
 
+from migration.duck import (
+    copy_to_files,
+    duck_connection,
+    mysql_query,
+    mysql_query_sql,
+    to_parquet,
+)
 from migration.lib import (
     SCHEMA_SNAPSHOT_DIR,
     Env,
-    die,
     file_stamp,
     log,
     rel,
@@ -118,27 +130,6 @@ _ENUM_SQL = (
 _ENUM_HEADER = ("table_name", "column_name", "data_type", "enum_ordinal", "enum_value", "column_comment")
 
 
-def _mysql_attach_dsn(mysql_url: str, mysql_db: str) -> str:
-    """Build a DuckDB MySQL ATTACH DSN from the connection URL + database name.
-
-    Accepts a standard MySQL connection URL; ``mysql_db`` takes
-    precedence over the URL path for the database name. Percent-encoded
-    credentials are decoded. Empty components are omitted so DuckDB applies
-    its own defaults. The host defaults to ``localhost`` and the port to
-    ``3306`` when absent.
-    """
-    u = urlparse(mysql_url)
-    db = mysql_db or u.path.lstrip("/")
-    parts = {
-        "host": u.hostname or "localhost",
-        "port": str(u.port or 3306),
-        "user": unquote(u.username) if u.username else "",
-        "password": unquote(u.password) if u.password else "",
-        "database": db,
-    }
-    return " ".join(f"{k}={v}" for k, v in parts.items() if v != "")
-
-
 def _parse_enum_values(column_type: str) -> list[str]:
     """Return the ordered value list from a MySQL ``enum(...)``/``set(...)`` type.
 
@@ -187,84 +178,113 @@ def _write_csv(path: Path, header: list[str], rows: list[tuple[Any, ...]]) -> in
     return len(rows)
 
 
-def _passthrough(con: Any, mysql_sql: str) -> tuple[list[str], list[tuple[Any, ...]]]:
-    """Run one MySQL query via DuckDB's mysql_query passthrough.
-
-    The authored query is embedded into the ``mysql_query('src', '...')``
-    call with single quotes doubled; the queries are static constants in this
-    module (never built from external input), so this is safe.
-    """
-    escaped = mysql_sql.replace("'", "''")
-    cur = con.execute(f"SELECT * FROM mysql_query('src', '{escaped}')")
-    header = [d[0] for d in cur.description]
-    return header, cur.fetchall()
-
-
-def run_schema_snapshot() -> None:
-    """Capture the source MySQL information_schema into reports/schema_snapshot/.
+@dataclass(frozen=True)
+class Capture:
+    """One written capture: rows, CSV + Parquet bytes on disk, and wall time."""
 
-    Attaches the source database READ_ONLY through the DuckDB MySQL scanner
-    and writes one CSV per metadata slice (columns, enums, foreign keys,
-    table stats, views, indexes, triggers, check constraints) plus a
-    ``_manifest.json`` audit record. A failure to attach (MySQL unreachable)
-    is fatal; an individual capture that errors or returns nothing is logged
-    and skipped so the rest of the snapshot still completes.
-    """
-    import duckdb
+    rows: int
+    bytes: int
+    seconds: float
 
-    env = Env.load()
-    SCHEMA_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
-    dsn = _mysql_attach_dsn(env.mysql_url, env.mysql_db)
 
-    con = duckdb.connect()
+def _capture(env: Env, directory: Path, filename: str, mysql_sql: str) -> Capture:
+    stem = directory / Path(filename).stem
+    started = time.perf_counter()
     try:
-        con.execute("INSTALL mysql_scanner; LOAD mysql_scanner;")
-        dsn_literal = dsn.replace("'", "''")
-        try:
-            con.execute(f"ATTACH '{dsn_literal}' AS src (TYPE mysql, READ_ONLY)")
-        except Exception as e:
-            die(f"could not attach MySQL source via DuckDB: {e}")
+        with duck_connection(env, "src") as con:
+            rows = copy_to_files(con, mysql_query_sql(mysql_sql), stem)
+    except Exception:
+        for suffix in (".csv", ".parquet"):
+            stem.with_suffix(suffix).unlink(missing_ok=True)
+        raise
+    size = sum(stem.with_suffix(s).stat().st_size for s in (".csv", ".parquet"))
+    return Capture(rows, size, round(time.perf_counter() - started, 3))
+
 
-        counts: dict[str, int] = {}
+def capture_all(
+    env: Env, directory: Path, captures: Sequence[tuple[str, str]], *, jobs: int
+) -> dict[str, Capture]:
+    """Write each ``(filename, MySQL SQL)`` capture to ``directory``, ``jobs`` at a time.
 
-        for filename, mysql_sql in _CAPTURES:
-            out = SCHEMA_SNAPSHOT_DIR / filename
+    A capture that errors is logged and skipped. Results keep ``captures`` order.
+    """
+    done: dict[str, Capture] = {}
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="capture") as pool:
+        futures = {
+            pool.submit(_capture, env, directory, filename, mysql_sql): filename
+            for filename, mysql_sql in captures
+        }
+        for future in as_completed(futures):
+            filename = futures[future]
             try:
-                header, rows = _passthrough(con, mysql_sql)
+                done[filename] = future.result()
             except Exception as e:
                 log(f"WARNING: capture {filename} failed, skipping: {e}")
                 continue
-            counts[filename] = _write_csv(out, header, rows)
-            log(f"wrote {rel(out)} ({counts[filename]} rows)")
+            c = done[filename]
+            log(f"wrote {rel(directory / filename)} ({c.rows} rows, {c.seconds:.1f}s)")
+    return {filename: done[filename] for filename, _ in captures if filename in done}
+
 
-        # Derived enum domains (exploded one row per value).
-        try:
-            _, enum_cols = _passthrough(con, _ENUM_SQL)
-        except Exception as e:
-            log(f"WARNING: enum capture failed, skipping: {e}")
-            enum_cols = []
-        enum_rows: list[tuple[Any, ...]] = []
-        for table_name, column_name, data_type, column_type, comment in enum_cols:
-            for ordinal, value in enumerate(_parse_enum_values(str(column_type)), start=1):
-                enum_rows.append((table_name, column_name, data_type, ordinal, value, comment))
-        enum_out = SCHEMA_SNAPSHOT_DIR / "enums.csv"
-        counts["enums.csv"] = _write_csv(enum_out, list(_ENUM_HEADER), enum_rows)
-        log(f"wrote {rel(enum_out)} ({counts['enums.csv']} rows)")
-    finally:
-        con.close()
+def capture_manifest(env: Env, captures: dict[str, Capture], seconds: float) -> dict[str, Any]:
+    """The ``_manifest.json`` audit record shared by the snapshot and the reference dump."""
+    import duckdb
 
-    manifest = {
+    return {
         "captured_at": ts(),
         "stamp": file_stamp(),
         "mysql_db": env.mysql_db or urlparse(env.mysql_url).path.lstrip("/"),
         "duckdb_version": duckdb.__version__,
-        "row_counts": counts,
+        "row_counts": {f: c.rows for f, c in captures.items()},
+        "bytes": {f: c.bytes for f, c in captures.items()},
+        "seconds": {f: c.seconds for f, c in captures.items()},
+        "elapsed_seconds": round(seconds, 3),
     }
-    manifest_path = SCHEMA_SNAPSHOT_DIR / "_manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-    log(f"wrote {rel(manifest_path)}")
 
-    # Columnar companions for offline DuckDB analysis (role B); additive.
-    from migration.duck import csv_dir_to_parquet
 
-    csv_dir_to_parquet(SCHEMA_SNAPSHOT_DIR)
+def run_schema_snapshot(jobs: int = 4) -> None:
+    """Capture the source MySQL information_schema into reports/schema_snapshot/.
+
+    Reads the source database through the process DuckDB session's READ_ONLY
+    ``src`` catalog (:func:`migration.duck.duck_connection`)
+    and writes a CSV + Parquet pair per metadata slice (columns, enums,
+    foreign keys, table stats, views, indexes, triggers, check constraints)
+    plus a ``_manifest.json`` audit record with rows, bytes and seconds per
+    capture. A failure to attach (MySQL unreachable) is fatal; an individual
+    capture that errors or returns nothing is logged and skipped so the rest
+    of the snapshot still completes.
+    """
+    env = Env.load()
+    SCHEMA_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    captures = capture_all(env, SCHEMA_SNAPSHOT_DIR, _CAPTURES, jobs=jobs)
+
+    # Derived enum domains (exploded one row per value).
+    enum_started = time.perf_counter()
+    try:
+        with duck_connection(env, "src") as con:
+            _, enum_cols = mysql_query(con, _ENUM_SQL)
+    except Exception as e:
+        log(f"WARNING: enum capture failed, skipping: {e}")
+        enum_cols = []
+    enum_rows: list[tuple[Any, ...]] = []
+    for table_name, column_name, data_type, column_type, comment in enum_cols:
+        for ordinal, value in enumerate(_parse_enum_values(str(column_type)), start=1):
+            enum_rows.append((table_name, column_name, data_type, ordinal, value, comment))
+    enum_out = SCHEMA_SNAPSHOT_DIR / "enums.csv"
+    n = _write_csv(enum_out, list(_ENUM_HEADER), enum_rows)
+    enum_parquet = to_parquet(enum_out)
+    captures["enums.csv"] = Capture(
+        n,
+        enum_out.stat().st_size + enum_parquet.stat().st_size,
+        round(time.perf_counter() - enum_started, 3),
+    )
+    log(f"wrote {rel(enum_out)} ({n} rows)")
+
+    manifest = capture_manifest(env, captures, time.perf_counter() - started)
+    manifest_path = SCHEMA_SNAPSHOT_DIR / "_manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    log(
+        f"wrote {rel(manifest_path)} ({len(captures)} captures in {manifest['elapsed_seconds']:.1f}s)"
+    )
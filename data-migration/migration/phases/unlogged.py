@@ -0,0 +1,226 @@
+"""Opt-in UNLOGGED build of ``mysql_raw`` and ``stg`` (``UNLOGGED_BUILD=true``).
+
+Both schemas are rebuilt from MySQL on every rehearsal, yet every pgloader
+write and every stg insert is WAL-logged, and on RDS that write
+amplification throttles the load. With ``Env.unlogged_build`` set:
+
+* ``load_full`` needs ``--engine copy``, which creates the tables UNLOGGED
+  before any row lands. pgloader creates logged tables: its copy would be
+  WAL-logged in full, and a later ``SET UNLOGGED`` only adds a rewrite, so
+  ``load_full`` refuses that engine in this mode.
+* ``delta`` and ``build_stg`` first convert whatever in their schema is still
+  logged (:func:`set_unlogged`), so the TRUNCATE + re-pull and the stg writes
+  skip WAL too. The conversion runs before the WAL meter starts: its
+  rewrite is a cost of the mode, not WAL a logged build would have written.
+* ``build_app`` ends with :func:`run_set_logged` (also ``migrate set-logged``)
+  so the cutover does not rely on tables a crash would empty.
+
+``demos_app``, the ``migration`` id maps and ``mysql_raw._delta_log`` (the
+freeze bookkeeping) are never converted: none of them can be re-derived
+from MySQL. The stg ``*_resolved`` snapshots stay UNLOGGED in every mode.
+
+Each metered phase appends two figures to ``state/unlogged_wal.json``: its
+measured WAL (the ``pg_current_wal_lsn`` delta) and an estimate of what it
+wrote to UNLOGGED tables (:func:`unlogged_bytes_written`). A logged build
+would have written at least that estimate as WAL. :func:`run_set_logged`
+adds the WAL that ``SET LOGGED`` pays back and writes the comparison to ``reports/runs/unlogged_wal_<stamp>.md``.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import re
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import LiteralString
+
+from psycopg import sql
+
+from migration.lib import (
+    RUNS_DIR,
+    STATE_DIR,
+    Env,
+    file_stamp,
+    log,
+    progress_for,
+    psql_exec_composed,
+    psql_query,
+    rel,
+)
+
+SCHEMAS = ("mysql_raw", "stg")
+WAL_LEDGER_FILE: Path = STATE_DIR / "unlogged_wal.json"
+
+# Relations left alone by both directions: the freeze / high-water-mark
+# bookkeeping must survive a crash, and build_stg's snapshots are UNLOGGED by
+# design (see migration.phases.build._materialize_view).
+_KEEP_LOGGED = frozenset({"mysql_raw._delta_log"})
+_SNAPSHOT_RE = re.compile(r"^stg\.\w+_resolved$")
+
+_TABLES_SQL = """
+SELECT n.nspname || '.' || c.relname
+FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND c.relpersistence = %s
+ORDER BY c.relname
+"""
+_UNLOGGED_FOOTPRINT_SQL = """
+SELECT c.oid::bigint, c.relfilenode::bigint, pg_total_relation_size(c.oid)::bigint
+FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = ANY(%s) AND c.relkind IN ('r', 'p') AND c.relpersistence = 'u'
+"""
+
+
+def _tables(env: Env, schema: str, persistence: str) -> list[str]:
+    """Base tables of ``schema`` with ``relpersistence`` = ``persistence``."""
+    return [
+        str(r[0])
+        for r in psql_query(env, _TABLES_SQL, [schema, persistence])
+        if str(r[0]) not in _KEEP_LOGGED and not _SNAPSHOT_RE.match(str(r[0]))
+    ]
+
+
+def _alter_each(env: Env, tables: list[str], action: LiteralString) -> None:
+    with progress_for(len(tables), action.lower()) as p:
+        for table in tables:
+            p.step(table)
+            schema, name = table.split(".", 1)
+            psql_exec_composed(
+                env,
+                sql.SQL("ALTER TABLE {} {}").format(sql.Identifier(schema, name), sql.SQL(action)),
+            )
+
+
+def set_unlogged(env: Env, schema: str) -> int:
+    """Convert ``schema``'s logged tables to UNLOGGED; return how many changed."""
+    tables = _tables(env, schema, "p")
+    _alter_each(env, tables, "SET UNLOGGED")
+    if tables:
+        log(f"unlogged build: {len(tables)} {schema} table(s) set UNLOGGED")
+    return len(tables)
+
+
+def wal_lsn(env: Env) -> str:
+    return str(psql_query(env, "SELECT pg_current_wal_lsn()::text")[0][0])
+
+
+def wal_bytes_since(env: Env, lsn: str) -> int:
+    rows = psql_query(env, "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)::bigint", [lsn])
+    return int(rows[0][0])
+
+
+def _read_ledger() -> list[dict]:
+    if not WAL_LEDGER_FILE.exists():
+        return []
+    return json.loads(WAL_LEDGER_FILE.read_text(encoding="utf-8"))
+
+
+def _append_ledger(entry: dict) -> None:
+    ledger = _read_ledger()
+    ledger.append(entry)
+    WAL_LEDGER_FILE.parent.mkdir(parents=True, exist_ok=True)
+    WAL_LEDGER_FILE.write_text(json.dumps(ledger, indent=2) + "\n", encoding="utf-8")
+
+
+def _unlogged_footprint(env: Env) -> dict[int, tuple[int, int]]:
+    """``{oid: (relfilenode, total bytes)}`` of every UNLOGGED mysql_raw/stg table."""
+    rows = psql_query(env, _UNLOGGED_FOOTPRINT_SQL, [list(SCHEMAS)])
+    return {int(oid): (int(node), int(size)) for oid, node, size in rows}
+
+
+def unlogged_bytes_written(
+    before: dict[int, tuple[int, int]], after: dict[int, tuple[int, int]]
+) -> int:
+    """Estimate the UNLOGGED bytes a phase wrote from two footprints.
+
+    A table that is new, or whose relfilenode changed (rewrite, TRUNCATE,
+    ``SET UNLOGGED``), counts in full; one that kept its file counts its growth.
+    """
+    total = 0
+    for oid, (node, size) in after.items():
+        prev = before.get(oid)
+        total += size if prev is None or prev[0] != node else max(size - prev[1], 0)
+    return total
+
+
+@contextmanager
+def wal_meter(env: Env, phase: str) -> Generator[None]:
+    """Record ``phase``'s WAL and UNLOGGED writes in the ledger when enabled.
+
+    A no-op unless ``env.unlogged_build``. Nothing is recorded for a phase
+    that raises.
+    """
+    if not env.unlogged_build:
+        yield
+        return
+    start_lsn = wal_lsn(env)
+    before = _unlogged_footprint(env)
+    start = time.perf_counter()
+    yield
+    wal = wal_bytes_since(env, start_lsn)
+    unlogged = unlogged_bytes_written(before, _unlogged_footprint(env))
+    _append_ledger(
+        {
+            "phase": phase,
+            "at": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+            "seconds": round(time.perf_counter() - start, 3),
+            "wal_bytes": wal,
+            "unlogged_bytes": unlogged,
+        }
+    )
+    log(f"unlogged build: {phase} wrote {_mb(wal)} of WAL and ~{_mb(unlogged)} UNLOGGED")
+
+
+def _mb(n: float) -> str:
+    return f"{n / 2**20:,.1f} MB"
+
+
+def wal_report_markdown(ledger: list[dict], set_logged_bytes: int) -> str:
+    """Render the per-phase WAL ledger plus the ``SET LOGGED`` pay-back."""
+    lines = [
+        "# Unlogged build WAL",
+        "",
+        "`UNLOGGED MB` estimates what the phase wrote to UNLOGGED mysql_raw/stg tables",
+        "(rewritten or new tables in full, otherwise their growth). A logged build",
+        "writes at least that much WAL for the same work.",
+        "",
+        "| Phase | At | Seconds | WAL written MB | UNLOGGED MB |",
+        "|---|---|---|---|---|",
+    ]
+    for e in ledger:
+        lines.append(
+            f"| {e['phase']} | {e['at']} | {e['seconds']:.1f} | "
+            f"{e['wal_bytes'] / 2**20:,.1f} | {e['unlogged_bytes'] / 2**20:,.1f} |"
+        )
+    avoided = sum(e["unlogged_bytes"] for e in ledger)
+    lines.extend(
+        [
+            "",
+            f"* WAL avoided (at least): {_mb(avoided)}",
+            f"* WAL paid back by SET LOGGED: {_mb(set_logged_bytes)}",
+            f"* Net WAL saved (at least): {_mb(avoided - set_logged_bytes)}",
+            "",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def run_set_logged(env: Env | None = None) -> Path:
+    """``SET LOGGED`` every UNLOGGED ``mysql_raw``/``stg`` table; write the WAL report.
+
+    Runs regardless of ``env.unlogged_build`` so an operator can always make
+    the schemas crash-safe again. Clears the ledger.
+    """
+    env = env or Env.load()
+    tables = [t for schema in SCHEMAS for t in _tables(env, schema, "u")]
+    start_lsn = wal_lsn(env)
+    _alter_each(env, tables, "SET LOGGED")
+    paid = wal_bytes_since(env, start_lsn)
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RUNS_DIR / f"unlogged_wal_{file_stamp()}.md"
+    out.write_text(wal_report_markdown(_read_ledger(), paid), encoding="utf-8")
+    WAL_LEDGER_FILE.unlink(missing_ok=True)
+    log(f"set {len(tables)} table(s) LOGGED ({_mb(paid)} of WAL); report: {rel(out)}")
+    return out
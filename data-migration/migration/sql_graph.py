@@ -0,0 +1,125 @@
+"""Dependency graph over the pipeline's SQL files, read from their front-matter.
+
+Every authored transform file declares ``Inputs:`` and ``Outputs:`` in its
+leading comment block (``scripts/check_sql_frontmatter.py`` enforces the
+labels; docs/developer/reference-sql-conventions.adoc is the template). This
+module turns those declarations into schema-qualified relation sets and
+links each file to the earlier files that produce what it reads, so callers
+can rebuild only the part of a layer downstream of a change.
+
+Only ``schema.relation`` tokens in the four pipeline schemas are taken from
+the prose; anything else in the field (verbs, ``-``) is ignored, and so
+is any parenthesised note -- "(guarded no-op until stg.x exists)" names a
+relation without reading or writing it. Files in the mechanical layers
+(``05_id_maps``) carry no Inputs/Outputs and come back with empty sets.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+_FIELD_RE = re.compile(r"^\s*(?:--|\*)?\s*([A-Z][A-Za-z]*)\s*:\s?(.*)$")
+_RELATION_RE = re.compile(r"\b(mysql_raw|stg|migration|demos_app)\.([A-Za-z_][A-Za-z0-9_]*)\b")
+_PAREN_RE = re.compile(r"\([^()]*\)")
+
+
+def _leading_comment(text: str) -> str:
+    """The file's leading comment block (``/* ... */`` or a run of ``--`` lines)."""
+    stripped = text.lstrip()
+    if stripped.startswith("/*"):
+        end = stripped.find("*/")
+        return stripped[: end if end != -1 else len(stripped)]
+    lines: list[str] = []
+    for line in stripped.splitlines():
+        if not line.lstrip().startswith("--"):
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def frontmatter_fields(text: str) -> dict[str, str]:
+    """Return ``{label: value}`` for every ``Label:`` line in the leading comment.
+
+    Only the line carrying the label is kept; the free prose below the
+    structured block is not part of any field.
+    """
+    fields: dict[str, str] = {}
+    for line in _leading_comment(text).splitlines():
+        m = _FIELD_RE.match(line)
+        if m and m.group(1) not in fields:
+            fields[m.group(1)] = m.group(2).strip()
+    return fields
+
+
+def relations(value: str) -> frozenset[str]:
+    """The ``schema.relation`` names mentioned in a front-matter field, lower-cased."""
+    prose = _PAREN_RE.sub("", value)
+    return frozenset(f"{s}.{r}".lower() for s, r in _RELATION_RE.findall(prose))
+
+
+@dataclass(frozen=True)
+class SqlNode:
+    """One SQL file with its declared inputs, outputs and content hash."""
+
+    path: Path
+    inputs: frozenset[str]
+    outputs: frozenset[str]
+    sha256: str
+
+
+def read_node(path: Path) -> SqlNode:
+    """Parse ``path``'s front-matter into a :class:`SqlNode`."""
+    raw = path.read_bytes()
+    fields = frontmatter_fields(raw.decode("utf-8"))
+    outputs = relations(fields.get("Outputs", ""))
+    # A file that reads back what it writes (e.g. an id map joined while
+    # being populated) does not depend on itself.
+    inputs = relations(fields.get("Inputs", "")) - outputs
+    return SqlNode(path, inputs, outputs, hashlib.sha256(raw).hexdigest())
+
+
+@dataclass(frozen=True)
+class SqlGraph:
+    """Files in apply order plus, for each, the earlier files it depends on."""
+
+    nodes: tuple[SqlNode, ...]
+    deps: dict[Path, frozenset[Path]]
+
+    def relations_read(self) -> frozenset[str]:
+        """Every relation some node reads."""
+        return frozenset().union(*(n.inputs for n in self.nodes))
+
+    def downstream(self, seeds: Iterable[Path]) -> set[Path]:
+        """``seeds`` plus every node that transitively depends on one of them."""
+        dirty = set(seeds)
+        for node in self.nodes:
+            if node.path not in dirty and self.deps[node.path] & dirty:
+                dirty.add(node.path)
+        return dirty
+
+
+def build_graph(files: Sequence[Path], *, strict: bool = False) -> SqlGraph:
+    """Link ``files`` (already in apply order) by their declared relations.
+
+    A node depends on every *earlier* node whose outputs intersect its
+    inputs -- apply order is lexical, so a producer that sorts later cannot
+    have run first and is not an edge.
+
+    ``strict=True`` also orders write-after-write (both write a relation)
+    and write-after-read (an earlier node reads what this one writes), so
+    running the graph concurrently sees exactly what the serial apply would.
+    """
+    nodes = tuple(read_node(f) for f in files)
+    deps: dict[Path, frozenset[Path]] = {}
+    for i, node in enumerate(nodes):
+        deps[node.path] = frozenset(
+            prior.path
+            for prior in nodes[:i]
+            if prior.outputs & node.inputs
+            or (strict and node.outputs & (prior.outputs | prior.inputs))
+        )
+    return SqlGraph(nodes, deps)
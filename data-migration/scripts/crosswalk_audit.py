@@ -27,9 +27,10 @@ page includes. Informational by default (exit 0); ``--strict`` exits non-zero
 when a *blocking* finding exists (an unmapped live code, or a missing source
 table/column).
 
-Security: the source DSN is built in-process via ``_mysql_attach_dsn`` and the
-ATTACH is wrapped so only the exception *type* can surface -- the password never
-lands in a log or traceback. The source is attached READ_ONLY.
+Security: the source DSN is built in-process via ``migration.duck.mysql_attach_dsn`` and the
+shared DuckDB session (``migration.duck.duck_connection``) reports only the
+exception *type* of a failed ATTACH -- the password never lands in a log or
+traceback. The source is attached READ_ONLY.
 
 NOTE: this needs live PROD access, which CI does not have, so the generated
 fragments are operator-refreshed artifacts -- they are NOT regenerated or
@@ -57,6 +58,7 @@ import yaml
 if TYPE_CHECKING:
     import duckdb
 
+from migration.duck import duck_connection, mysql_query
 from migration.lib import (
     REPORTS_DIR,
     ROOT_DIR,
@@ -68,7 +70,6 @@ from migration.lib import (
     rel,
     ts,
 )
-from migration.phases.schema_snapshot import _mysql_attach_dsn, _passthrough
 
 REGISTRY_FILE: Path = REPORTS_DIR / "crosswalks" / "registry.yaml"
 REFERENCE_DATA_DIR: Path = REPORTS_DIR / "reference_data"
@@ -386,19 +387,9 @@ def _subset_clause(column: str, subset: list[int] | None) -> str:
     return f" AND {column} IN ({', '.join(str(int(v)) for v in subset)})"
 
 
-def _attach_source(con: duckdb.DuckDBPyConnection, env: Env) -> None:
-    """Attach the source MySQL READ_ONLY; never let the DSN reach a traceback."""
-    con.execute("INSTALL mysql_scanner; LOAD mysql_scanner;")
-    dsn = _mysql_attach_dsn(env.mysql_url, env.mysql_db).replace("'", "''")
-    try:
-        con.execute(f"ATTACH '{dsn}' AS src (TYPE mysql, READ_ONLY)")
-    except Exception as e:
-        raise SystemExit(f"MySQL ATTACH failed: {type(e).__name__}") from None
-
-
 def _live_base_tables(con: duckdb.DuckDBPyConnection) -> set[str]:
     """The source's base-table inventory (scoped to the attached database)."""
-    _, rows = _passthrough(
+    _, rows = mysql_query(
         con,
         "SELECT table_name FROM information_schema.tables "
         "WHERE table_schema = DATABASE() AND table_type = 'BASE TABLE'",
@@ -409,7 +400,7 @@ def _live_base_tables(con: duckdb.DuckDBPyConnection) -> set[str]:
 def _live_columns(con: duckdb.DuckDBPyConnection, table: str) -> set[str]:
     """The column names of one source table."""
     _safe_ident(table, "table")
-    _, rows = _passthrough(
+    _, rows = mysql_query(
         con,
         "SELECT column_name FROM information_schema.columns "
         f"WHERE table_schema = DATABASE() AND table_name = '{table}'",
@@ -431,7 +422,7 @@ def _distinct_codes(
     where = f"{column} IS NOT NULL{_subset_clause(column, subset)}"
     if active_only:
         where += " AND dltd_ind = 0"
-    _, rows = _passthrough(con, f"SELECT DISTINCT {column} FROM {table} WHERE {where}")
+    _, rows = mysql_query(con, f"SELECT DISTINCT {column} FROM {table} WHERE {where}")
     return {c for c in (_norm_code(r[0]) for r in rows) if c is not None}
 
 
@@ -450,7 +441,7 @@ def _code_volumes(
         "SUM(CASE WHEN dltd_ind = 0 THEN 1 ELSE 0 END)" if has_dltd_ind else "COUNT(*)"
     )
     where = f"{column} IS NOT NULL{_subset_clause(column, subset)}"
-    _, rows = _passthrough(
+    _, rows = mysql_query(
         con,
         f"SELECT {column} AS cd, COUNT(*) AS n_all, {active_expr} AS n_active "
         f"FROM {table} WHERE {where} GROUP BY {column}",
@@ -475,7 +466,7 @@ def _live_rfrnc(
     _safe_ident(code_col, "rfrnc code column")
     _safe_ident(name_col, "rfrnc name column")
     where = f" WHERE {code_col} IS NOT NULL{_subset_clause(code_col, subset)}"
-    _, rows = _passthrough(con, f"SELECT {code_col}, {name_col} FROM {table}{where}")
+    _, rows = mysql_query(con, f"SELECT {code_col}, {name_col} FROM {table}{where}")
     out: dict[str, str] = {}
     for code, name in rows:
         norm = _norm_code(code)
@@ -492,7 +483,7 @@ def _row_counts(
     active_expr = (
         "SUM(CASE WHEN dltd_ind = 0 THEN 1 ELSE 0 END)" if has_dltd_ind else "COUNT(*)"
     )
-    _, rows = _passthrough(con, f"SELECT COUNT(*), {active_expr} FROM {table}")
+    _, rows = mysql_query(con, f"SELECT COUNT(*), {active_expr} FROM {table}")
     if not rows:
         return (0, 0)
     return (int(rows[0][0] or 0), int(rows[0][1] or 0))
@@ -838,18 +829,14 @@ def main(argv: list[str] | None = None) -> int:
     )
     args = parser.parse_args(argv)
 
-    import duckdb
-
     env = Env.load()
     mysql_db = env.mysql_db or "(from MYSQL_URL)"
     specs = load_registry()
 
-    con = duckdb.connect()
     code_audits: list[CodeAudit] = []
     structural_audits: list[StructuralAudit] = []
     skipped: list[str] = []
-    try:
-        _attach_source(con, env)
+    with duck_connection(env, "src") as con:
         live_tables = _live_base_tables(con)
         for spec in specs:
             if spec.kind == "code":
@@ -858,8 +845,6 @@ def main(argv: list[str] | None = None) -> int:
                 structural_audits.append(collect_structural_audit(con, spec, live_tables))
             else:
                 skipped.append(spec.name)
-    finally:
-        con.close()
 
     baseline = _baseline_captured_at()
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
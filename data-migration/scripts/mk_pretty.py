@@ -74,6 +74,8 @@ ROOT_HELP: list[tuple[str, list[tuple[str, str]]]] = [
         ("verify_prod_schema", "auxiliary, guards ddl -- migrate verify-prod-schema (diff PROD demos_app vs REFERENCE_PG_URL)"),
         ("ddl", "migrate ddl (01_ddl/)"),
         ("load_full", "migrate load-full (pgloader)"),
+        ("raw_indexes", "after load_full/delta (run by both) -- migrate raw-indexes (ANALYZE + join-key indexes)"),
+        ("set_logged", "auxiliary, end of build under UNLOGGED_BUILD -- migrate set-logged (SET LOGGED + WAL report)"),
         ("fk_candidates", "auxiliary, after load_full -- migrate fk-candidates"),
         ("load_fidelity", "auxiliary, after load_full -- migrate load-fidelity (live vs mysql_raw row counts; non-gating)"),
         ("schema_snapshot", "auxiliary, crosswalk input -- migrate schema-snapshot (MySQL information_schema -> reports/)"),
@@ -82,6 +84,7 @@ ROOT_HELP: list[tuple[str, list[tuple[str, str]]]] = [
         ("seeds", "migrate seeds (02 + 03)"),
         ("crosswalks", "migrate crosswalks (04)"),
         ("id_maps", "migrate id-maps (05)"),
+        ("warm_build", "auxiliary, before freeze -- migrate warm-build (pre-freeze build for a cutover-day build --replay)"),
     ]),
     ("Cutover phases (in order)", [
         ("preflight freeze delta build history constraints parity flip smoke decom",
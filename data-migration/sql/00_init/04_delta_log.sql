@@ -1,11 +1,18 @@
 /*
- * Purpose: Define the mysql_raw._delta_log bookkeeping table (one row per cutover) recording the freeze instant and the wall-clock time the delta finished loading; idempotent.
+ * Purpose: Define the mysql_raw._delta_log bookkeeping table (one row per cutover) recording the freeze instant, the wall-clock time the delta finished loading, and the per-table high-water marks of an incremental delta; idempotent.
  * Refs:    pgloader/delta.tmpl.load
  *
  * mysql_raw._delta_log: one row per cutover dress rehearsal / production cutover.
  * freeze.py inserts a row when the freeze instant is captured; the pgloader
  * AFTER LOAD DO block in pgloader/delta.tmpl.load updates that same row with
- * the wall-clock time the delta finished loading.
+ * the wall-clock time the delta finished loading. `migrate delta --incremental`
+ * (migration/phases/load_delta.py) writes delta_applied_at itself and keeps
+ * one high_water entry per manifest table:
+ *   {"<table>": {"column": ..., "type": <kind>, "value": <canonical text>,
+ *                "fetched": n, "skipped": n}}
+ * where <kind> is datetime, date, integer, decimal or text and <canonical text>
+ * is the mark in MySQL's own terms (ISO 8601 for dates and datetimes). Both
+ * are null when the table had no mark yet (empty, or its column all NULL).
  */
 CREATE TABLE IF NOT EXISTS mysql_raw._delta_log(
   id serial PRIMARY KEY,
@@ -13,5 +20,8 @@ CREATE TABLE IF NOT EXISTS mysql_raw._delta_log(
   delta_applied_at timestamptz
 );
 
+ALTER TABLE mysql_raw._delta_log
+  ADD COLUMN IF NOT EXISTS high_water jsonb NOT NULL DEFAULT '{}'::jsonb;
+
 CREATE INDEX IF NOT EXISTS idx_delta_log_freeze_instant ON mysql_raw._delta_log(freeze_instant);
 
@@ -56,3 +56,22 @@ def tmp_state_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
 
     monkeypatch.setattr(lib, "STATE_DIR", tmp_path)
     return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def _close_pg_pools() -> Iterator[None]:
+    """Drop pooled Postgres connections so no test reuses another's connection."""
+    from migration import lib
+
+    yield
+    lib.close_pg_pools()
+
+
+@pytest.fixture(autouse=True)
+def _drain_spans() -> Iterator[None]:
+    """Start every test with an empty timing-span buffer."""
+    from migration import lib
+
+    lib.drain_spans()
+    yield
+    lib.drain_spans()
@@ -16,6 +16,7 @@ from typing import Any
 
 import pytest
 
+from migration.duck import duck_connection
 from migration.lib import Env
 
 pytestmark = pytest.mark.integration
@@ -60,18 +61,9 @@ def _env(monkeypatch: pytest.MonkeyPatch) -> Env:
     return Env.load()
 
 
-def _con(env: Env):
-    import duckdb
-
-    con = duckdb.connect()
-    ca._attach_source(con, env)
-    return con
-
-
 def test_live_inventory_and_codes(mysql_conn: Any, monkeypatch: pytest.MonkeyPatch) -> None:
     _seed(mysql_conn)
-    con = _con(_env(monkeypatch))
-    try:
+    with duck_connection(_env(monkeypatch), "src") as con:
         tables = ca._live_base_tables(con)
         assert {"xw_fact", "xw_rfrnc"} <= tables
         assert "dltd_ind" in ca._live_columns(con, "xw_fact")
@@ -80,14 +72,11 @@ def test_live_inventory_and_codes(mysql_conn: Any, monkeypatch: pytest.MonkeyPat
         active = ca._distinct_codes(con, "xw_fact", "stus_cd", active_only=True, subset=None)
         assert all_codes == {"1", "2", "9"}
         assert active == {"1", "2"}  # code 9 is soft-deleted only
-    finally:
-        con.close()
 
 
 def test_live_volumes_and_rfrnc(mysql_conn: Any, monkeypatch: pytest.MonkeyPatch) -> None:
     _seed(mysql_conn)
-    con = _con(_env(monkeypatch))
-    try:
+    with duck_connection(_env(monkeypatch), "src") as con:
         vols = ca._code_volumes(con, "xw_fact", "stus_cd", has_dltd_ind=True, subset=None)
         assert vols["1"] == (2, 2)
         assert vols["9"] == (1, 0)
@@ -97,5 +86,3 @@ def test_live_volumes_and_rfrnc(mysql_conn: Any, monkeypatch: pytest.MonkeyPatch
 
         subset = ca._distinct_codes(con, "xw_fact", "stus_cd", active_only=False, subset=[1])
         assert subset == {"1"}
-    finally:
-        con.close()
@@ -12,6 +12,7 @@ from typing import Any
 
 import pytest
 
+from migration.lib import Env
 from migration.phases import prod_schema_guard as guard
 
 pytestmark = pytest.mark.integration
@@ -29,14 +30,21 @@ def _build_demos_app(conn: Any) -> None:
     )
 
 
+def _env() -> Env:
+    return Env(
+        pg_url=os.environ["PG_TEST_DSN"],
+        reference_pg_url=os.environ["REFERENCE_PG_URL"],
+        mysql_url="u",
+    )
+
+
 def test_guard_clean_when_identical(target_pg: Any, reference_pg: Any) -> None:
     """Identical schema + seeds + empty data table -> no drift."""
     _build_demos_app(target_pg)
     _build_demos_app(reference_pg)
 
     diffs = guard._collect_diffs(
-        os.environ["PG_TEST_DSN"],
-        os.environ["REFERENCE_PG_URL"],
+        _env(),
         seeded=["state"],
         require_empty=True,
     )
@@ -50,8 +58,7 @@ def test_guard_detects_column_drift(target_pg: Any, reference_pg: Any) -> None:
     target_pg.execute("ALTER TABLE demos_app.demonstration ADD COLUMN extra text")
 
     diffs = guard._collect_diffs(
-        os.environ["PG_TEST_DSN"],
-        os.environ["REFERENCE_PG_URL"],
+        _env(),
         seeded=["state"],
         require_empty=True,
     )
@@ -66,8 +73,7 @@ def test_guard_detects_seed_drift(target_pg: Any, reference_pg: Any) -> None:
     target_pg.execute("UPDATE demos_app.state SET code = 'TX' WHERE id = 2")
 
     diffs = guard._collect_diffs(
-        os.environ["PG_TEST_DSN"],
-        os.environ["REFERENCE_PG_URL"],
+        _env(),
         seeded=["state"],
         require_empty=True,
     )
@@ -82,8 +88,7 @@ def test_guard_detects_nonempty_target(target_pg: Any, reference_pg: Any) -> Non
     target_pg.execute("INSERT INTO demos_app.demonstration (id, state_id) VALUES (1, 1)")
 
     diffs = guard._collect_diffs(
-        os.environ["PG_TEST_DSN"],
-        os.environ["REFERENCE_PG_URL"],
+        _env(),
         seeded=["state"],
         require_empty=True,
     )
@@ -195,6 +195,37 @@ def test_idempotent_rerun(pg_db: psycopg.Connection, tmp_path: Path) -> None:
         assert cur.fetchone() == (2,)
 
 
+def test_copy_streams_in_chunks_and_skips_blank_rows(
+    pg_db: psycopg.Connection, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Rows cross chunk boundaries intact; blank rows drop; quoted "" is NULL too."""
+    from migration import lib
+
+    monkeypatch.setattr(lib, "_CSV_COPY_CHUNK_ROWS", 2)
+    _provision_simple_table(pg_db)
+    csv = tmp_path / "test.csv"
+    csv.write_text(
+        "legacy_int_cd,legacy_name,demos_text_id\n"
+        '1,"Smith, J.",Active\n'
+        "\n"
+        '2,"two\nlines",""\n'
+        " , , \n"
+        "3,back\\slash,Pending\n",
+        encoding="utf-8",
+    )
+    assert lib.copy_csv_into_table(pg_db, "mysql_raw", "crosswalk_test", csv) == 3
+    with pg_db.cursor() as cur:
+        cur.execute(
+            "SELECT legacy_int_cd, legacy_name, demos_text_id "
+            "FROM mysql_raw.crosswalk_test ORDER BY legacy_int_cd"
+        )
+        assert cur.fetchall() == [
+            (1, "Smith, J.", "Active"),
+            (2, "two\nlines", None),
+            (3, "back\\slash", "Pending"),
+        ]
+
+
 # ---------------------------------------------------------------------------
 # Fold-loop integration test: honors from_dt_col/to_dt_col from the crosswalk.
 # ---------------------------------------------------------------------------
@@ -0,0 +1,125 @@
+"""Tests for migration.phases.blue_green and the lib.app_schema routing it relies on."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg
+import pytest
+
+from migration import lib
+from migration.phases import blue_green, init_pg
+
+
+def test_canonical_app_schema_maps_only_whole_names() -> None:
+    text = "FOREIGN KEY (a) REFERENCES demos_app_next.b(id), demos_app_next_x.c"
+    assert lib.canonical_app_schema(text, "demos_app_next") == (
+        "FOREIGN KEY (a) REFERENCES demos_app.b(id), demos_app_next_x.c"
+    )
+
+
+def test_shadow_scope_is_a_no_op_unless_enabled() -> None:
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    with blue_green.shadow_scope(env):
+        assert lib._app_schema_target.get() is None
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="", blue_green=True)
+    with blue_green.shadow_scope(env):
+        assert lib._app_schema_target.get() == blue_green.SHADOW_SCHEMA
+    assert lib._app_schema_target.get() is None
+
+
+def test_app_schema_reaches_context_pool_workers_only() -> None:
+    """The routing target follows submits through ContextThreadPoolExecutor, not plain pools."""
+    with lib.app_schema("bg_route"):
+        with lib.ContextThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(lib._app_schema_target.get).result() == "bg_route"
+        with ThreadPoolExecutor(max_workers=1) as plain:
+            assert plain.submit(lib._app_schema_target.get).result() is None
+
+
+def test_app_schema_refuses_bound_app_schema_names() -> None:
+    lib._check_app_schema_params(["demos_app"])
+    with lib.app_schema("bg_route"):
+        for params in (["demos_app"], ("x", "demos_app.parent"), {"s": "demos_app"}):
+            with pytest.raises(psycopg.ProgrammingError, match="routed to bg_route"):
+                lib._check_app_schema_params(params)
+        lib._check_app_schema_params(["demos_app_next", 1, None])
+
+
+def _env() -> lib.Env:
+    return lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+
+
+def test_app_schema_routes_statements_and_canonicalizes_fks(pg_db: psycopg.Connection) -> None:
+    """SQL naming demos_app lands in the target; captured FKs name demos_app again."""
+    pg_db.execute("DROP SCHEMA IF EXISTS bg_route CASCADE")
+    pg_db.execute("CREATE SCHEMA bg_route")
+    env = _env()
+    try:
+        with lib.app_schema("bg_route"):
+            lib.psql_command(
+                env,
+                "CREATE TABLE demos_app.parent (id int PRIMARY KEY); "
+                "CREATE TABLE demos_app.child (pid int REFERENCES demos_app.parent (id))",
+            )
+            lib.psql_command(env, "INSERT INTO demos_app.parent VALUES (1)")
+            assert lib.psql_query(env, "SELECT count(*) FROM demos_app.parent") == [(1,)]
+            fks = init_pg._capture_fks(env)
+        assert pg_db.execute("SELECT count(*) FROM bg_route.parent").fetchone() == (1,)
+        assert [(fk["schema"], fk["table"]) for fk in fks] == [("demos_app", "child")]
+        assert "demos_app.parent" in fks[0]["definition"]
+        assert "bg_route" not in fks[0]["definition"]
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP SCHEMA IF EXISTS bg_route CASCADE")
+
+
+def test_swap_in_and_back_round_trip(
+    pg_db: psycopg.Connection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """swap_in promotes the shadow with the live grants; swap_back restores the old schema."""
+    monkeypatch.setattr(blue_green, "APP_SCHEMA", "bg_app")
+    monkeypatch.setattr(blue_green, "SHADOW_SCHEMA", "bg_app_next")
+    monkeypatch.setattr(blue_green, "PREVIOUS_SCHEMA", "bg_app_prev")
+    pg_db.execute("DROP SCHEMA IF EXISTS bg_app, bg_app_next, bg_app_prev CASCADE")
+    pg_db.execute("CREATE SCHEMA bg_app")
+    pg_db.execute("CREATE TABLE bg_app.t (generation text)")
+    pg_db.execute("INSERT INTO bg_app.t VALUES ('blue')")
+    pg_db.execute("GRANT USAGE ON SCHEMA bg_app TO PUBLIC")
+    pg_db.execute("GRANT SELECT ON bg_app.t TO PUBLIC")
+    pg_db.execute("CREATE SCHEMA bg_app_next")
+    pg_db.execute("CREATE TABLE bg_app_next.t (generation text)")
+    pg_db.execute("INSERT INTO bg_app_next.t VALUES ('green')")
+    pg_db.execute(
+        "CREATE FUNCTION bg_app_next.current_generation() RETURNS text "
+        "LANGUAGE sql AS 'SELECT generation FROM bg_app_next.t'"
+    )
+    env = _env()
+
+    def generation() -> str:
+        row = pg_db.execute("SELECT generation FROM bg_app.t").fetchone()
+        assert row is not None
+        return str(row[0])
+
+    try:
+        blue_green.swap_in(env)
+        assert generation() == "green"
+        assert pg_db.execute("SELECT bg_app.current_generation()").fetchone() == ("green",)
+        assert pg_db.execute(
+            "SELECT has_table_privilege('public', 'bg_app.t', 'SELECT'), "
+            "has_schema_privilege('public', 'bg_app', 'USAGE')"
+        ).fetchone() == (True, True)
+        assert blue_green.schema_exists(env, "bg_app_prev")
+        assert not blue_green.schema_exists(env, "bg_app_next")
+
+        blue_green.swap_back(env)
+        assert generation() == "blue"
+        assert blue_green.schema_exists(env, "bg_app_next")
+        assert not blue_green.schema_exists(env, "bg_app_prev")
+
+        with pytest.raises(SystemExit):
+            blue_green.swap_back(env)
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP SCHEMA IF EXISTS bg_app, bg_app_next, bg_app_prev CASCADE")
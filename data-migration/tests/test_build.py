@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+import time
 from pathlib import Path
+from typing import Any
 
+import psycopg
 import pytest
 
+from migration import lib
 from migration.phases import build
+from migration.sql_graph import SqlGraph, SqlNode
 
 
 def test_load_seeded_tables_missing_file(
@@ -24,3 +31,218 @@ def test_load_seeded_tables_reads_capture(
     f.write_text(json.dumps(["state", "role", "application_status"]), encoding="utf-8")
     monkeypatch.setattr(build, "PRISMA_SEEDED_TABLES_FILE", f)
     assert build._load_seeded_tables() == ["state", "role", "application_status"]
+
+
+def _node(path: str, inputs: set[str], outputs: set[str], sha: str = "s") -> Any:
+    return SqlNode(Path(path), frozenset(inputs), frozenset(outputs), sha)
+
+
+def test_plan_incremental_stg_rebuilds_only_the_affected_subgraph(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A changed mysql_raw fingerprint dirties its readers and their dependents only."""
+    monkeypatch.setattr(build, "rel", str)
+    setup = _node("00_setup.sql", set(), {"stg._keep_ids"})
+    demo = _node("10_demo.sql", {"mysql_raw.demo", "stg._keep_ids"}, {"stg.demo_ids"})
+    user = _node("17_user.sql", {"mysql_raw.users", "stg._keep_ids"}, {"stg.user_ids"})
+    idmap = _node("20_map.sql", {"stg.user_ids"}, {"migration._id_map_users"})
+    graph = SqlGraph(
+        (setup, demo, user, idmap),
+        {
+            setup.path: frozenset(),
+            demo.path: frozenset({setup.path}),
+            user.path: frozenset({setup.path}),
+            idmap.path: frozenset({user.path}),
+        },
+    )
+    previous = {
+        "relations": {"mysql_raw.demo": "5/t1", "mysql_raw.users": "3/t1", "stg._keep_ids": "h"},
+        "files": {str(n.path): "s" for n in graph.nodes},
+    }
+    current = {"mysql_raw.demo": "5/t1", "mysql_raw.users": "4/t2", "stg._keep_ids": "h"}
+
+    files, changed = build._plan_incremental_stg(graph, previous, current, set())
+
+    assert changed == ["mysql_raw.users"]
+    assert [p.name for p in files] == ["00_setup.sql", "17_user.sql", "20_map.sql"]
+
+
+def test_plan_incremental_stg_reapplies_edited_files_and_missing_outputs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An edited file or a dropped output relation is rebuilt with everything below it."""
+    monkeypatch.setattr(build, "rel", str)
+    a = _node("10_a.sql", {"mysql_raw.t"}, {"stg.a"}, sha="new")
+    b = _node("20_b.sql", {"stg.a"}, {"stg.b"})
+    c = _node("30_c.sql", {"mysql_raw.t"}, {"stg.c"})
+    graph = SqlGraph(
+        (a, b, c), {a.path: frozenset(), b.path: frozenset({a.path}), c.path: frozenset()}
+    )
+    previous = {
+        "relations": {"mysql_raw.t": "1/x"},
+        "files": {"10_a.sql": "old", "20_b.sql": "s", "30_c.sql": "s"},
+    }
+
+    files, _ = build._plan_incremental_stg(graph, previous, {"mysql_raw.t": "1/x"}, set())
+    assert [p.name for p in files] == ["10_a.sql", "20_b.sql"]
+
+    previous["files"]["10_a.sql"] = "new"
+    files, _ = build._plan_incremental_stg(graph, previous, {"mysql_raw.t": "1/x"}, {"stg.c"})
+    assert [p.name for p in files] == ["30_c.sql"]
+
+
+def test_source_fingerprints_track_count_and_loaded_at(
+    pg_db: psycopg.Connection, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Loaded tables are count/max(_loaded_at), lookups are hashed, absent ones 'missing'."""
+    monkeypatch.setattr(build, "_OVERRIDE_CSVS", {"stg._keep_ids": tmp_path / "keep_ids.csv"})
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS mysql_raw")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw.fp_loaded, mysql_raw.fp_lookup")
+    pg_db.execute("CREATE TABLE mysql_raw.fp_loaded (id int, _loaded_at timestamptz)")
+    pg_db.execute("CREATE TABLE mysql_raw.fp_lookup (code text)")
+    pg_db.execute("INSERT INTO mysql_raw.fp_loaded VALUES (1, '2026-01-01 00:00:00+00')")
+    pg_db.execute("INSERT INTO mysql_raw.fp_lookup VALUES ('a')")
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    rels = frozenset({"mysql_raw.fp_loaded", "mysql_raw.fp_lookup", "mysql_raw.fp_absent", "stg.x"})
+    try:
+        first = build._source_fingerprints(env, rels)
+        assert first["mysql_raw.fp_loaded"].startswith("1/2026-01-01")
+        assert first["mysql_raw.fp_absent"] == "missing"
+        assert first["stg._keep_ids"] == "absent"
+        assert "stg.x" not in first
+        pg_db.execute("INSERT INTO mysql_raw.fp_lookup VALUES ('b')")
+        second = build._source_fingerprints(env, rels)
+        assert second["mysql_raw.fp_loaded"] == first["mysql_raw.fp_loaded"]
+        assert second["mysql_raw.fp_lookup"] != first["mysql_raw.fp_lookup"]
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw.fp_loaded, mysql_raw.fp_lookup")
+
+
+def test_apply_stg_materializes_each_resolved_view_before_its_dependents(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Files run in batches ending at a resolved view, snapshotted before the next batch."""
+    calls: list[str] = []
+    monkeypatch.setattr(
+        build,
+        "apply_files",
+        lambda _env, files, _label: calls.append(",".join(p.stem for p in files)),
+    )
+    monkeypatch.setattr(build, "_materialize_view", lambda _env, view: calls.append(f"mat {view}"))
+    ids = _node("10_ids.sql", set(), {"stg.demo_ids"})
+    users = _node("21_users.sql", {"stg.demo_ids"}, {"stg.users_resolved"})
+    other = _node("22_other.sql", set(), {"stg.other"})
+    demo = _node("24_demo.sql", {"stg.users_resolved"}, {"stg.demonstration_resolved"})
+    tail = _node("90_tail.sql", {"stg.demonstration_resolved"}, {"stg.tail"})
+    nodes = (ids, users, other, demo, tail)
+    graph = SqlGraph(nodes, {n.path: frozenset() for n in nodes})
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+
+    build._apply_stg(env, graph, [n.path for n in nodes], materialize=True, label="x")
+    assert calls == [
+        "10_ids,21_users",
+        "mat stg.users_resolved",
+        "22_other,24_demo",
+        "mat stg.demonstration_resolved",
+        "90_tail",
+    ]
+
+    calls.clear()
+    build._apply_stg(env, graph, [n.path for n in nodes], materialize=False, label="x")
+    assert calls == ["10_ids,21_users,22_other,24_demo,90_tail"]
+
+
+def test_materialize_view_swaps_in_an_indexed_unlogged_table(pg_db: psycopg.Connection) -> None:
+    """The view becomes a same-name UNLOGGED table indexed on its selective key columns."""
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS stg")
+    pg_db.execute("DROP TABLE IF EXISTS stg.mat_src, stg.mat_resolved CASCADE")
+    pg_db.execute("DROP VIEW IF EXISTS stg.mat_resolved CASCADE")
+    pg_db.execute(
+        "CREATE TABLE stg.mat_src AS SELECT g AS demo_id, g % 2 AS state_id, 'x' AS name "
+        "FROM generate_series(1, 500) g"
+    )
+    pg_db.execute("CREATE VIEW stg.mat_resolved AS SELECT * FROM stg.mat_src")
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    try:
+        build._materialize_view(env, "stg.mat_resolved")
+        kind = pg_db.execute(
+            "SELECT relkind, relpersistence FROM pg_class WHERE oid = 'stg.mat_resolved'::regclass"
+        ).fetchone()
+        indexes = pg_db.execute(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = 'stg' "
+            "AND tablename = 'mat_resolved'"
+        ).fetchall()
+        assert kind == ("r", "u")
+        assert indexes == [("mat_resolved_demo_id_idx",)]
+        assert pg_db.execute("SELECT count(*) FROM stg.mat_resolved").fetchone() == (500,)
+
+        assert build._drop_materialized(env, ["stg.mat_resolved", "stg.absent"]) == [
+            "stg.mat_resolved"
+        ]
+        assert pg_db.execute("SELECT to_regclass('stg.mat_resolved')").fetchone() == (None,)
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP TABLE IF EXISTS stg.mat_src, stg.mat_resolved CASCADE")
+
+
+def test_apply_app_graph_respects_dependencies(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A file never starts before the files it depends on have committed."""
+    a, b, c, d = (_node(f"{n}.sql", set(), set()) for n in "abcd")
+    graph = SqlGraph(
+        (a, b, c, d),
+        {
+            a.path: frozenset(),
+            b.path: frozenset(),
+            c.path: frozenset({a.path}),
+            d.path: frozenset({b.path, c.path}),
+        },
+    )
+    committed: list[str] = []
+    lock = threading.Lock()
+
+    def fake_apply(_env: Any, path: Path, _pre: str) -> None:
+        deps = {p.name for p in graph.deps[path]}
+        with lock:
+            assert deps <= set(committed), f"{path.name} started before {deps}"
+        time.sleep(0.01)
+        with lock:
+            committed.append(path.name)
+
+    monkeypatch.setattr(build, "psql_file_tx", fake_apply)
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    assert build._apply_app_graph(env, graph, jobs=3) == []
+    assert sorted(committed) == ["a.sql", "b.sql", "c.sql", "d.sql"]
+    assert committed[-1] == "d.sql"
+
+
+def test_run_build_app_parallel_failure_resets_demos_app(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A failed file stops its dependents, re-truncates demos_app, and leaves the gate unset."""
+    monkeypatch.setattr(lib, "STATE_DIR", tmp_path)
+    lib.mark_gate("build_stg")
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    monkeypatch.setattr(build.Env, "load", classmethod(lambda cls: env))
+    monkeypatch.setattr(build, "_drop_demos_app_fks", lambda _env: None)
+    truncations: list[int] = []
+    monkeypatch.setattr(build, "_truncate_demos_app", lambda _env: truncations.append(1))
+    a, b, c = (_node(f"{n}.sql", set(), set()) for n in "abc")
+    graph = SqlGraph(
+        (a, b, c), {a.path: frozenset(), b.path: frozenset({a.path}), c.path: frozenset()}
+    )
+    monkeypatch.setattr(build, "_collect_app_files", lambda: [a.path, b.path, c.path])
+    monkeypatch.setattr(build, "build_graph", lambda _files, strict: graph)
+    applied: list[str] = []
+
+    def fake_apply(_env: Any, path: Path, _pre: str) -> None:
+        applied.append(path.name)
+        if path.name == "a.sql":
+            lib.die("SQL failed in a.sql")
+
+    monkeypatch.setattr(build, "psql_file_tx", fake_apply)
+    with pytest.raises(SystemExit):
+        build.run_build_app(jobs=2)
+    assert "b.sql" not in applied
+    assert len(truncations) == 2
+    assert not lib.gate_path("build_app").exists()
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
+from collections.abc import Generator
 from pathlib import Path
 
 import pytest
@@ -21,6 +23,39 @@ def prisma_fks_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
     return p
 
 
+class _TxConn:
+    """Stand-in for a pooled connection: records statements run in its transaction."""
+
+    def __init__(self) -> None:
+        self.executed: list[psql.Composed | psql.SQL] = []
+        self.transactions = 0
+
+    @contextlib.contextmanager
+    def transaction(self) -> Generator[None]:
+        self.transactions += 1
+        yield
+
+    @contextlib.contextmanager
+    def cursor(self) -> Generator[_TxConn]:
+        yield self
+
+    def execute(self, stmt: psql.Composed | psql.SQL) -> None:
+        self.executed.append(stmt)
+
+
+@pytest.fixture
+def tx_conn(monkeypatch: pytest.MonkeyPatch) -> _TxConn:
+    """Route ``constraints.pg_connection`` to a recording fake connection."""
+    conn = _TxConn()
+
+    @contextlib.contextmanager
+    def fake_pg_connection(_env: lib.Env) -> Generator[_TxConn]:
+        yield conn
+
+    monkeypatch.setattr(constraints, "pg_connection", fake_pg_connection)
+    return conn
+
+
 def _rendered(stmt: psql.Composed | psql.SQL) -> str:
     """Best-effort SQL rendering used only for substring assertions in tests."""
     return stmt.as_string(None)
@@ -56,16 +91,8 @@ def test_load_captured_fks_round_trips(prisma_fks_file: Path) -> None:
     assert out == data
 
 
-def test_readd_captured_fks_emits_not_valid(
-    prisma_fks_file: Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
+def test_readd_captured_fks_emits_not_valid(prisma_fks_file: Path, tx_conn: _TxConn) -> None:
     """Each captured FK is re-added with the verbatim def + NOT VALID."""
-    captured: list[psql.Composed | psql.SQL] = []
-
-    def fake_exec(_env, stmt):  # type: ignore[no-untyped-def]
-        captured.append(stmt)
-
-    monkeypatch.setattr(constraints, "psql_exec_composed", fake_exec)
     fks = [
         {
             "schema": "app",
@@ -83,9 +110,9 @@ def test_readd_captured_fks_emits_not_valid(
     env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
     constraints._readd_captured_fks(env, fks)
 
-    assert len(captured) == 2, "one ALTER per FK"
-    fk001 = _rendered(captured[0])
-    fk006 = _rendered(captured[1])
+    assert len(tx_conn.executed) == 2, "one ALTER per table"
+    fk001 = _rendered(tx_conn.executed[0])
+    fk006 = _rendered(tx_conn.executed[1])
     assert '"app"."demonstration"' in fk001
     assert '"fk001"' in fk001
     assert "FOREIGN KEY (state_id) REFERENCES app.state(id) ON DELETE CASCADE NOT VALID" in fk001
@@ -94,16 +121,48 @@ def test_readd_captured_fks_emits_not_valid(
     assert "; NOT VALID" not in fk006  # would mean the strip didn't happen
 
 
-def test_readd_captured_fks_drops_before_add(
-    prisma_fks_file: Path, monkeypatch: pytest.MonkeyPatch
+def test_readd_captured_fks_folds_one_table_into_one_alter(
+    prisma_fks_file: Path, tx_conn: _TxConn
 ) -> None:
-    """Each re-add must drop the constraint first so the phase is re-runnable."""
-    captured: list[psql.Composed | psql.SQL] = []
+    """FKs sharing a table become clauses of one ALTER; all tables share one transaction."""
+    fks = [
+        {
+            "schema": "app",
+            "table": "deliverable",
+            "name": "fk_a",
+            "definition": "FOREIGN KEY (demonstration_id) REFERENCES app.demonstration(id)",
+        },
+        {
+            "schema": "app",
+            "table": "demonstration",
+            "name": "fk_b",
+            "definition": "FOREIGN KEY (state_id) REFERENCES app.state(id)",
+        },
+        {
+            "schema": "app",
+            "table": "deliverable",
+            "name": "fk_c",
+            "definition": "FOREIGN KEY (owner_id) REFERENCES app.users(id)",
+        },
+    ]
+    env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
+    constraints._readd_captured_fks(env, fks)
 
-    def fake_exec(_env, stmt):  # type: ignore[no-untyped-def]
-        captured.append(stmt)
+    assert tx_conn.transactions == 1
+    assert len(tx_conn.executed) == 2
+    deliverable = _rendered(tx_conn.executed[0])
+    assert deliverable.count("ALTER TABLE") == 1
+    assert deliverable.startswith(
+        'ALTER TABLE "app"."deliverable" DROP CONSTRAINT IF EXISTS "fk_a"'
+    )
+    assert deliverable.index('ADD CONSTRAINT "fk_a"') < deliverable.index(
+        'DROP CONSTRAINT IF EXISTS "fk_c"'
+    )
+    assert '"fk_b"' not in deliverable
 
-    monkeypatch.setattr(constraints, "psql_exec_composed", fake_exec)
+
+def test_readd_captured_fks_drops_before_add(prisma_fks_file: Path, tx_conn: _TxConn) -> None:
+    """Each re-add must drop the constraint first so the phase is re-runnable."""
     fks = [
         {
             "schema": "app",
@@ -115,45 +174,41 @@ def test_readd_captured_fks_drops_before_add(
     env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
     constraints._readd_captured_fks(env, fks)
 
-    assert len(captured) == 1, "one combined ALTER per FK"
-    rendered = _rendered(captured[0])
+    assert len(tx_conn.executed) == 1, "one combined ALTER for the table"
+    rendered = _rendered(tx_conn.executed[0])
     assert 'DROP CONSTRAINT IF EXISTS "fk001"' in rendered
     assert 'ADD CONSTRAINT "fk001"' in rendered
     assert rendered.index("DROP CONSTRAINT") < rendered.index("ADD CONSTRAINT")
 
 
 def test_readd_captured_fks_rejects_unexpected_definition(
-    prisma_fks_file: Path, monkeypatch: pytest.MonkeyPatch
+    prisma_fks_file: Path, tx_conn: _TxConn
 ) -> None:
-    """A definition that doesn't start with FOREIGN KEY must hard-fail."""
-
-    def fake_exec(_env, _stmt):  # type: ignore[no-untyped-def]
-        raise AssertionError("psql_exec_composed must not be called for bad input")
-
-    monkeypatch.setattr(constraints, "psql_exec_composed", fake_exec)
+    """A definition that doesn't start with FOREIGN KEY must hard-fail before any SQL runs."""
     fks = [
+        {
+            "schema": "app",
+            "table": "x",
+            "name": "fk_ok",
+            "definition": "FOREIGN KEY (y) REFERENCES app.y(id)",
+        },
         {
             "schema": "app",
             "table": "x",
             "name": "fk_bad",
             "definition": "DROP TABLE app.users",
-        }
+        },
     ]
     env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
     with pytest.raises(SystemExit):
         constraints._readd_captured_fks(env, fks)
+    assert tx_conn.executed == []
 
 
 def test_readd_captured_fks_quotes_embedded_double_quotes(
-    prisma_fks_file: Path, monkeypatch: pytest.MonkeyPatch
+    prisma_fks_file: Path, tx_conn: _TxConn
 ) -> None:
     """Identifier quoting (via psycopg.sql.Identifier) doubles embedded `"`."""
-    captured: list[psql.Composed | psql.SQL] = []
-
-    def fake_exec(_env, stmt):  # type: ignore[no-untyped-def]
-        captured.append(stmt)
-
-    monkeypatch.setattr(constraints, "psql_exec_composed", fake_exec)
     fks = [
         {
             "schema": "app",
@@ -164,22 +219,89 @@ def test_readd_captured_fks_quotes_embedded_double_quotes(
     ]
     env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
     constraints._readd_captured_fks(env, fks)
-    rendered = _rendered(captured[0])
+    rendered = _rendered(tx_conn.executed[0])
     assert '"wei""rd"' in rendered
     assert '"fk""001"' in rendered
 
 
-def test_readd_captured_fks_empty_list_is_noop(
-    prisma_fks_file: Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    """An empty FK list must not call psql_exec_composed."""
-    called = False
+def test_readd_captured_fks_empty_list_is_noop(prisma_fks_file: Path, tx_conn: _TxConn) -> None:
+    """An empty FK list must not open a transaction."""
+    env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
+    constraints._readd_captured_fks(env, [])
+    assert tx_conn.transactions == 0
+    assert tx_conn.executed == []
+
+
+def test_validate_fks_serialises_each_child_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    """FKs on one child table run on one worker; results keep ``pending`` order."""
+    import threading
+
+    seen: list[tuple[str, str]] = []
+    lock = threading.Lock()
+
+    def fake_validate(_env, schema, table, name):  # type: ignore[no-untyped-def]
+        with lock:
+            seen.append((table, threading.current_thread().name))
+        return constraints._FkValidation(schema, table, name, 0.0)
+
+    monkeypatch.setattr(constraints, "_validate_fk", fake_validate)
+    monkeypatch.setattr(
+        constraints,
+        "_table_sizes",
+        lambda _env: {("demos_app", "small"): 1, ("demos_app", "big"): 9},
+    )
+    pending = [
+        ("demos_app", "small", "fk_a"),
+        ("demos_app", "big", "fk_b"),
+        ("demos_app", "small", "fk_c"),
+        ("demos_app", "big", "fk_d"),
+    ]
+    env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
+    results = constraints._validate_fks(env, pending, jobs=2)
+    assert [(r.table, r.constraint_name) for r in results] == [(t, n) for _, t, n in pending]
+    threads = {table: {th for t, th in seen if t == table} for table in ("small", "big")}
+    assert all(len(ths) == 1 for ths in threads.values())
+
+
+def test_validate_fk_counts_violations_on_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A failed VALIDATE is recorded with its error line and the orphan-row count."""
 
     def fake_exec(_env, _stmt):  # type: ignore[no-untyped-def]
-        nonlocal called
-        called = True
+        raise RuntimeError('violates foreign key constraint "fk_a"\nDETAIL: Key (x)=(1)')
 
     monkeypatch.setattr(constraints, "psql_exec_composed", fake_exec)
+    monkeypatch.setattr(
+        constraints,
+        "_fk_columns",
+        lambda *_a: (["parent_id"], "demos_app", "parent", ["id"]),
+    )
+    queries: list[str] = []
+
+    def fake_query(_env, q, _params=None):  # type: ignore[no-untyped-def]
+        queries.append(q)
+        return [(7,)]
+
+    monkeypatch.setattr(constraints, "psql_query", fake_query)
     env = lib.Env(pg_url="x", mysql_url="y", mysql_db="m", pg_db="d")
-    constraints._readd_captured_fks(env, [])
-    assert called is False
+    res = constraints._validate_fk(env, "demos_app", "child", "fk_a")
+    assert res.violations == 7
+    assert res.error == 'violates foreign key constraint "fk_a"'
+    assert 'c."parent_id" IS NOT NULL' in queries[0]
+    assert 'FROM "demos_app"."parent" p' in queries[0]
+
+
+def test_write_violations_carries_counts_and_timings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """fk_violations.csv keeps one row per invalid FK, with this run's count + time."""
+    monkeypatch.setattr(constraints, "STATE_DIR", tmp_path)
+    results = [constraints._FkValidation("demos_app", "child", "fk_a", 1.25, 7, "boom")]
+    constraints._write_violations(
+        [("demos_app", "child", "fk_a"), ("demos_app", "other", "fk_z")], results
+    )
+    lines = (tmp_path / "fk_violations.csv").read_text(encoding="utf-8").splitlines()
+    assert lines == [
+        "schema,table,constraint_name,violations,validate_s",
+        "demos_app,child,fk_a,7,1.250",
+        "demos_app,other,fk_z,,",
+    ]
@@ -29,7 +29,7 @@ def test_diagnose_best_effort_survives_failing_probes(
     monkeypatch.setattr(diagnose, "RUNS_DIR", tmp_path)
     _stub_env(monkeypatch)
 
-    def _die(_env: object) -> parity.ParityReport:
+    def _die(_env: object, jobs: int = 1) -> parity.ParityReport:
         raise SystemExit(1)  # mimics the always-on SQL-failure die on a missing schema
 
     def _boom(strict: bool = False) -> None:
@@ -61,7 +61,7 @@ def test_diagnose_aggregates_parity_report(
             parity.CheckResult(name="c2", status="RED"),
         ],
     )
-    monkeypatch.setattr(parity, "build_parity_report", lambda _env: rep)
+    monkeypatch.setattr(parity, "build_parity_report", lambda _env, jobs=1: rep)
     monkeypatch.setattr(load_fidelity, "run_load_fidelity", lambda strict=False: None)
 
     diagnose.run_diagnose()
@@ -84,7 +84,7 @@ def test_diagnose_surfaces_die_reason(
     monkeypatch.setattr(diagnose, "RUNS_DIR", tmp_path)
     _stub_env(monkeypatch)
 
-    def _die_probe(_env: object) -> parity.ParityReport:
+    def _die_probe(_env: object, jobs: int = 1) -> parity.ParityReport:
         lib.die(
             "SQL failed in sql/99_parity/10_x.sql; ERROR 42P01: "
             'relation "demos_app.foo" does not exist'
@@ -112,8 +112,27 @@ def test_diagnose_marks_no_gates(monkeypatch: pytest.MonkeyPatch, tmp_path: Path
     rep = parity.ParityReport(
         generated_at="x", checks=[parity.CheckResult(name="c1", status="GREEN")]
     )
-    monkeypatch.setattr(parity, "build_parity_report", lambda _env: rep)
+    monkeypatch.setattr(parity, "build_parity_report", lambda _env, jobs=1: rep)
     monkeypatch.setattr(load_fidelity, "run_load_fidelity", lambda strict=False: None)
 
     diagnose.run_diagnose()
     assert not lib.gate_path("parity").exists()
+
+
+def test_diagnose_forwards_jobs_to_parity(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """``migrate diagnose --jobs N`` runs the parity probe with N workers."""
+    monkeypatch.setattr(diagnose, "RUNS_DIR", tmp_path)
+    _stub_env(monkeypatch)
+    seen: list[int] = []
+
+    def _report(_env: object, jobs: int = 1) -> parity.ParityReport:
+        seen.append(jobs)
+        return parity.ParityReport(generated_at="x")
+
+    monkeypatch.setattr(parity, "build_parity_report", _report)
+    monkeypatch.setattr(load_fidelity, "run_load_fidelity", lambda strict=False: None)
+
+    diagnose.run_diagnose(jobs=4)
+    assert seen == [4]
@@ -0,0 +1,168 @@
+"""Unit coverage for ``--explain-slow`` plan capture and its summary report."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+
+import psycopg
+import pytest
+
+from migration import explain, lib
+
+
+def _node(node_type: str, plan_rows: float, actual_rows: float, **extra: object) -> dict:
+    return {
+        "Node Type": node_type,
+        "Plan Rows": plan_rows,
+        "Actual Rows": actual_rows,
+        "Actual Loops": 1,
+        "Actual Total Time": 5.0,
+        **extra,
+    }
+
+
+_PLAN = {
+    "Query Text": "INSERT INTO stg.x SELECT ...",
+    "Plan": _node(
+        "Hash Join",
+        10,
+        50_000,
+        Plans=[
+            _node("Seq Scan", 40_000, 50_000, **{"Relation Name": "big", "Shared Read Blocks": 7}),
+            _node("Seq Scan", 1, 1, **{"Relation Name": "small", "Actual Loops": 0}),
+        ],
+    ),
+}
+
+
+def _notice(message: str) -> psycopg.errors.Diagnostic:
+    """A NOTICE as the handler sees it; only ``message_primary`` is read."""
+    return cast(psycopg.errors.Diagnostic, SimpleNamespace(message_primary=message))
+
+
+@pytest.fixture(autouse=True)
+def _explain_off() -> Iterator[None]:
+    """Leave --explain-slow off (and no captured plans) after every test."""
+    yield
+    lib.set_explain_slow(None)
+    lib.drain_slow_plans()
+
+
+def test_capture_auto_explain_notice_is_attributed_to_the_open_span() -> None:
+    """auto_explain's JSON NOTICE becomes a SlowPlan labelled with the innermost span."""
+    message = "duration: 1523.456 ms  plan:\n" + json.dumps(_PLAN)
+    with lib.span("sql_file", "sql/10_stg/10_demo.sql"):
+        lib._capture_auto_explain(_notice(message))
+    lib._capture_auto_explain(_notice("relation x does not exist"))
+
+    (plan,) = lib.drain_slow_plans()
+    assert (plan.source, plan.duration_ms, plan.method) == (
+        "sql/10_stg/10_demo.sql",
+        1523.456,
+        "auto_explain",
+    )
+    assert plan.plan["Plan"]["Node Type"] == "Hash Join"
+
+
+class _RecordingConn:
+    """Just enough of a connection for :func:`lib._attach_slow_explain`."""
+
+    def __init__(self) -> None:
+        self.sql: list[str] = []
+        self.handlers: list[Any] = []
+
+    def transaction(self) -> contextlib.AbstractContextManager[None]:
+        return contextlib.nullcontext()
+
+    def execute(self, sql: str) -> None:
+        self.sql.append(sql)
+
+    def add_notice_handler(self, handler: Any) -> None:
+        self.handlers.append(handler)
+
+
+def test_attach_slow_explain_runs_once_per_connection() -> None:
+    """LOAD + SETs go out once per connection and threshold, not on every borrow."""
+    fake = _RecordingConn()
+    conn = cast(psycopg.Connection, fake)
+    lib.set_explain_slow(1.0)
+    lib._attach_slow_explain(conn)
+    lib._attach_slow_explain(conn)
+    assert len(fake.sql) == 1
+    assert fake.sql[0].startswith("LOAD 'auto_explain'")
+    assert len(fake.handlers) == 1
+
+    lib.set_explain_slow(2.0)
+    lib._attach_slow_explain(conn)
+    assert "log_min_duration = 2000" in fake.sql[-1]
+    assert len(fake.handlers) == 1
+
+    lib.set_explain_slow(None)
+    lib._attach_slow_explain(conn)
+    lib._attach_slow_explain(conn)
+    assert fake.sql[2:] == ["SET auto_explain.log_min_duration = -1"]
+
+
+def test_summary_ranks_seq_scans_and_misestimates() -> None:
+    """Executed seq scans and >=10x row misestimates are listed; unexecuted nodes are not."""
+    plan = lib.SlowPlan("sql/10_stg/10_demo.sql", 1500.0, _PLAN, "auto_explain")
+    nodes = explain.plan_nodes(1, plan)
+    assert [n.relation for n in nodes] == ["", "big"]
+    text = explain.summary_markdown([plan], ["001_10_demo.json"])
+    assert "| 1 | big | 50000 | 1 | 5 | 7 |" in text
+    assert "| 1 | Hash Join | - | 10 | 50000 | 5000x |" in text
+    assert "small" not in text
+
+
+def test_write_plans_writes_json_and_summary(tmp_path: Path) -> None:
+    """One JSON per statement (source/method/plan) plus summary.md; nothing when empty."""
+    assert explain.write_plans([], "build", tmp_path) is None
+    plan = lib.SlowPlan("row-count parity", 2000.0, _PLAN, "rerun")
+    out = explain.write_plans([plan], "parity", tmp_path)
+    assert out is not None
+    assert out.name.startswith("explain_parity_")
+    body = json.loads((out / "001_row_count_parity.json").read_text(encoding="utf-8"))
+    assert (body["source"], body["method"]) == ("row-count parity", "rerun")
+    assert "Plan" in body
+    assert (out / "summary.md").exists()
+
+
+def test_capture_writes_plans_even_when_the_command_dies(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A die() inside the block still leaves the captured plans on disk and turns capture off."""
+    monkeypatch.setattr(explain, "RUNS_DIR", tmp_path)
+
+    def slow_then_die() -> None:
+        assert lib._explain_min_ms == 500
+        lib._record_slow_plan(lib.SlowPlan("a.sql", 900.0, _PLAN, "auto_explain"))
+        lib.die("boom")
+
+    with pytest.raises(SystemExit), explain.capture(0.5, "build"):
+        slow_then_die()
+    assert lib._explain_min_ms is None
+    (out,) = tmp_path.glob("explain_build_*")
+    assert (out / "001_a.json").exists()
+
+
+def test_slow_psql_query_is_rerun_under_explain_without_auto_explain(
+    pg_db: psycopg.Connection,
+) -> None:
+    """Without auto_explain a slow read returns its rows unchanged and leaves a rerun plan."""
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    lib.set_explain_slow(0.0)
+    lib._auto_explain_ok = False  # the harness server need not ship auto_explain
+    with lib.span("parity_check", "probe"):
+        rows = lib.psql_query(env, "SELECT g FROM generate_series(1, 3) g ORDER BY g")
+    lib.psql_command(env, "SELECT 1")  # not a psql_query: never re-run
+    assert rows == [(1,), (2,), (3,)]
+    (plan,) = lib.drain_slow_plans()
+    assert (plan.source, plan.method) == ("probe", "rerun")
+    assert plan.plan["Plan"]["Node Type"] in ("Sort", "Function Scan")
+    assert "Execution Time" in plan.plan
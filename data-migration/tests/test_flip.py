@@ -133,3 +133,20 @@ def test_run_flip_uses_env_url(monkeypatch: pytest.MonkeyPatch, tmp_path: Path)
     flip.run_flip()
     assert probed == ["https://demos.test/healthz"]
     assert (tmp_path / "flip.ok").exists()
+
+
+def test_run_flip_blue_green_swaps_before_probe(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """With BLUE_GREEN the shadow schema is swapped in before healthz is probed."""
+    _arm_flip(monkeypatch, tmp_path)
+    monkeypatch.setenv("NEW_APP_HEALTHZ_URL", "https://demos.test/healthz")
+    monkeypatch.setenv("BLUE_GREEN", "true")
+    lib.reset_env_cache()
+
+    calls: list[str] = []
+    monkeypatch.setattr(flip, "swap_in", lambda env: calls.append("swap"))
+    monkeypatch.setattr(flip, "_check_healthz", lambda url: calls.append("probe"))
+
+    flip.run_flip()
+    assert calls == ["swap", "probe"]
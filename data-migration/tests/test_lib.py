@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import contextlib
+import os
 import stat
+import threading
 import urllib.parse
 from pathlib import Path
+from types import SimpleNamespace
 
+import psycopg
 import pytest
 
 from migration import lib
@@ -105,6 +110,7 @@ class _FakeConn:
         captured_dsn.append("called")
         self.transaction_entered = False
         self.in_txn = False
+        self.info = SimpleNamespace(transaction_status=lib.psycopg.pq.TransactionStatus.INTRANS)
 
     def __enter__(self) -> _FakeConn:
         """Return self for ``with connect(...) as conn`` usage."""
@@ -120,8 +126,9 @@ class _FakeConn:
         return self
 
     def execute(self, sql, *_a, **_kw):  # type: ignore[no-untyped-def]
-        """Capture the SQL string for assertion in tests."""
+        """Capture the SQL string; return a cursor stand-in with no row count."""
         self._captured_sql.append(str(sql))
+        return SimpleNamespace(rowcount=-1, nextset=lambda: None)
 
 
 def test_psql_files_uses_one_transaction(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -168,6 +175,142 @@ def test_psql_files_no_files_short_circuits(monkeypatch: pytest.MonkeyPatch) ->
     assert called is False
 
 
+class _PooledFakeConn:
+    """psycopg.Connection stand-in exposing the attributes the pool inspects."""
+
+    def __init__(self, opened: list[_PooledFakeConn]) -> None:
+        """Register this connection as freshly opened."""
+        opened.append(self)
+        self.closed = False
+        self.broken = False
+        self.sql: list[str] = []
+        self.dead = False
+        self.info = SimpleNamespace(transaction_status=lib.psycopg.pq.TransactionStatus.IDLE)
+
+    def execute(self, sql, *_a, **_kw):  # type: ignore[no-untyped-def]
+        """Capture the SQL string for assertion in tests; fail once ``dead``."""
+        if self.dead:
+            raise lib.psycopg.OperationalError("server closed the connection unexpectedly")
+        self.sql.append(str(sql))
+
+    def close(self) -> None:
+        """Mark the connection closed."""
+        self.closed = True
+
+
+@pytest.fixture
+def pooled_conns(monkeypatch: pytest.MonkeyPatch) -> list[_PooledFakeConn]:
+    """Route pool connects to fakes; return the list of connections opened."""
+    opened: list[_PooledFakeConn] = []
+    monkeypatch.setattr(lib.psycopg, "connect", lambda _dsn, **_kw: _PooledFakeConn(opened))
+    return opened
+
+
+def test_psql_command_reuses_pooled_connection(pooled_conns: list[_PooledFakeConn]) -> None:
+    """Back-to-back helper calls share one connection instead of reconnecting."""
+    env = lib.Env(pg_url="postgresql://u:p@h/d", mysql_url="y")
+    lib.psql_command(env, "select 1")
+    lib.psql_command(env, "select 2")
+    assert len(pooled_conns) == 1
+    assert pooled_conns[0].sql == ["select 1", "select 2"]
+
+
+def test_psql_file_resets_session_state(
+    pooled_conns: list[_PooledFakeConn], tmp_path: Path
+) -> None:
+    """A file apply runs DISCARD ALL before its connection goes back to the pool."""
+    env = lib.Env(pg_url="postgresql://u:p@h/d", mysql_url="y")
+    f = tmp_path / "a.sql"
+    f.write_text("SET search_path TO migration;\n", encoding="utf-8")
+    lib.psql_file(env, f)
+    assert pooled_conns[0].sql == ["SET search_path TO migration;\n", "DISCARD ALL"]
+
+
+def test_pool_discards_broken_connection(pooled_conns: list[_PooledFakeConn]) -> None:
+    """A connection returned broken is closed and replaced on the next borrow."""
+    env = lib.Env(pg_url="postgresql://u:p@h/d", mysql_url="y")
+    with lib.pg_connection(env):
+        pooled_conns[0].broken = True
+    lib.psql_command(env, "select 1")
+    assert len(pooled_conns) == 2
+    assert pooled_conns[0].closed is True
+
+
+def test_pool_pings_stale_idle_connection_and_reconnects(
+    pooled_conns: list[_PooledFakeConn], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An idle connection the server dropped is replaced on borrow, not handed out."""
+    env = lib.Env(pg_url="postgresql://u:p@h/d", mysql_url="y")
+    lib.psql_command(env, "select 1")
+    monkeypatch.setattr(lib, "_POOL_PING_AFTER_S", -1.0)
+    pooled_conns[0].dead = True
+    lib.psql_command(env, "select 2")
+    assert len(pooled_conns) == 2
+    assert pooled_conns[0].closed is True
+    assert pooled_conns[1].sql == ["select 2"]
+
+
+def test_pool_skips_ping_for_recently_returned_connection(
+    pooled_conns: list[_PooledFakeConn],
+) -> None:
+    """Back-to-back borrows do not pay a liveness round trip."""
+    env = lib.Env(pg_url="postgresql://u:p@h/d", mysql_url="y")
+    lib.psql_command(env, "select 1")
+    lib.psql_command(env, "select 2")
+    assert pooled_conns[0].sql == ["select 1", "select 2"]
+
+
+@pytest.mark.parametrize(
+    ("sql", "changes"),
+    [
+        ("SET search_path TO migration", True),
+        ("select 1; reset statement_timeout", True),
+        ("-- tune\nSET work_mem = '64MB'", True),
+        ("LOAD 'auto_explain'", True),
+        ("CREATE TEMP TABLE t (x int)", True),
+        ("SELECT set_config('application_name', 'x', false)", True),
+        ("SET LOCAL statement_timeout = 0", False),
+        ("UPDATE t\n   SET x = 1", False),
+        ("SELECT offset_ FROM t", False),
+    ],
+)
+def test_changes_session_state(sql: str, changes: bool) -> None:
+    """Statements whose effect outlives the borrow are recognised; data DML is not."""
+    assert lib._changes_session_state(sql) is changes
+
+
+def test_session_set_does_not_leak_to_next_borrower(pg_db: psycopg.Connection) -> None:
+    """A ``psql_command`` SET is discarded before the pooled connection is reused."""
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    lib.psql_command(env, "SET application_name = 'leaky'")
+    assert lib.psql_query(env, "SHOW application_name") != [("leaky",)]
+
+
+def test_pool_bounded_by_pg_pool_size(pooled_conns: list[_PooledFakeConn]) -> None:
+    """Concurrent borrowers never open more than ``pg_pool_size`` connections."""
+    env = lib.Env(pg_url="postgresql://u:p@h/d", mysql_url="y", pg_pool_size=2)
+    barrier = threading.Barrier(2)
+
+    def borrow() -> None:
+        with lib.pg_connection(env), contextlib.suppress(threading.BrokenBarrierError):
+            barrier.wait(timeout=0.5)
+
+    threads = [threading.Thread(target=borrow) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(pooled_conns) == 2
+
+
+def test_close_pg_pools_closes_idle_connections(pooled_conns: list[_PooledFakeConn]) -> None:
+    """The CLI shutdown hook closes every idle pooled connection."""
+    env = lib.Env(pg_url="postgresql://u:p@h/d", mysql_url="y")
+    lib.psql_command(env, "select 1")
+    lib.close_pg_pools()
+    assert pooled_conns[0].closed is True
+
+
 def test_devcontainer_pg_dsn_builds_from_parts() -> None:
     """With no override, the DSN is assembled from the devcontainer_pg_* parts."""
     env = lib.Env(mysql_url="y")
@@ -417,3 +560,120 @@ def test_phase_decorator_does_not_mark_on_exception(tmp_state_dir: Path) -> None
     with pytest.raises(RuntimeError):
         go()
     assert not lib.gate_path("p_d").exists()
+
+
+def test_span_records_wall_time_and_failure() -> None:
+    """Spans are recorded on success and on a raising block (with ``ok=False``)."""
+    with lib.span("sql_file", "a.sql") as s:
+        s.rows = 3
+    with pytest.raises(SystemExit), lib.span("phase", "p_x"):
+        lib.die("boom")
+    a, b = lib.drain_spans()
+    assert (a.kind, a.name, a.rows, a.ok) == ("sql_file", "a.sql", 3, True)
+    assert a.seconds >= 0
+    assert (b.kind, b.name, b.ok) == ("phase", "p_x", False)
+    assert lib.drain_spans() == []
+
+
+def test_phase_decorator_records_a_span(tmp_state_dir: Path) -> None:
+    """Every @phase body runs inside a ``phase`` span named after its gate."""
+
+    @lib.phase("p_e")
+    def go() -> None:
+        """Body is irrelevant; only the recorded span is under test."""
+        return None
+
+    go()
+    assert [(s.kind, s.name) for s in lib.drain_spans()] == [("phase", "p_e")]
+
+
+def test_execute_sql_file_records_rows_and_buffers(
+    pg_db: lib.psycopg.Connection, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An apply records its rows; the database buffer delta only under --explain-slow."""
+    f = tmp_path / "10_probe.sql"
+    f.write_text(
+        "CREATE TEMP TABLE span_probe (a int);\n"
+        "INSERT INTO span_probe SELECT generate_series(1, 5);\n"
+        "UPDATE span_probe SET a = a + 1 WHERE a < 3;\n",
+        encoding="utf-8",
+    )
+    lib._execute_sql_file(pg_db, f)
+    (s,) = lib.drain_spans()
+    assert (s.kind, s.rows, s.ok) == ("sql_file", 7, True)
+    assert s.db_blks_hit is None, "no pg_stat_database round trips by default"
+
+    monkeypatch.setattr(lib, "_explain_min_ms", 60_000)
+    pg_db.execute("DROP TABLE span_probe")
+    lib._execute_sql_file(pg_db, f)
+    (s,) = lib.drain_spans()
+    assert s.db_blks_hit is not None
+    assert s.db_blks_hit >= 0
+
+
+def test_load_session_profiles_normalizes_values(tmp_path: Path) -> None:
+    """YAML booleans become on/off and numbers strings; a missing file means none."""
+    f = tmp_path / "session_profiles.yaml"
+    f.write_text(
+        "build_stg:\n  work_mem: 256MB\n  synchronous_commit: off\n"
+        "  max_parallel_workers_per_gather: 4\n",
+        encoding="utf-8",
+    )
+    assert lib.load_session_profiles(f) == {
+        "build_stg": {
+            "work_mem": "256MB",
+            "synchronous_commit": "off",
+            "max_parallel_workers_per_gather": "4",
+        }
+    }
+    assert lib.load_session_profiles(tmp_path / "absent.yaml") == {}
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "no_such_phase:\n  work_mem: 1MB\n",
+        "parity:\n  'work_mem; DROP': 1MB\n",
+        "parity:\n  work_mem: [1MB]\n",
+        "parity: 1MB\n",
+    ],
+)
+def test_load_session_profiles_rejects_bad_profiles(tmp_path: Path, body: str) -> None:
+    f = tmp_path / "session_profiles.yaml"
+    f.write_text(body, encoding="utf-8")
+    with pytest.raises(SystemExit):
+        lib.load_session_profiles(f)
+
+
+def test_committed_session_profiles_load() -> None:
+    """The shipped sql/session_profiles.yaml parses and names real phases only.
+
+    ``synchronous_commit=off`` stays off the phases that write bookkeeping
+    (``delta``: ``_delta_log``) or id maps (``build_stg``).
+    """
+    profiles = lib.load_session_profiles()
+    assert profiles
+    assert set(profiles) <= set(lib.PROFILE_PHASES)
+    relaxed = {p for p, s in profiles.items() if s.get("synchronous_commit") == "off"}
+    assert relaxed == {"load_full"}
+
+
+def test_phase_scope_applies_profile_and_records_effective_settings(
+    pg_db: lib.psycopg.Connection, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Connections inside a phase carry its profile; pooled ones drop it afterwards."""
+    f = tmp_path / "session_profiles.yaml"
+    f.write_text("parity:\n  work_mem: 65536kB\n  jit: off\n", encoding="utf-8")
+    monkeypatch.setattr(lib, "SESSION_PROFILES_FILE", f)
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    try:
+        default = lib.psql_query(env, "SHOW work_mem")[0][0]
+        with lib.phase_scope("parity"):
+            assert lib.psql_query(env, "SHOW work_mem") == [("64MB",)]
+            assert lib.psql_query(env, "SHOW jit") == [("off",)]
+        assert lib.psql_query(env, "SHOW work_mem") == [(default,)]
+        (s,) = lib.drain_spans()
+        assert (s.kind, s.name) == ("phase", "parity")
+        assert s.settings == {"work_mem": "64MB", "jit": "off"}
+    finally:
+        lib.close_pg_pools()
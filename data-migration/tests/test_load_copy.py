@@ -0,0 +1,277 @@
+"""Unit coverage for the in-process binary-COPY loader (``load-full --engine=copy``).
+
+The DuckDB MySQL scan is integration-only (tests/integration); here the cast
+parsing, column planning, orchestration and -- when ``PG_TEST_DSN`` is set --
+the binary COPY itself are exercised.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+from collections.abc import Generator
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import psycopg
+import pytest
+
+from migration import lib
+from migration.phases import load_copy, load_full
+
+
+def test_parse_cast_rules_covers_every_casts_load_line() -> None:
+    """Every ``type`` rule in pgloader/casts.load parses; the two engines share it."""
+    text = lib.cast_block()
+    rules = load_copy.parse_cast_rules(text)
+    assert len(rules) == text.count("type ")
+    tinyint = rules[0]
+    assert (tinyint.source, tinyint.precision, tinyint.target) == ("tinyint", 1, "boolean")
+    decimal = next(r for r in rules if r.source == "decimal")
+    assert decimal.keep_typemod
+    datetime_rule = next(r for r in rules if r.source == "datetime")
+    assert datetime_rule.using == "zero-dates-to-null"
+
+
+def test_parse_cast_rules_rejects_unknown_syntax() -> None:
+    """A rule the copy engine cannot read is fatal rather than silently skipped."""
+    with pytest.raises(SystemExit):
+        load_copy.parse_cast_rules("CAST column foo.bar to text")
+
+
+@pytest.mark.parametrize(
+    ("col", "pg_type", "copy_type"),
+    [
+        (load_copy.SourceColumn("Flag", "tinyint", "tinyint(1)"), "boolean", "bool"),
+        (load_copy.SourceColumn("n", "tinyint", "tinyint(4)"), "smallint", "int2"),
+        (load_copy.SourceColumn("n", "int", "int(10) unsigned"), "bigint", "int8"),
+        (
+            load_copy.SourceColumn("amt", "decimal", "decimal(12,2)", None, 12, 2),
+            "numeric(12,2)",
+            "numeric",
+        ),
+        (load_copy.SourceColumn("nm", "varchar", "varchar(40)", 40), "varchar(40)", "varchar"),
+        (load_copy.SourceColumn("body", "longtext", "longtext"), "text", "text"),
+        (load_copy.SourceColumn("st", "enum", "enum('a','b')"), "text", "text"),
+        (load_copy.SourceColumn("at", "datetime", "datetime"), "timestamptz", "timestamptz"),
+    ],
+)
+def test_plan_column_follows_casts_then_pgloader_defaults(
+    col: load_copy.SourceColumn, pg_type: str, copy_type: str
+) -> None:
+    """casts.load rules win (with precision guards); other types use pgloader's defaults."""
+    plan = load_copy.plan_column(col, load_copy.parse_cast_rules())
+    assert (plan.pg_type, plan.copy_type) == (pg_type, copy_type)
+    assert plan.name == col.name.lower()
+
+
+def test_plan_column_nulls_zero_dates_in_the_source_select() -> None:
+    """``using zero-dates-to-null`` turns MySQL zero dates into NULL before they reach COPY."""
+    col = load_copy.SourceColumn("created", "datetime", "datetime")
+    plan = load_copy.plan_column(col, load_copy.parse_cast_rules())
+    assert plan.select_expr == "IF(CAST(`created` AS CHAR) LIKE '0000-00-00%', NULL, `created`)"
+
+
+def test_plan_column_keeps_not_null_and_literal_defaults() -> None:
+    """Source NOT NULL and literal defaults carry over unless casts.load drops them."""
+    rules = load_copy.parse_cast_rules()
+    count = load_copy.plan_column(
+        load_copy.SourceColumn("n", "int", "int(11)", nullable=False, default="0"), rules
+    )
+    ddl = load_copy.column_defs([count])[0]
+    assert ddl.as_string(None) == "\"n\" integer DEFAULT '0' NOT NULL"
+    assert load_copy.column_defs([count], constraints=False)[0].as_string(None) == '"n" integer'
+
+    stamp = load_copy.SourceColumn(
+        "at",
+        "timestamp",
+        "timestamp",
+        nullable=False,
+        default="CURRENT_TIMESTAMP",
+        default_is_expression=True,
+    )
+    planned = load_copy.plan_column(stamp, rules)
+    assert planned.default is None, "expression defaults are not carried"
+
+    dropped = load_copy.plan_column(
+        load_copy.SourceColumn("n", "int", "int(11)", nullable=False, default="7"),
+        load_copy.parse_cast_rules("CAST type int to bigint drop default drop not null"),
+    )
+    assert (dropped.not_null, dropped.default) == (False, None)
+
+
+def test_index_sql_skips_expression_indexes_and_warns_on_prefix_ones(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """An expression key part cannot be rebuilt; a prefix one is indexed on the full column."""
+    indexes = load_copy.source_indexes(
+        [
+            ("T", "PRIMARY", 0, "Id", None),
+            ("T", "by_lower", 1, None, None),
+            ("T", "by_name", 1, "Name", 10),
+            ("Other", "PRIMARY", 0, "id", None),
+        ],
+        {"T"},
+    )
+    stmts = [s.as_string(None) for s in load_copy.index_sql("T", indexes["T"])]
+    assert stmts == [
+        'ALTER TABLE "mysql_raw"."t" ADD PRIMARY KEY ("id")',
+        'CREATE INDEX ON "mysql_raw"."t" ("name")',
+    ]
+    err = " ".join(capsys.readouterr().err.split())
+    assert "skipping expression index 'by_lower'" in err
+    assert "prefix index on Name" in err
+
+
+@contextlib.contextmanager
+def _fake_duck_connection(_env: Any, *_catalogs: str) -> Generator[object]:
+    yield object()
+
+
+def test_run_copy_load_orders_largest_first_and_reports(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Dropped tables are skipped, the rest load largest first, and a rows/s CSV is written."""
+
+    catalog = {
+        load_copy._SOURCE_TABLES_SQL: [("small", 10), ("big", 1000), ("junk", 5)],
+        load_copy.SOURCE_COLUMNS_SQL: [
+            ("small", "id", "int", "int(11)", None, 10, 0, "NO", None, ""),
+            ("big", "id", "int", "int(11)", None, 10, 0, "NO", None, ""),
+            ("junk", "id", "int", "int(11)", None, 10, 0, "NO", None, ""),
+        ],
+        load_copy.SOURCE_INDEXES_SQL: [("big", "PRIMARY", 0, "id", None)],
+    }
+    monkeypatch.setattr(load_copy, "duck_connection", _fake_duck_connection)
+    monkeypatch.setattr(load_copy, "mysql_query", lambda _con, q: ([], catalog[q]))
+    monkeypatch.setattr(load_copy, "read_drop_list", lambda: ["JUNK"])
+    monkeypatch.setattr(load_copy, "psql_query", lambda _env, _q: [("UTC",)])
+    monkeypatch.setattr(load_copy, "RUNS_DIR", tmp_path)
+    started: list[str] = []
+
+    def fake_load(_env: Any, table: str, columns: Any, indexes: Any, *_a: Any) -> Any:
+        started.append(table)
+        assert [c.name for c in columns] == ["id"]
+        if table == "big":
+            assert indexes == {"PRIMARY": load_copy.SourceIndex(True, ["id"])}
+        return load_copy.TableLoad(table, rows=4, seconds=2.0)
+
+    monkeypatch.setattr(load_copy, "_load_table", fake_load)
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    load_copy.run_copy_load(env, parallel=1)
+
+    assert started == ["big", "small"]
+    (report,) = tmp_path.glob("copy_load_*.csv")
+    assert report.read_text(encoding="utf-8").splitlines() == [
+        "table,rows,seconds,rows_per_s,error",
+        "big,4,2.000,2,",
+        "small,4,2.000,2,",
+    ]
+
+
+def test_run_copy_load_dies_after_attempting_every_table(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """One failing table does not stop the others; the run still fails at the end."""
+
+    catalog = {
+        load_copy._SOURCE_TABLES_SQL: [("a", 1), ("b", 1)],
+        load_copy.SOURCE_COLUMNS_SQL: [],
+        load_copy.SOURCE_INDEXES_SQL: [],
+    }
+    monkeypatch.setattr(load_copy, "duck_connection", _fake_duck_connection)
+    monkeypatch.setattr(load_copy, "mysql_query", lambda _con, q: ([], catalog[q]))
+    monkeypatch.setattr(load_copy, "read_drop_list", lambda: [])
+    monkeypatch.setattr(load_copy, "psql_query", lambda _env, _q: [("UTC",)])
+    monkeypatch.setattr(load_copy, "RUNS_DIR", tmp_path)
+    loaded: list[str] = []
+
+    def fake_load(_env: Any, table: str, *_a: Any) -> Any:
+        loaded.append(table)
+        return load_copy.TableLoad(table, error="boom" if table == "a" else None)
+
+    monkeypatch.setattr(load_copy, "_load_table", fake_load)
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    with pytest.raises(SystemExit):
+        load_copy.run_copy_load(env, parallel=2)
+    assert sorted(loaded) == ["a", "b"]
+
+
+def test_run_load_full_copy_engine_skips_pgloader(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """--engine=copy needs no pgloader runner and marks the gate after the COPY load."""
+    monkeypatch.setattr(lib, "STATE_DIR", tmp_path)
+    env = lib.Env(pg_url="u", mysql_url="mysql://h/db", mysql_db="", pg_db="", pg_pool_size=3)
+    monkeypatch.setattr(load_full.Env, "load", classmethod(lambda cls: env))
+    monkeypatch.setattr(load_full, "require_pgloader", lambda _env: pytest.fail("no pgloader"))
+    monkeypatch.setattr(load_full, "require_schema", lambda _env, _schema: None)
+    calls: list[int] = []
+    monkeypatch.setattr(load_full, "run_copy_load", lambda _env, parallel: calls.append(parallel))
+    monkeypatch.setattr(load_full, "run_raw_indexes", lambda _env: calls.append(0))
+
+    load_full.run_load_full(engine="copy")
+
+    assert calls == [3, 0], "parallelism defaults to PG_POOL_SIZE; raw indexes follow"
+    assert lib.gate_path("load_full").exists()
+
+
+def test_run_load_full_rejects_unknown_engine() -> None:
+    """A typo in --engine fails before anything is loaded."""
+    with pytest.raises(SystemExit):
+        load_full.run_load_full(engine="pgloder")
+
+
+def test_run_load_full_rejects_shards_with_the_copy_engine() -> None:
+    """--shards splits pgloader runs; the copy engine already loads per table."""
+    with pytest.raises(SystemExit):
+        load_full.run_load_full(engine="copy", shards=2)
+
+
+def test_copy_rows_binary_round_trip(pg_db: psycopg.Connection) -> None:
+    """Planned columns COPY in binary: booleans, numerics, NUL-stripped text, JSON, tz."""
+    rules = load_copy.parse_cast_rules()
+    plans = [
+        load_copy.plan_column(c, rules)
+        for c in (
+            load_copy.SourceColumn("ID", "int", "int(11)"),
+            load_copy.SourceColumn("flag", "tinyint", "tinyint(1)"),
+            load_copy.SourceColumn("amt", "decimal", "decimal(10,2)", None, 10, 2),
+            load_copy.SourceColumn("created", "datetime", "datetime"),
+            load_copy.SourceColumn("nm", "varchar", "varchar(20)", 20),
+            load_copy.SourceColumn("doc", "json", "json"),
+        )
+    ]
+    rows = [
+        (1, 1, Decimal("1.50"), dt.datetime(2020, 1, 2, 3, 4, 5), "a\x00b", '{"k": [1]}'),
+        (2, 0, None, None, None, None),
+    ]
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS mysql_raw")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw.copy_probe")
+    try:
+        with pg_db.transaction(), pg_db.cursor() as cur:
+            cur.execute(load_copy.create_table_sql("Copy_Probe", plans))
+            n = load_copy.copy_rows(cur, "Copy_Probe", plans, iter([rows]), ZoneInfo("UTC"))
+            for stmt in load_copy.index_sql(
+                "Copy_Probe", {"PRIMARY": load_copy.SourceIndex(True, ["ID"])}
+            ):
+                cur.execute(stmt)
+        assert n == 2
+        got = pg_db.execute(
+            "SELECT id, flag, amt, created, nm, doc, _loaded_at IS NOT NULL "
+            "FROM mysql_raw.copy_probe ORDER BY id"
+        ).fetchall()
+        assert got[0] == (
+            1,
+            True,
+            Decimal("1.50"),
+            dt.datetime(2020, 1, 2, 3, 4, 5, tzinfo=dt.UTC),
+            "ab",
+            {"k": [1]},
+            True,
+        )
+        assert got[1][:2] == (2, False)
+    finally:
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw.copy_probe")
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import datetime as dt
+import os
+from collections.abc import Iterator
+from decimal import Decimal
 from pathlib import Path
+from typing import LiteralString, cast
+from zoneinfo import ZoneInfo
 
+import psycopg
 import pytest
 
-from migration.phases import load_delta
+from migration import lib
+from migration.phases import load_copy, load_delta
 
 
 def test_validate_freeze_instant_accepts_iso_utc() -> None:
@@ -63,3 +71,224 @@ def test_build_tables_block_emits_matching_clause() -> None:
     """Non-empty manifest renders as pgloader's INCLUDING-ONLY clause."""
     out = load_delta._build_tables_block(["users", "orders", "items"])
     assert out == "INCLUDING ONLY TABLE NAMES MATCHING 'users', 'orders', 'items'"
+
+
+def test_read_delta_manifest_keeps_updated_col(tmp_path: Path) -> None:
+    """The incremental mode reads each table's high-water column from the manifest."""
+    tsv = tmp_path / "delta_tables.tsv"
+    tsv.write_text("table_name\tupdated_col\nusers\tupdated_at\n# x\ty\n", encoding="utf-8")
+    assert load_delta._read_delta_manifest(tsv) == [("users", "updated_at")]
+
+
+@pytest.mark.parametrize(
+    ("value", "mark"),
+    [
+        (dt.datetime(2026, 5, 6, 14, 30, tzinfo=dt.UTC), ("datetime", "2026-05-06T10:30:00")),
+        (dt.datetime(2026, 5, 6, 14, 30, 0, 500), ("datetime", "2026-05-06T14:30:00.000500")),
+        (dt.date(2026, 5, 6), ("date", "2026-05-06")),
+        (42, ("integer", "42")),
+        (Decimal("1.50"), ("decimal", "1.50")),
+        ("o'k", ("text", "o'k")),
+    ],
+)
+def test_high_water_types_marks_in_mysql_terms(value: object, mark: tuple[str, str]) -> None:
+    """Aware marks are shifted into the load's session zone; every mark records its type."""
+    assert load_delta._high_water(value, ZoneInfo("America/New_York")) == load_delta.HighWater(
+        *mark
+    )
+
+
+@pytest.mark.parametrize(
+    ("mark", "bound"),
+    [
+        (("datetime", "2026-05-06T14:30:00.000500"), "'2026-05-06 14:30:00.000500'"),
+        (("date", "2026-05-06"), "'2026-05-06'"),
+        (("integer", "42"), "42"),
+        (("text", "o'k\\"), "'o''k\\\\'"),
+    ],
+)
+def test_mark_predicate_binds_the_decoded_mark_and_keeps_null_marks(
+    mark: tuple[str, str], bound: str
+) -> None:
+    """The mark is re-rendered from its parsed value; rows with a NULL mark always qualify."""
+    where = load_delta._mark_predicate("updtd_dt", load_delta.HighWater(*mark))
+    assert where == f" WHERE (`updtd_dt` >= {bound} OR `updtd_dt` IS NULL)"
+    assert load_delta._mark_predicate("updtd_dt", None) == ""
+
+
+@pytest.mark.parametrize(
+    "mark",
+    [("datetime", "2026-05-06' OR 1=1 -- "), ("integer", "1 OR 1=1"), ("decimal", "NaN")],
+)
+def test_mark_predicate_dies_on_a_malformed_mark(mark: tuple[str, str]) -> None:
+    """A stored mark that does not parse as its type is never spliced into MySQL."""
+    with pytest.raises(SystemExit):
+        load_delta._mark_predicate("updtd_dt", load_delta.HighWater(*mark))
+
+
+def test_upsert_sql_updates_non_key_columns_and_loaded_at() -> None:
+    """Key columns drive ON CONFLICT; the rest are overwritten and _loaded_at bumped."""
+    plans = [
+        load_copy.ColumnPlan("id", "`id`", "bigint", "int8"),
+        load_copy.ColumnPlan("nm", "`nm`", "text", "text"),
+    ]
+    rendered = load_delta._upsert_sql("Users", "_delta_users", plans, ["id"]).as_string()
+    assert rendered == (
+        'INSERT INTO "mysql_raw"."users" ("id", "nm") SELECT "id", "nm" FROM '
+        '"pg_temp"."_delta_users" ON CONFLICT ("id") DO UPDATE SET '
+        '"nm" = EXCLUDED."nm", _loaded_at = now()'
+    )
+
+
+def test_incremental_requires_a_manifest(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """An empty manifest would mean 'every table'; incremental mode refuses it."""
+    monkeypatch.setattr(load_delta, "DELTA_TABLES_TSV", tmp_path / "missing.tsv")
+    env = lib.Env(pg_url="u", mysql_url="mysql://h/db", mysql_db="", pg_db="")
+    with pytest.raises(SystemExit):
+        load_delta._run_incremental(env, "2026-05-06T14:30:00Z")
+
+
+def test_incremental_refuses_insert_only_marks_unless_allowed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A creatd_dt mark misses in-place updates; it needs an explicit opt-in."""
+    tsv = tmp_path / "delta_tables.tsv"
+    tsv.write_text("table_name\tupdated_col\nmdcd_demo\tcreatd_dt\n", encoding="utf-8")
+    monkeypatch.setattr(load_delta, "DELTA_TABLES_TSV", tsv)
+    env = lib.Env(pg_url="u", mysql_url="mysql://h/db", mysql_db="", pg_db="")
+    with pytest.raises(SystemExit):
+        load_delta._run_incremental(env, "2026-05-06T14:30:00Z")
+
+    monkeypatch.setattr(load_delta, "parse_cast_rules", lambda: pytest.fail("opted in"))
+    with pytest.raises(pytest.fail.Exception, match="opted in"):
+        load_delta._run_incremental(env, "2026-05-06T14:30:00Z", allow_insert_only=True)
+
+
+def test_run_load_delta_incremental_skips_pgloader(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """--incremental needs no pgloader runner and still marks the delta gate."""
+    monkeypatch.setattr(lib, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(load_delta, "STATE_DIR", tmp_path)
+    lib.mark_gate("freeze")
+    env = lib.Env(pg_url="u", mysql_url="mysql://h/db", mysql_db="", pg_db="")
+    monkeypatch.setattr(load_delta.Env, "load", classmethod(lambda cls: env))
+    (tmp_path / "freeze_instant.txt").write_text("2026-05-06T14:30:00Z\n", encoding="utf-8")
+    monkeypatch.setattr(load_delta, "require_pgloader", lambda _env: pytest.fail("no pgloader"))
+    calls: list[str] = []
+    monkeypatch.setattr(
+        load_delta, "_run_incremental", lambda _env, instant, _allow: calls.append(instant)
+    )
+    monkeypatch.setattr(load_delta, "run_raw_indexes", lambda _env: calls.append("raw_indexes"))
+
+    load_delta.run_load_delta(incremental=True)
+
+    assert calls == ["2026-05-06T14:30:00Z", "raw_indexes"]
+    assert lib.gate_path("delta").exists()
+
+
+def test_delta_table_upserts_past_the_mark(
+    pg_db: psycopg.Connection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Rows at/after the mark are upserted by PK; the new mark lands in _delta_log."""
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS mysql_raw")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw.delta_probe")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw._delta_log")
+    pg_db.execute(
+        cast(LiteralString, (lib.SQL_DIR / "00_init" / "04_delta_log.sql").read_text("utf-8"))
+    )
+    pg_db.execute("INSERT INTO mysql_raw._delta_log (freeze_instant) VALUES (now())")
+    pg_db.execute(
+        "CREATE TABLE mysql_raw.delta_probe (id bigint PRIMARY KEY, nm text, "
+        "updtd_dt timestamptz, _loaded_at timestamptz NOT NULL DEFAULT now())"
+    )
+    pg_db.execute(
+        "INSERT INTO mysql_raw.delta_probe (id, nm, updtd_dt) VALUES "
+        "(1, 'old', '2026-01-01 00:00:00+00'), (2, 'keep', '2026-01-02 00:00:00+00')"
+    )
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    plans = [
+        load_copy.plan_column(c, load_copy.parse_cast_rules())
+        for c in (
+            load_copy.SourceColumn("id", "bigint", "bigint(20)"),
+            load_copy.SourceColumn("nm", "varchar", "varchar(10)", 10),
+            load_copy.SourceColumn("updtd_dt", "datetime", "datetime"),
+        )
+    ]
+    selects: list[str] = []
+
+    def fake_batches(_con: object, sql: str, _rows: int) -> Iterator[list[tuple[object, ...]]]:
+        selects.append(sql)
+        yield [(1, "new", dt.datetime(2026, 2, 1)), (3, "added", dt.datetime(2026, 2, 2))]
+
+    monkeypatch.setattr(load_delta, "mysql_query", lambda _con, _q: ([], [(5,)]))
+    monkeypatch.setattr(load_delta, "mysql_batches", fake_batches)
+    try:
+        r = load_delta._delta_table(env, None, "delta_probe", "updtd_dt", plans, ZoneInfo("UTC"))
+        assert selects[0].endswith(
+            "WHERE (`updtd_dt` >= '2026-01-02 00:00:00' OR `updtd_dt` IS NULL)"
+        )
+        newest = load_delta.HighWater("datetime", "2026-02-02T00:00:00")
+        assert (r.fetched, r.skipped, r.mark_to) == (2, 3, newest)
+        rows = pg_db.execute("SELECT id, nm FROM mysql_raw.delta_probe ORDER BY id").fetchall()
+        assert rows == [(1, "new"), (2, "keep"), (3, "added")]
+        mark = pg_db.execute(
+            "SELECT high_water -> 'delta_probe' FROM mysql_raw._delta_log"
+        ).fetchone()
+        assert mark is not None
+        assert (mark[0]["type"], mark[0]["value"]) == ("datetime", "2026-02-02T00:00:00")
+        assert load_delta._recorded_mark(env, "delta_probe") == newest
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw.delta_probe")
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw._delta_log")
+
+
+def test_delta_table_round_trips_a_null_mark(
+    pg_db: psycopg.Connection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A table with no mark records a null one, and the next run re-pulls it in full."""
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS mysql_raw")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw.delta_probe")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw._delta_log")
+    pg_db.execute(
+        cast(LiteralString, (lib.SQL_DIR / "00_init" / "04_delta_log.sql").read_text("utf-8"))
+    )
+    pg_db.execute("INSERT INTO mysql_raw._delta_log (freeze_instant) VALUES (now())")
+    pg_db.execute(
+        "CREATE TABLE mysql_raw.delta_probe (id bigint PRIMARY KEY, updtd_dt timestamptz, "
+        "_loaded_at timestamptz NOT NULL DEFAULT now())"
+    )
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    plans = [
+        load_copy.plan_column(c, load_copy.parse_cast_rules())
+        for c in (
+            load_copy.SourceColumn("id", "bigint", "bigint(20)"),
+            load_copy.SourceColumn("updtd_dt", "datetime", "datetime"),
+        )
+    ]
+    selects: list[str] = []
+
+    def fake_batches(_con: object, sql: str, _rows: int) -> Iterator[list[tuple[object, ...]]]:
+        selects.append(sql)
+        yield [(1, None)]
+
+    monkeypatch.setattr(load_delta, "mysql_query", lambda _con, _q: ([], [(1,)]))
+    monkeypatch.setattr(load_delta, "mysql_batches", fake_batches)
+    try:
+        for _ in range(2):
+            r = load_delta._delta_table(
+                env, None, "delta_probe", "updtd_dt", plans, ZoneInfo("UTC")
+            )
+            assert (r.mark_from, r.mark_to, r.fetched) == (None, None, 1)
+        assert [s.endswith("FROM `delta_probe`") for s in selects] == [True, True]
+        mark = pg_db.execute(
+            "SELECT high_water -> 'delta_probe' FROM mysql_raw._delta_log"
+        ).fetchone()
+        assert mark is not None
+        assert (mark[0]["type"], mark[0]["value"]) == (None, None)
+        assert load_delta._recorded_mark(env, "delta_probe") is None
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw.delta_probe")
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw._delta_log")
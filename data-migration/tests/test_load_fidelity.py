@@ -6,45 +6,16 @@ mysql_raw and is exercised in the integration tier.
 
 from __future__ import annotations
 
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
 import pytest
 
+from migration import lib
 from migration.phases import load_fidelity as lf
 
 
-def test_scalar_int_returns_aggregate_value_not_rowcount() -> None:
-    """Regression: the pg-side count must return the aggregate, not the row count.
-
-    The original bug wrapped ``postgres_query('pg', 'SELECT count(*) ...')`` in
-    an outer ``count(*)``, which counts the single aggregate row (always 1)
-    instead of returning the count it already computed. ``_scalar_int`` must
-    read the value out of the first row.
-    """
-    duckdb = pytest.importorskip("duckdb")
-    con = duckdb.connect()
-    try:
-        con.execute("CREATE TABLE t (id INTEGER)")
-        con.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(3)])
-        # The aggregate already yields one row holding the value 3.
-        assert lf._scalar_int(con, "SELECT count(*) FROM t") == 3
-        # The historical bug shape would have collapsed that to 1:
-        bug = con.execute("SELECT count(*) FROM (SELECT count(*) FROM t)").fetchall()
-        assert bug[0][0] == 1
-    finally:
-        con.close()
-
-
-def test_scalar_int_handles_zero_and_empty() -> None:
-    """A 0-count (one row, value 0) and a truly empty result both read as 0."""
-    duckdb = pytest.importorskip("duckdb")
-    con = duckdb.connect()
-    try:
-        con.execute("CREATE TABLE t (id INTEGER)")
-        assert lf._scalar_int(con, "SELECT count(*) FROM t") == 0
-        assert lf._scalar_int(con, "SELECT id FROM t WHERE false") == 0
-    finally:
-        con.close()
-
-
 def test_count_row_matches() -> None:
     assert lf.CountRow("t", 10, 10).matches is True
     assert lf.CountRow("t", 10, 9).matches is False
@@ -69,9 +40,105 @@ def test_summarize_reports_signed_delta() -> None:
 
 
 def test_is_safe_identifier() -> None:
-    assert lf._is_safe_identifier("mdcd_demo")
-    assert lf._is_safe_identifier("Table_1")
-    assert not lf._is_safe_identifier("")
-    assert not lf._is_safe_identifier("drop; table")
-    assert not lf._is_safe_identifier("a.b")
-    assert not lf._is_safe_identifier('a"b')
+    assert lib.is_safe_identifier("mdcd_demo")
+    assert lib.is_safe_identifier("Table_1")
+    assert not lib.is_safe_identifier("")
+    assert not lib.is_safe_identifier("drop; table")
+    assert not lib.is_safe_identifier("a.b")
+    assert not lib.is_safe_identifier('a"b')
+
+
+def test_count_batched_unions_tables_and_isolates_a_bad_one(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Tables are counted a batch per query; a failing batch falls back to one per table."""
+    duckdb = pytest.importorskip("duckdb")
+    monkeypatch.setattr(lf, "_COUNT_BATCH", 2)
+    con = duckdb.connect()
+    queries: list[str] = []
+
+    def run(sql: str) -> list[tuple[object, ...]]:
+        queries.append(sql)
+        return con.execute(sql).fetchall()
+
+    try:
+        con.execute("CREATE TABLE a AS SELECT * FROM range(3)")
+        con.execute("CREATE TABLE b AS SELECT * FROM range(0)")
+        con.execute("CREATE TABLE c AS SELECT * FROM range(7)")
+        counts = lf._count_batched(run, ["a", "b", "c", "gone"], lambda t: f'"{t}"')
+    finally:
+        con.close()
+    assert counts == {"a": 3, "b": 0, "c": 7, "gone": -1}
+    assert "UNION ALL" in queries[0]
+    # [a, b] in one query; [c, gone] fails and is retried table by table.
+    assert len(queries) == 4
+
+
+def test_needs_exact_count_tolerance() -> None:
+    assert not lf.needs_exact_count(1000, 1050)
+    assert lf.needs_exact_count(1000, 1200)
+    assert not lf.needs_exact_count(0, 0)
+    assert lf.needs_exact_count(-1, 10)
+    assert lf.needs_exact_count(10, -1)
+
+
+def test_estimated_rows_are_unverified_not_matching() -> None:
+    """Agreeing estimates are not a pass, and not a mismatch either."""
+    assert not lf.CountRow("t", 1000, 1000, estimated=True).matches
+    assert lf.summarize_load_fidelity([lf.CountRow("t", 1000, 1040, estimated=True)]) == []
+
+
+def test_fast_counts_only_the_tables_whose_estimates_differ(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    estimates = {
+        "src": {"same": 100, "off": 100, "unknown": 5},
+        "pg": {"same": 102, "off": 40},
+    }
+    counted: list[list[str]] = []
+
+    def exact(_env: object, tables: list[str]) -> dict[str, int]:
+        counted.append(list(tables))
+        return dict.fromkeys(tables, 9)
+
+    monkeypatch.setattr(lf, "_estimates", lambda _env, alias, _sql: estimates[alias])
+    monkeypatch.setattr(lf, "_count_source", exact)
+    monkeypatch.setattr(lf, "_count_raw", exact)
+    env = lf.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+
+    rows = {r.table: r for r in lf._collect_counts(env, ["same", "off", "unknown"], fast=True)}
+
+    assert counted == [["off", "unknown"], ["off", "unknown"]]
+    assert rows["same"] == lf.CountRow("same", 100, 102, estimated=True)
+    assert rows["off"] == lf.CountRow("off", 9, 9)
+
+
+def test_fast_strict_refuses_to_pass_on_estimates(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Tables that only agreed by estimate leave the run UNVERIFIED, and --strict fails it."""
+
+    @contextmanager
+    def _conn(*_a: object) -> Generator[None]:
+        yield None
+
+    (tmp_path / "generated").mkdir()
+    env = lf.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    monkeypatch.setattr(lf.Env, "load", classmethod(lambda cls: env))
+    monkeypatch.setattr(lf, "duck_connection", _conn)
+    monkeypatch.setattr(lf, "mysql_query", lambda _con, _q: ([], [("a",), ("b",)]))
+    monkeypatch.setattr(lf, "read_drop_list", list)
+    monkeypatch.setattr(
+        lf,
+        "_collect_counts",
+        lambda _env, _tables, fast: [lf.CountRow("a", 5, 5), lf.CountRow("b", 100, 95, True)],
+    )
+    monkeypatch.setattr(lf, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(lf, "RUNS_DIR", tmp_path)
+
+    with pytest.raises(SystemExit):
+        lf.run_load_fidelity(strict=True, fast=True)
+    assert "1 table(s) were only estimated" in " ".join(capsys.readouterr().err.split())
+    report = next(tmp_path.glob("load_fidelity_*.md")).read_text(encoding="utf-8")
+    assert "**OVERALL: UNVERIFIED**" in report
+    assert "- b: source~100 mysql_raw~95" in report
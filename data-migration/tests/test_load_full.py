@@ -36,6 +36,7 @@ def _stub_runtime(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     monkeypatch.setattr(load_full, "require_pgloader", lambda _env: None)
     monkeypatch.setattr(load_full, "require_schema", lambda _env, _schema: None)
     monkeypatch.setattr(load_full, "assert_pgloader_ok", lambda _log: None)
+    monkeypatch.setattr(load_full, "run_raw_indexes", lambda _env: None)
 
 
 def test_run_load_full_renders_env_and_blocks_then_marks_gate(
@@ -122,3 +123,136 @@ def test_run_load_full_aborts_when_pgloader_runner_missing(
     assert ran["n"] == 0
     assert not (tmp_path / "schema.rendered.load").exists()
     assert not lib.gate_path("load_full").exists()
+
+
+def test_plan_shards_balances_rows_and_skips_dropped() -> None:
+    """Largest tables spread across buckets; dropped tables never appear."""
+    sizes = {"big": 1000, "mid": 600, "small1": 300, "small2": 300, "junk": 5000}
+    buckets = load_full._plan_shards(sizes, ["JUNK"], 2)
+    assert sorted(t for b in buckets for t in b) == ["big", "mid", "small1", "small2"]
+    loads = sorted(sum(sizes[t] for t in b) for b in buckets)
+    assert loads == [1000, 1200]
+
+
+def test_plan_shards_keeps_cross_bucket_fk_tables_together() -> None:
+    """An FK whose endpoints would land in different buckets pulls them into one.
+
+    Without FKs, ``child`` and ``parent`` balance onto separate buckets; with
+    ``child -> parent`` (and ``grandchild -> child``) the chain loads as one
+    unit, and an FK into a dropped table does not link anything.
+    """
+    sizes = {"parent": 1000, "child": 900, "grandchild": 10, "solo": 800, "junk": 5}
+    unlinked = load_full._plan_shards(sizes, ["junk"], 3)
+    assert not any({"child", "parent"} <= set(b) for b in unlinked)
+    fks = [("child", "parent"), ("GrandChild", "child"), ("solo", "junk")]
+    buckets = load_full._plan_shards(sizes, ["junk"], 3, fks)
+    assert buckets == [["child", "grandchild", "parent"], ["solo"]]
+
+
+def test_run_load_full_sharded_falls_back_when_every_table_is_fk_linked(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A plan that collapses to one bucket runs the ordinary unsharded load."""
+    _stub_runtime(monkeypatch, tmp_path)
+    (tmp_path / "table_stats.csv").write_text(
+        "table_name,table_rows\nmdcd_demo,900\nusers,500\n", encoding="utf-8"
+    )
+    (tmp_path / "foreign_keys.csv").write_text(
+        "constraint_name,table_name,column_name,ordinal_position,"
+        "referenced_table_name,referenced_column_name,update_rule,delete_rule\n"
+        "fk_1,mdcd_demo,user_id,1,users,id,RESTRICT,RESTRICT\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(load_full, "SCHEMA_SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(load_full, "cast_block", lambda: "")
+    monkeypatch.setattr(load_full, "excluding_block", lambda: "")
+    monkeypatch.setattr(load_full, "read_drop_list", lambda: [])
+    monkeypatch.setattr(
+        load_full, "pgloader_argv", lambda rendered, env=None: ["pgloader-stub", str(rendered)]
+    )
+    ran: list[str] = []
+    monkeypatch.setattr(
+        load_full, "run_teed", lambda argv, log_path, **_k: ran.append(argv[1]) or 0
+    )
+
+    load_full.run_load_full(shards=2)
+
+    assert ran == [str(tmp_path / "schema.rendered.load")]
+    assert not (tmp_path / "schema.shard0.rendered.load").exists()
+    assert lib.gate_path("load_full").exists()
+
+
+def test_shard_blocks_catch_all_excludes_other_buckets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Bucket 0 excludes the others (so unsnapshotted tables still load); the rest INCLUDE ONLY."""
+    monkeypatch.setattr(
+        load_full, "excluding_block", lambda: "EXCLUDING TABLE NAMES MATCHING 'junk'"
+    )
+    buckets = [["Big"], ["mid", "small"]]
+    first = load_full._shard_blocks(buckets, 0, ["junk"])
+    assert first["INCLUDING_BLOCK"] == ""
+    assert first["EXCLUDING_BLOCK"] == "EXCLUDING TABLE NAMES MATCHING 'junk', 'mid', 'small'"
+    assert first["LOADED_AT_SCOPE"] == "AND table_name NOT IN ('mid', 'small')"
+    second = load_full._shard_blocks(buckets, 1, ["junk"])
+    assert second["INCLUDING_BLOCK"] == "INCLUDING ONLY TABLE NAMES MATCHING 'mid', 'small'"
+    assert second["LOADED_AT_SCOPE"] == "AND table_name IN ('mid', 'small')"
+    assert load_full._shard_blocks(buckets, 1, [])["LOADED_AT_SCOPE"].count("big") == 0
+
+
+def test_run_load_full_sharded_renders_per_bucket_and_checks_every_log(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """--shards renders one command file per bucket, runs each, and checks all logs."""
+    _stub_runtime(monkeypatch, tmp_path)
+    stats = tmp_path / "table_stats.csv"
+    stats.write_text(
+        "table_name,table_rows\nmdcd_demo,900\nusers,500\ngeo_ansi_state_rfrnc,50\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "foreign_keys.csv").write_text(
+        "constraint_name,table_name,column_name,ordinal_position,"
+        "referenced_table_name,referenced_column_name,update_rule,delete_rule\n"
+        "fk_1,users,state_id,1,geo_ansi_state_rfrnc,state_id,RESTRICT,RESTRICT\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(load_full, "SCHEMA_SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(load_full, "cast_block", lambda: "-- CAST_SENTINEL")
+    monkeypatch.setattr(load_full, "excluding_block", lambda: "")
+    monkeypatch.setattr(load_full, "read_drop_list", lambda: [])
+    monkeypatch.setattr(
+        load_full, "pgloader_argv", lambda rendered, env=None: ["pgloader-stub", str(rendered)]
+    )
+    ran: list[str] = []
+    monkeypatch.setattr(
+        load_full, "run_teed", lambda argv, log_path, **_k: ran.append(argv[1]) or 0
+    )
+    checked: list[Path] = []
+    monkeypatch.setattr(load_full, "assert_pgloader_ok", lambda *logs: checked.extend(logs))
+
+    load_full.run_load_full(shards=2, parallel=2)
+
+    shard0 = (tmp_path / "schema.shard0.rendered.load").read_text(encoding="utf-8")
+    shard1 = (tmp_path / "schema.shard1.rendered.load").read_text(encoding="utf-8")
+    assert "EXCLUDING TABLE NAMES MATCHING 'geo_ansi_state_rfrnc', 'users'" in shard0
+    assert "INCLUDING ONLY TABLE NAMES MATCHING 'geo_ansi_state_rfrnc', 'users'" in shard1
+    assert "AND table_name IN ('geo_ansi_state_rfrnc', 'users')" in shard1
+    assert "{{" not in shard0 + shard1
+    assert sorted(ran) == sorted(str(tmp_path / f"schema.shard{i}.rendered.load") for i in range(2))
+    assert [p.name.rsplit("_", 1)[-1] for p in checked] == ["shard0.log", "shard1.log"]
+    assert lib.gate_path("load_full").exists()
+
+
+def test_run_load_full_sharded_dies_without_table_stats(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A sharded load needs the schema snapshot's sizes; without it, nothing runs."""
+    _stub_runtime(monkeypatch, tmp_path)
+    monkeypatch.setattr(load_full, "SCHEMA_SNAPSHOT_DIR", tmp_path / "absent")
+    monkeypatch.setattr(load_full, "read_drop_list", lambda: [])
+    monkeypatch.setattr(
+        load_full, "run_teed", lambda *_a, **_k: pytest.fail("pgloader must not run")
+    )
+    with pytest.raises(SystemExit):
+        load_full.run_load_full(shards=3)
+    assert not lib.gate_path("load_full").exists()
@@ -122,6 +122,40 @@ def test_build_parity_report_does_not_gate_or_die(
     assert not lib.gate_path("parity").exists()
 
 
+def test_build_parity_report_parallel_matches_serial(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """``jobs > 1`` yields the same checks, in the same order, as a serial run.
+
+    Each check also carries its wall time, which the markdown report renders,
+    and records a ``parity_check`` span for the run history.
+    """
+    monkeypatch.setattr(lib, "STATE_DIR", tmp_path / "state")
+    monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(parity, "RUNS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(parity, "PARITY_ACCEPTED_DIR", tmp_path / "reports" / "parity_accepted")
+    (tmp_path / "state").mkdir()
+    (tmp_path / "reports").mkdir()
+
+    monkeypatch.setattr(parity, "apply_dir", lambda env, _d: 0)
+    monkeypatch.setattr(parity, "psql_query", _shaped_query((1,)))
+    monkeypatch.setattr(parity, "_read_reconstructed_fks", lambda: [])
+
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    serial = parity.build_parity_report(env)
+    parallel = parity.build_parity_report(env, jobs=4)
+
+    assert [(c.name, c.status) for c in parallel.checks] == [
+        (c.name, c.status) for c in serial.checks
+    ]
+    assert all(c.elapsed_s is not None for c in parallel.checks)
+    assert "_Wall time: " in parallel.to_markdown()
+    spans = lib.drain_spans()
+    assert {s.kind for s in spans} == {"parity_check"}
+    assert len(spans) == 2 * len(serial.checks), "one span per check per run"
+
+
 def test_run_parity_default_does_not_mark_pending_gate(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
@@ -894,9 +928,69 @@ def test_orphan_rows_query_is_identifier_safe() -> None:
     assert '"state_id"' in rendered
 
 
-def test_orphans_green_when_no_candidates(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_orphan_scan_query_groups_edges_by_parent() -> None:
+    """Edges sharing a parent key read it once; each edge is one UNION ALL branch."""
+    mk = parity._ReconstructedFK
+    edges = [
+        mk("mysql_raw", "mdcd_demo", "state_id", "mysql_raw", "geo_ansi_state_rfrnc", "state_id"),
+        mk("mysql_raw", "users", "state_id", "mysql_raw", "geo_ansi_state_rfrnc", "state_id"),
+        mk("mysql_raw", "mdcd_dlvrbl", "mdcd_demo_id", "mysql_raw", "mdcd_demo", "mdcd_demo_id"),
+    ]
+    rendered = parity._orphan_scan_query(edges).as_string()
+    assert rendered.count("AS MATERIALIZED") == 2
+    assert rendered.count('FROM "mysql_raw"."geo_ansi_state_rfrnc"') == 1
+    assert rendered.count(" UNION ALL ") == 2
+    assert "SELECT 2 AS edge_id" in rendered
+    assert '"mysql_raw"."mdcd_dlvrbl"' in rendered
+
+
+def test_orphans_per_edge_fallback_writes_csv(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """When the batched pass fails, good edges still log their orphans per-row."""
+    import psycopg
+
+    mk = parity._ReconstructedFK
+    good = mk("mysql_raw", "mdcd_demo", "state_id", "mysql_raw", "geo_ansi_state_rfrnc", "state_id")
+    bad = mk("mysql_raw", "mdcd_demo", "role_cd", "mysql_raw", "role_rfrnc", "role_cd")
+    monkeypatch.setattr(parity, "_read_reconstructed_fks", lambda: [good, bad])
+    monkeypatch.setattr(
+        parity,
+        "_existing_columns",
+        lambda _env: {
+            ("mysql_raw", "mdcd_demo", "state_id"),
+            ("mysql_raw", "geo_ansi_state_rfrnc", "state_id"),
+            ("mysql_raw", "mdcd_demo", "role_cd"),
+            ("mysql_raw", "role_rfrnc", "role_cd"),
+        },
+    )
+
+    def _batched(*_a: object) -> parity._OrphanScan:
+        raise psycopg.errors.UndefinedFunction("operator does not exist: integer = text")
+
+    def _query(_env: object, q: str) -> list[tuple[object, ...]]:
+        if '"role_cd"' in q:
+            raise psycopg.errors.UndefinedFunction("operator does not exist: integer = text")
+        return [("XX",)]
+
+    monkeypatch.setattr(parity, "_scan_orphans_batched", _batched)
+    monkeypatch.setattr(parity, "psql_query", _query)
+    monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path)
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    result = parity._orphans(env)
+    assert result.status == "GREEN"
+    assert "1 orphan(s)" in result.detail
+    assert "uncheckable" in result.detail
+    body = (tmp_path / "orphans" / "reconstructed_fk_orphans.csv").read_text(encoding="utf-8")
+    assert "geo_ansi_state_rfrnc,state_id,XX" in body
+
+
+def test_orphans_green_when_no_candidates(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
     """No HIGH/MED edges -> vacuously GREEN without touching the DB."""
     monkeypatch.setattr(parity, "_read_reconstructed_fks", lambda: [])
+    monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path)
     env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
     result = parity._orphans(env)
     assert result.status == "GREEN"
@@ -931,7 +1025,18 @@ def test_orphans_nongating_green_and_logs_in_scope(
             ("mysql_raw", "geo_ansi_state_rfrnc", "state_id"),
         },
     )
-    monkeypatch.setattr(parity, "psql_query", lambda _env, _sql: [("XX",), ("YY",), ("XX",)])
+
+    def _batched(_env: object, edges: list[object], out: Path) -> parity._OrphanScan:
+        assert edges == [fk]
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(
+            ",".join(parity._ORPHAN_CSV_HEADER) + "\n"
+            "mysql_raw,mdcd_demo,state_id,mysql_raw,geo_ansi_state_rfrnc,state_id,XX\n",
+            encoding="utf-8",
+        )
+        return parity._OrphanScan({0: 3})
+
+    monkeypatch.setattr(parity, "_scan_orphans_batched", _batched)
     monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path)
     env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
     result = parity._orphans(env)
@@ -946,7 +1051,9 @@ def test_orphans_nongating_green_and_logs_in_scope(
     assert "XX" in body
 
 
-def test_orphans_uncheckable_absent_column_is_nongating(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_orphans_uncheckable_absent_column_is_nongating(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
     """An in-scope candidate naming a column absent from the loaded schema (the
     heuristic `id` PK guess) is reported and skipped -> GREEN (non-gating),
     never a crash."""
@@ -968,10 +1075,12 @@ def test_orphans_uncheckable_absent_column_is_nongating(monkeypatch: pytest.Monk
         },
     )
 
-    def _fail(_env: object, _sql: object) -> list[tuple[object, ...]]:
+    def _fail(_env: object, *_a: object) -> list[tuple[object, ...]]:
         raise AssertionError("orphan count must not run for an uncheckable edge")
 
     monkeypatch.setattr(parity, "psql_query", _fail)
+    monkeypatch.setattr(parity, "_scan_orphans_batched", _fail)
+    monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path)
     env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
     result = parity._orphans(env)
     assert result.status == "GREEN"
@@ -979,7 +1088,9 @@ def test_orphans_uncheckable_absent_column_is_nongating(monkeypatch: pytest.Monk
     assert "absent" in result.detail
 
 
-def test_orphans_uncheckable_type_mismatch_is_nongating(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_orphans_uncheckable_type_mismatch_is_nongating(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
     """An in-scope edge whose endpoints exist but whose count query raises (e.g.
     an integer-vs-text key comparison) is reported uncheckable -> GREEN
     (non-gating), not a crash."""
@@ -1003,14 +1114,19 @@ def test_orphans_uncheckable_type_mismatch_is_nongating(monkeypatch: pytest.Monk
         },
     )
 
-    def _raise(_env: object, _sql: object) -> list[tuple[object, ...]]:
+    def _raise(_env: object, *_a: object) -> list[tuple[object, ...]]:
         raise psycopg.errors.UndefinedFunction("operator does not exist: integer = text")
 
+    # The batched pass fails on the bad edge; the per-edge fallback isolates it.
+    monkeypatch.setattr(parity, "_scan_orphans_batched", _raise)
     monkeypatch.setattr(parity, "psql_query", _raise)
+    monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path)
     env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
     result = parity._orphans(env)
     assert result.status == "GREEN"
     assert "uncheckable" in result.detail
+    # The failed edge is not counted as checked, whatever its error text says.
+    assert "0 in-scope edge(s) orphan-free" in result.detail
 
 
 def test_orphans_skips_out_of_scope_edges(
@@ -1032,11 +1148,12 @@ def test_orphans_skips_out_of_scope_edges(
     def _fail_cols(_env: object) -> set[tuple[str, str, str]]:
         raise AssertionError("out-of-scope edge must not touch the schema")
 
-    def _fail_q(_env: object, _sql: object) -> list[tuple[object, ...]]:
+    def _fail_q(_env: object, *_a: object) -> list[tuple[object, ...]]:
         raise AssertionError("out-of-scope edge must not be queried")
 
     monkeypatch.setattr(parity, "_existing_columns", lambda _env: set())
     monkeypatch.setattr(parity, "psql_query", _fail_q)
+    monkeypatch.setattr(parity, "_scan_orphans_batched", _fail_q)
     monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path)
     env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
     result = parity._orphans(env)
@@ -1045,6 +1162,33 @@ def test_orphans_skips_out_of_scope_edges(
     assert "out-of-scope" in result.detail
 
 
+def test_orphans_removes_stale_csv_when_run_is_clean(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A CSV from an earlier run with orphans does not survive an orphan-free run."""
+    fk = parity._ReconstructedFK(
+        "mysql_raw", "mdcd_demo", "state_id", "mysql_raw", "geo_ansi_state_rfrnc", "state_id"
+    )
+    monkeypatch.setattr(parity, "_read_reconstructed_fks", lambda: [fk])
+    monkeypatch.setattr(
+        parity,
+        "_existing_columns",
+        lambda _env: {
+            ("mysql_raw", "mdcd_demo", "state_id"),
+            ("mysql_raw", "geo_ansi_state_rfrnc", "state_id"),
+        },
+    )
+    monkeypatch.setattr(parity, "_scan_orphans_batched", lambda *_a: parity._OrphanScan())
+    monkeypatch.setattr(parity, "REPORTS_DIR", tmp_path)
+    stale = tmp_path / "orphans" / "reconstructed_fk_orphans.csv"
+    stale.parent.mkdir(parents=True)
+    stale.write_text("from_schema\nold\n", encoding="utf-8")
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    result = parity._orphans(env)
+    assert "1 in-scope edge(s) orphan-free" in result.detail
+    assert not stale.exists()
+
+
 def test_approved_demo_held_green_when_view_absent(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
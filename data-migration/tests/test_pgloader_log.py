@@ -99,3 +99,22 @@ def test_missing_file_dies(tmp_path: Path) -> None:
     """A missing log file must hard-fail."""
     with pytest.raises(SystemExit):
         lib.assert_pgloader_ok(tmp_path / "nope.log")
+
+
+def test_multiple_logs_report_every_failing_shard(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A sharded load dies once, naming each failing shard's log, not just the first."""
+    clean = tmp_path / "shard0.log"
+    clean.write_text(_CLEAN, encoding="utf-8")
+    bad1 = tmp_path / "shard1.log"
+    bad1.write_text(_WITH_ERRORS, encoding="utf-8")
+    bad2 = tmp_path / "shard2.log"
+    bad2.write_text(_ECASE, encoding="utf-8")
+    with pytest.raises(SystemExit):
+        lib.assert_pgloader_ok(clean, bad1, bad2)
+    err = capsys.readouterr().err
+    assert "2 pgloader run(s) failed" in err
+    assert "shard1.log" in err
+    assert "shard2.log" in err
+    assert lib.pgloader_log_problem(clean) is None
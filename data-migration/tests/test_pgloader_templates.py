@@ -23,6 +23,8 @@ _SUBSTITUTIONS = {
     "EXCLUDING_BLOCK": "EXCLUDING TABLE NAMES MATCHING 'x'",
     "FREEZE_INSTANT": "2026-01-01T00:00:00Z",
     "TABLES_BLOCK": "INCLUDING ONLY TABLE NAMES MATCHING 'y'",
+    "INCLUDING_BLOCK": "INCLUDING ONLY TABLE NAMES MATCHING 'y'",
+    "LOADED_AT_SCOPE": "AND table_name IN ('y')",
 }
 
 _TEMPLATES = [lib.PGLOADER_DIR / "schema.load", lib.PGLOADER_DIR / "delta.tmpl.load"]
@@ -7,6 +7,8 @@ the drift summary, and the seeded-table reader.
 
 from __future__ import annotations
 
+from collections.abc import Generator
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
@@ -74,3 +76,68 @@ def test_read_seeded_tables_parses_list(tmp_path: Path) -> None:
     p = tmp_path / "seeded.json"
     p.write_text('["application_status", "role", "phase"]', encoding="utf-8")
     assert guard._read_seeded_tables(p) == ["application_status", "role", "phase"]
+
+
+def test_differing_keys_covers_one_sided_and_changed_items() -> None:
+    ref = {"columns": (4, "a"), "seed:role": (2, "b"), "seed:gone": (1, "c")}
+    tgt = {"columns": (4, "a"), "seed:role": (2, "x"), "seed:new": (1, "d")}
+    assert guard.differing_keys(ref, tgt) == ["seed:gone", "seed:new", "seed:role"]
+
+
+def test_digest_sql_has_one_item_per_catalog_and_seed_table() -> None:
+    sql = guard.digest_sql(["role", "phase"])
+    assert sql.count(" UNION ALL ") == 3
+    assert "'seed:phase' AS item" in sql
+    assert 'FROM demos_app."role" AS t' in sql
+
+
+# Canned rows per cluster alias ("ref"/"pg"), keyed by the query kind.
+_Results = dict[str, dict[str, list[tuple[object, ...]]]]
+
+
+class _FakeDuck:
+    """Answers the guard's passthrough queries from canned per-cluster results."""
+
+    def __init__(self, results: _Results) -> None:
+        self.results = results
+        self.queries: list[tuple[str, str]] = []
+        self._rows: list[tuple[object, ...]] = []
+
+    def execute(self, sql: str) -> None:
+        alias = "ref" if "postgres_query('ref'" in sql else "pg"
+        kind = next(k for k in ("UNION ALL", "GROUP BY", "table_schema", "conname") if k in sql)
+        self.queries.append((alias, kind))
+        self._rows = self.results[alias][kind]
+
+    def fetchall(self) -> list[tuple[object, ...]]:
+        return self._rows
+
+
+def test_collect_diffs_fetches_catalogs_only_on_digest_drift(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Equal digests move no rows; a drifted catalog is fetched once per digest."""
+    same: list[tuple[object, ...]] = [("columns", 4, "c"), ("fks", 1, "f")]
+    fake = _FakeDuck({"ref": {"UNION ALL": same}, "pg": {"UNION ALL": same}})
+
+    @contextmanager
+    def _conn(*_a: object) -> Generator[_FakeDuck]:
+        yield fake
+
+    monkeypatch.setattr(guard, "duck_connection", _conn)
+    monkeypatch.setattr(guard, "_CATALOG_CACHE", {})
+    assert guard.summarize_guard(guard._collect_diffs(_env(), [], require_empty=False)) == []
+    assert [k for _, k in fake.queries] == ["UNION ALL", "UNION ALL"]
+
+    col = ("t", "c", "text", "YES", "")
+    fake.results["pg"] = {
+        "UNION ALL": [("columns", 5, "c2"), ("fks", 1, "f")],
+        "table_schema": [col, ("t", "extra", "text", "YES", "")],
+    }
+    fake.results["ref"]["table_schema"] = [col]
+    for _ in range(2):
+        fake.queries.clear()
+        diffs = guard._collect_diffs(_env(), [], require_empty=False)
+        assert diffs.columns_only_tgt == [("t", "extra", "text", "YES", "")]
+        assert diffs.columns_only_ref == []
+    assert ("pg", "table_schema") not in fake.queries  # served from the cache
@@ -0,0 +1,111 @@
+"""Tests for migration.phases.raw_indexes (post-load ANALYZE + join-key indexes)."""
+
+from __future__ import annotations
+
+import csv
+import os
+from pathlib import Path
+
+import psycopg
+import pytest
+
+from migration import lib
+from migration.phases import raw_indexes
+
+
+def test_sql_join_keys_resolves_aliases_per_file(tmp_path: Path) -> None:
+    """Both sides of an equi-join map back through the file's mysql_raw aliases."""
+    f = tmp_path / "21_x_resolved.sql"
+    f.write_text(
+        "-- JOIN mysql_raw.ignored i ON i.a = d.b\n"
+        "SELECT d.mdcd_demo_id\n"
+        "FROM mysql_raw.mdcd_demo d\n"
+        "JOIN mysql_raw.crosswalk_state AS cs ON cs.legacy_cd = d.geo_ansi_state_cd\n"
+        "LEFT JOIN mysql_raw.users ON users.id = d.creatd_user_id\n"
+        "JOIN stg.demo_ids k ON k.legacy_id = d.mdcd_demo_id\n"
+        "WHERE mysql_raw.users.id = d.x AND lower(d.y) = cs.z\n",
+        encoding="utf-8",
+    )
+    keys = raw_indexes.sql_join_keys([f])
+    assert set(keys) == {
+        ("crosswalk_state", "legacy_cd"),
+        ("mdcd_demo", "geo_ansi_state_cd"),
+        ("mdcd_demo", "creatd_user_id"),
+        ("mdcd_demo", "mdcd_demo_id"),
+        ("users", "id"),
+    }
+    assert keys[("users", "id")] == {lib.rel(f)}
+
+
+def test_fk_candidate_keys_reads_high_confidence_ends(tmp_path: Path) -> None:
+    """HIGH rows contribute both ends; LOW rows and blank targets are ignored."""
+    f = tmp_path / "fk_candidates.csv"
+    with f.open("w", encoding="utf-8", newline="") as out:
+        w = csv.writer(out)
+        w.writerow(["from_table_qual", "from_column", "to_table", "to_column", "confidence"])
+        w.writerow(["mysql_raw.mdcd_dlvrbl", "mdcd_demo_id", "mdcd_demo", "mdcd_demo_id", "HIGH"])
+        w.writerow(["mysql_raw.mdcd_dlvrbl", "creatd_user_id", "", "id", "HIGH"])
+        w.writerow(["mysql_raw.mdcd_demo", "updtd_user_id", "users", "id", "LOW"])
+    assert set(raw_indexes.fk_candidate_keys(f)) == {
+        ("mdcd_dlvrbl", "mdcd_demo_id"),
+        ("mdcd_demo", "mdcd_demo_id"),
+        ("mdcd_dlvrbl", "creatd_user_id"),
+    }
+    assert raw_indexes.fk_candidate_keys(tmp_path / "absent.csv") == {}
+
+
+def test_index_name_fits_postgres_identifier_limit() -> None:
+    assert raw_indexes.index_name("mdcd_demo", "state_cd") == "mdcd_demo_state_cd_jk"
+    long = raw_indexes.index_name("t" * 40, "c" * 40)
+    assert len(long) == 63
+    assert long != raw_indexes.index_name("t" * 40, "c" * 41)
+
+
+def test_run_raw_indexes_indexes_selective_keys_only(
+    pg_db: psycopg.Connection, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A large selective join key gets an index; flags, small tables and PKs do not."""
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS mysql_raw")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw.ri_child, mysql_raw.ri_small")
+    pg_db.execute(
+        "CREATE TABLE mysql_raw.ri_child AS SELECT g AS ri_child_id, g % 997 AS ri_parent_id, "
+        "(g % 2)::text AS del_ind FROM generate_series(1, 5000) g"
+    )
+    pg_db.execute("ALTER TABLE mysql_raw.ri_child ADD PRIMARY KEY (ri_child_id)")
+    pg_db.execute(
+        "CREATE TABLE mysql_raw.ri_small AS SELECT g AS ri_parent_id FROM generate_series(1, 10) g"
+    )
+    stg = tmp_path / "10_x.sql"
+    stg.write_text(
+        "SELECT 1 FROM mysql_raw.ri_child c JOIN mysql_raw.ri_small s "
+        "ON s.ri_parent_id = c.ri_parent_id AND c.del_ind = s.del_ind "
+        "AND c.ri_child_id = s.ri_parent_id",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(raw_indexes, "_stg_sql_files", lambda: [stg])
+    monkeypatch.setattr(raw_indexes, "FK_CANDIDATES_CSV", tmp_path / "absent.csv")
+    monkeypatch.setattr(raw_indexes, "RUNS_DIR", tmp_path)
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+    try:
+        report = raw_indexes.run_raw_indexes(env, dry_run=True)
+        with report.open(encoding="utf-8", newline="") as f:
+            planned = {(r["table"], r["column"]): r for r in csv.DictReader(f)}
+        assert planned[("ri_child", "ri_parent_id")]["status"] == "would create"
+
+        report = raw_indexes.run_raw_indexes(env)
+        with report.open(encoding="utf-8", newline="") as f:
+            rows = {(r["table"], r["column"]): r for r in csv.DictReader(f)}
+        created = rows[("ri_child", "ri_parent_id")]
+        assert created["status"] == "created"
+        assert float(created["cost_saved"]) > 0
+        assert rows[("ri_child", "del_ind")]["status"] == "unselective"
+        assert rows[("ri_child", "ri_child_id")]["status"] == "exists"
+        assert rows[("ri_small", "ri_parent_id")]["status"] == "small"
+        valid = pg_db.execute(
+            "SELECT i.indisvalid FROM pg_index i WHERE i.indexrelid = "
+            "'mysql_raw.ri_child_ri_parent_id_jk'::regclass"
+        ).fetchone()
+        assert valid == (True,)
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw.ri_child, mysql_raw.ri_small")
@@ -2,9 +2,11 @@
 
 The DuckDB <-> MySQL passthrough needs a live source and is exercised in
 integration (mirroring schema_snapshot). These tests cover the identifier
-guard and dump-SQL construction that drive the artifacts; the reused
-``_write_csv``/``_mysql_attach_dsn`` helpers are covered by
-``test_schema_snapshot.py``.
+guard and dump-SQL construction that drive the artifacts. The dump runs
+through helpers shared with schema_snapshot, covered elsewhere:
+``schema_snapshot.capture_all`` / ``capture_manifest`` and
+``duck.mysql_attach_dsn`` in ``test_schema_snapshot.py``, and
+``duck.copy_to_files`` in ``test_duck.py``.
 """
 
 from __future__ import annotations
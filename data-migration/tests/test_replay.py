@@ -0,0 +1,110 @@
+"""Tests for migration.phases.replay (``build --replay`` onto a warm demos_app)."""
+
+from __future__ import annotations
+
+import csv
+import datetime as dt
+import json
+import os
+from pathlib import Path
+
+import psycopg
+import pytest
+from psycopg import sql
+
+from migration import lib
+from migration.phases import replay
+from migration.phases.load_delta import _read_delta_tables
+
+
+def test_parse_fk_handles_quoted_and_qualified_names() -> None:
+    assert replay.parse_fk(
+        'FOREIGN KEY ("demonstrationId", kind) REFERENCES demos_app."application"(id, kind) '
+        "ON DELETE CASCADE"
+    ) == (["demonstrationId", "kind"], "application", ["id", "kind"])
+
+
+def test_parse_fk_dies_on_a_non_fk() -> None:
+    with pytest.raises(SystemExit):
+        replay.parse_fk("CHECK (id > 0)")
+
+
+def test_replay_keys_cover_the_delta_manifest() -> None:
+    assert set(replay.REPLAY_KEYS) == set(_read_delta_tables())
+
+
+def test_read_warm_mark_round_trips(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(replay, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(replay, "WARM_BUILD_FILE", tmp_path / "warm_build.json")
+    with pytest.raises(SystemExit):
+        replay.read_warm_mark()
+    at = dt.datetime(2026, 3, 1, 12, 0, tzinfo=dt.UTC)
+    replay.write_warm_mark(at, materialized=True)
+    assert replay.read_warm_mark() == at.isoformat()
+
+
+def test_replay_deletes_changed_keys_and_their_dependents(
+    pg_db: psycopg.Connection, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Only rows fed by post-warm source rows go, with every FK dependent below them."""
+    pg_db.execute("DROP SCHEMA IF EXISTS rp_app CASCADE")
+    pg_db.execute("CREATE SCHEMA rp_app")
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS mysql_raw")
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS migration")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw.rp_src, migration._id_map_rp")
+    pg_db.execute("CREATE TABLE mysql_raw.rp_src (src_id int, _loaded_at timestamptz)")
+    pg_db.execute(
+        "INSERT INTO mysql_raw.rp_src VALUES "
+        "(1, '2026-01-01'), (2, '2026-03-01'), (3, '2026-01-01')"
+    )
+    pg_db.execute("CREATE TABLE migration._id_map_rp (legacy_int_id int, new_uuid int)")
+    pg_db.execute("INSERT INTO migration._id_map_rp VALUES (1, 101), (2, 102), (3, 103)")
+    pg_db.execute("CREATE TABLE rp_app.parent (id int PRIMARY KEY)")
+    pg_db.execute("CREATE TABLE rp_app.child (id int PRIMARY KEY, parent_id int)")
+    pg_db.execute("CREATE TABLE rp_app.grandchild (child_id int)")
+    pg_db.execute("CREATE TABLE rp_app.lookup (id int)")
+    pg_db.execute("INSERT INTO rp_app.parent VALUES (101), (102), (103)")
+    # Child 4 and grandchild 7 were orphaned before the replay: not its to delete.
+    pg_db.execute("INSERT INTO rp_app.child VALUES (1, 101), (2, 102), (3, NULL), (4, 999)")
+    pg_db.execute("INSERT INTO rp_app.grandchild VALUES (1), (2), (3), (7)")
+    pg_db.execute("INSERT INTO rp_app.lookup VALUES (9)")
+
+    fks = [
+        {"table": "child", "definition": "FOREIGN KEY (parent_id) REFERENCES demos_app.parent(id)"},
+        {
+            "table": "grandchild",
+            "definition": "FOREIGN KEY (child_id) REFERENCES demos_app.child(id)",
+        },
+        {"table": "lookup", "definition": "FOREIGN KEY (id) REFERENCES demos_app.parent(id)"},
+    ]
+    fks_file = tmp_path / "prisma_fks.json"
+    fks_file.write_text(json.dumps(fks), encoding="utf-8")
+    monkeypatch.setattr(replay, "PRISMA_FKS_FILE", fks_file)
+    monkeypatch.setattr(replay, "RUNS_DIR", tmp_path)
+    monkeypatch.setattr(
+        replay, "REPLAY_KEYS", {"rp_src": ("src_id", {"_id_map_rp": (("parent", "id"),)})}
+    )
+    env = lib.Env(pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="")
+
+    def ids(table: str) -> list[int | None]:
+        query = sql.SQL("SELECT * FROM {} ORDER BY 1").format(sql.Identifier("rp_app", table))
+        return [r[0] for r in pg_db.execute(query)]
+
+    try:
+        with lib.app_schema("rp_app"):
+            out = replay.replay_changed_keys(env, "2026-02-01T00:00:00+00:00", ["lookup"])
+        assert ids("parent") == [101, 103]
+        assert ids("child") == [1, 3, 4]
+        assert ids("grandchild") == [1, 3, 7]
+        assert ids("lookup") == [9]
+        with out.open(encoding="utf-8") as f:
+            report = list(csv.DictReader(f))
+        assert [(r["kind"], r["target"], r["deleted"]) for r in report] == [
+            ("key", "parent.id", "1"),
+            ("cascade", "child", "1"),
+            ("cascade", "grandchild", "1"),
+        ]
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP SCHEMA IF EXISTS rp_app CASCADE")
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw.rp_src, migration._id_map_rp")
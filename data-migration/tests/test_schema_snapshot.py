@@ -2,14 +2,21 @@
 
 The DuckDB <-> MySQL passthrough needs a live source and is exercised in
 integration, mirroring how preflight/load_full DB paths are handled. These
-tests cover the connection-string parsing and enum-domain parsing that drive
-the artifacts.
+tests cover the connection-string parsing (:func:`migration.duck.mysql_attach_dsn`,
+which the snapshot's ``src`` catalog attaches with) and enum-domain parsing
+that drive the artifacts, and the concurrent capture runner over a local DuckDB.
 """
 
 from __future__ import annotations
 
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
 import pytest
 
+from migration import duck, lib
 from migration.phases import schema_snapshot as ss
 
 
@@ -18,7 +25,7 @@ def _dsn_dict(dsn: str) -> dict[str, str]:
 
 
 def test_attach_dsn_full_url() -> None:
-    dsn = _dsn_dict(ss._mysql_attach_dsn("mysql://u:p@db.host:3307/legacy", ""))
+    dsn = _dsn_dict(duck.mysql_attach_dsn("mysql://u:p@db.host:3307/legacy", ""))
     assert dsn == {
         "host": "db.host",
         "port": "3307",
@@ -29,12 +36,12 @@ def test_attach_dsn_full_url() -> None:
 
 
 def test_attach_dsn_env_db_takes_precedence_over_url_path() -> None:
-    dsn = _dsn_dict(ss._mysql_attach_dsn("mysql://u:p@h/url_db", "env_db"))
+    dsn = _dsn_dict(duck.mysql_attach_dsn("mysql://u:p@h/url_db", "env_db"))
     assert dsn["database"] == "env_db"
 
 
 def test_attach_dsn_defaults_host_and_port() -> None:
-    dsn = _dsn_dict(ss._mysql_attach_dsn("mysql://u:p@/d", ""))
+    dsn = _dsn_dict(duck.mysql_attach_dsn("mysql://u:p@/d", ""))
     assert dsn["host"] == "localhost"
     assert dsn["port"] == "3306"
 
@@ -43,12 +50,12 @@ def test_attach_dsn_decodes_percent_encoded_credentials() -> None:
     # password 'p@ss:w/d' percent-encoded in the URL must round-trip decoded.
     enc_pw = "p%40ss%3Aw%2Fd"  # decodes to p@ss:w/d
     url = "mysql://" + "user:" + enc_pw + "@host/d"
-    dsn = _dsn_dict(ss._mysql_attach_dsn(url, ""))
+    dsn = _dsn_dict(duck.mysql_attach_dsn(url, ""))
     assert dsn["password"] == "p@ss:w/d" # pragma: allowlist secret
 
 
 def test_attach_dsn_omits_empty_credentials() -> None:
-    dsn = ss._mysql_attach_dsn("mysql://h:3306/d", "")
+    dsn = duck.mysql_attach_dsn("mysql://h:3306/d", "")
     assert "user=" not in dsn
     assert "password=" not in dsn
 
@@ -77,3 +84,37 @@ def test_write_csv_roundtrip(tmp_path) -> None:
     assert n == 2
     # None is written as an empty field, not the string "None".
     assert out.read_text(encoding="utf-8").splitlines() == ["a,b", "1,", "y,z"]
+
+
+def test_capture_all_skips_failures_and_keeps_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Captures run concurrently; a failing one is skipped and leaves no files."""
+    duckdb = pytest.importorskip("duckdb")
+
+    @contextmanager
+    def _local(*_a: Any) -> Generator[Any]:
+        con = duckdb.connect()
+        try:
+            yield con
+        finally:
+            con.close()
+
+    monkeypatch.setattr(ss, "duck_connection", _local)
+    monkeypatch.setattr(ss, "mysql_query_sql", lambda sql: sql)
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="")
+    captures = [
+        ("b.csv", "SELECT * FROM range(3)"),
+        ("bad.csv", "SELECT * FROM no_such_table"),
+        ("a.csv", "SELECT 1 AS x WHERE false"),
+    ]
+    done = ss.capture_all(env, tmp_path, captures, jobs=2)
+    assert list(done) == ["b.csv", "a.csv"]
+    assert done["b.csv"].rows == 3
+    assert done["b.csv"].bytes == sum((tmp_path / f).stat().st_size for f in ("b.csv", "b.parquet"))
+    assert done["a.csv"].rows == 0
+    assert not list(tmp_path.glob("bad.*"))
+    manifest = ss.capture_manifest(env, done, 1.23456)
+    assert manifest["row_counts"] == {"b.csv": 3, "a.csv": 0}
+    assert set(manifest["seconds"]) == {"b.csv", "a.csv"}
+    assert manifest["elapsed_seconds"] == 1.235
@@ -0,0 +1,122 @@
+"""Unit coverage for migration.sql_graph (front-matter dependency graph)."""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+
+from migration.lib import SQL_DIR
+from migration.sql_graph import build_graph, frontmatter_fields, read_node, relations
+
+
+def _sql(path: Path, inputs: str, outputs: str) -> Path:
+    path.write_text(
+        "/*\n"
+        " * Purpose:    test\n"
+        f" * Inputs:     {inputs}\n"
+        f" * Outputs:    {outputs}\n"
+        " * Invariants: -\n"
+        " * Refs:       -\n"
+        " *\n"
+        " * Prose mentioning mysql_raw.not_an_input is not a field.\n"
+        " */\n"
+        "SELECT 1;\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_frontmatter_fields_reads_labelled_lines_only() -> None:
+    """Each ``Label:`` line of the leading comment becomes one field."""
+    fields = frontmatter_fields("-- Purpose: p\n-- Inputs: mysql_raw.a\nSELECT 1; -- Outputs: x\n")
+    assert fields == {"Purpose": "p", "Inputs": "mysql_raw.a"}
+
+
+def test_relations_ignore_parenthesised_notes() -> None:
+    """Relations named inside a parenthetical are commentary, not dependencies."""
+    value = "CREATE OR REPLACE VIEW stg.link (guarded no-op until stg.document_resolved exists)"
+    assert relations(value) == {"stg.link"}
+    assert relations("INSERT INTO migration._id_map_X (ON CONFLICT DO NOTHING)") == {
+        "migration._id_map_x"
+    }
+
+
+def test_read_node_drops_self_reads(tmp_path: Path) -> None:
+    """A file reading the relation it writes does not depend on itself."""
+    node = read_node(_sql(tmp_path / "a.sql", "stg.v, mysql_raw.t", "CREATE VIEW stg.v"))
+    assert node.inputs == {"mysql_raw.t"}
+    assert node.outputs == {"stg.v"}
+
+
+def test_build_graph_links_earlier_producers_and_walks_downstream(tmp_path: Path) -> None:
+    """Edges point only at earlier producers; downstream() follows them transitively."""
+    a = _sql(tmp_path / "10_a.sql", "mysql_raw.t", "stg.a")
+    b = _sql(tmp_path / "20_b.sql", "stg.a", "stg.b")
+    c = _sql(tmp_path / "30_c.sql", "mysql_raw.u, stg.z", "stg.c")
+    z = _sql(tmp_path / "40_z.sql", "stg.b", "stg.z")
+    graph = build_graph([a, b, c, z])
+    assert graph.deps[b] == {a}
+    assert graph.deps[c] == frozenset(), "stg.z is produced later, so it is not an edge"
+    assert graph.relations_read() == {"mysql_raw.t", "mysql_raw.u", "stg.a", "stg.b", "stg.z"}
+    assert graph.downstream([a]) == {a, b, z}
+
+
+def test_stg_layer_graph_is_connected_through_the_filters() -> None:
+    """The real 10_stg front-matter wires the id-map populators to their filters."""
+    files = sorted((SQL_DIR / "10_stg").glob("*.sql"))
+    graph = build_graph(files)
+    by_name = {p.name: p for p in files}
+    assert by_name["10_filter_demo.sql"] in graph.deps[by_name["18_populate_id_map_mdcd_demo.sql"]]
+    downstream = {p.name for p in graph.downstream([by_name["17_filter_user.sql"]])}
+    assert {"20_populate_id_map_users.sql", "21_users_resolved.sql"} <= downstream
+    assert "30_amendment_resolved.sql" not in downstream
+
+
+def test_build_graph_strict_orders_shared_writers_and_readers(tmp_path: Path) -> None:
+    """Strict mode adds write-after-write and write-after-read edges for concurrent runs."""
+    a = _sql(tmp_path / "10_a.sql", "stg.src", "demos_app.x")
+    b = _sql(tmp_path / "20_b.sql", "stg.other", "demos_app.x")
+    c = _sql(tmp_path / "30_c.sql", "stg.more", "stg.src")
+    loose = build_graph([a, b, c])
+    strict = build_graph([a, b, c], strict=True)
+    assert loose.deps[b] == frozenset()
+    assert strict.deps[b] == {a}
+    assert strict.deps[c] == {a}, "c rewrites what a read, so it must wait for a"
+
+
+_SQL_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_SQL_WRITE_RE = re.compile(
+    r"\b(?:INSERT\s+INTO|CREATE\s+(?:UNLOGGED\s+)?TABLE(?:\s+IF\s+NOT\s+EXISTS)?)\s+"
+    r"((?:mysql_raw|stg|migration|demos_app)\.\w+)",
+    re.IGNORECASE,
+)
+_SQL_READ_RE = re.compile(
+    r"\b(?:FROM|JOIN)\s+((?:mysql_raw|stg|migration|demos_app)\.\w+)", re.IGNORECASE
+)
+
+
+@pytest.mark.parametrize(
+    "path",
+    sorted(
+        p
+        for layer in ("20_app", "21_app_associative", "23_app_derived")
+        for p in (SQL_DIR / layer).glob("*.sql")
+    ),
+    ids=lambda p: f"{p.parent.name}/{p.name}",
+)
+def test_app_frontmatter_declares_what_the_sql_touches(path: Path) -> None:
+    """build_app --jobs schedules from the front-matter, so it must match the SQL.
+
+    Outputs are exactly the INSERT INTO / CREATE TABLE targets (dynamic
+    ``EXECUTE format('INSERT INTO ...')`` included), and every relation read
+    with FROM/JOIN is declared. Comments are not SQL; a hold-back view named
+    only in a ``RAISE NOTICE`` is neither read nor written.
+    """
+    node = read_node(path)
+    body = _SQL_COMMENT_RE.sub(" ", path.read_text(encoding="utf-8"))
+    writes = {t.lower() for t in _SQL_WRITE_RE.findall(body)}
+    reads = {t.lower() for t in _SQL_READ_RE.findall(body)}
+    assert node.outputs == writes
+    assert reads - node.inputs - node.outputs == set()
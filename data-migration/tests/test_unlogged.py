@@ -0,0 +1,114 @@
+"""Tests for migration.phases.unlogged (the opt-in UNLOGGED_BUILD mode)."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import LiteralString, cast
+
+import psycopg
+import pytest
+
+from migration import lib
+from migration.phases import load_copy, load_full, unlogged
+
+
+def test_unlogged_bytes_written_counts_rewrites_in_full_and_growth_otherwise() -> None:
+    before = {1: (100, 8_000), 2: (200, 8_000), 3: (300, 8_000)}
+    after = {
+        1: (101, 5_000),  # rewritten: counts in full
+        2: (200, 12_000),  # same file: counts its growth
+        3: (300, 4_000),  # shrank in place: nothing
+        4: (400, 9_000),  # new table: counts in full
+    }
+    assert unlogged.unlogged_bytes_written(before, after) == 5_000 + 4_000 + 9_000
+
+
+def test_wal_report_markdown_nets_set_logged_against_avoided() -> None:
+    ledger = [
+        {
+            "phase": "load_full",
+            "at": "t0",
+            "seconds": 12.0,
+            "wal_bytes": 0,
+            "unlogged_bytes": 3 << 20,
+        },
+        {
+            "phase": "build_stg",
+            "at": "t1",
+            "seconds": 3.0,
+            "wal_bytes": 0,
+            "unlogged_bytes": 1 << 20,
+        },
+    ]
+    text = unlogged.wal_report_markdown(ledger, 1 << 20)
+    assert "| load_full | t0 | 12.0 | 0.0 | 3.0 |" in text
+    assert "WAL avoided (at least): 4.0 MB" in text
+    assert "WAL paid back by SET LOGGED: 1.0 MB" in text
+    assert "Net WAL saved (at least): 3.0 MB" in text
+
+
+def test_run_load_full_refuses_pgloader_under_unlogged_build(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """pgloader creates logged tables, so its load would not skip WAL."""
+    env = lib.Env(pg_url="u", mysql_url="u", mysql_db="", pg_db="", unlogged_build=True)
+    monkeypatch.setattr(load_full.Env, "load", classmethod(lambda cls: env))
+    with pytest.raises(SystemExit):
+        load_full.run_load_full(engine="pgloader")
+    assert "UNLOGGED_BUILD needs --engine copy" in " ".join(capsys.readouterr().err.split())
+
+
+def test_create_table_sql_unlogged() -> None:
+    rules = load_copy.parse_cast_rules()
+    plans = [load_copy.plan_column(load_copy.SourceColumn("id", "int", "int(11)"), rules)]
+    assert (
+        "CREATE UNLOGGED TABLE" in load_copy.create_table_sql("t", plans, unlogged=True).as_string()
+    )
+    assert "UNLOGGED" not in load_copy.create_table_sql("t", plans).as_string()
+
+
+def _persistence(conn: psycopg.Connection, relation: str) -> str:
+    row = conn.execute(
+        "SELECT relpersistence FROM pg_class WHERE oid = %s::regclass", [relation]
+    ).fetchone()
+    assert row is not None
+    return str(row[0])
+
+
+def test_set_unlogged_meter_and_set_logged_round_trip(
+    pg_db: psycopg.Connection, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """mysql_raw goes UNLOGGED and back; _delta_log and stg snapshots are left alone."""
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS mysql_raw")
+    pg_db.execute("CREATE SCHEMA IF NOT EXISTS stg")
+    pg_db.execute("DROP TABLE IF EXISTS mysql_raw.ul_probe, stg.ul_probe_resolved")
+    pg_db.execute("CREATE TABLE mysql_raw.ul_probe (id int)")
+    pg_db.execute("CREATE UNLOGGED TABLE stg.ul_probe_resolved (id int)")
+    pg_db.execute(
+        cast(LiteralString, (lib.SQL_DIR / "00_init" / "04_delta_log.sql").read_text("utf-8"))
+    )
+    monkeypatch.setattr(unlogged, "WAL_LEDGER_FILE", tmp_path / "unlogged_wal.json")
+    monkeypatch.setattr(unlogged, "RUNS_DIR", tmp_path)
+    env = lib.Env(
+        pg_url=os.environ["PG_TEST_DSN"], mysql_url="u", mysql_db="", pg_db="", unlogged_build=True
+    )
+    try:
+        assert unlogged.set_unlogged(env, "mysql_raw") >= 1
+        with unlogged.wal_meter(env, "delta"):
+            pg_db.execute("INSERT INTO mysql_raw.ul_probe SELECT generate_series(1, 20000)")
+        assert _persistence(pg_db, "mysql_raw.ul_probe") == "u"
+        assert _persistence(pg_db, "mysql_raw._delta_log") == "p"
+        ledger = json.loads((tmp_path / "unlogged_wal.json").read_text(encoding="utf-8"))
+        assert [e["phase"] for e in ledger] == ["delta"]
+        assert ledger[0]["unlogged_bytes"] > 0
+
+        report = unlogged.run_set_logged(env)
+        assert _persistence(pg_db, "mysql_raw.ul_probe") == "p"
+        assert _persistence(pg_db, "stg.ul_probe_resolved") == "u"
+        assert "| delta |" in report.read_text(encoding="utf-8")
+        assert not (tmp_path / "unlogged_wal.json").exists()
+    finally:
+        lib.close_pg_pools()
+        pg_db.execute("DROP TABLE IF EXISTS mysql_raw.ul_probe, stg.ul_probe_resolved")
@@ -93,6 +93,8 @@ def test_execute_sql_file_dies_naming_the_file(
     """A psycopg error during apply hard-fails with the failing file in the message."""
 
     class _Conn:
+        info = SimpleNamespace(transaction_status=psycopg.pq.TransactionStatus.INTRANS)
+
         def execute(self, _sql: object) -> None:
             raise psycopg.Error("boom")
 